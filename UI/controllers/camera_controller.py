@@ -41,6 +41,7 @@ class CameraController(QObject): # QObject for signals/slots if not inheriting B
 
         self._view.stream_button_clicked.connect(self._handle_stream_toggle)
         self._view.trigger_button_clicked.connect(self._handle_trigger_button)
+        self._view.save_button_clicked.connect(self._handle_save_button)
         self._view.roi_button_toggled.connect(self._handle_roi_mode_toggled) # View toggles ROI mode in viewer
 
         self._view.parameter_changed_by_user.connect(self._handle_single_parameter_change_from_ui)
@@ -83,7 +84,7 @@ class CameraController(QObject): # QObject for signals/slots if not inheriting B
     @pyqtSlot()
     def _handle_refresh_devices(self):
         self.logger.info("Controller: Refresh devices requested.")
-        self._model.enumerate_devices()
+        self._model.enumerate_devices(refresh=True)
 
     @pyqtSlot()
     def _handle_connect_disconnect(self):
@@ -124,6 +125,11 @@ class CameraController(QObject): # QObject for signals/slots if not inheriting B
         self.logger.info("Controller: Trigger button clicked.")
         self._model.trigger_software()
 
+    @pyqtSlot()
+    def _handle_save_button(self):
+        self.logger.info("Controller: Save image button clicked.")
+        self._model.take_photo()
+
     @pyqtSlot(bool)
     def _handle_roi_mode_toggled(self, is_roi_mode: bool):
         self.logger.info(f"Controller: ROI selection mode toggled to {is_roi_mode}.")
@@ -175,10 +181,14 @@ class CameraController(QObject): # QObject for signals/slots if not inheriting B
             status_summary.get("is_streaming", False)
         )
 
-    @pyqtSlot(np.ndarray, str)
-    def _on_model_new_frame(self, frame: np.ndarray, camera_id: str):
+    @pyqtSlot(object, str)
+    def _on_model_new_frame(self, frame: object, camera_id: str):
         # self.logger.debug(f"Controller: New frame from cam {camera_id}") # Potentially spammy
-        self._view.display_frame(frame)
+        # The signal is only a notification; display the newest queued frame and skip the backlog
+        latest = self._model.take_latest_frame()
+        if latest is None:
+            return
+        self._view.display_frame(latest)
 
     @pyqtSlot(dict)
     def _on_model_parameters_updated(self, params: Dict[str, Any]):
@@ -39,12 +39,15 @@ try:
     from UI.utils.ui_constants import LIGHT_COLORS, SPACING
     from UI.widgets.enhanced_image_viewer import ImageViewerWidget, InteractionMode
     from UI.widgets.collapsible_panel import CollapsiblePanel
+    from UI.widgets.dashboard_card import MetricsCard
 
     # 核心组件
     from core.camera.camera_factory import CameraFactoryManager
     # 确保在注册需要时导入特定的工厂
     from core.camera.hikvision_camera_factory import HikvisionCameraFactory
     from core.utils.signal_manager import signal_manager
+    from core.utils.frame_channel import get_channel
+    from core.camera.frame import Frame, as_array
     from core.utils.logger import get_logger
 
 except ImportError as e:
@@ -74,6 +77,7 @@ class CameraTabWidget(QMainWindow):
         self.camera = None           # 相机对象
         self.is_running = False      # 是否正在运行
         self.current_frame = None    # 当前帧
+        self._current_record = None  # current_frame所属的Frame，持有其缓冲区引用直到被下一帧替换
         self.camera_id = "未知"      # 相机 ID，将在连接时更新
         self.available_devices = []  # 可用的相机设备列表
         self.use_simulation = False  # 默认不使用模拟
@@ -81,7 +85,6 @@ class CameraTabWidget(QMainWindow):
 
         # 线程与帧率
         self.frame_lock = threading.Lock()       # 用于多线程处理图像帧的锁
-        self.new_frame_available = False        # 新帧是否可用标志
         self.fps_count = 0                     # 帧率计数器
         self.last_fps_time = time.time()       # 上次计算帧率的时间
         self.display_fps = 0.0                  # 显示帧率
@@ -100,8 +103,8 @@ class CameraTabWidget(QMainWindow):
 
         # --- 初始化相机逻辑 ---
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update_display_and_fps) # 更新图像显示和计算 FPS
-        self.timer.start(30)  # 约30帧/秒的显示刷新率
+        self.timer.timeout.connect(self._update_display_and_fps) # 计算并显示 FPS
+        self.timer.start(250)
 
         # 稍微推迟相机的初始化，以便让用户界面能够显示出来(100 毫秒之后，initialize_camera_core 方法会被自动调用)
         QTimer.singleShot(100, self.initialize_camera_core)
@@ -198,6 +201,7 @@ class CameraTabWidget(QMainWindow):
         # Image Viewer
         self._image_viewer = ImageViewerWidget()
         self._image_viewer.setMinimumSize(640, 480) # Ensure minimum size
+        self._image_viewer.set_live_mode(True) # 复用图像项，按显示器刷新节奏只绘制最新帧
         self._viewer_container_layout.addWidget(self._image_viewer)
 
         # FPS标签位于容器内右上角
@@ -360,6 +364,10 @@ class CameraTabWidget(QMainWindow):
         self._camera_info_label.setWordWrap(True)
         self._status_layout.addWidget(self._camera_info_label)
 
+        # 采集链路各阶段耗时(p50/p95/p99)和丢帧统计
+        self._metrics_card = MetricsCard("采集性能", parent=status_content)
+        self._status_layout.addWidget(self._metrics_card)
+
         self._status_panel.add_widget(status_content)
         self._status_panel.set_expanded(True) # Keep status expanded by default
 
@@ -430,6 +438,7 @@ class CameraTabWidget(QMainWindow):
         """Connect signals from the camera core (signal_manager)."""
         try:
             signal_manager.frame_ready_signal.connect(self.handle_frame)
+            signal_manager.deviceListUpdatedSignal.connect(self._on_device_list_updated)
         except AttributeError:
             self.show_error("Signal Manager not configured correctly.")
             logger.warning("signal_manager or frame_ready_signal not found.")
@@ -613,56 +622,74 @@ class CameraTabWidget(QMainWindow):
             self.camera._is_simulation = self.use_simulation
 
             self.log_status("正在枚举设备...")
-            QApplication.processEvents() # Allow UI update
-
-            self.available_devices = self.camera.enumerate_devices()
-
-            self._camera_combo.clear()
-            self._camera_combo.addItem("自动选择")
-            target_device_index = -1 # Index in the combo box (0 = auto)
-
-            if self.available_devices:
-                for i, device in enumerate(self.available_devices):
-                    model_name = device.get('model_name', '未知型号')
-                    serial_number = device.get('serial_number', '未知SN')
-                    device_id = device.get('device_id', f'索引{i}') # Use index as fallback ID
-                    device_ip = device.get('device_ip') # Might be None for non-GigE
-
-                    # Build display string
-                    display_text = f"[{device_id}] {model_name} (SN:{serial_number})"
-                    if device_ip:
-                        display_text += f" - {device_ip}"
-
-                    # Check for target model (case-insensitive)
-                    is_target = "MV-CI003-GL-N6" in model_name.upper() # Example target
-
-                    if is_target:
-                        display_text += " [目标相机]"
-                        if target_device_index == -1: # Select the first target found
-                            target_device_index = i + 1 # +1 because index 0 is "自动选择"
-
-                    self._camera_combo.addItem(display_text, userData=device_id) # Store device_id as userData
-
-                # Auto-select the target model if found
-                if target_device_index != -1:
-                    self._camera_combo.setCurrentIndex(target_device_index)
-                    self.log_status(f"找到 {len(self.available_devices)} 个设备。已自动选择目标相机。")
-                else:
-                     self.log_status(f"找到 {len(self.available_devices)} 个设备。")
 
+            # 枚举在工作线程中进行，每发现一批设备通过deviceListUpdatedSignal更新下拉框
+            publish = signal_manager.deviceListUpdatedSignal.emit
+            if hasattr(self.camera, 'enumerate_devices_async'):
+                self.camera.enumerate_devices_async(refresh=True, callback=publish, done_callback=publish)
             else:
-                if self.use_simulation:
-                    self.log_status("未找到真实相机，将使用模拟模式（如果启用）。")
-                    # Add a simulation entry if none found
-                    self._camera_combo.addItem("[模拟设备]", userData="simulation_id")
-                else:
-                    self.log_status("未找到相机设备。请检查连接或启用模拟模式。")
+                publish(self.camera.enumerate_devices())
 
         except Exception as e:
             self.show_error(f"刷新设备列表失败: {e}")
             self.log_status(f"错误：刷新设备列表失败: {e}")
             logger.error(f"Failed to refresh device list: {e}", exc_info=True)
+            self._update_ui_state()
+
+    def _on_device_list_updated(self, devices):
+        """设备列表更新(枚举过程中会多次调用)，重建设备下拉框并保留用户已选的设备"""
+        self.available_devices = devices
+        selected_id = self._camera_combo.currentData()
+
+        self._camera_combo.blockSignals(True)
+        self._camera_combo.clear()
+        self._camera_combo.addItem("自动选择")
+        target_device_index = -1 # Index in the combo box (0 = auto)
+        selected_index = -1
+
+        if self.available_devices:
+            for i, device in enumerate(self.available_devices):
+                model_name = device.get('model_name', '未知型号')
+                serial_number = device.get('serial_number', '未知SN')
+                device_id = device.get('device_id', f'索引{i}') # Use index as fallback ID
+                device_ip = device.get('device_ip') # Might be None for non-GigE
+
+                # Build display string
+                display_text = f"[{device_id}] {model_name} (SN:{serial_number})"
+                if device_ip:
+                    display_text += f" - {device_ip}"
+
+                # Check for target model (case-insensitive)
+                is_target = "MV-CI003-GL-N6" in model_name.upper() # Example target
+
+                if is_target:
+                    display_text += " [目标相机]"
+                    if target_device_index == -1: # Select the first target found
+                        target_device_index = i + 1 # +1 because index 0 is "自动选择"
+
+                self._camera_combo.addItem(display_text, userData=device_id) # Store device_id as userData
+                if selected_id is not None and device_id == selected_id:
+                    selected_index = i + 1
+
+            # Keep the user's choice; otherwise auto-select the target model if found
+            if selected_index != -1:
+                self._camera_combo.setCurrentIndex(selected_index)
+                self.log_status(f"找到 {len(self.available_devices)} 个设备。")
+            elif target_device_index != -1:
+                self._camera_combo.setCurrentIndex(target_device_index)
+                self.log_status(f"找到 {len(self.available_devices)} 个设备。已自动选择目标相机。")
+            else:
+                 self.log_status(f"找到 {len(self.available_devices)} 个设备。")
+
+        else:
+            if self.use_simulation:
+                self.log_status("未找到真实相机，将使用模拟模式（如果启用）。")
+                # Add a simulation entry if none found
+                self._camera_combo.addItem("[模拟设备]", userData="simulation_id")
+            else:
+                self.log_status("未找到相机设备。请检查连接或启用模拟模式。")
 
+        self._camera_combo.blockSignals(False)
         self._update_ui_state() # Refresh UI state after listing
 
     def toggle_simulation_mode(self):
@@ -688,6 +715,7 @@ class CameraTabWidget(QMainWindow):
             try:
                 if self.is_running:
                     self.stop_grabbing() # Stop grabbing before closing
+                self._release_current_frame()
 
                 if self.camera.close():
                     self.log_status("相机已断开")
@@ -1042,9 +1070,13 @@ class CameraTabWidget(QMainWindow):
             self.log_status(f"正在应用参数: {params_to_set}")
             QApplication.processEvents()
 
-            # Use the unified set_parameter method if available
-            if hasattr(self.camera, 'set_parameter') and callable(self.camera.set_parameter):
-                 results = self.camera.set_parameter(**params_to_set) # Pass dict as kwargs
+            # Use the batched set_parameters (skips unchanged nodes) or the unified set_parameter if available
+            batch_setter = getattr(self.camera, 'set_parameters', None)
+            if callable(batch_setter) or (hasattr(self.camera, 'set_parameter') and callable(self.camera.set_parameter)):
+                 if callable(batch_setter):
+                      results = batch_setter(params_to_set) # Returns success flags per param
+                 else:
+                      results = self.camera.set_parameter(**params_to_set) # Pass dict as kwargs
 
                  if isinstance(results, dict): # Assume it returns success flags per param
                       success_flags = results
@@ -1089,8 +1121,9 @@ class CameraTabWidget(QMainWindow):
                     self.log_status(f"参数应用完成 ({num_success}/{num_total} 成功 via individual setters).")
 
 
-            # Refresh display with actual values read back from camera
-            QTimer.singleShot(100, self.update_parameter_display)
+            # Refresh display with actual values read back from camera. Nodes that were just written are
+            # invalidated in the camera's parameter cache, so only those are read again.
+            self.update_parameter_display()
 
 
         except Exception as e:
@@ -1103,54 +1136,44 @@ class CameraTabWidget(QMainWindow):
 
     def handle_frame(self, frame, camera_id):
         """通过信号从相机核心接收一帧图像."""
+        # 信号只是通知，从该相机的帧队列中取最新一帧，积压的旧帧直接跳过；
+        # 取出的帧持有缓冲区的一个引用，交给查看器，由查看器在该帧不再显示时归还
+        channel = get_channel(camera_id)
+        if channel is not None:
+            frame = channel.get_latest()
+            if frame is None:
+                return
+        else:
+            # 没有帧队列时信号中的帧不属于本消费者，采集线程随后可能复用其缓冲区，拷贝后再使用
+            frame = as_array(frame)
+            if frame is not None:
+                frame = frame.copy()
         if frame is not None:
+            # current_frame与查看器各持有一个引用：查看器接管取出的引用，这里再增加一个，
+            # 缓冲区在两者都不再使用之前不会被采集线程复用
+            record = frame.retain() if isinstance(frame, Frame) else None
+            # 查看器处于实时模式，只保留最新一帧并按显示器刷新节奏绘制，这里不需要拷贝和转换
+            self._image_viewer.submit_frame(frame)
             with self.frame_lock:
-                # 进行复制，以便与相机回调线程解耦
-                self.current_frame = frame.copy()
+                previous, self._current_record = self._current_record, record
+                self.current_frame = as_array(frame)
                 self.camera_id = camera_id 
-                self.new_frame_available = True
                 # 在此处增加帧率计数器
                 self.fps_count += 1
+            if previous is not None:
+                previous.release()
 
-
-    def _update_display_and_fps(self):
-        """定时器触发的函数，用于在 UI 线程中安全地更新图像显示并计算 FPS。"""
-        frame_to_display = None
+    def _release_current_frame(self):
+        """清除current_frame并归还其缓冲区引用"""
         with self.frame_lock:
-            if self.new_frame_available and self.current_frame is not None:
-                # 获取最新帧并标记为已处理
-                frame_to_display = self.current_frame
-                self.new_frame_available = False
+            record, self._current_record = self._current_record, None
+            self.current_frame = None
+        if record is not None:
+            record.release()
 
-        # --- 处理帧（锁外部） ---
-        if frame_to_display is not None:
-            try:
-                height, width = frame_to_display.shape[:2]   #获取帧的高度、宽度
-                bytes_per_line = frame_to_display.strides[0]  #每行的字节数
-
-                if len(frame_to_display.shape) == 3: # Color 颜色 
-                    # 检查是BGR还是RGB
-                    if frame_to_display.shape[2] == 3:
-                        q_image = QImage(frame_to_display.data, width, height, bytes_per_line, QImage.Format_BGR888)
-                    elif frame_to_display.shape[2] == 4: # BGRA?
-                         q_image = QImage(frame_to_display.data, width, height, bytes_per_line, QImage.Format_ARGB32) 
-                    else:
-                        logger.warning(f"不支持的彩色图像形状: {frame_to_display.shape}")
-                        return # 如果格式未知则跳过显示
-                elif len(frame_to_display.shape) == 2: # Grayscale  灰度
-                    q_image = QImage(frame_to_display.data, width, height, bytes_per_line, QImage.Format_Grayscale8)
-                else:
-                     logger.warning(f"不支持的图像形状: {frame_to_display.shape}")
-                     return # 如果格式未知则跳过显示
-
-                # 转换为QPixmap以在ImageViewerWidget中显示（它处理像素图）
-                #q_image.copy()防止底层数据在 QPixmap 仍在使用时被释放或修改
-                pixmap = QPixmap.fromImage(q_image.copy())
-                self._image_viewer.set_image(pixmap) # 设置并显示新的 pixmap
-
-            except Exception as e:
-                logger.error(f"图像转换/显示错误: {e}", exc_info=True)
 
+    def _update_display_and_fps(self):
+        """定时器触发的函数，在 UI 线程中计算并显示 FPS（图像由查看器的实时模式绘制）。"""
         # --- 计算并更新帧率 ---
         now = time.time()
         elapsed = now - self.last_fps_time    #self.last_fps_time：记录上次计算 FPS 的时间
@@ -1160,7 +1183,14 @@ class CameraTabWidget(QMainWindow):
                 self.fps_count = 0 # 重置下一个时间间隔的计数器
             self.display_fps = current_fps_count / elapsed
             self.last_fps_time = now
-            self._fps_label.setText(f"FPS: {self.display_fps:.1f}")
+            fps_text = f"FPS: {self.display_fps:.1f}"
+            display_stats = self._image_viewer.get_display_stats()
+            fps_text += f" | 显示: {display_stats['paint_fps']:.1f}"
+            channel = get_channel(self.camera_id)
+            if channel is not None:
+                stats = channel.get_stats()
+                fps_text += f" | 队列: {stats['size']}/{stats['depth']} 丢帧: {stats['dropped'] + stats['superseded']}"
+            self._fps_label.setText(fps_text)
 
 
     def log_status(self, message):
@@ -1179,6 +1209,7 @@ class CameraTabWidget(QMainWindow):
         """Handles the window closing event."""
         self.log_status("正在关闭应用程序...")
         self.timer.stop() # Stop display updates
+        self._release_current_frame()
 
         if self.camera:
             try:
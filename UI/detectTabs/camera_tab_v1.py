@@ -55,6 +55,8 @@ except ImportError as e:
 from core.camera.camera_factory import CameraFactoryManager
 from core.camera.hikvision_camera_factory import HikvisionCameraFactory  # 确保工厂类被导入
 from core.utils.signal_manager import signal_manager    
+from core.utils.frame_channel import get_channel
+from core.camera.frame import Frame, as_array
 from core.utils.logger import get_logger
 
 # 获取日志记录器
@@ -637,12 +639,23 @@ class CameraTabWidget(QMainWindow):
     def handle_frame(self, frame, camera_id):
         """处理接收到的图像帧"""
         try:
+            # 从该相机的帧队列中取最新一帧，积压的旧帧直接跳过
+            channel = get_channel(camera_id)
+            record = None
+            if channel is not None:
+                record = frame = channel.get_latest()
+                if frame is None:
+                    return
             # 创建帧的深拷贝，避免在处理过程中被修改
+            frame = as_array(frame)
             if frame is not None:
                 with self.frame_lock:
                     self.current_frame = frame.copy()
                     self.camera_id = camera_id
                     self.new_frame_available = True
+            if isinstance(record, Frame):
+                # 拷贝后归还从帧队列取出的缓冲区引用
+                record.release()
         except Exception as e:
             self.log_status(f"处理图像帧时发生错误: {str(e)}")
             import traceback
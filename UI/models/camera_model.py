@@ -7,13 +7,21 @@ import threading
 import time
 import numpy as np
 
-from PyQt5.QtCore import pyqtSignal, QMutex, QMutexLocker, QTimer, QObject
+from PyQt5.QtCore import pyqtSignal, QMutex, QMutexLocker, QTimer, QObject, Qt
 
 from UI.models.base_model import BaseModel
 from core.camera.camera_factory import CameraFactoryManager
 from core.camera.camera_interface import CameraInterface
+from core.camera.frame import Frame
 import core.camera.hikvision_camera_factory # 确保海康工厂被导入并注册
+from core.camera.parameter_writer import ParameterWriter
+from core.utils.frame_channel import FrameChannel, DROP_OLDEST, DEFAULT_DEPTH
 from core.utils.logger import get_logger
+from core.utils.save_service import image_save_service
+from core.utils.signal_manager import signal_manager
+
+# 断开相机前等待正在写入的参数完成的最长时间(秒)
+PARAM_FLUSH_TIMEOUT = 1.0
 
 
 class CameraModel(BaseModel):
@@ -30,7 +38,7 @@ class CameraModel(BaseModel):
     simulation_mode_status_changed = pyqtSignal(bool) # is_simulation_mode
 
     # 数据信号
-    new_frame_available = pyqtSignal(np.ndarray, str)   # frame, camera_id
+    new_frame_available = pyqtSignal(object, str)   # Frame (array + frame number/timestamps), camera_id
     fps_updated = pyqtSignal(float)                # current_fps
 
     # 参数变化信号
@@ -41,6 +49,9 @@ class CameraModel(BaseModel):
     error_occurred = pyqtSignal(str, str)          # error_title, error_message
     status_message_updated = pyqtSignal(str)       # status_message
 
+    # 内部信号：枚举线程发现的设备列表，排队送到界面线程更新_available_devices_info
+    _devices_found = pyqtSignal(list)
+
     def __init__(self):
         """初始化相机模型"""
         super().__init__()
@@ -54,11 +65,18 @@ class CameraModel(BaseModel):
         self._is_streaming = False
         self._current_device_id: Optional[str] = None
         self._available_devices_info: List[Dict[str, Any]] = []
+        self._enumeration_lock = threading.Lock()
+        self._enumeration_thread: Optional[threading.Thread] = None
+        self._enumeration_request: Optional[bool] = None   # 枚举期间再次请求时的refresh参数
         self._is_simulation_mode = False
 
         # 图像数据
         self._frame_lock = QMutex()
         self._current_frame: Optional[np.ndarray] = None
+        self._current_record: Optional[Frame] = None # 最新一帧(拍照保存时带帧号、时间戳)，持有缓冲区的一个引用
+        # 采集线程到界面的有界帧队列，队列由空变为非空时才发射new_frame_available；被丢弃的帧归还缓冲区
+        self._display_channel = FrameChannel(DEFAULT_DEPTH, DROP_OLDEST, notify=self._emit_new_frame,
+                                             name="camera_model", release=Frame.release)
 
         # FPS计算
         self._fps_count = 0
@@ -86,10 +104,20 @@ class CameraModel(BaseModel):
             "roi_height": 0,
         }
 
+        # 后台参数写入线程：滑块拖动产生的修改按参数合并、限速写入，不占用界面线程和相机互斥锁
+        self._param_writer = ParameterWriter(self._apply_parameters, result_callback=self._on_parameters_applied,
+                                             name="CameraParameterWriter")
+        self._param_writer.start()
+
         self._streaming_thread: Optional[threading.Thread] = None
         self._streaming_active_flag = False
         self._thread_stop_event = threading.Event()
 
+        # 拍照请求：图像交给后台保存服务编码写盘，不阻塞界面和采集线程
+        signal_manager.requestTakePhoto.connect(self.take_photo)
+        signal_manager.data_saved_signal.connect(self._on_data_saved)
+        self._devices_found.connect(self._on_devices_found, Qt.QueuedConnection)
+
         QTimer.singleShot(100, self._initialize_camera_system)
 
     def _initialize_camera_system(self):
@@ -114,51 +142,74 @@ class CameraModel(BaseModel):
         self.status_message_updated.emit(f"模拟模式已{'启用' if enabled else '禁用'}. 请刷新设备列表或重新连接.")
 
 
-    def enumerate_devices(self):
-        self.logger.info("Enumerating camera devices...")
-        self.status_message_updated.emit("正在枚举设备...")
+    def enumerate_devices(self, refresh: bool = False):
+        """
+        在后台线程中枚举设备(不阻塞界面)
+
+        每发现一批设备发出camera_list_updated和signal_manager.deviceListUpdatedSignal，枚举结束后发出状态消息；
+        正在枚举时再次调用不会重复扫描。
+
+        Args:
+            refresh: 是否忽略缓存的枚举结果重新扫描(刷新按钮)
+        """
+        with self._enumeration_lock:
+            if self._enumeration_thread is not None:
+                # Enumerate again when the running scan finishes (e.g. simulation mode changed meanwhile)
+                self.logger.info("Device enumeration already in progress, queued another one.")
+                self._enumeration_request = bool(self._enumeration_request) or refresh
+                return
+            self.logger.info("Enumerating camera devices...")
+            self.status_message_updated.emit("正在枚举设备...")
+            self._enumeration_thread = threading.Thread(target=self._enumeration_worker, args=(refresh,),
+                                                        name="CameraEnumeration", daemon=True)
+            self._enumeration_thread.start()
+
+    def _enumeration_worker(self, refresh: bool):
+        """枚举线程函数，信号经Qt排队送到界面线程"""
+        while True:
+            self._enumerate_once(refresh)
+            with self._enumeration_lock:
+                if self._enumeration_request is None:
+                    self._enumeration_thread = None
+                    return
+                refresh, self._enumeration_request = self._enumeration_request, None
+
+    def _enumerate_once(self, refresh: bool):
+        """枚举一次设备"""
         temp_cam_instance: Optional[CameraInterface] = None
         try:
             available_types = CameraFactoryManager.get_available_types()
             if not available_types:
                 self.logger.warning("No camera factory types available for enumeration.")
                 self.error_occurred.emit("枚举设备失败", "未找到可用的相机工厂类型。")
-                self._available_devices_info = []
-                self.camera_list_updated.emit([])
+                self._publish_devices([])
                 return
 
             cam_type_to_use = "hikvision" if "hikvision" in available_types else available_types[0]
-            temp_cam_instance = CameraFactoryManager.create_camera(cam_type_to_use, is_simulation=self._is_simulation_mode)
+            temp_cam_instance = self._create_camera(cam_type_to_use)
 
             if not temp_cam_instance:
                 self.logger.error(f"Failed to create temp camera for enumeration (type: {cam_type_to_use}).")
                 self.error_occurred.emit("枚举设备失败", f"无法创建用于枚举的相机实例 ({cam_type_to_use})。")
-                self._available_devices_info = []
-                self.camera_list_updated.emit([])
+                self._publish_devices([])
                 return
-            
-            # Ensure the temp instance knows about simulation mode if it's a dynamic property
-            if hasattr(temp_cam_instance, 'set_simulation_mode_internal'): # Hypothetical method
-                 temp_cam_instance.set_simulation_mode_internal(self._is_simulation_mode)
-
 
-            devices = temp_cam_instance.enumerate_devices()
-            self._available_devices_info = devices if devices else []
-            self.logger.info(f"Found {len(self._available_devices_info)} devices.")
-            self.camera_list_updated.emit(self._available_devices_info.copy()) # Emit a copy
+            # Devices found so far are published as each transport layer finishes
+            devices = temp_cam_instance.enumerate_devices(refresh=refresh, callback=self._publish_devices) or []
+            self._publish_devices(devices)
+            self.logger.info(f"Found {len(devices)} devices.")
             
             msg = ""
-            if not self._available_devices_info:
+            if not devices:
                 msg = "未找到相机设备。" + ("请检查连接或启用模拟模式。" if not self._is_simulation_mode else "模拟模式已启用。")
             else:
-                msg = f"找到 {len(self._available_devices_info)} 个设备。"
+                msg = f"找到 {len(devices)} 个设备。"
             self.status_message_updated.emit(msg)
 
         except Exception as e:
             self.logger.error(f"Error enumerating devices: {e}", exc_info=True)
             self.error_occurred.emit("枚举设备错误", str(e))
-            self._available_devices_info = []
-            self.camera_list_updated.emit([])
+            self._publish_devices([])
         finally:
             if temp_cam_instance:
                 try:
@@ -167,6 +218,22 @@ class CameraModel(BaseModel):
                 except Exception as e_close:
                     self.logger.warning(f"Error closing temp camera after enumeration: {e_close}")
 
+    def _publish_devices(self, devices: List[Dict[str, Any]]):
+        """在枚举线程中调用，把设备列表排队交给界面线程"""
+        self._devices_found.emit(list(devices))
+
+    def _on_devices_found(self, devices: List[Dict[str, Any]]):
+        """界面线程槽函数：更新设备列表，有变化时发出camera_list_updated和deviceListUpdatedSignal"""
+        if devices == self._available_devices_info:
+            return
+        self._available_devices_info = list(devices)
+        self.camera_list_updated.emit(list(devices))
+        signal_manager.deviceListUpdatedSignal.emit(list(devices))
+
+    def _create_camera(self, cam_type: str) -> Optional[CameraInterface]:
+        """创建相机实例，模拟模式开启时由工厂以模拟模式创建"""
+        return CameraFactoryManager.create_camera(cam_type, simulation=self._is_simulation_mode)
+
     def connect_camera(self, device_id: str) -> bool:
         with QMutexLocker(self._camera_mutex):
             if self._is_connected and self._current_device_id == device_id:
@@ -187,7 +254,7 @@ class CameraModel(BaseModel):
                 if cam_type_to_use not in available_types and available_types:
                     cam_type_to_use = available_types[0]
                 
-                self._camera = CameraFactoryManager.create_camera(cam_type_to_use, is_simulation=self._is_simulation_mode)
+                self._camera = self._create_camera(cam_type_to_use)
                 if not self._camera:
                     self.logger.error(f"Failed to create camera instance for {device_id} (type: {cam_type_to_use}).")
                     self.error_occurred.emit("连接失败", f"无法创建相机实例 ({device_id}, 类型: {cam_type_to_use})。")
@@ -265,6 +332,13 @@ class CameraModel(BaseModel):
             # For now, emit here. Controller/View should handle UI updates safely.
             # self.streaming_status_changed.emit(False) # Emitted by public disconnect_camera
 
+        # Parameters queued for this camera must not be written to the next one
+        self._param_writer.clear()
+        # A batch already taken by the writer may be inside the SDK; closing the handle under it is unsafe.
+        # A writer still waiting for camera_mutex will see the camera disconnected once we release it.
+        if not self._param_writer.flush(PARAM_FLUSH_TIMEOUT):
+            self.logger.warning(f"Parameter write still in progress after {PARAM_FLUSH_TIMEOUT}s, closing camera anyway.")
+
         try:
             self._camera.close()
             self.logger.info(f"Camera {self._current_device_id} closed internally.")
@@ -346,6 +420,7 @@ class CameraModel(BaseModel):
             if self._streaming_thread.is_alive():
                 self.logger.warning("Streaming thread did not terminate gracefully.")
         self._streaming_thread = None
+        self._display_channel.clear()
         
         # Lock for camera hardware access
         with QMutexLocker(self._camera_mutex):
@@ -372,42 +447,42 @@ class CameraModel(BaseModel):
 
     def _frame_grabbing_loop(self):
         self.logger.info("Frame grabbing thread started.")
-        last_frame_log_time = time.monotonic()
 
         while self._streaming_active_flag:
             if self._thread_stop_event.is_set():
                 self.logger.info("Stop event received, exiting frame grabbing loop.")
                 break
-            
-            frame_data: Optional[np.ndarray] = None
-            
-            # Try to acquire lock briefly to access camera
-            if self._camera_mutex.tryLock(10): # Timeout for lock: 10ms
-                try:
-                    if self._camera and self._is_streaming: # Check if still valid to grab
-                        frame_data = self._camera.get_frame(timeout=50) # Short timeout for frame
-                except Exception as e:
-                    self.logger.error(f"Error in _camera.get_frame: {e}", exc_info=False) # Less verbose logging in loop
-                    time.sleep(0.02) # Sleep on error
-                finally:
-                    self._camera_mutex.unlock()
-            else: # Failed to get lock, camera might be busy
-                time.sleep(0.005) # Very short sleep and retry
+
+            # Hold the camera mutex only long enough to grab a reference; get_frame blocks on the
+            # camera's latest-frame slot (condition variable), so waiting costs no CPU and does not
+            # keep parameter changes from the UI thread waiting on the mutex.
+            with QMutexLocker(self._camera_mutex):
+                camera = self._camera if self._is_streaming else None
+            if camera is None:
+                self._thread_stop_event.wait(0.05)
+                continue
+
+            try:
+                record = camera.get_frame_record(timeout=200)
+            except Exception as e:
+                self.logger.error(f"Error in _camera.get_frame_record: {e}", exc_info=False) # Less verbose logging in loop
+                self._thread_stop_event.wait(0.02) # Back off on error
                 continue
 
-            if frame_data is not None:
-                with self._frame_lock:
-                    self._current_frame = frame_data # Camera should provide a copy or new buffer
+            if record is not None:
+                if not record.camera_id:
+                    record.camera_id = self._current_device_id or ""
+                # The grabbed reference goes to the display channel; _current_record holds its own
+                record.retain()
+                with QMutexLocker(self._frame_lock):
+                    previous = self._current_record
+                    self._current_frame = record.array
+                    self._current_record = record
                     self._fps_count += 1
-                self.new_frame_available.emit(self._current_frame, self._current_device_id or "")
-                last_frame_log_time = time.monotonic()
-            else:
-                # No frame, could be timeout or end of stream
-                if self._streaming_active_flag and (time.monotonic() - last_frame_log_time > 1.0):
-                    # self.logger.debug("No frame received in last second.") # Avoid log spam
-                    last_frame_log_time = time.monotonic()
-                time.sleep(0.001) # Minimal sleep if no frame
-        
+                if previous is not None:
+                    previous.release()
+                self._display_channel.put(record)
+
         self.logger.info("Frame grabbing thread finished.")
 
     def _calculate_and_emit_fps(self):
@@ -429,69 +504,181 @@ class CameraModel(BaseModel):
             self.fps_updated.emit(self._current_fps)
 
 
+    def _emit_new_frame(self, record: Frame):
+        # Called from the grabbing thread when the display channel becomes non-empty
+        self.new_frame_available.emit(record, record.camera_id)
+
+    def take_latest_frame(self) -> Optional[Frame]:
+        """
+        取出显示队列中最新的一帧(带帧号、时间戳等元数据)，积压的旧帧被丢弃
+
+        Returns:
+            Frame，调用者持有其缓冲区的一个引用，不再显示时调用release()；队列为空时返回None
+        """
+        return self._display_channel.get_latest()
+
+    def set_frame_queue(self, depth: Optional[int] = None, policy: Optional[str] = None):
+        """设置显示队列深度和丢帧策略(drop_oldest / drop_newest / block)"""
+        if depth is not None:
+            self._display_channel.set_depth(depth)
+        if policy is not None:
+            self._display_channel.set_policy(policy)
+
+    def get_frame_queue_stats(self) -> Dict[str, Any]:
+        """获取显示队列的深度、当前长度和丢帧计数"""
+        return self._display_channel.get_stats()
+
     def get_current_frame_copy(self) -> Optional[np.ndarray]:
-        with self._frame_lock:
+        with QMutexLocker(self._frame_lock):
             return self._current_frame.copy() if self._current_frame is not None else None
 
+    def take_photo(self, fmt: Optional[str] = None) -> Optional[str]:
+        """
+        保存当前图像
+
+        图像拷贝后提交给后台保存服务，编码和写盘在编码线程池中完成，完成后由data_saved_signal通知。
+
+        Args:
+            fmt: 保存格式(png / jpg / bmp / tiff)，None表示保存服务的默认格式
+
+        Returns:
+            将要写入的文件路径；没有图像或保存队列已满时返回None
+        """
+        with QMutexLocker(self._frame_lock):
+            record = self._current_record
+            if record is not None:
+                # 采集线程随时会替换当前帧，提交保存(拷贝)期间保持引用
+                record.retain()
+        if record is None:
+            self.error_occurred.emit("拍照失败", "当前没有可保存的图像。")
+            return None
+
+        try:
+            if not image_save_service.running:
+                image_save_service.start()
+            path = image_save_service.submit(record, fmt=fmt, data_type="photo")
+            if path is None:
+                self.logger.warning("Save queue is full, photo dropped.")
+                self.status_message_updated.emit("保存队列已满，本次拍照未保存。")
+                return None
+            signal_manager.cameraTakePhotoSignal.emit(record.array.copy())
+        finally:
+            record.release()
+        self.status_message_updated.emit(f"正在保存: {path}")
+        return path
+
+    def get_save_stats(self) -> Dict[str, Any]:
+        """获取后台保存服务的积压帧数、吞吐量和丢弃计数"""
+        return image_save_service.get_stats()
+
+    def _on_data_saved(self, data_type: str, path: str):
+        if data_type == "photo":
+            self.status_message_updated.emit(f"图像已保存: {path}")
+
     def set_parameters(self, params_to_set: Dict[str, Any]):
-        with QMutexLocker(self._camera_mutex):
-            if not self._is_connected or not self._camera:
-                self.error_occurred.emit("操作失败", "相机未连接，无法设置参数。")
-                return
+        """
+        提交参数修改(不阻塞)
+
+        参数交给后台写入线程，同一参数写入前的多次修改只写最后一个值，写入频率受最小间隔限制；
+        写入后相机的实际值通过parameters_updated异步回报。
+        """
+        if not self._is_connected:
+            self.error_occurred.emit("操作失败", "相机未连接，无法设置参数。")
+            return
+        self.logger.debug(f"Queueing parameters: {params_to_set}")
+        self._param_writer.submit_many(params_to_set)
 
-            self.logger.info(f"Attempting to set parameters: {params_to_set}")
-            self.status_message_updated.emit(f"正在应用参数: {list(params_to_set.keys())}")
-            
-            actually_changed_params = {}
+    def get_parameter_writer_stats(self) -> Dict[str, Any]:
+        """获取后台参数写入线程的提交/合并/写入计数和写入耗时"""
+        return self._param_writer.get_stats()
 
-            try:
-                # Prefer batch set if camera supports it
-                if hasattr(self._camera, 'set_parameters') and callable(self._camera.set_parameters):
-                    # This assumes set_parameters takes a dict and applies them.
-                    # The CameraInterface should define how this works.
-                    # For now, we'll assume it tries its best.
-                    self._camera.set_parameters(params_to_set.copy()) # Send a copy
-                    # After attempting batch set, we must reload all params to know what actually changed
-                else: # Fallback to individual setters
-                    for param_name, value in params_to_set.items():
-                        if param_name not in self._parameters:
-                            self.logger.warning(f"Unknown parameter '{param_name}' in set_parameters. Skipping.")
-                            continue
-                        
-                        success = False
-                        # Call specific setters based on param_name
-                        if param_name == "exposure_time": success = self._camera.set_exposure_time(value)
-                        elif param_name == "gain": success = self._camera.set_gain(value)
-                        elif param_name == "frame_rate": success = self._camera.set_frame_rate(value)
-                        elif param_name == "trigger_mode": success = self._camera.set_trigger_mode(value)
-                        elif param_name == "auto_exposure" and hasattr(self._camera, 'set_auto_exposure'):
-                            success = self._camera.set_auto_exposure(value)
-                        elif param_name == "auto_gain" and hasattr(self._camera, 'set_auto_gain'):
-                            success = self._camera.set_auto_gain(value)
-                        elif param_name == "auto_wb" and hasattr(self._camera, 'set_auto_white_balance'):
-                            success = self._camera.set_auto_white_balance(value)
-                        elif param_name == "white_balance_kelvin" and hasattr(self._camera, 'set_white_balance_kelvin'):
-                            success = self._camera.set_white_balance_kelvin(value)
-                        elif param_name.startswith("roi_") and hasattr(self._camera, 'set_roi'):
-                            # ROI needs all components. Assume they are all in params_to_set if one is.
-                            if param_name == "roi_x": # Set ROI only once when the first ROI param is encountered
-                                roi_params = {p: params_to_set.get(p, self._parameters[p]) for p in ["roi_x", "roi_y", "roi_width", "roi_height"]}
-                                success = self._camera.set_roi(roi_params["roi_x"], roi_params["roi_y"], roi_params["roi_width"], roi_params["roi_height"])
-                        else:
-                            self.logger.warning(f"No specific setter or attribute for parameter '{param_name}'.")
-                            continue # Skip to next parameter
-
-                        if not success:
-                             self.logger.warning(f"Failed to set parameter '{param_name}' to '{value}' via camera interface.")
-                
-                # After attempting to set, always reload from camera to get actual values
-                self._load_initial_parameters_from_camera() # This will emit parameters_updated with all current values
-                self.status_message_updated.emit("参数已尝试应用，请检查更新后的值。")
+    def _apply_parameters(self, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, bool]]:
+        """
+        把一批参数写入相机(在参数写入线程中执行)
 
-            except Exception as e:
-                self.logger.error(f"Exception setting parameters: {e}", exc_info=True)
-                self.error_occurred.emit("参数设置异常", f"应用参数时发生错误: {e}")
-                self._load_initial_parameters_from_camera() # Still try to sync on error
+        只在取相机引用时持有相机互斥锁，SDK往返期间不阻塞采集线程和界面线程。
+
+        Returns:
+            (相机修正后的实际值, {参数名: 是否成功})
+        """
+        with QMutexLocker(self._camera_mutex):
+            camera = self._camera if self._is_connected else None
+        if camera is None:
+            return {}, {name: False for name in params}
+
+        self.logger.info(f"Applying parameters: {params}")
+        results: Dict[str, bool] = {}
+        applied: Dict[str, Any] = {}
+        roi_keys = ("roi_x", "roi_y", "roi_width", "roi_height")
+        others = {}
+        for param_name, value in params.items():
+            if param_name in roi_keys:
+                continue
+            if param_name == "trigger_mode":
+                # 0: Continuous, 1: Software, 2: Hardware; set_trigger_mode also selects the trigger source
+                results[param_name] = bool(camera.set_trigger_mode(value != 0))
+                if results[param_name]:
+                    applied[param_name] = value
+            elif param_name in self._parameters:
+                others[param_name] = value
+            else:
+                self.logger.warning(f"Unknown parameter '{param_name}' in set_parameters. Skipping.")
+                results[param_name] = False
+
+        if any(key in params for key in roi_keys) and hasattr(camera, 'set_roi'):
+            # ROI needs all components; missing ones keep their current values
+            roi = [params.get(key, self._parameters[key]) for key in roi_keys]
+            success = bool(camera.set_roi(*roi))
+            results.update({key: success for key in roi_keys if key in params})
+            if success:
+                applied.update(zip(roi_keys, camera.get_roi()))
+
+        if others:
+            if hasattr(camera, 'set_parameters') and callable(camera.set_parameters):
+                # Batched write: unchanged nodes are skipped, written nodes are read back from the camera
+                results.update(camera.set_parameters(others) or {name: False for name in others})
+                succeeded = [name for name in others if results.get(name)]
+                if succeeded and hasattr(camera, 'get_parameters'):
+                    applied.update(camera.get_parameters(succeeded) or {})
+            else: # Fallback to individual setters
+                for param_name, value in others.items():
+                    success = False
+                    if param_name == "exposure_time": success = camera.set_exposure(value)
+                    elif param_name == "gain": success = camera.set_gain(value)
+                    elif param_name == "frame_rate" and hasattr(camera, 'set_frame_rate'):
+                        success = camera.set_frame_rate(value)
+                    elif param_name == "auto_exposure" and hasattr(camera, 'set_auto_exposure'):
+                        success = camera.set_auto_exposure(value)
+                    elif param_name == "auto_gain" and hasattr(camera, 'set_auto_gain'):
+                        success = camera.set_auto_gain(value)
+                    elif param_name == "auto_wb" and hasattr(camera, 'set_auto_white_balance'):
+                        success = camera.set_auto_white_balance(value)
+                    elif param_name == "white_balance_kelvin" and hasattr(camera, 'set_white_balance_kelvin'):
+                        success = camera.set_white_balance_kelvin(value)
+                    else:
+                        self.logger.warning(f"No specific setter or attribute for parameter '{param_name}'.")
+                    results[param_name] = bool(success)
+                    if success:
+                        applied[param_name] = value
+
+        return applied, results
+
+    def _on_parameters_applied(self, requested: Dict[str, Any], applied: Dict[str, Any],
+                               results: Dict[str, bool]):
+        """参数写入线程回报写入结果，信号经Qt排队送到界面线程"""
+        # A newer value for the same parameter is already queued; reporting this one would make the UI jump back
+        changed = {key: value for key, value in applied.items()
+                   if key in self._parameters and not self._param_writer.is_pending(key)}
+        self._parameters.update(changed)
+        if changed:
+            self.parameters_updated.emit(self._parameters.copy())
+
+        failed = [name for name, success in results.items() if not success]
+        if failed:
+            self.logger.warning(f"Failed to set parameters {failed} to {[requested[name] for name in failed]}.")
+            self.status_message_updated.emit(f"参数设置失败: {', '.join(failed)}")
+        else:
+            self.status_message_updated.emit("参数已应用。")
 
     def get_all_parameters(self) -> Dict[str, Any]:
         # Optionally, refresh from camera before returning, if high accuracy is needed
@@ -553,4 +740,9 @@ class CameraModel(BaseModel):
         if self._is_connected:
             self.disconnect_camera()
 
+        self._param_writer.stop(flush=False)
+
+        # Finish pending photo saves
+        image_save_service.stop(wait=True)
+
         self.logger.info("CameraModel cleanup complete.")
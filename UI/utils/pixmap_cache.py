@@ -0,0 +1,151 @@
+"""
+QPixmap缓存
+-------------
+按内容标识缓存转换好的QPixmap，按字节预算做LRU淘汰并统计命中率。
+
+键应当标识图像内容而不是Python对象：id(array)在数组释放后会被CPython复用，
+以它为键可能返回另一幅图像的旧QPixmap。实时帧每帧只显示一次，不进入缓存；
+静态图像用frame_key计算的内容摘要，归档帧用(归档目录, 帧序号)。
+"""
+
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+def frame_key(frame, camera_id=None, frame_number=None):
+    """
+    计算图像的内容标识
+
+    未给出帧号时对整幅图像计算CRC32(2000万像素约20ms)，任何像素不同的两幅图像都会得到不同的标识。
+    只用于静态图像；实时帧和归档帧应当给出相机ID和帧号，不计算摘要。
+
+    Args:
+        frame: numpy图像
+        camera_id: 相机ID，与frame_number同时给出时直接作为标识
+        frame_number: 帧号
+
+    Returns:
+        可哈希的标识；未给出帧号时为形状、类型和整幅图像CRC32组成的元组
+    """
+    if camera_id is not None and frame_number is not None:
+        return ('frame', camera_id, frame_number)
+    data = np.ascontiguousarray(frame)
+    return ('crc', frame.shape, frame.dtype.str, zlib.crc32(memoryview(data).cast('B')))
+
+
+def pixmap_bytes(pixmap):
+    """QPixmap占用的字节数"""
+    return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+
+class PixmapCache:
+    """
+    按字节预算LRU淘汰的QPixmap缓存
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, name=""):
+        """
+        初始化缓存
+
+        Args:
+            max_bytes: 字节预算
+            name: 缓存名称
+        """
+        self._name = name
+        self._max_bytes = int(max_bytes)
+        self._entries = OrderedDict()  # 键 -> (QPixmap, 字节数)
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        查找缓存，命中时移到最近使用的位置
+
+        Args:
+            key: 内容标识
+
+        Returns:
+            QPixmap，未命中时返回None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[0]
+
+    def put(self, key, pixmap):
+        """
+        放入缓存，超出预算时淘汰最久未使用的条目；单个条目大于预算时不缓存
+
+        Args:
+            key: 内容标识
+            pixmap: QPixmap
+        """
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        size = pixmap_bytes(pixmap)
+        if size > self._max_bytes:
+            return
+        self._entries[key] = (pixmap, size)
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self._evictions += 1
+
+    def discard(self, key):
+        """移除指定条目"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self):
+        """清空缓存(不清零统计)"""
+        self._entries.clear()
+        self._bytes = 0
+
+    def set_max_bytes(self, max_bytes):
+        """设置字节预算并立即按新预算淘汰"""
+        self._max_bytes = int(max_bytes)
+        while self._bytes > self._max_bytes and self._entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self._evictions += 1
+
+    def get_stats(self):
+        """
+        获取缓存统计信息
+
+        Returns:
+            条目数、占用字节数、预算、命中/未命中/淘汰次数和命中率
+        """
+        lookups = self._hits + self._misses
+        return {
+            'name': self._name,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self._max_bytes,
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'hit_rate': self._hits / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self):
+        """清零统计计数"""
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
@@ -17,6 +17,7 @@ from UI.views.base_view import BaseView # 假设存在
 from UI.widgets.enhanced_image_viewer import ImageViewerWidget, InteractionMode
 from UI.widgets.collapsible_panel import CollapsiblePanel
 from UI.utils.ui_constants import LIGHT_COLORS, SPACING # 假设存在
+from core.camera.frame import Frame
 from core.utils.logger import get_logger
 
 
@@ -34,6 +35,7 @@ class CameraView(BaseView):
 
     stream_button_clicked = pyqtSignal() # 开始/停止流按钮被点击
     trigger_button_clicked = pyqtSignal() # 软触发按钮
+    save_button_clicked = pyqtSignal() # 保存当前图像按钮
     roi_button_toggled = pyqtSignal(bool) # ROI选择模式切换
 
     # 参数相关信号
@@ -101,6 +103,15 @@ class CameraView(BaseView):
         """)
         toolbar_layout.addWidget(self._trigger_button)
 
+        self._save_button = QPushButton("保存图像")
+        self._save_button.setStyleSheet(f"""
+            QPushButton {{ background-color: {LIGHT_COLORS["INFO"]}; color: white; border: none; border-radius: 4px; padding: {SPACING["SMALL"]}px {SPACING["MEDIUM"]}px; }}
+            QPushButton:hover {{ background-color: {LIGHT_COLORS["INFO_LIGHT"] if "INFO_LIGHT" in LIGHT_COLORS else LIGHT_COLORS["INFO"]}; }}
+            QPushButton:pressed {{ background-color: {LIGHT_COLORS["INFO_DARK"] if "INFO_DARK" in LIGHT_COLORS else LIGHT_COLORS["INFO"]}; }}
+            QPushButton:disabled {{ background-color: {LIGHT_COLORS["DISABLED"]}; color: {LIGHT_COLORS["TEXT_DISABLED"]}; }}
+        """)
+        toolbar_layout.addWidget(self._save_button)
+
         self._roi_button = QPushButton("选择ROI")
         self._roi_button.setCheckable(True)
         self._roi_button.setStyleSheet(f"""
@@ -122,6 +133,7 @@ class CameraView(BaseView):
 
         self._image_viewer = ImageViewerWidget()
         self._image_viewer.setMinimumSize(640, 480)
+        self._image_viewer.set_live_mode(True)
         viewer_container_layout.addWidget(self._image_viewer)
         
         self._fps_label = QLabel("FPS: 0.0", self._viewer_container)
@@ -261,6 +273,7 @@ class CameraView(BaseView):
 
         self._stream_button.clicked.connect(self.stream_button_clicked)
         self._trigger_button.clicked.connect(self.trigger_button_clicked)
+        self._save_button.clicked.connect(self.save_button_clicked)
         self._roi_button.toggled.connect(self._on_roi_button_toggled_by_user)
 
         self._exposure_slider.valueChanged.connect(lambda value: self._on_parameter_slider_changed("exposure_time", value, self._exposure_value_label, " μs"))
@@ -375,6 +388,9 @@ class CameraView(BaseView):
 
     def update_available_devices(self, devices: List[Dict[str, Any]], current_selection_id: Optional[str] = None):
         self.logger.info(f"View: Updating available devices. Found: {len(devices)}. Current selection hint: {current_selection_id}")
+        if current_selection_id is None:
+            # The list grows while enumeration is running; keep what the user already selected
+            current_selection_id = self._camera_combo.currentData()
         self._camera_combo.blockSignals(True)
         self._camera_combo.clear()
         self._camera_combo.addItem("自动选择", None) 
@@ -403,25 +419,19 @@ class CameraView(BaseView):
         self._simulation_check.setChecked(is_simulation)
         self._simulation_check.blockSignals(False)
 
-    def display_frame(self, frame: Optional[np.ndarray]):
+    def display_frame(self, frame: Optional[Any]):
+        # frame为Frame记录(图像及帧号、时间戳)或numpy数组
         if frame is None:
             self._image_viewer.set_image(None)
             return
-        try:
-            h, w = frame.shape[:2]
-            stride = frame.strides[0]
-            fmt = QImage.Format_Grayscale8
-            if frame.ndim == 3:
-                if frame.shape[2] == 3: fmt = QImage.Format_BGR888
-                elif frame.shape[2] == 4: fmt = QImage.Format_ARGB32
-                else: self.logger.warning(f"Unsupported color frame: {frame.shape}"); return
-            elif frame.ndim != 2:
-                 self.logger.warning(f"Unsupported frame: {frame.shape}"); return
-            
-            qimg = QImage(frame.data, w, h, stride, fmt)
-            self._image_viewer.set_image(qimg.copy())
-        except Exception as e:
-            self.logger.error(f"Error displaying frame: {e}", exc_info=True)
+        if frame.ndim not in (2, 3) or (frame.ndim == 3 and frame.shape[2] not in (3, 4)):
+            self.logger.warning(f"Unsupported frame: {frame.shape}")
+            # 不交给查看器时由这里归还调用者交来的缓冲区引用
+            if isinstance(frame, Frame):
+                frame.release()
+            return
+        # 实时模式下查看器只保留最新一帧，在下一次刷新时转换并原地更新图像项；Frame的相机ID和帧号作为缓存键
+        self._image_viewer.submit_frame(frame)
 
     def update_fps_display(self, fps: float):
         self._fps_label.setText(f"FPS: {fps:.1f}")
@@ -431,7 +441,9 @@ class CameraView(BaseView):
 
         def set_val(widget, val, block=True):
             if block: widget.blockSignals(True)
-            if isinstance(widget, QSlider): widget.setValue(int(val))
+            # Values reported by the background parameter writer must not fight a slider being dragged
+            if isinstance(widget, QSlider):
+                if not widget.isSliderDown(): widget.setValue(int(val))
             elif isinstance(widget, (QSpinBox, QDoubleSpinBox)): widget.setValue(val) # Handles int/float
             elif isinstance(widget, QCheckBox): widget.setChecked(bool(val))
             elif isinstance(widget, QComboBox):
@@ -534,6 +546,7 @@ class CameraView(BaseView):
         params_adjustable = is_connected and not is_streaming
         
         self._trigger_button.setEnabled(is_connected and (not is_streaming or self._trigger_mode_combo.currentIndex() != 0))
+        self._save_button.setEnabled(is_connected)
         self._trigger_mode_combo.setEnabled(is_connected) # Can change trigger mode if connected, even if streaming (model handles logic)
 
 
@@ -4,11 +4,13 @@
 用于在仪表盘上显示数据统计、状态信息等
 """
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QColor, QPainter, QIcon, QPixmap
 from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QFrame
 
 from UI.utils.ui_constants import LIGHT_COLORS, SPACING, FONTS
+from core.utils.metrics import (metrics, STAGE_SDK_GET, STAGE_CONVERT, STAGE_EMIT,
+                                STAGE_DISPLAY, STAGE_LATENCY)
 
 
 class DashboardCard(QFrame):
@@ -254,6 +256,89 @@ class CounterCard(DashboardCard):
         self.set_value(str(self._count), color)
 
 
+class MetricsCard(DashboardCard):
+    """
+    性能指标卡片
+    显示采集链路各阶段耗时的p50/p95/p99和丢帧统计，数据来自core.utils.metrics
+    """
+    
+    STAGE_LABELS = [
+        (STAGE_SDK_GET, "取帧"),
+        (STAGE_CONVERT, "转换"),
+        (STAGE_EMIT, "发布"),
+        (STAGE_DISPLAY, "显示"),
+        (STAGE_LATENCY, "延迟"),
+    ]
+    
+    def __init__(self, title="采集性能", registry=None, interval_ms=1000, icon=None,
+                 color=LIGHT_COLORS["PRIMARY"], parent=None):
+        """
+        初始化性能指标卡片
+        
+        Args:
+            title: 卡片标题
+            registry: 指标注册表，None表示使用全局metrics
+            interval_ms: 自动刷新间隔(毫秒)，0表示只在调用refresh时刷新
+            icon: 图标路径或QIcon对象
+            color: 卡片主色调
+            parent: 父控件
+        """
+        super().__init__(title, "--", icon, "暂无数据", color, parent)
+        self._registry = registry if registry is not None else metrics
+        self._subtitle_label.setAlignment(Qt.AlignLeft)
+        
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        if interval_ms > 0:
+            self._timer.start(interval_ms)
+    
+    def set_interval(self, interval_ms):
+        """
+        设置自动刷新间隔
+        
+        Args:
+            interval_ms: 刷新间隔(毫秒)，0表示停止自动刷新
+        """
+        if interval_ms > 0:
+            self._timer.start(interval_ms)
+        else:
+            self._timer.stop()
+    
+    def refresh(self):
+        """从注册表读取快照并更新显示"""
+        self.update_metrics(self._registry.snapshot())
+    
+    def update_metrics(self, snapshot):
+        """
+        按指标快照更新显示
+        
+        Args:
+            snapshot: MetricsRegistry.snapshot()返回的字典
+        """
+        histograms = snapshot.get('histograms', {})
+        lines = []
+        for stage, label in self.STAGE_LABELS:
+            stats = histograms.get(stage)
+            if not stats or not stats['count']:
+                continue
+            lines.append(f"{label}: {stats['p50']:.1f} / {stats['p95']:.1f} / {stats['p99']:.1f} ms")
+        
+        frame_gaps = snapshot.get('frame_gaps', {})
+        missing = sum(stats['missing'] for stats in frame_gaps.values())
+        gaps = sum(stats['gaps'] for stats in frame_gaps.values())
+        if frame_gaps:
+            lines.append(f"丢帧: {missing} (跳变 {gaps} 次)")
+        
+        # 主数值优先显示端到端延迟的p95，没有时显示转换耗时
+        headline = histograms.get(STAGE_LATENCY) or histograms.get(STAGE_CONVERT)
+        if headline and headline['count']:
+            color = LIGHT_COLORS["DANGER"] if missing else LIGHT_COLORS["TEXT_PRIMARY"]
+            self.set_value(f"p95 {headline['p95']:.1f} ms", color)
+        else:
+            self.set_value("--")
+        self.update_subtitle("\n".join(lines) if lines else "暂无数据")
+
+
 class StatusCard(DashboardCard):
     """
     状态卡片
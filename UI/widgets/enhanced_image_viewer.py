@@ -7,6 +7,8 @@
 from enum import Enum, auto
 import weakref
 import time
+import threading
+from collections import deque
 from functools import lru_cache
 
 from PyQt5.QtCore import Qt, QRectF, QPointF, pyqtSignal, QLineF, QSize, QTimer ,QRectF
@@ -16,9 +18,22 @@ from PyQt5.QtWidgets import (QWidget, QGraphicsView, QGraphicsScene,
                             QGraphicsPixmapItem, QGraphicsRectItem, QGraphicsLineItem,
                             QGraphicsPathItem, QGraphicsTextItem,
                             QMenu, QAction, QLabel, QVBoxLayout, QFrame,
-                            QToolTip, QActionGroup, QSlider, QHBoxLayout)
+                            QToolTip, QActionGroup, QSlider, QHBoxLayout, QApplication)
 
 from UI.utils.ui_constants import LIGHT_COLORS
+from UI.utils.pixmap_cache import PixmapCache, frame_key
+from core.camera.frame import Frame
+from core.archive.frame_archive import VERDICT_NAMES
+from core.utils.metrics import metrics, STAGE_DISPLAY, STAGE_LATENCY
+from UI.widgets.tiled_image_item import (TiledImageItem, numpy_to_qimage,
+                                         DEFAULT_TILE_SIZE, DEFAULT_TILE_CACHE_BYTES)
+
+# 放大超过1:1时，在可见区域四周额外渲染的比例，平移时不必立即重新渲染
+_VISIBLE_MARGIN = 0.5
+
+# 自动切换到分块显示的图像尺寸：任一边超过GPU常见纹理上限，或总像素数过大
+_TILED_AUTO_SIDE = 8192
+_TILED_AUTO_PIXELS = 32 * 1024 * 1024
 
 
 class InteractionMode(Enum):
@@ -44,6 +59,7 @@ class EnhancedImageViewer(QGraphicsView):
     color_picked = pyqtSignal(QColor, QPointF)  # 颜色拾取信号
     measurements_updated = pyqtSignal(list)  # 测量更新信号
     multiple_rois_selected = pyqtSignal(list)  # 多ROI选择信号
+    archive_frame_changed = pyqtSignal(int, dict)  # 归档浏览位置变化信号(帧序号, 帧信息)
     
     def __init__(self, parent=None):
         """初始化图像查看器"""
@@ -59,14 +75,50 @@ class EnhancedImageViewer(QGraphicsView):
         self._original_image = QImage()
         
         # 性能优化
-        self._image_cache = {}  # 缓存最近使用的图像
-        self._cache_size = 5    # 缓存大小
+        self._pixmap_cache = PixmapCache(64 * 1024 * 1024, name="viewer")  # 按图像内容缓存转换好的QPixmap
         self._last_render_time = 0  # 最后渲染时间
         self._render_timer = QTimer(self)  # 延迟渲染计时器
         self._render_timer.setSingleShot(True)
         self._render_timer.timeout.connect(self._delayed_render)
         self._viewport_only = True  # 仅渲染可见区域
         
+        # 实时模式：只保留最新一帧，按显示器刷新节奏转换和绘制
+        self._live_mode = False
+        self._live_lock = threading.Lock()
+        self._pending_frame = None  # 等待绘制的最新帧
+        self._pending_record = None # 等待绘制的Frame，持有其缓冲区引用
+        self._live_frame = None     # 当前显示的帧(QImage直接引用其数据)
+        self._live_record = None    # 当前显示的Frame，持有其缓冲区引用直到被替换
+        self._live_timer = QTimer(self)
+        self._live_timer.setTimerType(Qt.PreciseTimer)
+        self._live_timer.timeout.connect(self._on_live_tick)
+        self._frames_received = 0   # 收到的帧数
+        self._frames_painted = 0    # 实际绘制的帧数
+        self._frames_coalesced = 0  # 被更新的帧覆盖而未绘制的帧数
+        self._convert_ms = 0.0      # 最近一帧的转换耗时
+        self._paint_times = deque(maxlen=60)
+        
+        # 缩放相关的降采样显示：缩小时显示金字塔层级，放大超过1:1时只渲染可见区域的全分辨率图像
+        self._source_frame = None       # numpy源图像，None表示显示的是QImage/QPixmap
+        self._source_key = None         # 源图像的内容标识，None表示不缓存
+        self._downscale_enabled = True
+        self._rendition_key = None      # 当前显示的(层级, 裁剪区域)
+        self._rendition_ms = 0.0        # 最近一次生成显示图像的耗时
+        
+        # 归档浏览：拖动时只显示缩略图，停止拖动后再解码完整图像
+        self._archive = None
+        self._archive_index = -1
+        self._archive_timer = QTimer(self)
+        self._archive_timer.setSingleShot(True)
+        self._archive_timer.setInterval(150)
+        self._archive_timer.timeout.connect(self._load_archive_frame)
+        
+        # 分块显示：None表示按图像尺寸自动选择
+        self._tiled_mode = None
+        self._tiled_item = None
+        self._tile_size = DEFAULT_TILE_SIZE
+        self._tile_cache_bytes = DEFAULT_TILE_CACHE_BYTES
+        
         # ROI相关
         self._roi_rect = None
         self._roi_start = QPointF()
@@ -124,9 +176,18 @@ class EnhancedImageViewer(QGraphicsView):
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._show_context_menu)
         
+        # 平移后按新的可见区域重新生成显示图像
+        self.horizontalScrollBar().valueChanged.connect(self._schedule_rendition)
+        self.verticalScrollBar().valueChanged.connect(self._schedule_rendition)
+        
         # 初始化LRU缓存装饰器
         self._initialize_caches()
     
+    def resizeEvent(self, event):
+        """窗口大小变化时重新生成显示图像"""
+        super().resizeEvent(event)
+        self._schedule_rendition()
+    
     def _initialize_caches(self):
         """初始化缓存机制"""
         # 使用lru_cache装饰内部方法以提高性能
@@ -134,9 +195,15 @@ class EnhancedImageViewer(QGraphicsView):
         self._cached_compute_grid = lru_cache(maxsize=5)(self._compute_grid)
     
     def _delayed_render(self):
-        """延迟渲染，用于提高性能"""
+        """延迟渲染，用于提高性能；缩放或平移停止后按新的视图重新生成显示图像"""
+        self._render_source()
         self.viewport().update()
     
+    def _schedule_rendition(self):
+        """视图变化后延迟重新生成显示图像，连续缩放/平移时只生成一次"""
+        if self._source_frame is not None:
+            self._render_timer.start(30)
+    
     def _convert_scene_to_image(self, width, height):
         """将当前场景转换为图像 (被缓存)"""
         if not self._pixmap_item:
@@ -181,20 +248,30 @@ class EnhancedImageViewer(QGraphicsView):
             
         return lines
     
-    def set_image(self, image):
+    def set_image(self, image, key=None, cache=True):
         """
         设置显示图像，支持多种输入格式，并优化性能
         
         Args:
-            image: QImage或QPixmap或numpy数组
+            image: QImage、QPixmap、numpy数组或Frame
+            key: numpy图像的内容标识(如frame_key(frame, 相机ID, 帧号))，None表示对整幅图像计算摘要
+            cache: 是否按内容标识缓存显示图像，只显示一次的实时帧传入False
         """
+        if isinstance(image, Frame):
+            image, key = image.array, key if key is not None else self._record_key(image)
+        
         # 记录开始时间，用于性能分析
         start_time = time.time()
+        # 之前通过submit_frame显示的帧不再显示，归还其引用
+        self._hold_record(None)
         
         # 清除当前图像
         if self._pixmap_item:
             self._scene.removeItem(self._pixmap_item)
             self._pixmap_item = None
+        if self._tiled_item is not None:
+            self._scene.removeItem(self._tiled_item)
+            self._tiled_item = None
         
         if self._roi_rect:
             self._scene.removeItem(self._roi_rect)
@@ -221,75 +298,81 @@ class EnhancedImageViewer(QGraphicsView):
         if isinstance(image, QPixmap):
             pixmap = image
             self._image = pixmap.toImage()
+            self._source_frame = None
         elif isinstance(image, QImage):
             self._image = image
             pixmap = QPixmap.fromImage(image)
+            self._source_frame = None
         elif image is None:
             self._scene.clear()
             self._image = QImage()
             self._original_image = QImage()
+            self._live_frame = None
+            self._source_frame = None
+            self._source_key = None
+            self._rendition_key = None
+            self._drop_pending()
             return
         else:
-            # 尝试从numpy数组转换
             try:
                 import numpy as np
-                import cv2
-                if isinstance(image, np.ndarray):
-                    # 检查是否已在缓存中
-                    cache_key = id(image)
-                    if cache_key in self._image_cache:
-                        pixmap = self._image_cache[cache_key]
-                        self._image = pixmap.toImage()
-                    else:
-                        # 根据通道数确定格式
-                        if len(image.shape) == 2:  # 灰度图
-                            height, width = image.shape
-                            self._image = QImage(image.data, width, height, width, QImage.Format_Grayscale8)
-                        else:  # 彩色图
-                            # OpenCV是BGR顺序，Qt需要RGB顺序
-                            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                            height, width, channels = rgb_image.shape
-                            bytes_per_line = channels * width
-                            self._image = QImage(rgb_image.data, width, height, bytes_per_line, QImage.Format_RGB888)
-                        
-                        # 将图像转换为QPixmap并缓存
-                        pixmap = QPixmap.fromImage(self._image)
-                        self._update_cache(cache_key, pixmap)
-                else:
+                if not isinstance(image, np.ndarray):
                     return  # 不支持的格式
             except ImportError:
-                print("Warning: numpy or cv2 not available for image conversion")
+                print("Warning: numpy not available for image conversion")
                 return
+            qimage = self._numpy_to_qimage(image)
+            if qimage is None:
+                return  # 不支持的格式
+            # 保留numpy源图像，显示图像按当前缩放生成，并按内容标识缓存
+            self._image = qimage
+            self._source_frame = image
+            if not cache:
+                self._source_key = None
+            else:
+                self._source_key = key if key is not None else frame_key(image)
+            pixmap = None
         
         # 保存原始图像
         self._original_image = self._image
         
         # 创建新的图像项
-        self._pixmap_item = QGraphicsPixmapItem(pixmap)
+        self._pixmap_item = QGraphicsPixmapItem() if pixmap is None else QGraphicsPixmapItem(pixmap)
+        self._pixmap_item.setZValue(-1)
+        self._pixmap_item.setTransformationMode(Qt.SmoothTransformation)
         self._scene.addItem(self._pixmap_item)
+        self._rendition_key = None
         
         # 启用交互
         self._pixmap_item.setAcceptHoverEvents(True)
         
-        # 调整场景大小
-        self._scene.setSceneRect(QRectF(pixmap.rect()))
+        # 调整场景大小(场景坐标始终是全分辨率图像的像素坐标)
+        self._scene.setSceneRect(QRectF(0, 0, self._image.width(), self._image.height()))
         
         # 重置视图
         self.fit_in_view()
+        self._render_source(force=True)
         
         # 记录性能指标
         self._last_render_time = time.time() - start_time
         
-    def _update_cache(self, key, pixmap):
-        """更新图像缓存，保持缓存大小限制"""
-        # 如果缓存已满，移除最早的条目
-        if len(self._image_cache) >= self._cache_size:
-            # 移除一个最早的键
-            oldest_key = next(iter(self._image_cache))
-            del self._image_cache[oldest_key]
+    def set_pixmap_cache_budget(self, max_bytes):
+        """
+        设置显示图像缓存的字节预算
+        
+        Args:
+            max_bytes: 字节预算，0表示不缓存
+        """
+        self._pixmap_cache.set_max_bytes(max_bytes)
+    
+    def get_cache_stats(self):
+        """
+        获取显示图像缓存的统计信息
         
-        # 添加新项到缓存
-        self._image_cache[key] = pixmap
+        Returns:
+            条目数、占用字节数、命中/未命中/淘汰次数和命中率
+        """
+        return self._pixmap_cache.get_stats()
     
     def get_image(self):
         """获取当前显示的图像"""
@@ -309,6 +392,474 @@ class EnhancedImageViewer(QGraphicsView):
         self.fitInView(self._scene.sceneRect(), Qt.KeepAspectRatio)
         self._zoom_factor = 1.0
         self.zoom_changed.emit(self._zoom_factor)
+        self._schedule_rendition()
+    
+    @staticmethod
+    def _numpy_to_qimage(frame):
+        """将numpy图像包装为QImage(不拷贝)，格式不支持时返回None"""
+        return numpy_to_qimage(frame)
+    
+    def set_live_mode(self, enabled, interval_ms=None):
+        """
+        设置实时模式
+        
+        实时模式下submit_frame只记录最新一帧，由定时器按显示器刷新间隔取出并绘制；
+        复用同一个图像项，保留缩放、ROI和测量，只有图像尺寸变化时才重新适应窗口。
+        
+        Args:
+            enabled: 是否启用
+            interval_ms: 绘制间隔(毫秒)，默认按主屏幕刷新率
+        """
+        self._live_mode = enabled
+        if enabled:
+            if interval_ms is None:
+                screen = QApplication.primaryScreen()
+                refresh_rate = screen.refreshRate() if screen else 60.0
+                interval_ms = int(1000.0 / max(1.0, refresh_rate))
+            self._live_timer.start(max(1, int(interval_ms)))
+        else:
+            self._live_timer.stop()
+            self._drop_pending()
+    
+    def is_live_mode(self):
+        """是否处于实时模式"""
+        return self._live_mode
+    
+    def submit_frame(self, frame, key=None):
+        """
+        提交一帧实时图像(可在任意线程调用)
+        
+        上一帧尚未绘制时直接被覆盖，因此转换和绘制的次数不会超过显示器刷新次数。
+        未启用实时模式时等同于set_image(只能在界面线程调用)。
+        
+        传入Frame时查看器接管调用者持有的一个缓冲区引用，该帧被覆盖或不再显示时调用其release()。
+        
+        实时帧每帧只显示一次，默认不放入显示图像缓存，以免挤掉静态图像和归档帧的缓存条目。
+        
+        Args:
+            frame: numpy图像或Frame
+            key: 帧的内容标识(如frame_key(frame, 相机ID, 帧号))；None表示不缓存该帧的显示图像
+        """
+        arrival_time = None
+        record = None
+        if isinstance(frame, Frame):
+            record = frame
+            arrival_time = frame.arrival_time or None
+            frame = frame.array
+        if not self._live_mode:
+            self.set_image(frame, key, cache=key is not None)
+            self._hold_record(record)
+            return
+        with self._live_lock:
+            if self._pending_frame is not None:
+                self._frames_coalesced += 1
+            coalesced = self._pending_record
+            self._pending_frame = (frame, key, arrival_time)
+            self._pending_record = record
+            self._frames_received += 1
+        if coalesced is not None:
+            coalesced.release()
+    
+    def get_display_stats(self):
+        """
+        获取实时显示统计信息
+        
+        Returns:
+            收到帧数、绘制帧数、被合并帧数、绘制帧率、最近一帧转换耗时(毫秒)
+        """
+        with self._live_lock:
+            stats = {
+                'received': self._frames_received,
+                'painted': self._frames_painted,
+                'coalesced': self._frames_coalesced,
+                'paint_fps': 0.0,
+                'convert_ms': self._convert_ms,
+            }
+        times = list(self._paint_times)
+        if len(times) >= 2 and times[-1] > times[0]:
+            stats['paint_fps'] = (len(times) - 1) / (times[-1] - times[0])
+        return stats
+    
+    def reset_display_stats(self):
+        """清零实时显示统计"""
+        with self._live_lock:
+            self._frames_received = 0
+            self._frames_painted = 0
+            self._frames_coalesced = 0
+        self._paint_times.clear()
+    
+    @staticmethod
+    def _record_key(record):
+        """
+        Frame的内容标识
+        
+        相机重新打开后帧号从头计数，因此同时带上到达时间，避免命中上一次采集同帧号的旧图像
+        
+        Args:
+            record: Frame
+        
+        Returns:
+            内容标识，缺少相机ID或到达时间时返回None
+        """
+        if not record.camera_id or not record.arrival_time:
+            return None
+        return frame_key(record.array, record.camera_id, (record.frame_number, record.arrival_time))
+    
+    def _on_live_tick(self):
+        """实时模式定时器：取出最新帧并绘制"""
+        with self._live_lock:
+            pending, record = self._pending_frame, self._pending_record
+            self._pending_frame = None
+            self._pending_record = None
+        if pending is None:
+            return
+        self._show_live_frame(*pending, record=record)
+    
+    def _show_live_frame(self, frame, key=None, arrival_time=None, record=None):
+        """
+        在现有图像项上原地更新实时帧
+        
+        Args:
+            frame: numpy图像
+            key: 内容标识
+            arrival_time: 帧到达采集线程的时间(用于统计端到端延迟)
+            record: frame所属的Frame，显示期间持有其引用
+        """
+        start_time = time.perf_counter()
+        if not self._replace_source(frame, key):
+            if record is not None:
+                record.release()
+            return
+        self._hold_record(record)
+        
+        self._convert_ms = (time.perf_counter() - start_time) * 1000.0
+        metrics.observe(STAGE_DISPLAY, self._convert_ms)
+        if arrival_time:
+            metrics.observe(STAGE_LATENCY, (time.time() - arrival_time) * 1000.0)
+        with self._live_lock:
+            self._frames_painted += 1
+        self._paint_times.append(time.perf_counter())
+    
+    def _replace_source(self, frame, key=None):
+        """
+        在现有图像项上原地替换源图像，保留缩放、ROI和测量，只有图像尺寸变化时才重新适应窗口
+        
+        Returns:
+            是否成功替换
+        """
+        image = self._numpy_to_qimage(frame)
+        if image is None:
+            return False
+        
+        # 缩略图占位时场景已是完整图像的尺寸，此时保留当前缩放
+        size_changed = self._image.isNull() or not self._scene_has_size(image.width(), image.height())
+        self._ensure_pixmap_item()
+        
+        # QImage引用frame的数据，保留frame直到下一帧替换
+        self._live_frame = frame
+        self._source_frame = frame
+        self._source_key = key
+        self._image = image
+        self._original_image = image
+        
+        if size_changed:
+            self._scene.setSceneRect(QRectF(0, 0, image.width(), image.height()))
+            self.fit_in_view()
+        self._render_source(force=True)
+        return True
+    
+    def _hold_record(self, record):
+        """持有当前显示的Frame的引用，归还上一帧的引用"""
+        previous, self._live_record = self._live_record, record
+        if previous is not None:
+            previous.release()
+    
+    def _drop_pending(self):
+        """丢弃等待绘制的帧并归还其引用"""
+        with self._live_lock:
+            record = self._pending_record
+            self._pending_frame = None
+            self._pending_record = None
+        if record is not None:
+            record.release()
+    
+    def _scene_has_size(self, width, height):
+        """场景坐标范围是否为给定的图像尺寸"""
+        rect = self._scene.sceneRect()
+        return (int(rect.width()), int(rect.height())) == (width, height)
+    
+    def _ensure_pixmap_item(self):
+        """图像项不存在时创建"""
+        if self._pixmap_item is None:
+            self._pixmap_item = QGraphicsPixmapItem()
+            self._pixmap_item.setZValue(-1)  # 保证位于ROI和测量之下
+            self._pixmap_item.setTransformationMode(Qt.SmoothTransformation)
+            self._pixmap_item.setAcceptHoverEvents(True)
+            self._scene.addItem(self._pixmap_item)
+    
+    def set_archive(self, archive, index=0):
+        """
+        设置要浏览的归档
+        
+        Args:
+            archive: core.archive.frame_archive.ArchiveReader，None表示退出归档浏览
+            index: 初始显示的帧序号
+        """
+        self._archive_timer.stop()
+        self._archive = archive
+        self._archive_index = -1
+        if archive is not None and len(archive) > 0:
+            self.show_archive_frame(min(max(0, index), len(archive) - 1))
+    
+    def get_archive(self):
+        """获取当前浏览的归档"""
+        return self._archive
+    
+    def archive_index(self):
+        """当前显示的归档帧序号，未浏览归档时返回-1"""
+        return self._archive_index
+    
+    def scrub_to(self, index):
+        """
+        拖动浏览归档：立即显示缩略图，停止拖动一段时间后再加载完整图像
+        
+        Args:
+            index: 帧序号
+        """
+        if self._archive is None or not 0 <= index < len(self._archive):
+            return
+        self._archive_index = index
+        info = self._archive.read_info(index)
+        thumb_key = ('archive_thumb', self._archive.directory, index)
+        pixmap = self._pixmap_cache.get(thumb_key)
+        if pixmap is None:
+            thumb = self._archive.read_thumbnail(index)
+            image = self._numpy_to_qimage(thumb) if thumb is not None else None
+            if image is not None:
+                pixmap = QPixmap.fromImage(image)
+                self._pixmap_cache.put(thumb_key, pixmap)
+        if pixmap is not None:
+            self._show_placeholder(pixmap, info['width'], info['height'])
+        self.archive_frame_changed.emit(index, info)
+        self._archive_timer.start()
+    
+    def show_archive_frame(self, index):
+        """
+        立即显示归档中的一帧完整图像
+        
+        Args:
+            index: 帧序号
+        """
+        if self._archive is None or not 0 <= index < len(self._archive):
+            return
+        self._archive_timer.stop()
+        frame, info = self._archive.read(index)
+        if frame is None:
+            return
+        self._archive_index = index
+        if self._replace_source(frame, ('archive', self._archive.directory, index)):
+            self._hold_record(None)
+        self.archive_frame_changed.emit(index, info)
+    
+    def _load_archive_frame(self):
+        """拖动停止后加载当前位置的完整图像"""
+        if self._archive is not None and self._archive_index >= 0:
+            self.show_archive_frame(self._archive_index)
+    
+    def _show_placeholder(self, pixmap, width, height):
+        """
+        把低分辨率图像拉伸显示在全分辨率坐标中(不替换源图像，缩放时不重新生成)
+        
+        Args:
+            pixmap: 缩略图
+            width: 完整图像宽度
+            height: 完整图像高度
+        """
+        self._ensure_pixmap_item()
+        if self._tiled_item is not None:
+            self._hide_tiles()
+        self._source_frame = None
+        self._rendition_key = None
+        self._pixmap_item.setPixmap(pixmap)
+        self._pixmap_item.setTransform(QTransform.fromScale(width / pixmap.width(), height / pixmap.height()))
+        self._pixmap_item.setPos(0, 0)
+        if self._image.isNull() or not self._scene_has_size(width, height):
+            self._scene.setSceneRect(QRectF(0, 0, width, height))
+            self.fit_in_view()
+    
+    def set_downscale_enabled(self, enabled):
+        """
+        设置是否按缩放比例降采样显示
+        
+        启用时(默认)缩小显示只转换与屏幕分辨率相当的金字塔层级(cv2.INTER_AREA)，
+        放大超过1:1时只转换可见区域的全分辨率图像，显示开销与窗口大小成正比而与传感器分辨率无关。
+        
+        Args:
+            enabled: 是否启用
+        """
+        self._downscale_enabled = enabled
+        self._render_source(force=True)
+    
+    def get_rendition_info(self):
+        """
+        获取当前显示图像的信息
+        
+        Returns:
+            层级(1为全分辨率)、裁剪区域(x, y, w, h)、生成耗时(毫秒)
+        """
+        if self._rendition_key == 'tiled':
+            return {'level': None, 'crop': None, 'render_ms': 0.0, 'tiled': True}
+        level, crop = self._rendition_key if self._rendition_key else (1, None)
+        return {'level': level, 'crop': crop, 'render_ms': self._rendition_ms, 'tiled': False}
+    
+    def _view_scale(self):
+        """当前视图每个图像像素对应的屏幕像素数"""
+        scale = abs(self.transform().m11())
+        return scale if scale > 0 else 1.0
+    
+    def _choose_rendition(self, width, height):
+        """
+        根据当前缩放选择显示层级和裁剪区域
+        
+        Returns:
+            (层级, (x, y, w, h))，层级为2的幂，裁剪区域为全分辨率图像坐标
+        """
+        full = (0, 0, width, height)
+        if not self._downscale_enabled:
+            return 1, full
+        scale = self._view_scale()
+        if scale < 1.0:
+            # 选择不低于屏幕分辨率的最小层级
+            level = 1
+            while level * 2 <= 1.0 / scale and width // (level * 2) > 0 and height // (level * 2) > 0:
+                level *= 2
+            return level, full
+        if scale > 1.0:
+            visible = self.mapToScene(self.viewport().rect()).boundingRect()
+            margin_x = visible.width() * _VISIBLE_MARGIN
+            margin_y = visible.height() * _VISIBLE_MARGIN
+            x0 = max(0, int(visible.left() - margin_x))
+            y0 = max(0, int(visible.top() - margin_y))
+            x1 = min(width, int(visible.right() + margin_x) + 1)
+            y1 = min(height, int(visible.bottom() + margin_y) + 1)
+            if x1 > x0 and y1 > y0:
+                return 1, (x0, y0, x1 - x0, y1 - y0)
+        return 1, full
+    
+    def set_tiled_mode(self, enabled, tile_size=None, cache_bytes=None):
+        """
+        设置分块显示模式
+        
+        分块模式下图像被切成图块，只在进入可见区域时转换，已转换的图块按内存预算LRU缓存，
+        显示内存与图像尺寸无关。
+        
+        Args:
+            enabled: True/False强制开启/关闭，None表示图像超过8192像素边长或32MP时自动开启
+            tile_size: 图块边长(像素)
+            cache_bytes: 图块缓存预算(字节)
+        """
+        self._tiled_mode = enabled
+        if tile_size is not None:
+            self._tile_size = tile_size
+        if cache_bytes is not None:
+            self._tile_cache_bytes = cache_bytes
+        if self._tiled_item is not None:
+            # 图块大小变化时需要重建
+            self._scene.removeItem(self._tiled_item)
+            self._tiled_item = None
+        self._render_source(force=True)
+    
+    def get_tile_stats(self):
+        """
+        获取图块缓存统计信息
+        
+        Returns:
+            统计字典，未使用分块显示时返回None
+        """
+        return self._tiled_item.get_stats() if self._tiled_item is not None else None
+    
+    def _use_tiles(self, width, height):
+        """当前图像是否使用分块显示"""
+        if self._tiled_mode is not None:
+            return self._tiled_mode
+        return max(width, height) > _TILED_AUTO_SIDE or width * height > _TILED_AUTO_PIXELS
+    
+    def _show_tiles(self, frame):
+        """以分块图像项显示源图像"""
+        if self._tiled_item is None:
+            self._tiled_item = TiledImageItem(self._tile_size, self._tile_cache_bytes)
+            self._tiled_item.setZValue(-1)
+            self._scene.addItem(self._tiled_item)
+        self._tiled_item.set_frame(frame)
+        self._tiled_item.show()
+        # 保留空的图像项，其余依赖_pixmap_item的功能(网格、适应窗口等)不受影响
+        self._pixmap_item.setPixmap(QPixmap())
+        self._pixmap_item.hide()
+        self._rendition_key = 'tiled'
+    
+    def _hide_tiles(self):
+        """退出分块显示"""
+        self._tiled_item.set_frame(None)
+        self._tiled_item.hide()
+        self._pixmap_item.show()
+        self._rendition_key = None
+    
+    def _render_source(self, force=False):
+        """
+        按当前视图从numpy源图像生成显示用的QPixmap
+        
+        Args:
+            force: 源图像已变化，即使层级和裁剪区域不变也重新生成
+        """
+        frame = self._source_frame
+        if frame is None or self._pixmap_item is None:
+            return
+        height, width = frame.shape[:2]
+        if self._use_tiles(width, height):
+            # 分块显示：图块在进入可见区域时由TiledImageItem按需生成
+            if force or self._rendition_key != 'tiled':
+                self._show_tiles(frame)
+            return
+        if self._tiled_item is not None:
+            self._hide_tiles()
+        level, crop = self._choose_rendition(width, height)
+        key = (level, crop)
+        if not force and key == self._rendition_key:
+            return
+        
+        start_time = time.perf_counter()
+        x, y, w, h = crop
+        cache_key = (self._source_key, level, crop) if self._source_key is not None else None
+        pixmap = self._pixmap_cache.get(cache_key) if cache_key is not None else None
+        if pixmap is None:
+            pixmap = self._convert_region(frame, level, crop)
+            if pixmap is None:
+                return
+            if cache_key is not None:
+                self._pixmap_cache.put(cache_key, pixmap)
+        
+        # 缩放和平移图像项，使其在场景中覆盖全分辨率坐标中的裁剪区域
+        self._pixmap_item.setPixmap(pixmap)
+        self._pixmap_item.setTransform(QTransform.fromScale(w / pixmap.width(), h / pixmap.height()))
+        self._pixmap_item.setPos(x, y)
+        self._rendition_key = key
+        self._rendition_ms = (time.perf_counter() - start_time) * 1000.0
+    
+    def _convert_region(self, frame, level, crop):
+        """将源图像的裁剪区域按层级降采样后转换为QPixmap"""
+        height, width = frame.shape[:2]
+        x, y, w, h = crop
+        region = frame if crop == (0, 0, width, height) else frame[y:y + h, x:x + w]
+        if level > 1:
+            import cv2
+            region = cv2.resize(region, (max(1, w // level), max(1, h // level)), interpolation=cv2.INTER_AREA)
+        elif region is not frame:
+            import numpy as np
+            region = np.ascontiguousarray(region)
+        image = self._numpy_to_qimage(region)
+        if image is None:
+            return None
+        return QPixmap.fromImage(image)
     
     def set_interaction_mode(self, mode):
         """
@@ -344,6 +895,7 @@ class EnhancedImageViewer(QGraphicsView):
         self.resetTransform()
         self._zoom_factor = 1.0
         self.zoom_changed.emit(self._zoom_factor)
+        self._schedule_rendition()
     
     def clear_roi(self):
         """清除ROI选择框"""
@@ -437,6 +989,7 @@ class EnhancedImageViewer(QGraphicsView):
         
         # 发出缩放变化信号
         self.zoom_changed.emit(self._zoom_factor)
+        self._schedule_rendition()
         
         # 防止事件传递
         event.accept()
@@ -724,6 +1277,12 @@ class EnhancedImageViewer(QGraphicsView):
             # 绘制图像信息
             info_text = f"尺寸: {self._image.width()} x {self._image.height()} px"
             info_text += f" | 缩放: {self._zoom_factor:.2f}x"
+            if self._live_mode:
+                stats = self.get_display_stats()
+                info_text += f" | 显示: {stats['painted']}/{stats['received']} ({stats['paint_fps']:.1f} fps)"
+            cache_stats = self._pixmap_cache.get_stats()
+            if cache_stats['hits'] or cache_stats['misses']:
+                info_text += f" | 缓存: {cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']}"
             
             # 获取鼠标位置
             view_pos = self.mapFromGlobal(QCursor.pos())
@@ -959,6 +1518,14 @@ class ImageViewerWidget(QWidget):
         self._viewer = EnhancedImageViewer()
         self._layout.addWidget(self._viewer)
         
+        # 归档浏览进度条，设置归档后显示
+        self._scrub_slider = QSlider(Qt.Horizontal)
+        self._scrub_slider.setMinimum(0)
+        self._scrub_slider.setMaximum(0)
+        self._scrub_slider.setVisible(False)
+        self._scrub_slider.valueChanged.connect(self._viewer.scrub_to)
+        self._layout.addWidget(self._scrub_slider)
+        
         # 状态栏
         self._status_bar = QLabel()
         self._status_bar.setObjectName("viewer_status_bar")
@@ -981,6 +1548,38 @@ class ImageViewerWidget(QWidget):
         self._viewer.multiple_rois_selected.connect(self._on_multiple_rois_selected)
         self._viewer.color_picked.connect(self._on_color_picked)
         self._viewer.measurements_updated.connect(self._on_measurements_updated)
+        self._viewer.archive_frame_changed.connect(self._on_archive_frame_changed)
+    
+    def set_archive(self, archive, index=0):
+        """
+        浏览归档，拖动进度条时显示缩略图
+        
+        Args:
+            archive: ArchiveReader，None表示退出归档浏览
+            index: 初始显示的帧序号
+        """
+        self._scrub_slider.blockSignals(True)
+        self._scrub_slider.setMaximum(max(0, len(archive) - 1) if archive is not None else 0)
+        self._scrub_slider.setValue(index)
+        self._scrub_slider.blockSignals(False)
+        self._scrub_slider.setVisible(archive is not None)
+        self._viewer.set_archive(archive, index)
+    
+    def refresh_archive(self):
+        """归档仍在写入时读取新追加的帧并更新进度条范围"""
+        archive = self._viewer.get_archive()
+        if archive is not None:
+            archive.refresh()
+            self._scrub_slider.setMaximum(max(0, len(archive) - 1))
+    
+    def _on_archive_frame_changed(self, index, info):
+        """在状态栏显示归档帧信息"""
+        archive = self._viewer.get_archive()
+        total = len(archive) if archive is not None else 0
+        stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(info.get('timestamp', 0)))
+        verdict = VERDICT_NAMES.get(info.get('verdict'), "")
+        self._status_bar.setText(f"帧 {index + 1}/{total} | {info.get('camera_id', '')} #{info.get('frame_number', 0)}"
+                                 f" | {stamp} | {verdict}")
     
     def _update_position_info(self, pos):
         """更新鼠标位置信息"""
@@ -1042,14 +1641,26 @@ class ImageViewerWidget(QWidget):
             mm_length = last_measure['length_mm']
             self._status_bar.setText(f"测量: {px_length:.1f} px ({mm_length:.2f} mm)")
     
-    def set_image(self, image):
+    def set_image(self, image, key=None, cache=True):
         """设置图像"""
-        self._viewer.set_image(image)
+        self._viewer.set_image(image, key, cache)
     
     def get_image(self):
         """获取当前图像"""
         return self._viewer.get_image()
     
+    def set_live_mode(self, enabled, interval_ms=None):
+        """设置实时模式"""
+        self._viewer.set_live_mode(enabled, interval_ms)
+    
+    def submit_frame(self, frame, key=None):
+        """提交一帧实时图像"""
+        self._viewer.submit_frame(frame, key)
+    
+    def get_display_stats(self):
+        """获取实时显示统计信息"""
+        return self._viewer.get_display_stats()
+    
     def get_viewer(self):
         """获取内部图像查看器对象"""
         return self._viewer
@@ -0,0 +1,178 @@
+"""
+分块图像项
+-------------
+把超大图像切成固定大小的图块，只在图块进入可见区域时才转换为QPixmap，并按内存预算LRU缓存，
+避免整幅图像的QPixmap超出GPU纹理尺寸限制或占用数百MB内存
+"""
+
+import numpy as np
+from PyQt5 import sip
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+
+from UI.utils.pixmap_cache import PixmapCache
+
+# 默认图块边长(显示像素)
+DEFAULT_TILE_SIZE = 512
+
+# 默认图块缓存预算(字节)
+DEFAULT_TILE_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def numpy_to_qimage(frame):
+    """
+    将numpy图像转换为QImage
+
+    行内像素连续的uint8图像(C连续数组，或ROI切片这类只有行跨度不同的视图)按首地址和行跨度直接包装，
+    不拷贝，调用者需保证frame在QImage使用期间有效；通道翻转、取单通道、列步进等其他视图
+    逐行拷贝到QImage自己的内存中
+
+    Args:
+        frame: 灰度、BGR或BGRA图像
+
+    Returns:
+        QImage，格式不支持时返回None
+    """
+    if frame.ndim == 2:
+        fmt, channels = QImage.Format_Grayscale8, 1
+    elif frame.ndim == 3 and frame.shape[2] == 3:
+        fmt, channels = QImage.Format_BGR888, 3
+    elif frame.ndim == 3 and frame.shape[2] == 4:
+        fmt, channels = QImage.Format_ARGB32, 4
+    else:
+        return None
+
+    height, width = frame.shape[:2]
+    row_bytes = width * channels
+    if _rows_packed(frame, channels, row_bytes):
+        return QImage(sip.voidptr(frame.ctypes.data), width, height, frame.strides[0], fmt)
+
+    image = QImage(width, height, fmt)
+    if image.isNull():
+        return None
+    bits = image.bits()
+    bits.setsize(image.byteCount())
+    target = np.ndarray((height, width, channels), dtype=np.uint8, buffer=bits,
+                        strides=(image.bytesPerLine(), channels, 1))
+    target[...] = frame.reshape(height, width, channels)
+    return image
+
+
+def _rows_packed(frame, channels, row_bytes):
+    """判断图像能否按首地址和行跨度直接包装为QImage(uint8、行内像素连续、行跨度不小于行宽)"""
+    if frame.dtype != np.uint8 or frame.size == 0:
+        return False
+    if frame.strides[1] != channels or (frame.ndim == 3 and frame.strides[2] != 1):
+        return False
+    return frame.strides[0] >= row_bytes
+
+
+class TiledImageItem(QGraphicsItem):
+    """
+    分块图像项
+
+    项坐标为全分辨率图像像素坐标。绘制时根据视图缩放选择金字塔层级(2的幂)，
+    只生成与暴露区域相交的图块；缩小显示时每个图块由INTER_AREA降采样得到。
+    """
+
+    def __init__(self, tile_size=DEFAULT_TILE_SIZE, cache_bytes=DEFAULT_TILE_CACHE_BYTES, parent=None):
+        """
+        初始化分块图像项
+
+        Args:
+            tile_size: 图块边长(显示像素)
+            cache_bytes: 图块缓存预算(字节)
+            parent: 父图形项
+        """
+        super().__init__(parent)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self._frame = None
+        self._width = 0
+        self._height = 0
+        self._tile_size = max(64, int(tile_size))
+        self._cache = PixmapCache(cache_bytes, name="tiles")  # (层级, 列, 行) -> QPixmap
+
+    def set_frame(self, frame):
+        """
+        设置源图像，已缓存的图块全部失效
+
+        Args:
+            frame: numpy图像(灰度、BGR或BGRA)，None表示清空
+        """
+        height, width = frame.shape[:2] if frame is not None else (0, 0)
+        if (width, height) != (self._width, self._height):
+            self.prepareGeometryChange()
+            self._width, self._height = width, height
+        self._frame = frame
+        self.clear_cache()
+        self.update()
+
+    def set_cache_budget(self, cache_bytes):
+        """设置图块缓存预算(字节)"""
+        self._cache.set_max_bytes(cache_bytes)
+
+    def clear_cache(self):
+        """清空图块缓存"""
+        self._cache.clear()
+
+    def get_stats(self):
+        """
+        获取图块缓存统计信息
+
+        Returns:
+            PixmapCache的统计字典(条目数、占用字节数、命中/未命中/淘汰次数等)
+        """
+        return self._cache.get_stats()
+
+    def boundingRect(self):
+        return QRectF(0, 0, self._width, self._height)
+
+    def paint(self, painter, option, widget=None):
+        if self._frame is None:
+            return
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        level = 1
+        while lod > 0 and level * 2 <= 1.0 / lod:
+            level *= 2
+
+        span = self._tile_size * level  # 每个图块覆盖的全分辨率像素数
+        exposed = option.exposedRect.intersected(self.boundingRect())
+        if exposed.isEmpty():
+            return
+        col0 = int(exposed.left()) // span
+        col1 = int(exposed.right()) // span
+        row0 = int(exposed.top()) // span
+        row1 = int(exposed.bottom()) // span
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                x, y = col * span, row * span
+                if x >= self._width or y >= self._height:
+                    continue
+                pixmap = self._get_tile(level, col, row)
+                w = min(span, self._width - x)
+                h = min(span, self._height - y)
+                painter.drawPixmap(QRectF(x, y, w, h), pixmap, QRectF(pixmap.rect()))
+
+    def _get_tile(self, level, col, row):
+        """从缓存获取图块，不存在时生成"""
+        key = (level, col, row)
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        span = self._tile_size * level
+        x, y = col * span, row * span
+        region = self._frame[y:y + span, x:x + span]
+        if level > 1:
+            import cv2
+            h, w = region.shape[:2]
+            region = cv2.resize(region, (max(1, -(-w // level)), max(1, -(-h // level))),
+                                interpolation=cv2.INTER_AREA)
+        else:
+            import numpy as np
+            region = np.ascontiguousarray(region)
+        pixmap = QPixmap.fromImage(numpy_to_qimage(region))
+
+        self._cache.put(key, pixmap)
+        return pixmap
@@ -0,0 +1,320 @@
+"""
+采集链路基准
+
+让HikvisionCamera在模拟模式下、以及接上FakeMvCamera(输出Mono8/Bayer/RGB/YUV合成缓冲区)后
+以指定分辨率和帧率持续出图，由一个消费者线程从帧队列取帧，测量:
+
+- 持续吞吐(消费者每秒取到的帧数)以及帧队列、SDK替身的丢帧
+- 每帧转换耗时(core.utils.metrics中convert阶段的p50/p95/p99)
+- 分配速率(缓冲池未命中即新分配的帧缓冲区数；可选tracemalloc统计峰值内存增长)
+- 队列延迟(帧到达采集线程到消费者取出的时间)
+
+结果以JSON输出，传入--baseline时与基线比较，吞吐下降或转换耗时上升超过容差时以非零状态退出，
+用于发现_work_thread和像素转换器的性能回退。
+
+用法:
+    python benchmarks/bench_acquisition.py
+    python benchmarks/bench_acquisition.py --resolution 2448x2048 --frame-rate 0 --duration 5 --output result.json
+    python benchmarks/bench_acquisition.py --baseline result.json --tolerance 0.2
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import threading
+import tracemalloc
+
+import numpy as np
+import cv2
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.camera.hikvision_camera import HikvisionCamera
+from core.camera.fake_mv_camera import FakeMvCamera
+from core.camera.pixel_converter import get_converter
+from core.camera.MvImport.PixelType_header import (
+    PixelType_Gvsp_Mono8, PixelType_Gvsp_BayerRG8, PixelType_Gvsp_RGB8_Packed, PixelType_Gvsp_YUV422_YUYV_Packed,
+)
+from core.utils.metrics import metrics, Histogram, STAGE_CONVERT, STAGE_EMIT
+
+DEFAULT_FORMATS = [PixelType_Gvsp_Mono8, PixelType_Gvsp_BayerRG8, PixelType_Gvsp_RGB8_Packed,
+                   PixelType_Gvsp_YUV422_YUYV_Packed]
+DEFAULT_MODES = ["poll", "callback"]
+
+# 与基线比较的指标: (键, 越大越好)
+REGRESSION_KEYS = [
+    ('fps', True),
+    ('convert_p50_ms', False),
+]
+
+
+class _Consumer:
+    """消费者线程: 从帧队列取帧、记录队列延迟并把缓冲区归还给缓冲池"""
+
+    def __init__(self, camera: HikvisionCamera):
+        self._camera = camera
+        self._channel = camera.get_frame_channel()
+        self._thread = None
+        self._running = False
+        self.frames = 0
+        self.latency = Histogram("queue_latency")
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="BenchConsumer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def reset(self):
+        self.frames = 0
+        self.latency.reset()
+
+    def _loop(self):
+        while self._running:
+            frame = self._channel.get(timeout=0.1)
+            if frame is None:
+                continue
+            self.latency.observe((time.time() - frame.arrival_time) * 1000.0)
+            self.frames += 1
+            self._camera.release_frame(frame)
+
+
+def _measure(name: str, camera: HikvisionCamera, start, duration: float, warmup: float,
+             trace_alloc: bool, fake: FakeMvCamera = None):
+    """
+    运行一个场景并收集结果
+
+    Args:
+        name: 场景名称
+        camera: 已打开的相机
+        start: 开始采集的函数
+        duration: 测量时长(秒)
+        warmup: 预热时长(秒)，预热期间的数据不计入结果
+        trace_alloc: 是否用tracemalloc统计内存增长
+        fake: SDK替身(用于读取其生成帧数和丢帧数)
+
+    Returns:
+        结果字典
+    """
+    consumer = _Consumer(camera)
+    channel = camera.get_frame_channel()
+    consumer.start()
+    start()
+    time.sleep(warmup)
+
+    # 预热结束，清零统计后开始计时
+    metrics.reset()
+    channel.reset_stats()
+    consumer.reset()
+    pool_before = camera.get_buffer_pool_stats()
+    fake_before = fake.get_stats() if fake is not None else None
+    if trace_alloc:
+        tracemalloc.start()
+        alloc_base = tracemalloc.get_traced_memory()[0]
+    begin = time.perf_counter()
+    time.sleep(duration)
+    elapsed = time.perf_counter() - begin
+    frames = consumer.frames
+    if trace_alloc:
+        alloc_current, alloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    camera.stop_grabbing()
+    consumer.stop()
+
+    pool_after = camera.get_buffer_pool_stats()
+    queue_stats = channel.get_stats()
+    snapshot = metrics.snapshot()
+    convert = snapshot['histograms'].get(STAGE_CONVERT)
+    emit = snapshot['histograms'].get(STAGE_EMIT)
+    latency = consumer.latency.snapshot()
+    allocations = pool_after['misses'] - pool_before['misses']
+    gaps = snapshot['frame_gaps'].get(camera.camera_id, {})
+
+    result = {
+        'scenario': name,
+        'duration_s': elapsed,
+        'frames': frames,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+        'convert_p50_ms': convert['p50'] if convert else None,
+        'convert_p95_ms': convert['p95'] if convert else None,
+        'convert_p99_ms': convert['p99'] if convert else None,
+        'emit_p50_ms': emit['p50'] if emit else None,
+        'queue_latency_p50_ms': latency['p50'],
+        'queue_latency_p95_ms': latency['p95'],
+        'queue_latency_p99_ms': latency['p99'],
+        'queue_dropped': queue_stats['dropped'] + queue_stats['superseded'],
+        'frame_gaps': gaps.get('missing', 0),
+        'buffer_allocations': allocations,
+        'allocations_per_s': allocations / elapsed if elapsed > 0 else 0.0,
+        'pool_exhausted': pool_after['exhausted'] - pool_before['exhausted'],
+    }
+    if fake is not None:
+        fake_after = fake.get_stats()
+        result['source_frames'] = fake_after['frames'] - fake_before['frames']
+        result['source_dropped'] = fake_after['dropped'] - fake_before['dropped']
+    if trace_alloc:
+        result['traced_growth_bytes'] = alloc_current - alloc_base
+        result['traced_peak_bytes'] = alloc_peak - alloc_base
+    return result
+
+
+def run_simulation(width: int, height: int, frame_rate: float, duration: float, warmup: float,
+                   trace_alloc: bool = False):
+    """
+    模拟模式场景(HikvisionCamera自带的模拟采集线程)
+
+    Returns:
+        结果字典
+    """
+    camera = HikvisionCamera(simulation=True)
+    camera.open("SIM_BENCH")
+    camera.set_simulation_source(width=width, height=height)
+    # 模拟采集线程按1/帧率休眠，0表示不限速时用一个足够大的帧率
+    camera.set_parameter(frame_rate=frame_rate if frame_rate > 0 else 100000)
+    try:
+        return _measure("simulation", camera, camera.start_grabbing, duration, warmup, trace_alloc)
+    finally:
+        camera.close()
+
+
+def run_fake(pixel_type: int, mode: str, width: int, height: int, frame_rate: float, duration: float,
+             warmup: float, trace_alloc: bool = False, zero_copy: bool = False):
+    """
+    FakeMvCamera场景: 合成的SDK缓冲区经过_work_thread(取流)或SDK回调，再经像素转换放入帧队列
+
+    Returns:
+        结果字典
+    """
+    fake = FakeMvCamera(width=width, height=height, pixel_type=pixel_type, frame_rate=frame_rate)
+    camera = HikvisionCamera(mv_camera=fake)
+    camera.open()
+    if zero_copy:
+        camera.set_zero_copy(True)
+    name = f"fake-{get_converter(pixel_type).name}-{mode}" + ("-zerocopy" if zero_copy else "")
+    try:
+        return _measure(name, camera, lambda: camera.start_grabbing(acquisition_mode=mode),
+                        duration, warmup, trace_alloc, fake)
+    finally:
+        camera.close()
+
+
+def run(resolution: str, frame_rate: float, duration: float, warmup: float, formats=None, modes=None,
+        simulation: bool = True, trace_alloc: bool = False, zero_copy: bool = False):
+    """
+    执行全部场景
+
+    Returns:
+        结果报告字典
+    """
+    width, height = (int(v) for v in resolution.lower().split("x"))
+    results = []
+    if simulation:
+        results.append(run_simulation(width, height, frame_rate, duration, warmup, trace_alloc))
+    for pixel_type in (formats or DEFAULT_FORMATS):
+        for mode in (modes or DEFAULT_MODES):
+            results.append(run_fake(pixel_type, mode, width, height, frame_rate, duration, warmup,
+                                    trace_alloc, zero_copy and mode == "poll"))
+    return {
+        'benchmark': 'acquisition',
+        'timestamp': time.time(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+            'cpu_count': os.cpu_count(),
+        },
+        'config': {
+            'resolution': f"{width}x{height}",
+            'frame_rate': frame_rate,
+            'duration_s': duration,
+            'warmup_s': warmup,
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline, tolerance: float):
+    """
+    与基线比较
+
+    Args:
+        report: 本次结果
+        baseline: 基线结果
+        tolerance: 允许的相对变化，如0.2表示20%
+
+    Returns:
+        回退列表，每项为描述字符串
+    """
+    baseline_rows = {row['scenario']: row for row in baseline.get('results', [])}
+    regressions = []
+    for row in report['results']:
+        base = baseline_rows.get(row['scenario'])
+        if base is None:
+            continue
+        for key, higher_is_better in REGRESSION_KEYS:
+            value, reference = row.get(key), base.get(key)
+            if value is None or not reference:
+                continue
+            change = (value - reference) / reference
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{row['scenario']} {key}: {reference:.3f} -> {value:.3f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="采集链路基准")
+    parser.add_argument("--resolution", default="1280x1024", help="分辨率，如 2448x2048")
+    parser.add_argument("--frame-rate", type=float, default=0, help="出帧速率，0表示不限速(测最大吞吐)")
+    parser.add_argument("--duration", type=float, default=3.0, help="每个场景的测量时长(秒)")
+    parser.add_argument("--warmup", type=float, default=0.5, help="每个场景的预热时长(秒)")
+    parser.add_argument("--modes", nargs="+", default=DEFAULT_MODES, choices=DEFAULT_MODES, help="采集方式")
+    parser.add_argument("--no-simulation", action="store_true", help="跳过模拟模式场景")
+    parser.add_argument("--zero-copy", action="store_true", help="取流方式下开启零拷贝")
+    parser.add_argument("--tracemalloc", action="store_true", help="用tracemalloc统计内存增长(会降低吞吐)")
+    parser.add_argument("--output", help="把JSON结果写入文件")
+    parser.add_argument("--baseline", help="基线JSON文件，有回退时以状态1退出")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="与基线比较时允许的相对变化")
+    args = parser.parse_args()
+
+    report = run(args.resolution, args.frame_rate, args.duration, args.warmup, modes=args.modes,
+                 simulation=not args.no_simulation, trace_alloc=args.tracemalloc, zero_copy=args.zero_copy)
+
+    print(f"{'场景':<28}{'帧率':>9}{'转换p50':>10}{'转换p99':>10}{'延迟p50':>10}{'延迟p99':>10}{'丢帧':>7}{'分配/秒':>9}")
+    for row in report['results']:
+        convert_p50 = f"{row['convert_p50_ms']:.3f}" if row['convert_p50_ms'] is not None else "-"
+        convert_p99 = f"{row['convert_p99_ms']:.3f}" if row['convert_p99_ms'] is not None else "-"
+        dropped = row['queue_dropped'] + row.get('source_dropped', 0)
+        print(f"{row['scenario']:<28}{row['fps']:>9.1f}{convert_p50:>10}{convert_p99:>10}"
+              f"{row['queue_latency_p50_ms']:>10.3f}{row['queue_latency_p99_ms']:>10.3f}{dropped:>7}"
+              f"{row['allocations_per_s']:>9.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.output}")
+    else:
+        print(json.dumps(report, ensure_ascii=False))
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"性能回退: {line}")
+        if regressions:
+            sys.exit(1)
+        print("未发现性能回退")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+像素格式转换微基准
+
+对比旧的逐通道拷贝实现(_mono_to_numpy/_color_to_numpy及_work_thread中的内联分支)
+与 core.camera.pixel_converter 转换器注册表在不同格式和分辨率下的单帧耗时。
+
+用法:
+    python benchmarks/bench_pixel_conversion.py
+    python benchmarks/bench_pixel_conversion.py --resolutions 1280x1024 2448x2048 --repeat 50
+    python benchmarks/bench_pixel_conversion.py --output conversion.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+import cv2
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from core.camera.pixel_converter import convert_frame, get_converter
+from core.camera.MvImport.PixelType_header import (
+    PixelType_Gvsp_Mono8, PixelType_Gvsp_Mono12, PixelType_Gvsp_Mono12_Packed,
+    PixelType_Gvsp_BayerRG8, PixelType_Gvsp_BayerRG12, PixelType_Gvsp_BayerRG12_Packed,
+    PixelType_Gvsp_RGB8_Packed, PixelType_Gvsp_BGR8_Packed, PixelType_Gvsp_YUV422_YUYV_Packed,
+)
+
+DEFAULT_RESOLUTIONS = ["640x480", "1280x1024", "2448x2048"]
+
+
+# ---------------------------------------------------------------------------
+# 旧实现(保留用于对比)
+# ---------------------------------------------------------------------------
+
+def _legacy_mono(data, width, height):
+    """旧的单色转换: 拷贝到新数组后再扩展为BGR"""
+    data_arr = np.frombuffer(data, count=int(width * height), dtype=np.uint8, offset=0)
+    data_mono_arr = data_arr.reshape(height, width)
+    num_array = np.zeros([height, width, 1], "uint8")
+    num_array[:, :, 0] = data_mono_arr
+    return cv2.cvtColor(num_array, cv2.COLOR_GRAY2BGR)
+
+
+def _legacy_color(data, width, height):
+    """旧的彩色转换: 三次跨步切片后逐通道拷贝到全零数组"""
+    data_arr = np.frombuffer(data, count=int(width * height * 3), dtype=np.uint8, offset=0)
+    data_r = data_arr[0:width * height * 3:3]
+    data_g = data_arr[1:width * height * 3:3]
+    data_b = data_arr[2:width * height * 3:3]
+    num_array = np.zeros([height, width, 3], "uint8")
+    num_array[:, :, 0] = data_b.reshape(height, width)
+    num_array[:, :, 1] = data_g.reshape(height, width)
+    num_array[:, :, 2] = data_r.reshape(height, width)
+    return num_array
+
+
+def _legacy_yuv(data, width, height):
+    """旧的YUV转换: 拷贝后再cvtColor"""
+    copied = np.frombuffer(bytes(data[:width * height * 2]), dtype=np.uint8)
+    return cv2.cvtColor(copied.reshape(height, width, -1), cv2.COLOR_YUV2BGR_YUYV)
+
+
+# 格式 -> 旧实现(None表示旧代码不支持该格式)
+FORMATS = [
+    (PixelType_Gvsp_Mono8, _legacy_mono),
+    (PixelType_Gvsp_Mono12, None),
+    (PixelType_Gvsp_Mono12_Packed, None),
+    (PixelType_Gvsp_BayerRG8, None),
+    (PixelType_Gvsp_BayerRG12, None),
+    (PixelType_Gvsp_BayerRG12_Packed, None),
+    (PixelType_Gvsp_RGB8_Packed, _legacy_color),
+    (PixelType_Gvsp_BGR8_Packed, _legacy_color),
+    (PixelType_Gvsp_YUV422_YUYV_Packed, _legacy_yuv),
+]
+
+
+def _time_call(func, repeat: int) -> float:
+    """返回单次调用的平均耗时(毫秒)"""
+    func()  # 预热
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000.0 / repeat
+
+
+def run(resolutions, repeat: int):
+    """
+    执行基准测试
+
+    Returns:
+        结果列表，每项为字典
+    """
+    rng = np.random.default_rng(0)
+    results = []
+    for resolution in resolutions:
+        width, height = (int(v) for v in resolution.lower().split("x"))
+        for pixel_type, legacy in FORMATS:
+            converter = get_converter(pixel_type)
+            raw = rng.integers(0, 256, converter.raw_size(width, height), dtype=np.uint8)
+            out = np.empty(converter.output_shape(width, height), dtype=np.uint8)
+
+            new_ms = _time_call(lambda: convert_frame(raw, width, height, pixel_type, out=out), repeat)
+            legacy_ms = _time_call(lambda: legacy(raw, width, height), repeat) if legacy else None
+            results.append({
+                'format': converter.name,
+                'resolution': f"{width}x{height}",
+                'legacy_ms': legacy_ms,
+                'new_ms': new_ms,
+                'speedup': (legacy_ms / new_ms) if legacy_ms and new_ms > 0 else None,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="像素格式转换微基准")
+    parser.add_argument("--resolutions", nargs="+", default=DEFAULT_RESOLUTIONS, help="分辨率列表，如 1280x1024")
+    parser.add_argument("--repeat", type=int, default=30, help="每项重复次数")
+    parser.add_argument("--output", help="把JSON结果写入文件")
+    args = parser.parse_args()
+
+    results = run(args.resolutions, args.repeat)
+    print(f"{'格式':<18}{'分辨率':<12}{'旧实现(ms)':>12}{'新实现(ms)':>12}{'加速比':>8}")
+    for row in results:
+        legacy = f"{row['legacy_ms']:.3f}" if row['legacy_ms'] is not None else "-"
+        speedup = f"{row['speedup']:.1f}x" if row['speedup'] else "-"
+        print(f"{row['format']:<18}{row['resolution']:<12}{legacy:>12}{row['new_ms']:>12.3f}{speedup:>8}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'benchmark': 'pixel_conversion', 'timestamp': time.time(), 'repeat': args.repeat,
+                       'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
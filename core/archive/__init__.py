@@ -0,0 +1,3 @@
+"""
+归档模块初始化文件
+"""
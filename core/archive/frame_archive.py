@@ -0,0 +1,515 @@
+"""
+帧归档模块
+
+按帧号随机访问的长期图像归档，供质检人员浏览大量历史帧。
+
+归档目录布局:
+    archive.json        归档描述(编码方式、缩略图尺寸、相机ID表)
+    index.aix           定长二进制索引，每帧64字节(帧号、时间戳、段号、偏移、长度、尺寸、相机、判定、缩略图位置)
+    segment_00000.seg   只追加的数据段，存放编码后的图像(PNG/JPEG)或原始记录，写满segment_size后换下一段
+    thumbnails.seg      只追加的缩略图轨道(JPEG)，浏览时只解码缩略图，不读取完整图像
+
+索引可以直接内存映射为numpy结构数组，按序号O(1)定位，按时间、帧号、判定、相机筛选都是向量运算。
+写入顺序为数据段 -> 缩略图 -> 索引，写入中断时索引中只会缺少最后一帧。
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..camera.frame import Frame
+from ..camera.frame_stream import (FILE_HEADER_SIZE, pack_record_header, read_record, record_info,
+                                   write_file_header, read_file_header)
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+INDEX_MAGIC = b"ACARIDX\0"
+SEGMENT_MAGIC = b"ACARSEG\0"
+
+META_FILE = "archive.json"
+INDEX_FILE = "index.aix"
+THUMBNAIL_FILE = "thumbnails.seg"
+
+# 判定结果
+VERDICT_UNKNOWN = 0
+VERDICT_OK = 1
+VERDICT_NG = 2
+VERDICT_NAMES = {VERDICT_UNKNOWN: "未判定", VERDICT_OK: "OK", VERDICT_NG: "NG"}
+
+# 图像编码方式
+CODEC_RAW = 0       # 原始记录(与帧流文件相同)，写入最快、体积最大
+CODEC_PNG = 1       # 无损
+CODEC_JPEG = 2      # 有损，仅支持8位图像，其他位深自动改用PNG
+CODEC_NAMES = {"raw": CODEC_RAW, "png": CODEC_PNG, "jpeg": CODEC_JPEG, "jpg": CODEC_JPEG}
+
+# 帧号, 时间戳, 段号, 段内偏移, 长度, 宽, 高, 相机, 判定, 编码, 缩略图偏移, 缩略图长度, 像素格式, 保留
+INDEX_ENTRY = struct.Struct("<QdIQIIIHBBQIII")
+INDEX_DTYPE = np.dtype([
+    ('frame_number', '<u8'), ('timestamp', '<f8'), ('segment', '<u4'), ('offset', '<u8'), ('size', '<u4'),
+    ('width', '<u4'), ('height', '<u4'), ('camera', '<u2'), ('verdict', 'u1'), ('codec', 'u1'),
+    ('thumb_offset', '<u8'), ('thumb_size', '<u4'), ('pixel_type', '<u4'), ('reserved', '<u4'),
+])
+_VERDICT_OFFSET = INDEX_DTYPE.fields['verdict'][1]
+
+# 默认数据段大小(字节)
+DEFAULT_SEGMENT_SIZE = 1024 * 1024 * 1024
+
+# 默认缩略图尺寸(最大宽, 最大高)，保持图像宽高比
+DEFAULT_THUMBNAIL_SIZE = (160, 120)
+
+
+def segment_path(directory: str, segment: int) -> str:
+    """数据段文件路径"""
+    return os.path.join(directory, f"segment_{segment:05d}.seg")
+
+
+def make_thumbnail(frame: np.ndarray, size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE) -> np.ndarray:
+    """
+    生成缩略图
+
+    Args:
+        frame: 图像(单通道或BGR，8位或16位)
+        size: (最大宽, 最大高)
+
+    Returns:
+        8位缩略图，保持宽高比
+    """
+    height, width = frame.shape[:2]
+    scale = min(size[0] / width, size[1] / height, 1.0)
+    thumb = cv2.resize(frame, (max(1, int(width * scale)), max(1, int(height * scale))),
+                       interpolation=cv2.INTER_AREA)
+    if thumb.dtype != np.uint8:
+        thumb = cv2.convertScaleAbs(thumb, alpha=255.0 / max(1, int(thumb.max())))
+    return thumb
+
+
+class ArchiveWriter:
+    """
+    归档写入器
+
+    在调用线程中同步编码和追加，可被多个线程共享。打开已有归档时在其末尾继续追加。
+    """
+
+    def __init__(self, directory: str, codec: str = "png", segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 thumbnail_size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE, jpeg_quality: int = 90,
+                 thumbnail_quality: int = 80):
+        """
+        打开或创建归档
+
+        Args:
+            directory: 归档目录
+            codec: 新建归档时的图像编码方式，"png"、"jpeg"或"raw"
+            segment_size: 数据段大小(字节)，超过后换下一段
+            thumbnail_size: 新建归档时的缩略图尺寸(最大宽, 最大高)
+            jpeg_quality: JPEG编码质量
+            thumbnail_quality: 缩略图JPEG质量
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.jpeg_quality = jpeg_quality
+        self.thumbnail_quality = thumbnail_quality
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                self._meta = json.load(f)
+        else:
+            if codec not in CODEC_NAMES:
+                raise ValueError(f"不支持的编码方式: {codec}")
+            self._meta = {'version': 1, 'codec': codec, 'thumbnail_size': list(thumbnail_size), 'cameras': []}
+            self._save_meta()
+        self._codec = CODEC_NAMES[self._meta['codec']]
+        self._thumbnail_size = tuple(self._meta['thumbnail_size'])
+        self._cameras = {camera_id: i for i, camera_id in enumerate(self._meta['cameras'])}
+
+        self._index_file = self._open_append(os.path.join(directory, INDEX_FILE), INDEX_MAGIC)
+        # 丢弃写入中断留下的半条索引
+        count = (self._index_file.tell() - FILE_HEADER_SIZE) // INDEX_ENTRY.size
+        self._index_file.truncate(FILE_HEADER_SIZE + count * INDEX_ENTRY.size)
+        self._index_file.seek(0, os.SEEK_END)
+        self._count = count
+        self._thumb_file = self._open_append(os.path.join(directory, THUMBNAIL_FILE), SEGMENT_MAGIC)
+
+        self._segment = 0
+        while os.path.exists(segment_path(directory, self._segment + 1)):
+            self._segment += 1
+        self._segment_file = self._open_append(segment_path(directory, self._segment), SEGMENT_MAGIC)
+        logger.info(f"打开归档: {directory}，已有{count}帧")
+
+    def _open_append(self, path: str, magic: bytes):
+        """打开文件并定位到末尾，新文件先写入文件头"""
+        exists = os.path.exists(path)
+        f = open(path, 'r+b' if exists else 'w+b')
+        if exists:
+            read_file_header(f.read(FILE_HEADER_SIZE), magic, path)
+        else:
+            header = bytearray(FILE_HEADER_SIZE)
+            write_file_header(header, magic, "")
+            f.write(header)
+        f.seek(0, os.SEEK_END)
+        return f
+
+    def _save_meta(self) -> None:
+        """写入归档描述"""
+        path = os.path.join(self.directory, META_FILE)
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(self._meta, f, ensure_ascii=False, indent=4)
+        os.replace(path + ".tmp", path)
+
+    def _camera_index(self, camera_id: str) -> int:
+        """相机ID在相机表中的序号，新相机追加到表中"""
+        index = self._cameras.get(camera_id)
+        if index is None:
+            index = len(self._meta['cameras'])
+            self._meta['cameras'].append(camera_id)
+            self._cameras[camera_id] = index
+            self._save_meta()
+        return index
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _encode(self, frame: np.ndarray, info: Dict[str, Any]) -> Tuple[int, bytes]:
+        """按归档编码方式编码图像，返回(实际编码方式, 数据)"""
+        codec = self._codec
+        if codec == CODEC_JPEG and frame.dtype != np.uint8:
+            codec = CODEC_PNG
+        if codec == CODEC_RAW:
+            array = np.ascontiguousarray(frame)
+            return codec, pack_record_header(array, info) + memoryview(array).cast('B').tobytes()
+        if codec == CODEC_JPEG:
+            ok, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        else:
+            ok, data = cv2.imencode(".png", frame, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        if not ok:
+            raise ValueError("图像编码失败")
+        return codec, data.tobytes()
+
+    def append(self, frame, info: Optional[Dict[str, Any]] = None, verdict: int = VERDICT_UNKNOWN) -> int:
+        """
+        追加一帧
+
+        Args:
+            frame: 图像数组或Frame
+            info: 帧信息(camera_id、frame_number、timestamp、pixel_type)，frame为Frame时可省略
+            verdict: 检测判定，VERDICT_OK / VERDICT_NG / VERDICT_UNKNOWN
+
+        Returns:
+            该帧在归档中的序号
+        """
+        if isinstance(frame, Frame):
+            info = frame.to_info() if info is None else info
+            frame = frame.array
+        info = info or {}
+        # 编码在锁外进行，多个线程可以并行编码
+        codec, data = self._encode(frame, info)
+        thumb_ok, thumb = cv2.imencode(".jpg", make_thumbnail(frame, self._thumbnail_size),
+                                       [cv2.IMWRITE_JPEG_QUALITY, self.thumbnail_quality])
+        thumb = thumb.tobytes() if thumb_ok else b""
+        height, width = frame.shape[:2]
+
+        with self._lock:
+            if self._segment_file.tell() + len(data) > self.segment_size and \
+                    self._segment_file.tell() > FILE_HEADER_SIZE:
+                self._segment_file.close()
+                self._segment += 1
+                self._segment_file = self._open_append(segment_path(self.directory, self._segment), SEGMENT_MAGIC)
+            offset = self._segment_file.tell()
+            self._segment_file.write(data)
+            thumb_offset = self._thumb_file.tell()
+            self._thumb_file.write(thumb)
+            self._index_file.write(INDEX_ENTRY.pack(
+                int(info.get('frame_number', 0) or 0), float(info.get('timestamp', 0.0) or 0.0),
+                self._segment, offset, len(data), width, height,
+                self._camera_index(info.get('camera_id', "") or ""), verdict, codec,
+                thumb_offset, len(thumb), int(info.get('pixel_type', 0) or 0), 0))
+            self._count += 1
+            return self._count - 1
+
+    def set_verdict(self, index: int, verdict: int) -> None:
+        """
+        修改已归档帧的判定(判定晚于归档时使用)
+
+        Args:
+            index: 帧序号
+            verdict: 判定
+        """
+        with self._lock:
+            if not 0 <= index < self._count:
+                raise IndexError(index)
+            self._index_file.seek(FILE_HEADER_SIZE + index * INDEX_ENTRY.size + _VERDICT_OFFSET)
+            self._index_file.write(bytes([verdict]))
+            self._index_file.seek(0, os.SEEK_END)
+
+    def flush(self) -> None:
+        """把缓冲数据写入文件，之后打开的读取器可以看到已追加的帧"""
+        with self._lock:
+            self._segment_file.flush()
+            self._thumb_file.flush()
+            self._index_file.flush()
+
+    def close(self) -> None:
+        """关闭归档"""
+        with self._lock:
+            for f in (self._segment_file, self._thumb_file, self._index_file):
+                if not f.closed:
+                    f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ArchiveReader:
+    """
+    归档读取器
+
+    内存映射索引，按序号O(1)读取完整帧或缩略图；数据段在第一次访问时才映射。
+    归档仍在写入时可以调用refresh()看到新追加的帧。
+    """
+
+    def __init__(self, directory: str):
+        """
+        打开归档
+
+        Args:
+            directory: 归档目录
+        """
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.cameras: List[str] = list(meta['cameras'])
+        self.thumbnail_size = tuple(meta['thumbnail_size'])
+        self._segments: Dict[int, Tuple[Any, mmap.mmap]] = {}
+        self._thumbs = None
+        self._index = np.zeros(0, dtype=INDEX_DTYPE)
+        self.refresh()
+
+    def refresh(self) -> int:
+        """
+        重新映射索引和缩略图轨道，读取写入器新追加的帧
+
+        Returns:
+            帧数
+        """
+        path = os.path.join(self.directory, INDEX_FILE)
+        with open(path, 'rb') as f:
+            read_file_header(f.read(FILE_HEADER_SIZE), INDEX_MAGIC, path)
+        count = (os.path.getsize(path) - FILE_HEADER_SIZE) // INDEX_DTYPE.itemsize
+        if count != len(self._index):
+            self._index = (np.memmap(path, dtype=INDEX_DTYPE, mode='r', offset=FILE_HEADER_SIZE, shape=(count,))
+                           if count > 0 else np.zeros(0, dtype=INDEX_DTYPE))
+            # 新的相机、缩略图和数据段都可能随新帧出现
+            with open(os.path.join(self.directory, META_FILE), 'r', encoding='utf-8') as f:
+                self.cameras = list(json.load(f)['cameras'])
+            self._close_thumbs()
+            last = self._segments.pop(max(self._segments), None) if self._segments else None
+            if last is not None:
+                self._close_mapping(last)
+        return count
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def index(self) -> np.ndarray:
+        """索引结构数组(只读)，字段见INDEX_DTYPE"""
+        return self._index
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """各帧时间戳(秒)"""
+        return self._index['timestamp']
+
+    @property
+    def frame_numbers(self) -> np.ndarray:
+        """各帧的相机帧号"""
+        return self._index['frame_number']
+
+    @property
+    def verdicts(self) -> np.ndarray:
+        """各帧的判定"""
+        return self._index['verdict']
+
+    @property
+    def duration(self) -> float:
+        """归档覆盖的时长(秒)"""
+        if len(self._index) < 2:
+            return 0.0
+        return float(self._index['timestamp'][-1] - self._index['timestamp'][0])
+
+    def _camera_code(self, camera_id: str) -> int:
+        """相机ID在相机表中的序号，不存在时返回-1"""
+        return self.cameras.index(camera_id) if camera_id in self.cameras else -1
+
+    def select(self, verdict: int = None, camera_id: str = None,
+               start: float = None, end: float = None) -> np.ndarray:
+        """
+        按条件筛选帧
+
+        Args:
+            verdict: 判定，None表示不限
+            camera_id: 相机ID，None表示不限
+            start: 起始时间戳(包含)，None表示不限
+            end: 结束时间戳(不包含)，None表示不限
+
+        Returns:
+            满足条件的帧序号数组
+        """
+        mask = np.ones(len(self._index), dtype=bool)
+        if verdict is not None:
+            mask &= self._index['verdict'] == verdict
+        if camera_id is not None:
+            mask &= self._index['camera'] == self._camera_code(camera_id)
+        if start is not None:
+            mask &= self._index['timestamp'] >= start
+        if end is not None:
+            mask &= self._index['timestamp'] < end
+        return np.flatnonzero(mask)
+
+    def find_time(self, timestamp: float) -> int:
+        """
+        查找时间戳不早于timestamp的第一帧(帧按写入顺序，时间戳单调递增时有效)
+
+        Args:
+            timestamp: 时间戳(秒)
+
+        Returns:
+            帧序号，超出范围时返回帧数
+        """
+        return int(np.searchsorted(self._index['timestamp'], timestamp))
+
+    def find(self, frame_number: int, camera_id: str = None) -> int:
+        """
+        按相机帧号查找帧
+
+        Args:
+            frame_number: 相机帧号
+            camera_id: 相机ID，None表示任意相机
+
+        Returns:
+            第一个匹配的帧序号，不存在时返回-1
+        """
+        mask = self._index['frame_number'] == frame_number
+        if camera_id is not None:
+            mask &= self._index['camera'] == self._camera_code(camera_id)
+        matches = np.flatnonzero(mask)
+        return int(matches[0]) if len(matches) else -1
+
+    def read_info(self, index: int) -> Dict[str, Any]:
+        """
+        读取一帧的索引信息(不访问数据段)
+
+        Args:
+            index: 帧序号
+
+        Returns:
+            帧信息字典，键与Frame.to_info一致，另含verdict和index
+        """
+        entry = self._index[index]
+        camera = int(entry['camera'])
+        return {
+            'index': int(index),
+            'camera_id': self.cameras[camera] if camera < len(self.cameras) else "",
+            'frame_number': int(entry['frame_number']),
+            'timestamp': float(entry['timestamp']),
+            'width': int(entry['width']),
+            'height': int(entry['height']),
+            'pixel_type': int(entry['pixel_type']),
+            'verdict': int(entry['verdict']),
+        }
+
+    def _segment(self, segment: int) -> mmap.mmap:
+        """映射数据段"""
+        mapping = self._segments.get(segment)
+        if mapping is None:
+            f = open(segment_path(self.directory, segment), 'rb')
+            mapping = (f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            self._segments[segment] = mapping
+        return mapping[1]
+
+    def read(self, index: int) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        读取并解码一帧完整图像
+
+        Args:
+            index: 帧序号
+
+        Returns:
+            (图像数组, 帧信息)
+        """
+        entry = self._index[index]
+        mm = self._segment(int(entry['segment']))
+        offset, size = int(entry['offset']), int(entry['size'])
+        info = self.read_info(index)
+        if entry['codec'] == CODEC_RAW:
+            array, fields = read_record(mm, offset)
+            raw_info = record_info(fields, info['camera_id'])
+            raw_info.update(info)
+            return array.copy(), raw_info
+        data = np.frombuffer(mm, dtype=np.uint8, count=size, offset=offset)
+        return cv2.imdecode(data, cv2.IMREAD_UNCHANGED), info
+
+    def read_frame(self, index: int) -> Frame:
+        """读取一帧为Frame"""
+        array, info = self.read(index)
+        return Frame.from_info(array, info)
+
+    def read_thumbnail(self, index: int) -> Optional[np.ndarray]:
+        """
+        读取并解码一帧的缩略图
+
+        Args:
+            index: 帧序号
+
+        Returns:
+            8位缩略图，没有缩略图时返回None
+        """
+        entry = self._index[index]
+        size = int(entry['thumb_size'])
+        if size == 0:
+            return None
+        if self._thumbs is None:
+            f = open(os.path.join(self.directory, THUMBNAIL_FILE), 'rb')
+            self._thumbs = (f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        data = np.frombuffer(self._thumbs[1], dtype=np.uint8, count=size, offset=int(entry['thumb_offset']))
+        return cv2.imdecode(data, cv2.IMREAD_UNCHANGED)
+
+    @staticmethod
+    def _close_mapping(mapping) -> None:
+        """关闭映射和文件(仍被引用的映射由垃圾回收关闭)"""
+        f, mm = mapping
+        try:
+            mm.close()
+        except BufferError:
+            pass
+        f.close()
+
+    def _close_thumbs(self) -> None:
+        if self._thumbs is not None:
+            self._close_mapping(self._thumbs)
+            self._thumbs = None
+
+    def close(self) -> None:
+        """关闭归档"""
+        for mapping in self._segments.values():
+            self._close_mapping(mapping)
+        self._segments.clear()
+        self._close_thumbs()
+        self._index = np.zeros(0, dtype=INDEX_DTYPE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -17,10 +17,13 @@ class CameraFactory(ABC):
     """
     
     @abstractmethod
-    def create_camera(self) -> CameraInterface:
+    def create_camera(self, simulation: bool = False) -> CameraInterface:
         """
         创建相机对象
         
+        Args:
+            simulation: 是否使用模拟模式(不支持模拟的相机类型可以忽略)
+            
         Returns:
             相机接口对象
         """
@@ -48,12 +51,13 @@ class CameraFactoryManager:
         cls._factories[camera_type] = factory_class
     
     @classmethod
-    def create_camera(cls, camera_type: str) -> Optional[CameraInterface]:
+    def create_camera(cls, camera_type: str, simulation: bool = False) -> Optional[CameraInterface]:
         """
         创建指定类型的相机对象
         
         Args:
             camera_type: 相机类型名称
+            simulation: 是否使用模拟模式
             
         Returns:
             相机接口对象，类型不存在时返回None
@@ -62,7 +66,7 @@ class CameraFactoryManager:
             return None
         
         factory = cls._factories[camera_type]()
-        return factory.create_camera()
+        return factory.create_camera(simulation=simulation)
     
     @classmethod
     def get_available_types(cls) -> list:
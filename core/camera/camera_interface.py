@@ -5,9 +5,11 @@
 使用适配器模式，提供统一的相机操作接口。
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 import numpy as np
 
+from .frame import Frame
+
 class CameraInterface(ABC):
     """
     相机接口抽象类
@@ -16,10 +18,15 @@ class CameraInterface(ABC):
     """
     
     @abstractmethod
-    def enumerate_devices(self) -> List[Dict[str, Any]]:
+    def enumerate_devices(self, refresh: bool = False,
+                          callback: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
         """
         枚举可用的相机设备
         
+        Args:
+            refresh: 是否忽略缓存的枚举结果重新扫描
+            callback: 增量回调，以目前发现的全部设备调用，可能不在调用线程中
+            
         Returns:
             可用相机设备列表，每个设备为一个字典，包含设备信息
         """
@@ -91,6 +98,43 @@ class CameraInterface(ABC):
         """
         pass
     
+    def get_frame_record(self, timeout: int = 1000) -> Optional[Frame]:
+        """
+        获取一帧图像及其元数据；默认实现只包装get_frame，能提供帧号、时间戳等信息的相机应重写
+        
+        Args:
+            timeout: 超时时间(毫秒)
+            
+        Returns:
+            Frame，获取失败时返回None
+        """
+        frame = self.get_frame(timeout)
+        return Frame(frame) if frame is not None else None
+    
+    def retain_frame(self, frame) -> bool:
+        """
+        为新的持有者增加帧缓冲区的引用；默认实现的帧不来自缓冲池，无需引用计数
+        
+        Args:
+            frame: 该相机产生的Frame或图像数组
+            
+        Returns:
+            是否增加了引用
+        """
+        return False
+    
+    def release_frame(self, frame) -> bool:
+        """
+        归还一个持有者的帧缓冲区引用，所有持有者都归还后缓冲区才会被复用
+        
+        Args:
+            frame: 该相机产生的Frame或图像数组
+            
+        Returns:
+            是否归还成功
+        """
+        return False
+    
     @abstractmethod
     def trigger_once(self) -> bool:
         """
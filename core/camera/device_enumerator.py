@@ -0,0 +1,233 @@
+"""
+设备枚举模块
+
+GigE相机的枚举要发广播并等待设备应答，网络中设备多时一次MV_CC_EnumDevices需要数秒，
+在界面线程中同步调用会让界面卡住。DeviceEnumerator把枚举移到工作线程：
+- 枚举结果缓存ttl秒，有效期内直接返回缓存，refresh=True时强制重新扫描
+- 同时发起的多个枚举请求共享同一次扫描，不会重复调用SDK
+- 按传输层(USB、GigE等)依次扫描，每扫完一层就把目前发现的全部设备交给回调，界面可以逐步显示
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+# 扫描一个传输层: 第一台设备的ID序号 -> [(设备信息, 设备句柄)]，设备句柄供打开设备时使用
+Probe = Callable[[int], List[Tuple[Dict[str, Any], Any]]]
+
+# 增量回调: 本次扫描目前发现的全部设备
+DevicesCallback = Callable[[List[Dict[str, Any]]], None]
+
+# 默认缓存有效期(秒)
+DEFAULT_TTL = 5.0
+
+
+class DeviceEnumerator:
+    """
+    在工作线程中扫描设备并缓存结果
+
+        enumerator = DeviceEnumerator([("USB", usb_probe), ("GigE", gige_probe)])
+        enumerator.enumerate_async(callback=lambda devices: combo.update(devices))
+        devices = enumerator.enumerate()            # 缓存有效时不访问SDK
+        handle = enumerator.get_handle(devices[0]['device_id'])
+    """
+
+    def __init__(self, probes: List[Tuple[str, Probe]], ttl: float = DEFAULT_TTL, name: str = "DeviceEnumerator"):
+        """
+        初始化设备枚举器
+
+        Args:
+            probes: [(传输层名称, 扫描函数)]，按顺序扫描，耗时短的放在前面
+            ttl: 缓存有效期(秒)，0表示每次都重新扫描
+            name: 工作线程名称
+        """
+        self._probes = list(probes)
+        self.ttl = max(0.0, float(ttl))
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._devices: Optional[List[Dict[str, Any]]] = None
+        self._handles: Dict[str, Any] = {}
+        self._timestamp = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._generation = 0
+        self._listeners: List[Tuple[Optional[DevicesCallback], Optional[DevicesCallback]]] = []
+        self._stats = {'scans': 0, 'cache_hits': 0, 'joined': 0, 'errors': 0, 'last_scan_ms': 0.0}
+
+    @property
+    def scanning(self) -> bool:
+        """是否正在扫描"""
+        return self._thread is not None
+
+    def enumerate(self, refresh: bool = False, callback: Optional[DevicesCallback] = None,
+                  timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        获取设备列表，缓存过期或refresh时等待扫描完成
+
+        Args:
+            refresh: 是否忽略缓存重新扫描
+            callback: 增量回调，在工作线程中调用；使用缓存时在调用线程中调用一次
+            timeout: 最长等待时间(秒)，None表示一直等待；超时返回上一次的结果
+
+        Returns:
+            设备信息列表
+        """
+        with self._lock:
+            generation = self._generation
+            cached = self._start_scan(refresh, callback, None)
+            if cached is None:
+                self._done.wait_for(lambda: self._generation != generation and self._thread is None, timeout)
+            devices = list(self._devices or [])
+        if cached is not None and callback is not None:
+            callback(list(cached))
+        return devices
+
+    def enumerate_async(self, refresh: bool = False, callback: Optional[DevicesCallback] = None,
+                        done_callback: Optional[DevicesCallback] = None) -> bool:
+        """
+        在工作线程中获取设备列表(不阻塞)
+
+        Args:
+            refresh: 是否忽略缓存重新扫描
+            callback: 增量回调，每扫完一个传输层调用一次
+            done_callback: 扫描结束回调，参数为全部设备
+
+        Returns:
+            是否需要扫描；False表示使用了缓存，回调已在调用线程中完成
+        """
+        with self._lock:
+            cached = self._start_scan(refresh, callback, done_callback)
+        if cached is None:
+            return True
+        for notify in (callback, done_callback):
+            if notify is not None:
+                notify(list(cached))
+        return False
+
+    def get_devices(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        上一次扫描的结果(不论是否过期)
+
+        Returns:
+            设备信息列表，从未扫描过时返回None
+        """
+        with self._lock:
+            return None if self._devices is None else list(self._devices)
+
+    def get_handle(self, device_id: str) -> Any:
+        """
+        获取上一次扫描得到的设备句柄
+
+        Args:
+            device_id: 设备ID
+
+        Returns:
+            设备句柄，不存在时返回None
+        """
+        with self._lock:
+            return self._handles.get(device_id)
+
+    def invalidate(self) -> None:
+        """使缓存失效，下一次枚举重新扫描"""
+        with self._lock:
+            self._timestamp = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取枚举统计信息
+
+        Returns:
+            扫描次数、缓存命中数、共享扫描数、出错的传输层数、上次扫描耗时(毫秒)、设备数和缓存时长(秒)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['devices'] = len(self._devices or [])
+            stats['age'] = time.monotonic() - self._timestamp if self._timestamp else None
+            stats['scanning'] = self._thread is not None
+        return stats
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _start_scan(self, refresh: bool, callback: Optional[DevicesCallback],
+                    done_callback: Optional[DevicesCallback]) -> Optional[List[Dict[str, Any]]]:
+        """
+        缓存有效时返回缓存，否则登记回调并启动(或加入正在进行的)扫描，调用者持有锁
+
+        Returns:
+            缓存的设备列表，需要扫描时返回None
+        """
+        if self._thread is None and not refresh and self._devices is not None and self._timestamp \
+                and time.monotonic() - self._timestamp < self.ttl:
+            self._stats['cache_hits'] += 1
+            return list(self._devices)
+
+        self._listeners.append((callback, done_callback))
+        if self._thread is not None:
+            self._stats['joined'] += 1
+            return None
+        self._thread = threading.Thread(target=self._scan_thread, name=self.name, daemon=True)
+        self._thread.start()
+        return None
+
+    def _scan_thread(self):
+        """工作线程函数：依次扫描各传输层并增量回报"""
+        started = time.perf_counter()
+        devices: List[Dict[str, Any]] = []
+        handles: Dict[str, Any] = {}
+        errors = 0
+        for layer, probe in self._probes:
+            try:
+                found = probe(len(devices))
+            except Exception as e:
+                logger.error(f"枚举{layer}设备失败: {str(e)}")
+                errors += 1
+                continue
+            for info, handle in found:
+                devices.append(info)
+                handles[info['device_id']] = handle
+            if found:
+                logger.info(f"发现 {len(found)} 个{layer}设备")
+                self._notify(0, devices)
+
+        with self._lock:
+            self._devices = devices
+            self._handles = handles
+            # 有传输层扫描失败时不缓存，下次枚举重新扫描
+            self._timestamp = time.monotonic() if not errors else 0.0
+            self._stats['scans'] += 1
+            self._stats['errors'] += errors
+            self._stats['last_scan_ms'] = (time.perf_counter() - started) * 1000.0
+            self._generation += 1
+            self._thread = None
+            listeners, self._listeners = self._listeners, []
+            self._done.notify_all()
+        logger.info(f"设备枚举完成: {len(devices)} 个设备, 耗时 {self._stats['last_scan_ms']:.0f}ms")
+
+        self._notify(1, devices, listeners)
+
+    def _notify(self, index: int, devices: List[Dict[str, Any]], listeners=None):
+        """
+        调用登记的回调
+
+        Args:
+            index: 0为增量回调，1为扫描结束回调
+            devices: 设备列表(每个回调收到一份拷贝)
+            listeners: 回调列表，None表示当前登记的回调
+        """
+        if listeners is None:
+            with self._lock:
+                listeners = list(self._listeners)
+        for pair in listeners:
+            notify = pair[index]
+            if notify is None:
+                continue
+            try:
+                notify(list(devices))
+            except Exception as e:
+                logger.error(f"设备列表回调出错: {str(e)}")
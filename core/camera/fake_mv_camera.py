@@ -0,0 +1,373 @@
+"""
+海康SDK替身模块
+
+FakeMvCamera实现了HikvisionCamera用到的MvCamera接口子集，不依赖MvCameraControl.dll，
+用于在没有相机和SDK的环境中验证采集链路：
+
+    camera = HikvisionCamera(mv_camera=FakeMvCamera(frame_rate=200))
+    camera.open()
+    camera.start_grabbing(acquisition_mode="callback")
+
+- 取流模式: MV_CC_GetImageBuffer按设定帧率返回SDK风格的缓冲节点，并统计未释放的节点数
+- 回调模式: MV_CC_StartGrabbing后由独立线程按设定帧率、经ctypes函数指针调用注册的图像回调，
+  与SDK在内部线程中回调的方式一致
+"""
+import os
+import sys
+import time
+import ctypes
+import threading
+from ctypes import POINTER, c_ubyte, c_void_p, byref, cast, pointer
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# SDK头文件之间使用顶层导入(from CameraParams_const import *)，需要把MvImport目录加入搜索路径
+sdk_path = os.path.abspath(os.path.join(os.path.dirname(__file__), 'MvImport'))
+if sdk_path not in sys.path:
+    sys.path.append(sdk_path)
+
+from .pixel_converter import get_converter
+from .MvImport.PixelType_header import PixelType_Gvsp_Mono8
+from .MvImport.CameraParams_const import MV_USB_DEVICE
+from .MvImport.CameraParams_header import MV_CC_DEVICE_INFO, MV_FRAME_OUT_INFO_EX
+from .MvImport.MvErrorDefine_const import MV_OK, MV_E_NODATA, MV_E_CALLORDER, MV_E_PARAMETER, MV_E_SUPPORT
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+
+class _BufferNode:
+    """模拟SDK内部的图像缓冲节点"""
+    __slots__ = ('data', 'address', 'in_use')
+
+    def __init__(self, size: int):
+        self.data = (c_ubyte * size)()
+        self.address = ctypes.addressof(self.data)
+        self.in_use = False
+
+
+class FakeMvCamera:
+    """
+    MvCamera替身
+
+    Attributes:
+        width: 图像宽度
+        height: 图像高度
+        pixel_type: 像素格式(PixelType_Gvsp_*)
+        frame_rate: 出帧速率(帧/秒)
+    """
+
+    def __init__(self, width: int = 640, height: int = 480, pixel_type: int = PixelType_Gvsp_Mono8,
+                 frame_rate: float = 30.0, buffer_count: int = 8, device_count: int = 1, source=None):
+        """
+        初始化SDK替身
+
+        Args:
+            width: 图像宽度
+            height: 图像高度
+            pixel_type: 像素格式
+            frame_rate: 出帧速率(帧/秒)
+            buffer_count: 缓冲节点数量，全部被占用时取流返回MV_E_NODATA、回调模式丢帧
+            device_count: 枚举时返回的设备数量
+            source: 可选的图像源(simulation_source.FrameSource)，给出时宽高和像素格式取自图像源，
+                每帧由图像源生成；None表示使用固定的渐变图案
+        """
+        self._source = source
+        if source is not None:
+            width, height, pixel_type = source.width, source.height, source.pixel_type
+        converter = get_converter(pixel_type)
+        if converter is None:
+            raise ValueError(f"不支持的像素格式: {pixel_type}")
+        self.width = int(width)
+        self.height = int(height)
+        self.pixel_type = int(pixel_type)
+        self.frame_rate = float(frame_rate)
+        self._frame_len = converter.raw_size(self.width, self.height)
+        self._nodes = [_BufferNode(self._frame_len) for _ in range(max(1, int(buffer_count)))]
+        self._pattern = self._make_pattern()
+
+        self._lock = threading.Lock()
+        self._opened = False
+        self._grabbing = False
+        self._callback = None
+        self._callback_user = None
+        self._callback_thread: Optional[threading.Thread] = None
+        self._next_frame_time = 0.0
+
+        # 设备信息
+        self._device_infos = [self._make_device_info(i) for i in range(max(0, int(device_count)))]
+
+        # 参数
+        self._values: Dict[str, Any] = {
+            'Width': self.width,
+            'Height': self.height,
+            'WidthMax': self.width,
+            'HeightMax': self.height,
+            'OffsetX': 0,
+            'OffsetY': 0,
+            'AcquisitionFrameRateEnable': True,
+            'AcquisitionFrameRate': self.frame_rate,
+            'ExposureTime': 10000.0,
+            'Gain': 0.0,
+            'ExposureAuto': 0,
+            'GainAuto': 0,
+            'TriggerMode': 0,
+            'TriggerSource': 7,
+        }
+        self._node_reads = 0
+        self._node_writes = 0
+
+        # 统计信息
+        self._frame_num = 0
+        self._callbacks_invoked = 0
+        self._dropped = 0
+        self._enumerations = 0
+        self._callback_thread_ids = set()
+
+    # ------------------------------------------------------------------
+    # 设备管理
+    # ------------------------------------------------------------------
+
+    def MV_CC_EnumDevices(self, nTLayerType, stDevList):
+        self._enumerations += 1
+        infos = [info for info in self._device_infos if info.nTLayerType & nTLayerType]
+        stDevList.nDeviceNum = len(infos)
+        for i, info in enumerate(infos):
+            stDevList.pDeviceInfo[i] = pointer(info)
+        return MV_OK
+
+    def MV_CC_CreateHandle(self, stDevInfo):
+        return MV_OK
+
+    def MV_CC_DestroyHandle(self):
+        self._callback = None
+        return MV_OK
+
+    def MV_CC_OpenDevice(self, nAccessMode=1, nSwitchoverKey=0):
+        self._opened = True
+        return MV_OK
+
+    def MV_CC_CloseDevice(self):
+        self.MV_CC_StopGrabbing()
+        self._opened = False
+        return MV_OK
+
+    def MV_CC_GetOptimalPacketSize(self):
+        return 1500
+
+    # ------------------------------------------------------------------
+    # 参数读写
+    # ------------------------------------------------------------------
+
+    def MV_CC_GetIntValue(self, strKey, stIntValue):
+        return self._get_value(strKey, stIntValue, 'nCurValue', int)
+
+    def MV_CC_GetFloatValue(self, strKey, stFloatValue):
+        return self._get_value(strKey, stFloatValue, 'fCurValue', float)
+
+    def MV_CC_GetBoolValue(self, strKey, stBoolValue):
+        return self._get_value(strKey, stBoolValue, 'bCurValue', bool)
+
+    def MV_CC_GetEnumValue(self, strKey, stEnumValue):
+        return self._get_value(strKey, stEnumValue, 'nCurValue', int)
+
+    def MV_CC_SetIntValue(self, strKey, nValue):
+        return self._set_value(strKey, int(nValue))
+
+    def MV_CC_SetFloatValue(self, strKey, fValue):
+        return self._set_value(strKey, float(fValue))
+
+    def MV_CC_SetBoolValue(self, strKey, bValue):
+        return self._set_value(strKey, bool(bValue))
+
+    def MV_CC_SetEnumValue(self, strKey, nValue):
+        return self._set_value(strKey, int(nValue))
+
+    def MV_CC_SetCommandValue(self, strKey):
+        return MV_OK
+
+    def MV_CC_InvalidateNodes(self):
+        return MV_OK
+
+    # ------------------------------------------------------------------
+    # 取流
+    # ------------------------------------------------------------------
+
+    def MV_CC_RegisterImageCallBackEx(self, CallBackFun, pUser):
+        if self._grabbing:
+            return MV_E_CALLORDER
+        self._callback = CallBackFun
+        self._callback_user = pUser
+        return MV_OK
+
+    def MV_CC_StartGrabbing(self):
+        if not self._opened:
+            return MV_E_CALLORDER
+        if self._grabbing:
+            return MV_OK
+        self._grabbing = True
+        self._next_frame_time = time.perf_counter()
+        if self._callback:
+            self._callback_thread = threading.Thread(target=self._callback_loop, name="FakeMvCameraCallback",
+                                                     daemon=True)
+            self._callback_thread.start()
+        return MV_OK
+
+    def MV_CC_StopGrabbing(self):
+        self._grabbing = False
+        thread = self._callback_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        self._callback_thread = None
+        return MV_OK
+
+    def MV_CC_GetImageBuffer(self, stOutFrame, nMsec):
+        if not self._grabbing:
+            return MV_E_CALLORDER
+        if self._callback:
+            # 与SDK一致: 注册了回调后不能再主动取流
+            return MV_E_CALLORDER
+        deadline = time.perf_counter() + nMsec / 1000.0
+        if not self._wait_next_frame(deadline):
+            return MV_E_NODATA
+        with self._lock:
+            node = next((n for n in self._nodes if not n.in_use), None)
+            if node is None:
+                self._dropped += 1
+                return MV_E_NODATA
+            node.in_use = True
+            self._fill_node(node, stOutFrame.stFrameInfo)
+        stOutFrame.pBufAddr = cast(node.address, POINTER(c_ubyte))
+        return MV_OK
+
+    def MV_CC_FreeImageBuffer(self, stOutFrame):
+        address = cast(stOutFrame.pBufAddr, c_void_p).value
+        with self._lock:
+            for node in self._nodes:
+                if node.address == address:
+                    if not node.in_use:
+                        return MV_E_PARAMETER
+                    node.in_use = False
+                    return MV_OK
+        return MV_E_PARAMETER
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取替身的运行统计
+
+        Returns:
+            已生成帧数、回调次数、丢帧数、未释放节点数、调用回调的线程数、参数节点读写次数和设备枚举次数
+        """
+        with self._lock:
+            outstanding = sum(1 for n in self._nodes if n.in_use)
+        return {
+            'frames': self._frame_num,
+            'callbacks': self._callbacks_invoked,
+            'dropped': self._dropped,
+            'outstanding_buffers': outstanding,
+            'buffer_count': len(self._nodes),
+            'callback_threads': len(self._callback_thread_ids),
+            'node_reads': self._node_reads,
+            'node_writes': self._node_writes,
+            'enumerations': self._enumerations,
+        }
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _callback_loop(self):
+        """模拟SDK内部的回调线程: 按帧率填充缓冲节点并调用回调，回调返回后节点立即复用"""
+        self._callback_thread_ids.add(threading.get_ident())
+        frame_info = MV_FRAME_OUT_INFO_EX()
+        while self._grabbing:
+            if not self._wait_next_frame(time.perf_counter() + 0.1):
+                continue
+            with self._lock:
+                node = next((n for n in self._nodes if not n.in_use), None)
+                if node is None:
+                    self._dropped += 1
+                    continue
+                node.in_use = True
+                self._fill_node(node, frame_info)
+            try:
+                callback = self._callback
+                if callback is not None:
+                    callback(cast(node.address, POINTER(c_ubyte)), byref(frame_info), self._callback_user)
+                    self._callbacks_invoked += 1
+            except Exception as e:
+                logger.error(f"FakeMvCamera回调异常: {str(e)}")
+            finally:
+                with self._lock:
+                    node.in_use = False
+
+    def _wait_next_frame(self, deadline: float) -> bool:
+        """按帧率等待下一帧的时间点，超过deadline返回False"""
+        interval = 1.0 / self.frame_rate if self.frame_rate > 0 else 0.0
+        now = time.perf_counter()
+        if self._next_frame_time > deadline:
+            time.sleep(max(0.0, deadline - now))
+            return False
+        if self._next_frame_time > now:
+            time.sleep(self._next_frame_time - now)
+        # 落后太多时不追帧，与真实相机按固定帧率出图一致
+        self._next_frame_time = max(self._next_frame_time + interval, time.perf_counter() - interval)
+        return self._grabbing
+
+    def _fill_node(self, node: _BufferNode, frame_info) -> None:
+        """填充缓冲节点和帧信息，调用者需持有锁"""
+        self._frame_num += 1
+        if self._source is not None:
+            ctypes.memmove(node.address, self._source.render().ctypes.data, self._frame_len)
+        else:
+            ctypes.memmove(node.address, self._pattern.ctypes.data, self._frame_len)
+        # 帧号写入前4个字节，便于消费者校验顺序
+        ctypes.c_uint32.from_address(node.address).value = self._frame_num
+        frame_info.nWidth = self.width
+        frame_info.nHeight = self.height
+        frame_info.nExtendWidth = self.width
+        frame_info.nExtendHeight = self.height
+        frame_info.enPixelType = self.pixel_type
+        frame_info.nFrameLen = self._frame_len
+        frame_info.nFrameNum = self._frame_num
+        frame_info.nHostTimeStamp = int(time.time() * 1000)
+
+    def _make_pattern(self) -> np.ndarray:
+        """生成渐变测试图案"""
+        ramp = (np.arange(self._frame_len, dtype=np.uint32) * 7) & 0xFF
+        return ramp.astype(np.uint8)
+
+    def _make_device_info(self, index: int):
+        """生成USB设备信息结构体"""
+        info = MV_CC_DEVICE_INFO()
+        info.nTLayerType = MV_USB_DEVICE
+        usb = info.SpecialInfo.stUsb3VInfo
+        for field, text in (('chManufacturerName', "Hikvision"), ('chModelName', "MV-FAKE"),
+                            ('chSerialNumber', f"FAKE{index:04d}")):
+            raw = text.encode('ascii')
+            ctypes.memmove(ctypes.addressof(getattr(usb, field)), raw, len(raw))
+        return info
+
+    def _get_value(self, key: str, st, attr: str, cast_type) -> int:
+        self._node_reads += 1
+        if key not in self._values:
+            # 与SDK一致: 相机没有的节点返回不支持
+            return MV_E_SUPPORT
+        if isinstance(st, ctypes.c_bool):
+            # SDK的MV_CC_GetBoolValue输出参数是bool*
+            st.value = bool(self._values[key])
+        elif hasattr(st, attr):
+            setattr(st, attr, cast_type(self._values[key]))
+        return MV_OK
+
+    def _set_value(self, key: str, value) -> int:
+        self._node_writes += 1
+        self._values[key] = value
+        if key == 'AcquisitionFrameRate':
+            self.frame_rate = float(value)
+        return MV_OK
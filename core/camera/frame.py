@@ -0,0 +1,168 @@
+"""
+帧记录模块
+
+Frame把图像数组和采集时的元数据(帧号、设备时间戳、主机到达时间、像素格式、丢包数等)绑在一起，
+沿着采集线程 -> 帧队列 -> frame_ready_signal -> 界面模型/查看器一路传递，
+使下游能够根据帧号检测丢帧、根据时间戳计算延迟。
+
+图像数组可能引用相机帧缓冲池中的缓冲区，Frame记录了缓冲区的所有者(通常是相机)：
+持有者需要保留帧时调用retain()，用完后调用release()，所有持有者都释放后缓冲区才会被复用。
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class Frame:
+    """
+    带元数据的图像帧
+
+    使用__slots__保持每帧开销很小；实现了__array__，需要numpy数组的地方可以直接np.asarray(frame)。
+    """
+    __slots__ = ('array', 'camera_id', 'frame_number', 'trigger_index', 'device_timestamp',
+                 'host_timestamp', 'arrival_time', 'pixel_type', 'lost_packets', 'sequence', 'owner')
+
+    def __init__(self, array: np.ndarray, camera_id: str = "", frame_number: int = 0,
+                 trigger_index: int = 0, device_timestamp: int = 0, host_timestamp: int = 0,
+                 arrival_time: float = 0.0, pixel_type: int = 0, lost_packets: int = 0, sequence: int = 0,
+                 owner: Any = None):
+        """
+        Args:
+            array: 图像数据
+            camera_id: 相机ID
+            frame_number: 相机帧号(nFrameNum)
+            trigger_index: 触发计数(nTriggerIndex)
+            device_timestamp: 设备时间戳(nDevTimeStampHigh/Low拼接，相机时钟计数)
+            host_timestamp: SDK生成的主机时间戳(nHostTimeStamp，毫秒)
+            arrival_time: 帧到达采集线程的时间(time.time()，秒)
+            pixel_type: SDK像素格式(enPixelType)
+            lost_packets: 本帧丢包数(nLostPacket)
+            sequence: 本相机发布的帧序号
+            owner: 图像缓冲区的所有者，提供retain_frame/release_frame；None表示数组不属于任何缓冲池
+        """
+        self.array = array
+        self.camera_id = camera_id
+        self.frame_number = frame_number
+        self.trigger_index = trigger_index
+        self.device_timestamp = device_timestamp
+        self.host_timestamp = host_timestamp
+        self.arrival_time = arrival_time
+        self.pixel_type = pixel_type
+        self.lost_packets = lost_packets
+        self.sequence = sequence
+        self.owner = owner
+
+    @classmethod
+    def from_info(cls, array: np.ndarray, info: Dict[str, Any], owner: Any = None) -> "Frame":
+        """
+        由get_frame_with_info返回的帧信息字典构造
+
+        Args:
+            array: 图像数据
+            info: 帧信息字典
+            owner: 图像缓冲区的所有者
+
+        Returns:
+            帧记录
+        """
+        return cls(array,
+                   camera_id=info.get('camera_id', ""),
+                   frame_number=info.get('frame_number', 0),
+                   trigger_index=info.get('trigger_index', 0),
+                   device_timestamp=info.get('device_timestamp', 0),
+                   host_timestamp=info.get('host_timestamp', 0),
+                   arrival_time=info.get('timestamp', 0.0),
+                   pixel_type=info.get('pixel_type', 0),
+                   lost_packets=info.get('lost_packets', 0),
+                   sequence=info.get('sequence', 0),
+                   owner=owner)
+
+    def retain(self) -> "Frame":
+        """
+        增加一个持有者，持有期间缓冲区不会被复用
+
+        Returns:
+            自身，便于链式调用
+        """
+        if self.owner is not None:
+            self.owner.retain_frame(self.array)
+        return self
+
+    def release(self) -> bool:
+        """
+        归还一个持有者的引用(每次retain或取得帧对应一次release)
+
+        Returns:
+            是否归还到了所有者；数组不属于任何缓冲池时返回False
+        """
+        if self.owner is None:
+            return False
+        return bool(self.owner.release_frame(self.array))
+
+    def to_info(self) -> Dict[str, Any]:
+        """
+        转换为帧信息字典(与get_frame_with_info的字段一致)
+
+        Returns:
+            帧信息字典
+        """
+        return {
+            'camera_id': self.camera_id,
+            'frame_number': self.frame_number,
+            'trigger_index': self.trigger_index,
+            'timestamp': self.arrival_time,
+            'device_timestamp': self.device_timestamp,
+            'host_timestamp': self.host_timestamp,
+            'width': self.width,
+            'height': self.height,
+            'pixel_type': self.pixel_type,
+            'lost_packets': self.lost_packets,
+            'sequence': self.sequence,
+        }
+
+    @property
+    def width(self) -> int:
+        """图像宽度"""
+        return self.array.shape[1]
+
+    @property
+    def height(self) -> int:
+        """图像高度"""
+        return self.array.shape[0]
+
+    @property
+    def shape(self):
+        """图像数组形状"""
+        return self.array.shape
+
+    @property
+    def dtype(self):
+        """图像数组类型"""
+        return self.array.dtype
+
+    @property
+    def ndim(self) -> int:
+        """图像数组维数"""
+        return self.array.ndim
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or dtype == self.array.dtype:
+            return self.array
+        return self.array.astype(dtype)
+
+    def __repr__(self):
+        return (f"Frame(camera_id={self.camera_id!r}, frame_number={self.frame_number}, "
+                f"shape={self.array.shape}, lost_packets={self.lost_packets})")
+
+
+def as_array(frame: Any) -> Optional[np.ndarray]:
+    """
+    取出图像数组；frame为Frame时返回其array，为numpy数组时原样返回
+
+    Args:
+        frame: Frame、numpy数组或None
+
+    Returns:
+        numpy数组或None
+    """
+    return frame.array if isinstance(frame, Frame) else frame
@@ -0,0 +1,278 @@
+"""
+帧缓冲池模块
+
+为相机采集线程提供预分配的帧缓冲区，避免每一帧都重新申请numpy输出数组。
+采集线程直接从SDK缓冲区转换(或拷贝)到借出的输出数组中，不再经过中间的原始数据数组。
+缓冲区按 (宽度, 高度, 像素格式) 分组，采集线程从池中借出，
+消费者使用完毕后归还；只有在ROI/分辨率变化时才重新分配。
+
+同一块缓冲区可能同时被多方持有(最新帧槽位、帧队列、录制队列、界面等)，
+每个持有者各占一个引用，所有引用都归还后缓冲区才回到空闲队列。
+"""
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple, Any
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+# 默认缓冲池大小
+DEFAULT_POOL_SIZE = 8
+
+
+class FrameBuffer:
+    """
+    帧缓冲区
+
+    包含一块用于存放转换结果的C连续numpy数组，以及持有者的引用计数。
+    """
+    __slots__ = ('key', 'output', '_pool', '_pooled', '_refs')
+
+    def __init__(self, pool, key: Tuple[int, int, int],
+                 output_shape: Tuple[int, ...], pooled: bool = True):
+        self.key = key
+        self.output = np.empty(output_shape, dtype=np.uint8)
+        self._pool = pool
+        self._pooled = pooled
+        self._refs = 1
+
+    @property
+    def refs(self) -> int:
+        """当前持有者数量"""
+        return self._refs
+
+    def retain(self) -> None:
+        """增加一个持有者"""
+        self._pool.retain(self)
+
+    def release(self) -> None:
+        """归还一个持有者的引用，最后一个引用归还时缓冲区回到缓冲池"""
+        self._pool.release(self)
+
+
+class FrameBufferPool:
+    """
+    帧缓冲池
+
+    以环形队列管理同一规格的缓冲区：
+    - acquire: 借出一个空闲缓冲区(引用计数为1，属于采集线程)，没有空闲时在容量允许范围内新建
+    - retain: 新的持有者(帧槽位、帧队列、消费者等)增加一个引用
+    - release: 持有者归还引用，计数归零时缓冲区回到空闲队列
+    - invalidate: ROI/分辨率变化时丢弃当前规格的所有缓冲区
+
+    池满且没有空闲缓冲区时临时分配一个不入池的缓冲区，保证采集线程不会阻塞；
+    忘记归还的缓冲区只会减少池的可用容量，不会被提前复用。
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        """
+        初始化帧缓冲池
+
+        Args:
+            pool_size: 每种规格最多缓存的缓冲区数量
+        """
+        self._pool_size = max(1, int(pool_size))
+        self._lock = threading.Lock()
+        self._key: Optional[Tuple[int, int, int]] = None
+        self._output_shape: Tuple[int, ...] = ()
+        self._free: deque = deque()
+        self._in_use: Dict[int, FrameBuffer] = {}
+
+        # 统计信息
+        self._hits = 0
+        self._misses = 0
+        self._exhausted = 0
+        self._released = 0
+        self._reallocations = 0
+
+    @property
+    def pool_size(self) -> int:
+        """缓冲池容量"""
+        return self._pool_size
+
+    def set_pool_size(self, pool_size: int) -> None:
+        """
+        设置缓冲池容量
+
+        缩小容量时会丢弃多余的空闲缓冲区，已借出的缓冲区归还时按新容量处理。
+
+        Args:
+            pool_size: 新的容量
+        """
+        with self._lock:
+            self._pool_size = max(1, int(pool_size))
+            while self._free and len(self._free) + len(self._in_use) > self._pool_size:
+                self._free.popleft()
+        logger.info(f"帧缓冲池容量设置为: {self._pool_size}")
+
+    def invalidate(self) -> None:
+        """
+        丢弃当前规格的全部缓冲区
+
+        在ROI或分辨率变化时调用，下一次acquire将按新规格重新分配。
+        已借出的缓冲区不再被跟踪，持有者归还时直接丢弃。
+        """
+        with self._lock:
+            if self._key is not None:
+                self._reallocations += 1
+            self._key = None
+            self._free.clear()
+            self._in_use.clear()
+
+    def acquire(self, width: int, height: int, pixel_type: int,
+                output_shape: Tuple[int, ...]) -> FrameBuffer:
+        """
+        借出一个缓冲区
+
+        Args:
+            width: 图像宽度
+            height: 图像高度
+            pixel_type: 像素格式
+            output_shape: 输出numpy数组的形状
+
+        Returns:
+            可用的帧缓冲区
+        """
+        key = (int(width), int(height), int(pixel_type))
+        output_shape = tuple(output_shape)
+
+        with self._lock:
+            if key != self._key or output_shape != self._output_shape:
+                self._reconfigure(key, output_shape)
+
+            if self._free:
+                buffer = self._free.popleft()
+                buffer._refs = 1
+                self._hits += 1
+            elif len(self._in_use) < self._pool_size:
+                buffer = FrameBuffer(self, key, self._output_shape)
+                self._misses += 1
+            else:
+                # 池已耗尽，临时分配一个不入池的缓冲区
+                self._exhausted += 1
+                return FrameBuffer(self, key, self._output_shape, pooled=False)
+
+            self._in_use[id(buffer.output)] = buffer
+            return buffer
+
+    def retain(self, buffer: FrameBuffer) -> bool:
+        """
+        为新的持有者增加一个引用
+
+        Args:
+            buffer: 借出中的缓冲区
+
+        Returns:
+            是否增加成功；缓冲区已归还或不入池时返回False
+        """
+        if buffer is None or not buffer._pooled:
+            return False
+        with self._lock:
+            if self._in_use.get(id(buffer.output)) is not buffer:
+                return False
+            buffer._refs += 1
+            return True
+
+    def release(self, buffer: FrameBuffer) -> bool:
+        """
+        归还一个引用，最后一个引用归还时缓冲区回到空闲队列
+
+        Args:
+            buffer: 之前借出的缓冲区
+
+        Returns:
+            是否归还成功；缓冲区已归还、已失效或不入池时返回False
+        """
+        if buffer is None or not buffer._pooled:
+            return False
+        with self._lock:
+            if self._in_use.get(id(buffer.output)) is not buffer:
+                return False
+            self._released += 1
+            buffer._refs -= 1
+            if buffer._refs > 0:
+                return True
+            del self._in_use[id(buffer.output)]
+            if buffer.key == self._key and len(self._free) + len(self._in_use) < self._pool_size:
+                self._free.append(buffer)
+            return True
+
+    def retain_array(self, array: np.ndarray) -> bool:
+        """
+        按输出数组增加一个引用
+
+        Args:
+            array: 缓冲区的输出数组或其视图
+
+        Returns:
+            是否找到对应的缓冲区
+        """
+        buffer = self._find(array)
+        return buffer is not None and self.retain(buffer)
+
+    def release_array(self, array: np.ndarray) -> bool:
+        """
+        按输出数组归还一个引用
+
+        供只拿到numpy数组的消费者使用(例如通过信号接收帧的界面)。
+
+        Args:
+            array: 缓冲区的输出数组或其视图
+
+        Returns:
+            是否找到并归还了对应的缓冲区
+        """
+        buffer = self._find(array)
+        return buffer is not None and self.release(buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓冲池统计信息
+
+        Returns:
+            包含命中、未命中、耗尽等计数的字典
+        """
+        with self._lock:
+            return {
+                'pool_size': self._pool_size,
+                'key': self._key,
+                'free': len(self._free),
+                'in_use': len(self._in_use),
+                'hits': self._hits,
+                'misses': self._misses,
+                'exhausted': self._exhausted,
+                'released': self._released,
+                'reallocations': self._reallocations,
+            }
+
+    def reset_stats(self) -> None:
+        """清零统计计数"""
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._exhausted = 0
+            self._released = 0
+            self._reallocations = 0
+
+    def _find(self, array: np.ndarray) -> Optional[FrameBuffer]:
+        """根据输出数组(或其视图)查找借出中的缓冲区"""
+        base = array
+        while isinstance(base, np.ndarray) and isinstance(base.base, np.ndarray):
+            base = base.base
+        if not isinstance(base, np.ndarray):
+            return None
+        with self._lock:
+            return self._in_use.get(id(base))
+
+    def _reconfigure(self, key: Tuple[int, int, int], output_shape: Tuple[int, ...]) -> None:
+        """按新规格重建缓冲池，调用者需持有锁"""
+        if self._key is not None:
+            self._reallocations += 1
+            logger.info(f"帧缓冲池规格变化: {self._key} -> {key}，重新分配缓冲区")
+        self._key = key
+        self._output_shape = output_shape
+        self._free.clear()
+        self._in_use.clear()
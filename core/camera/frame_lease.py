@@ -0,0 +1,290 @@
+"""
+帧租约模块
+
+零拷贝模式下，采集线程把SDK图像缓冲区(MV_FRAME_OUT.pBufAddr)直接以只读numpy视图的形式
+交给消费者，同时生成一个租约对象。与帧缓冲池一样，最新帧槽位、帧队列和各个消费者各持有租约的
+一个引用，最后一个引用归还时才调用MV_CC_FreeImageBuffer把缓冲区归还给SDK。
+"""
+import ctypes
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+
+def sdk_buffer_view(address: int, shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    将SDK缓冲区地址包装为只读numpy数组(不拷贝)
+
+    Args:
+        address: 缓冲区首地址
+        shape: 数组形状
+
+    Returns:
+        只读numpy数组，数据仍位于SDK缓冲区中
+    """
+    size = int(np.prod(shape))
+    buffer = (ctypes.c_ubyte * size).from_address(address)
+    array = np.ndarray(shape, dtype=np.uint8, buffer=buffer)
+    array.flags.writeable = False
+    return array
+
+
+def copy_from_address(dst: np.ndarray, address: int, size: int) -> None:
+    """
+    从SDK缓冲区拷贝数据到连续的numpy数组(可移植的memcpy，Windows/Linux均可用)
+
+    Args:
+        dst: 目标数组，必须是C连续的
+        address: 源地址
+        size: 拷贝字节数
+    """
+    ctypes.memmove(dst.ctypes.data, address, size)
+
+
+class FrameLease:
+    """
+    帧租约
+
+    持有SDK输出帧结构体、指向其缓冲区的只读视图和持有者的引用计数，
+    最后一个引用归还时把缓冲区归还给SDK。支持上下文管理器用法(退出时归还调用者的引用)：
+
+        with lease:
+            process(lease.array)
+    """
+    __slots__ = ('array', '_frame_out', '_release_func', '_released', '_refs', '_manager')
+
+    def __init__(self, array: np.ndarray, frame_out: Any, release_func: Callable[[Any], Any]):
+        """
+        Args:
+            array: 指向SDK缓冲区的只读视图
+            frame_out: SDK的MV_FRAME_OUT结构体
+            release_func: 释放函数，通常为MV_CC_FreeImageBuffer
+        """
+        self.array = array
+        self._frame_out = frame_out
+        self._release_func = release_func
+        self._released = False
+        self._refs = 1
+        self._manager = None
+
+    @property
+    def released(self) -> bool:
+        """缓冲区是否已归还给SDK"""
+        return self._released
+
+    @property
+    def refs(self) -> int:
+        """当前持有者数量"""
+        return self._refs
+
+    def retain(self) -> None:
+        """增加一个持有者"""
+        if self._manager is not None:
+            self._manager.retain(self)
+        elif not self._released:
+            self._refs += 1
+
+    def release(self) -> None:
+        """归还一个持有者的引用，最后一个引用归还时把缓冲区归还给SDK"""
+        if self._manager is not None:
+            self._manager.release(self)
+            return
+        if self._released:
+            return
+        self._refs -= 1
+        if self._refs <= 0:
+            self._free()
+
+    def _free(self) -> None:
+        """把缓冲区归还给SDK；重复调用无副作用"""
+        if self._released:
+            return
+        self._released = True
+        try:
+            self._release_func(self._frame_out)
+        except Exception as e:
+            logger.error(f"释放SDK图像缓冲区失败: {str(e)}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+
+class FrameLeaseManager:
+    """
+    帧租约管理器
+
+    记录所有未归还的租约并为每个持有者计数，限制同时借出的SDK缓冲区数量，
+    借出数量达到上限时由采集线程退回拷贝模式，防止SDK缓冲节点耗尽导致采集停顿。
+    """
+
+    def __init__(self, max_leases: int = 4):
+        """
+        Args:
+            max_leases: 最多同时借出的SDK缓冲区数量，应小于SDK缓冲节点数
+        """
+        self._max_leases = max(1, int(max_leases))
+        self._lock = threading.Lock()
+        self._all_released = threading.Condition(self._lock)
+        self._leases: Dict[int, FrameLease] = {}
+        self._issued = 0
+        self._released = 0
+        self._refused = 0
+
+    @property
+    def max_leases(self) -> int:
+        """最大租约数"""
+        return self._max_leases
+
+    def set_max_leases(self, max_leases: int) -> None:
+        """设置最大租约数"""
+        self._max_leases = max(1, int(max_leases))
+
+    def try_reserve(self) -> bool:
+        """
+        判断是否还可以借出新的租约
+
+        Returns:
+            True表示可以借出，False表示应退回拷贝模式
+        """
+        with self._lock:
+            if len(self._leases) >= self._max_leases:
+                self._refused += 1
+                return False
+            return True
+
+    def add(self, lease: FrameLease) -> FrameLease:
+        """
+        登记新租约，登记后SDK缓冲区由租约负责归还，调用者持有租约的第一个引用
+
+        Args:
+            lease: 新建的租约
+
+        Returns:
+            登记的租约
+        """
+        with self._lock:
+            lease._manager = self
+            self._leases[id(lease.array)] = lease
+            self._issued += 1
+        return lease
+
+    def get_lease(self, array: np.ndarray) -> Optional[FrameLease]:
+        """根据视图查找租约"""
+        with self._lock:
+            return self._leases.get(id(_base_of(array)))
+
+    def retain(self, lease: FrameLease) -> bool:
+        """
+        为新的持有者增加一个引用
+
+        Returns:
+            是否增加成功；租约已归还时返回False
+        """
+        with self._lock:
+            if self._leases.get(id(lease.array)) is not lease:
+                return False
+            lease._refs += 1
+            return True
+
+    def release(self, lease: FrameLease) -> bool:
+        """
+        归还一个引用，最后一个引用归还时把缓冲区归还给SDK
+
+        Returns:
+            是否归还成功；租约已归还时返回False
+        """
+        with self._lock:
+            if self._leases.get(id(lease.array)) is not lease:
+                return False
+            lease._refs -= 1
+            if lease._refs > 0:
+                return True
+            del self._leases[id(lease.array)]
+            self._released += 1
+            if not self._leases:
+                self._all_released.notify_all()
+        lease._free()
+        return True
+
+    def retain_array(self, array: np.ndarray) -> bool:
+        """
+        按视图增加一个引用
+
+        Returns:
+            是否找到对应的租约
+        """
+        lease = self.get_lease(array)
+        return lease is not None and self.retain(lease)
+
+    def release_array(self, array: np.ndarray) -> bool:
+        """
+        按视图归还一个引用
+
+        Returns:
+            是否找到并归还了对应的租约
+        """
+        lease = self.get_lease(array)
+        return lease is not None and self.release(lease)
+
+    def wait_released(self, timeout: float) -> int:
+        """
+        等待持有者归还全部租约
+
+        Args:
+            timeout: 最长等待时间(秒)
+
+        Returns:
+            超时后仍未归还的租约数量
+        """
+        with self._lock:
+            self._all_released.wait_for(lambda: not self._leases, timeout)
+            return len(self._leases)
+
+    def release_all(self) -> int:
+        """
+        不论是否还有持有者，把全部租约的缓冲区归还给SDK
+
+        只在销毁相机句柄前调用：句柄销毁后SDK缓冲区随之失效，之后已无法再归还。
+        停止采集时不应调用，仍被持有的租约由最后一个持有者归还。
+
+        Returns:
+            归还的租约数量
+        """
+        with self._lock:
+            leases = list(self._leases.values())
+            self._leases.clear()
+            self._released += len(leases)
+            self._all_released.notify_all()
+        if leases:
+            logger.warning(f"关闭相机时仍有{len(leases)}个零拷贝帧未归还，这些帧的数据将失效")
+        for lease in leases:
+            lease._free()
+        return len(leases)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取租约统计信息"""
+        with self._lock:
+            return {
+                'max_leases': self._max_leases,
+                'outstanding': len(self._leases),
+                'issued': self._issued,
+                'released': self._released,
+                'refused': self._refused,
+            }
+
+
+def _base_of(array: np.ndarray) -> np.ndarray:
+    """沿视图链找到租约登记的原始视图"""
+    base = array
+    while isinstance(base, np.ndarray) and isinstance(base.base, np.ndarray):
+        base = base.base
+    return base
@@ -0,0 +1,358 @@
+"""
+帧流文件模块
+
+定义录制帧序列使用的二进制文件格式，以及顺序写入器和基于内存映射的读取器。
+
+文件布局(小端):
+    文件头(64字节): 魔数、版本、文件头长度、创建时间、相机ID
+    记录 * N: 记录头(72字节) + 图像数据，数据按8字节对齐
+
+记录头中保存数组的形状和类型，读取时直接在映射内存上构造numpy数组，不需要解码；
+同时保存帧号、触发计数、设备/主机时间戳、到达时间、像素格式和丢包数，与Frame的字段一致。
+"""
+import mmap
+import os
+import struct
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .frame import Frame
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+FILE_MAGIC = b"ACFSTRM\0"
+FILE_VERSION = 1
+RECORD_MAGIC = b"FRM1"
+
+# 魔数, 版本, 文件头长度, 保留, 创建时间, 相机ID
+FILE_HEADER = struct.Struct("<8sHHId32s")
+FILE_HEADER_SIZE = 64
+
+# 魔数, 维数, 类型字符, 保留, 形状*3, 像素格式, 帧号, 触发计数, 丢包数, 设备时间戳, 主机时间戳, 到达时间, 数据长度
+RECORD_HEADER = struct.Struct("<4sBcH3IIQIIQQdQ")
+
+# 数据对齐字节数
+ALIGNMENT = 8
+
+# 帧流文件扩展名
+STREAM_EXTENSION = ".afs"
+
+
+def aligned_size(size: int) -> int:
+    """按ALIGNMENT向上对齐"""
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def pack_record_header(frame: np.ndarray, info: Dict[str, Any]) -> bytes:
+    """
+    生成一帧的记录头
+
+    Args:
+        frame: 图像数组(最多3维)
+        info: 帧信息，键与Frame.to_info一致
+
+    Returns:
+        记录头字节串
+    """
+    if frame.ndim > 3:
+        raise ValueError(f"不支持的数组维数: {frame.ndim}")
+    shape = tuple(frame.shape) + (0,) * (3 - frame.ndim)
+    return RECORD_HEADER.pack(
+        RECORD_MAGIC, frame.ndim, frame.dtype.char.encode('ascii'), 0, *shape,
+        int(info.get('pixel_type', 0) or 0),
+        int(info.get('frame_number', 0) or 0),
+        int(info.get('trigger_index', 0) or 0),
+        int(info.get('lost_packets', 0) or 0),
+        int(info.get('device_timestamp', 0) or 0),
+        int(info.get('host_timestamp', 0) or 0),
+        float(info.get('timestamp', 0.0) or 0.0),
+        frame.nbytes,
+    )
+
+
+def read_record(buffer, offset: int) -> Tuple[np.ndarray, tuple]:
+    """
+    在缓冲区(通常是映射内存)的offset处解析一条记录
+
+    Args:
+        buffer: 支持缓冲区协议的对象
+        offset: 记录头的偏移
+
+    Returns:
+        (直接引用缓冲区的图像数组, 记录头字段)
+    """
+    fields = RECORD_HEADER.unpack_from(buffer, offset)
+    if fields[0] != RECORD_MAGIC:
+        raise ValueError(f"偏移{offset}处不是帧记录")
+    ndim, dtype_char = fields[1], fields[2]
+    shape = fields[4:4 + ndim]
+    array = np.frombuffer(buffer, dtype=np.dtype(dtype_char.decode('ascii')),
+                          count=int(np.prod(shape)), offset=offset + RECORD_HEADER.size).reshape(shape)
+    return array, fields
+
+
+def record_info(fields: tuple, camera_id: str = "") -> Dict[str, Any]:
+    """
+    把记录头字段转换为帧信息字典
+
+    Args:
+        fields: RECORD_HEADER解析出的字段
+        camera_id: 文件头中的相机ID
+
+    Returns:
+        帧信息字典，键与Frame.to_info一致
+    """
+    (_, ndim, _, _, d0, d1, d2, pixel_type, frame_number, trigger_index, lost_packets,
+     device_timestamp, host_timestamp, timestamp, _) = fields
+    shape = (d0, d1, d2)[:ndim]
+    return {
+        'camera_id': camera_id,
+        'frame_number': frame_number,
+        'trigger_index': trigger_index,
+        'timestamp': timestamp,
+        'device_timestamp': device_timestamp,
+        'host_timestamp': host_timestamp,
+        'width': shape[1] if ndim > 1 else shape[0],
+        'height': shape[0] if ndim > 1 else 1,
+        'pixel_type': pixel_type,
+        'lost_packets': lost_packets,
+    }
+
+
+def write_file_header(buffer, magic: bytes, camera_id: str, offset: int = 0) -> None:
+    """
+    把文件头写入可写缓冲区
+
+    Args:
+        buffer: 可写缓冲区(bytearray或映射内存)
+        magic: 文件魔数
+        camera_id: 相机ID
+        offset: 写入位置
+    """
+    FILE_HEADER.pack_into(buffer, offset, magic, FILE_VERSION, FILE_HEADER_SIZE, 0, time.time(),
+                          camera_id.encode('utf-8')[:32])
+
+
+def read_file_header(buffer, magic: bytes, path: str = "") -> Tuple[int, float, str]:
+    """
+    解析并校验文件头
+
+    Args:
+        buffer: 文件内容缓冲区
+        magic: 期望的文件魔数
+        path: 文件路径，用于错误信息
+
+    Returns:
+        (文件头长度, 创建时间, 相机ID)
+    """
+    if len(buffer) < FILE_HEADER_SIZE:
+        raise ValueError(f"文件过短: {path}")
+    file_magic, version, header_size, _, created, camera_id = FILE_HEADER.unpack_from(buffer, 0)
+    if file_magic != magic:
+        raise ValueError(f"文件格式不匹配: {path}")
+    if version > FILE_VERSION:
+        raise ValueError(f"不支持的文件版本: {version}")
+    return header_size, created, camera_id.rstrip(b'\0').decode('utf-8', 'replace')
+
+
+class FrameStreamWriter:
+    """
+    帧流文件写入器
+
+    按顺序追加帧，在调用线程中同步写入；需要在采集线程之外后台写入时使用录制器。
+    """
+
+    def __init__(self, path: str, camera_id: str = ""):
+        """
+        创建帧流文件
+
+        Args:
+            path: 文件路径(已存在时覆盖)
+            camera_id: 写入文件头的相机ID
+        """
+        self.path = path
+        self.camera_id = camera_id
+        self._file = open(path, 'wb')
+        header = bytearray(FILE_HEADER_SIZE)
+        write_file_header(header, FILE_MAGIC, camera_id)
+        self._file.write(header)
+        self.frames = 0
+        self.bytes_written = FILE_HEADER_SIZE
+
+    def append(self, frame, info: Optional[Dict[str, Any]] = None) -> int:
+        """
+        追加一帧
+
+        Args:
+            frame: 图像数组或Frame(Frame自带帧信息)
+            info: 帧信息，frame为Frame时可省略
+
+        Returns:
+            该帧的序号(从0开始)
+        """
+        if isinstance(frame, Frame):
+            info = frame.to_info() if info is None else info
+            frame = frame.array
+        array = np.ascontiguousarray(frame)
+        header = pack_record_header(array, info or {})
+        padding = aligned_size(array.nbytes) - array.nbytes
+        self._file.write(header)
+        self._file.write(memoryview(array).cast('B'))
+        if padding:
+            self._file.write(b'\0' * padding)
+        self.bytes_written += len(header) + array.nbytes + padding
+        self.frames += 1
+        return self.frames - 1
+
+    def flush(self) -> None:
+        """把缓冲数据写入文件"""
+        self._file.flush()
+
+    def close(self) -> None:
+        """关闭文件"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FrameStreamReader:
+    """
+    帧流文件读取器
+
+    以只读方式内存映射整个文件，打开时扫描一遍记录头建立偏移索引，之后按序号O(1)定位任意一帧。
+    文件末尾不完整的记录(录制中断)会被忽略。
+    """
+
+    def __init__(self, path: str):
+        """
+        打开帧流文件
+
+        Args:
+            path: 文件路径
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < FILE_HEADER_SIZE:
+            self._file.close()
+            raise ValueError(f"不是帧流文件: {path}")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header_size, self.created, self.camera_id = read_file_header(self._mm, FILE_MAGIC, path)
+        except ValueError:
+            self.close()
+            raise
+        self._offsets, self._timestamps = self._build_index(header_size, size)
+
+    def _build_index(self, offset: int, size: int):
+        """扫描记录头，返回(记录偏移数组, 到达时间数组)"""
+        offsets = []
+        timestamps = []
+        header_size = RECORD_HEADER.size
+        while offset + header_size <= size:
+            fields = RECORD_HEADER.unpack_from(self._mm, offset)
+            if fields[0] == b"\0\0\0\0":
+                # 录制器预分配但未写入的区域(录制中断时未截断)
+                break
+            if fields[0] != RECORD_MAGIC:
+                logger.warning(f"帧流文件在偏移{offset}处记录头损坏，忽略之后的数据: {self.path}")
+                break
+            data_size = fields[-1]
+            end = offset + header_size + aligned_size(data_size)
+            if offset + header_size + data_size > size:
+                logger.warning(f"帧流文件末尾的记录不完整，已忽略: {self.path}")
+                break
+            offsets.append(offset)
+            timestamps.append(fields[13])
+            offset = end
+        return np.array(offsets, dtype=np.int64), np.array(timestamps, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """各帧录制时的到达时间(time.time()，秒)"""
+        return self._timestamps
+
+    @property
+    def duration(self) -> float:
+        """录制时长(秒)"""
+        if len(self._timestamps) < 2:
+            return 0.0
+        return float(self._timestamps[-1] - self._timestamps[0])
+
+    def read_info(self, index: int) -> Dict[str, Any]:
+        """
+        读取一帧的帧信息(不访问图像数据)
+
+        Args:
+            index: 帧序号
+
+        Returns:
+            帧信息字典，键与Frame.to_info一致
+        """
+        return record_info(RECORD_HEADER.unpack_from(self._mm, int(self._offsets[index])), self.camera_id)
+
+    def read(self, index: int, copy: bool = False) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        读取一帧
+
+        Args:
+            index: 帧序号
+            copy: 是否拷贝；False时返回直接引用映射内存的只读数组，读取器关闭后不能再使用
+
+        Returns:
+            (图像数组, 帧信息)
+        """
+        array, fields = read_record(self._mm, int(self._offsets[index]))
+        if copy:
+            array = array.copy()
+        return array, record_info(fields, self.camera_id)
+
+    def read_frame(self, index: int, copy: bool = False) -> Frame:
+        """
+        读取一帧为Frame
+
+        Args:
+            index: 帧序号
+            copy: 是否拷贝图像数据
+
+        Returns:
+            Frame
+        """
+        array, info = self.read(index, copy)
+        return Frame.from_info(array, info)
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, Dict[str, Any]]]:
+        for index in range(len(self)):
+            yield self.read(index)
+
+    def close(self) -> None:
+        """
+        关闭文件
+
+        仍有未拷贝的数组引用映射内存时不能立即解除映射，映射会在这些数组释放后由垃圾回收关闭
+        """
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass
+            self._mm = None
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,334 @@
+"""
+多相机帧同步模块
+
+多台相机被同一个PLC脉冲触发时，把各相机针对同一次触发拍到的帧组合成一组交给检测：
+- 按帧信息中的时间戳在容差窗口内匹配，或按相机的触发计数(trigger_index)精确匹配
+- 收到PLC触发事件(plc_trigger_signal)时可以预先建立分组，帧按触发时间归组
+- 所有相机的帧到齐后发出完整分组；超时未到齐的发出不完整分组；分组关闭后才到的帧记为迟到帧
+"""
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..utils.logger import get_logger
+from ..utils.event_bus import event_bus, PLC_TRIGGER
+
+logger = get_logger()
+
+# 匹配方式
+MATCH_TIMESTAMP = "timestamp"           # 按时间戳在容差窗口内匹配
+MATCH_TRIGGER_INDEX = "trigger_index"   # 按相机触发计数精确匹配
+
+# 已关闭分组的保留数量，用于识别迟到帧(只保留分组序号、匹配基准和已到达的相机，不保留图像)
+_CLOSED_HISTORY = 64
+
+
+class FrameGroup:
+    """
+    同一次触发的一组帧
+
+    Attributes:
+        group_id: 分组序号
+        reference: 匹配基准(时间戳模式为秒，触发计数模式为触发计数)
+        trigger_time: PLC触发时间，由帧建立的分组为None
+        created: 分组建立时间(同步器时钟)
+        frames: {序列号: (图像, 帧信息)}
+        expected: 期望的相机序列号
+        status: open / complete / incomplete
+    """
+    __slots__ = ('group_id', 'reference', 'trigger_time', 'created', 'frames', 'expected', 'status')
+
+    def __init__(self, group_id: int, reference: float, created: float, expected: Iterable[str],
+                 trigger_time: Optional[float] = None):
+        self.group_id = group_id
+        self.reference = reference
+        self.trigger_time = trigger_time
+        self.created = created
+        self.frames: Dict[str, Any] = {}
+        self.expected = frozenset(expected)
+        self.status = "open"
+
+    @property
+    def complete(self) -> bool:
+        """是否所有相机的帧都已到齐"""
+        return self.expected.issubset(self.frames)
+
+    @property
+    def missing(self) -> List[str]:
+        """尚未到达的相机序列号"""
+        return sorted(self.expected.difference(self.frames))
+
+    def get_frame(self, serial: str) -> Optional[np.ndarray]:
+        """获取指定相机的图像"""
+        item = self.frames.get(serial)
+        return item[0] if item else None
+
+    def spread(self, key: str = 'timestamp') -> float:
+        """组内各帧时间戳的最大差值(秒)"""
+        values = [info.get(key) for _, info in self.frames.values() if info.get(key) is not None]
+        return (max(values) - min(values)) if len(values) >= 2 else 0.0
+
+
+class FrameSynchronizer:
+    """
+    多相机帧同步器
+
+    add_frame可以在多个相机工作线程中并发调用，签名与MultiCameraManager的帧处理函数一致；
+    分组会保留图像直到到齐或超时，而处理函数返回后缓冲区即被复用，因此加入前先拷贝：
+
+        manager.add_frame_handler(lambda serial, frame, info: synchronizer.add_frame(serial, frame.copy(), info))
+    """
+
+    def __init__(self, serials: Iterable[str], tolerance_ms: float = 5.0, timeout_ms: float = 200.0,
+                 match: str = MATCH_TIMESTAMP, timestamp_key: str = 'timestamp',
+                 trigger_latency_ms: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        """
+        初始化帧同步器
+
+        Args:
+            serials: 参与同步的相机序列号
+            tolerance_ms: 时间戳匹配容差(毫秒)
+            timeout_ms: 分组从建立到关闭的最长等待时间(毫秒)
+            match: 匹配方式，MATCH_TIMESTAMP或MATCH_TRIGGER_INDEX
+            timestamp_key: 帧信息中用于匹配的时间戳字段(秒)，各相机必须使用同一时钟
+            trigger_latency_ms: PLC触发到帧时间戳的预期延迟(毫秒)，用于触发建立的分组
+            clock: 时钟函数，测试时可替换为手动时钟
+        """
+        if match not in (MATCH_TIMESTAMP, MATCH_TRIGGER_INDEX):
+            raise ValueError(f"不支持的匹配方式: {match}")
+        self._serials = frozenset(serials)
+        self._tolerance = tolerance_ms / 1000.0
+        self._timeout = timeout_ms / 1000.0
+        self._match = match
+        self._timestamp_key = timestamp_key
+        self._trigger_latency = trigger_latency_ms / 1000.0
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._open: List[FrameGroup] = []
+        # (分组序号, 匹配基准, 已到达的相机序列号)
+        self._closed: deque = deque(maxlen=_CLOSED_HISTORY)
+        self._next_group_id = 1
+        self._trigger_driven = False
+
+        self._group_handlers: List[Callable[[FrameGroup], None]] = []
+        self._incomplete_handlers: List[Callable[[FrameGroup], None]] = []
+        self._late_handlers: List[Callable[[str, np.ndarray, Dict[str, Any], int], None]] = []
+
+        self.reset_stats()
+
+    @property
+    def timeout_ms(self) -> float:
+        """分组从建立到关闭的最长等待时间(毫秒)"""
+        return self._timeout * 1000.0
+
+    @property
+    def tolerance_ms(self) -> float:
+        """时间戳匹配容差(毫秒)"""
+        return self._tolerance * 1000.0
+
+    # ------------------------------------------------------------------
+    # 处理函数
+    # ------------------------------------------------------------------
+
+    def add_group_handler(self, handler: Callable[[FrameGroup], None]) -> None:
+        """注册完整分组处理函数"""
+        self._group_handlers.append(handler)
+
+    def add_incomplete_handler(self, handler: Callable[[FrameGroup], None]) -> None:
+        """注册不完整(超时)分组处理函数"""
+        self._incomplete_handlers.append(handler)
+
+    def add_late_handler(self, handler: Callable[[str, np.ndarray, Dict[str, Any], int], None]) -> None:
+        """注册迟到帧处理函数，参数为(序列号, 图像, 帧信息, 所属分组序号)"""
+        self._late_handlers.append(handler)
+
+    # ------------------------------------------------------------------
+    # 输入
+    # ------------------------------------------------------------------
+
+    def notify_trigger(self, trigger_time: Optional[float] = None) -> int:
+        """
+        通知发生了一次PLC触发，预先为本次触发建立分组
+
+        调用过一次后同步器进入触发驱动模式：无法归入任何触发分组的帧不再自行建组，而是计为未匹配帧。
+
+        Args:
+            trigger_time: 触发时间(与timestamp_key同一时钟)，None表示当前时间
+
+        Returns:
+            新分组的序号
+        """
+        if trigger_time is None:
+            trigger_time = time.time()
+        with self._lock:
+            self._trigger_driven = True
+            group = self._new_group(trigger_time + self._trigger_latency, trigger_time)
+            self._stats['triggers'] += 1
+            return group.group_id
+
+    def add_frame(self, serial: str, frame: np.ndarray, info: Dict[str, Any]) -> None:
+        """
+        加入一帧
+
+        Args:
+            serial: 相机序列号
+            frame: 图像
+            info: 帧信息，需包含timestamp_key或trigger_index字段
+        """
+        if serial not in self._serials:
+            return
+        reference = self._reference_of(info)
+        if reference is None:
+            logger.warning(f"帧信息缺少同步字段: {serial}")
+            return
+
+        events = []
+        with self._lock:
+            self._stats['frames'] += 1
+            self._expire_locked(self._clock(), events)
+
+            group = self._find_open_locked(serial, reference)
+            if group is None:
+                late_group_id = self._find_closed_locked(serial, reference)
+                if late_group_id is not None:
+                    self._stats['late_frames'] += 1
+                    events.append(('late', (serial, frame, info, late_group_id)))
+                elif self._trigger_driven:
+                    self._stats['unmatched_frames'] += 1
+                else:
+                    group = self._new_group(reference)
+
+            if group is not None:
+                group.frames[serial] = (frame, info)
+                if group.complete:
+                    self._close_locked(group, "complete", events)
+
+        self._dispatch(events)
+
+    def poll(self) -> None:
+        """关闭已超时的分组；没有新帧到达时也应定期调用"""
+        events = []
+        with self._lock:
+            self._expire_locked(self._clock(), events)
+        self._dispatch(events)
+
+    def flush(self) -> None:
+        """立即关闭所有未完成的分组(停止采集时调用)"""
+        events = []
+        with self._lock:
+            for group in list(self._open):
+                self._close_locked(group, "incomplete", events)
+        self._dispatch(events)
+
+    def connect_plc_trigger(self) -> None:
+        """订阅PLC触发事件(界面进程中由plc_trigger_signal桥接而来)，每次触发调用notify_trigger"""
+        event_bus.subscribe(PLC_TRIGGER, self._on_plc_trigger)
+
+    def disconnect_plc_trigger(self) -> None:
+        """取消订阅PLC触发事件"""
+        event_bus.unsubscribe(PLC_TRIGGER, self._on_plc_trigger)
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取同步统计信息
+
+        Returns:
+            完整/不完整分组数、迟到帧数、未匹配帧数、当前未关闭分组数等
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['open_groups'] = len(self._open)
+            return stats
+
+    def reset_stats(self) -> None:
+        """清零统计计数"""
+        self._stats = {
+            'frames': 0,
+            'triggers': 0,
+            'groups_complete': 0,
+            'groups_incomplete': 0,
+            'late_frames': 0,
+            'unmatched_frames': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _on_plc_trigger(self):
+        self.notify_trigger()
+
+    def _reference_of(self, info: Dict[str, Any]) -> Optional[float]:
+        """取帧信息中的匹配基准"""
+        if self._match == MATCH_TRIGGER_INDEX:
+            return info.get('trigger_index')
+        return info.get(self._timestamp_key)
+
+    def _matches(self, group_reference: float, reference: float) -> bool:
+        if self._match == MATCH_TRIGGER_INDEX:
+            return group_reference == reference
+        return abs(reference - group_reference) <= self._tolerance
+
+    def _find_open_locked(self, serial: str, reference: float) -> Optional[FrameGroup]:
+        """查找可以接收该帧的最早的未关闭分组"""
+        for group in self._open:
+            if serial not in group.frames and self._matches(group.reference, reference):
+                return group
+        return None
+
+    def _find_closed_locked(self, serial: str, reference: float) -> Optional[int]:
+        """查找该帧本应属于的已关闭分组，返回分组序号"""
+        for group_id, group_reference, arrived in reversed(self._closed):
+            if serial not in arrived and self._matches(group_reference, reference):
+                return group_id
+        return None
+
+    def _new_group(self, reference: float, trigger_time: Optional[float] = None) -> FrameGroup:
+        """建立新分组，调用者需持有锁"""
+        group = FrameGroup(self._next_group_id, reference, self._clock(), self._serials, trigger_time)
+        self._next_group_id += 1
+        self._open.append(group)
+        return group
+
+    def _close_locked(self, group: FrameGroup, status: str, events: list) -> None:
+        """关闭分组并记录待分发的事件，调用者需持有锁"""
+        group.status = status
+        self._open.remove(group)
+        # 分组交给处理函数后不再持有其图像
+        self._closed.append((group.group_id, group.reference, frozenset(group.frames)))
+        if status == "complete":
+            self._stats['groups_complete'] += 1
+            events.append(('complete', group))
+        else:
+            self._stats['groups_incomplete'] += 1
+            events.append(('incomplete', group))
+
+    def _expire_locked(self, now: float, events: list) -> None:
+        """关闭超时分组，调用者需持有锁"""
+        for group in list(self._open):
+            if now - group.created > self._timeout:
+                self._close_locked(group, "incomplete", events)
+
+    def _dispatch(self, events: list) -> None:
+        """在锁外调用处理函数"""
+        for kind, payload in events:
+            if kind == 'complete':
+                handlers, args = self._group_handlers, (payload,)
+            elif kind == 'incomplete':
+                logger.warning(f"帧分组{payload.group_id}不完整，缺少相机: {payload.missing}")
+                handlers, args = self._incomplete_handlers, (payload,)
+            else:
+                handlers, args = self._late_handlers, payload
+            for handler in handlers:
+                try:
+                    handler(*args)
+                except Exception as e:
+                    logger.error(f"帧同步处理函数异常: {str(e)}")
@@ -8,19 +8,29 @@ import time
 import threading
 import traceback
 import ctypes
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 import numpy as np
 import os
 import sys
 import cv2
-from ctypes import cast, POINTER, byref, c_ubyte, cdll
-
-from Cython import sizeof
+from ctypes import cast, POINTER, byref, c_ubyte, c_void_p, sizeof
 
 from ..utils.logger import get_logger
 from ..utils.error_handler import handle_exception
 from .camera_interface import CameraInterface
-from ..utils.signal_manager import signal_manager
+from .frame import Frame, as_array
+from .simulation_source import FrameSource, SimulationSource, create_source
+from .MvImport.PixelType_header import PixelType_Gvsp_BGR8_Packed
+from .frame_buffer_pool import FrameBufferPool, DEFAULT_POOL_SIZE
+from .stream_recorder import StreamRecorder
+from .frame_lease import FrameLease, FrameLeaseManager, sdk_buffer_view, copy_from_address
+from .pixel_converter import get_converter, convert_frame
+from .device_enumerator import DeviceEnumerator, DevicesCallback, DEFAULT_TTL
+from ..utils.event_bus import event_bus, FRAME_READY
+from ..utils.metrics import metrics, STAGE_SDK_GET, STAGE_CONVERT, STAGE_EMIT
+from .MvImport.MvErrorDefine_const import MV_E_SUPPORT, MV_E_GC_PROPERTY, MV_E_GC_ACCESS, MV_E_ACCESS_DENIED
+from ..utils.frame_channel import (FrameChannel, LatestFrameSlot, DROP_OLDEST, BLOCK, DEFAULT_DEPTH,
+                                   register_channel, unregister_channel)
 
 logger = get_logger()
 
@@ -35,12 +45,14 @@ try:
     from core.camera.MvImport.MvCameraControl_class import MV_CC_DEVICE_INFO_LIST, MV_CC_DEVICE_INFO, MV_FRAME_OUT
     from core.camera.MvImport.MvCameraControl_class import MV_GIGE_DEVICE, MV_USB_DEVICE, MV_TRIGGER_MODE_OFF
     from core.camera.MvImport.MvErrorDefine_const import MV_OK
-    from core.camera.MvImport.CameraParams_header import MVCC_FLOATVALUE
+    from core.camera.MvImport.CameraParams_header import (MVCC_FLOATVALUE, MVCC_INTVALUE, MVCC_ENUMVALUE,
+                                                          MV_FRAME_OUT_INFO_EX)
     from core.camera.MvImport.PixelType_header import *
     
     HIKVISION_SDK_AVAILABLE = True
     logger.info("海康威视SDK导入成功")
-except ImportError as e:
+except (ImportError, OSError, AttributeError) as e:
+    # 非Windows平台上MvCameraControl_class加载WinDLL会抛出AttributeError/OSError
     logger.warning(f"海康威视SDK导入失败: {str(e)}，将使用模拟模式")
     HIKVISION_SDK_AVAILABLE = False
     
@@ -124,6 +136,273 @@ except ImportError as e:
         def MV_CC_FreeImageBuffer(self, stOutFrame):
             return 0
 
+    # 结构体定义只依赖ctypes，与平台无关；导入真实定义以便注入SDK替身(如FakeMvCamera)
+    try:
+        from core.camera.MvImport.CameraParams_const import MV_GIGE_DEVICE, MV_USB_DEVICE
+        from core.camera.MvImport.CameraParams_header import (
+            MV_CC_DEVICE_INFO_LIST, MV_CC_DEVICE_INFO, MV_FRAME_OUT, MV_FRAME_OUT_INFO_EX,
+            MVCC_FLOATVALUE, MVCC_INTVALUE, MVCC_ENUMVALUE, MV_TRIGGER_MODE_OFF)
+    except ImportError as e:
+        logger.warning(f"SDK结构体定义导入失败: {str(e)}")
+
+        class MV_FRAME_OUT_INFO_EX(ctypes.Structure):
+            pass
+
+        class MVCC_INTVALUE(ctypes.Structure):
+            _fields_ = [("nCurValue", ctypes.c_uint), ("nMax", ctypes.c_uint), ("nMin", ctypes.c_uint),
+                        ("nInc", ctypes.c_uint), ("nReserved", ctypes.c_uint * 4)]
+
+        class MVCC_FLOATVALUE(ctypes.Structure):
+            _fields_ = [("fCurValue", ctypes.c_float), ("fMax", ctypes.c_float), ("fMin", ctypes.c_float),
+                        ("nReserved", ctypes.c_uint * 4)]
+
+        class MVCC_ENUMVALUE(ctypes.Structure):
+            _fields_ = [("nCurValue", ctypes.c_uint), ("nSupportedNum", ctypes.c_uint),
+                        ("nSupportValue", ctypes.c_uint * 64), ("nReserved", ctypes.c_uint * 4)]
+
+# SDK图像回调函数类型: void(*)(unsigned char* pData, MV_FRAME_OUT_INFO_EX* pFrameInfo, void* pUser)
+# Windows下SDK使用stdcall调用约定
+_winfun_ctype = getattr(ctypes, 'WINFUNCTYPE', ctypes.CFUNCTYPE)
+FrameInfoCallBack = _winfun_ctype(None, POINTER(c_ubyte), POINTER(MV_FRAME_OUT_INFO_EX), c_void_p)
+
+# 采集方式
+ACQUISITION_POLL = "poll"           # 采集线程轮询MV_CC_GetImageBuffer
+ACQUISITION_CALLBACK = "callback"   # SDK内部线程通过MV_CC_RegisterImageCallBackEx回调推送
+
+# 停止采集时等待采集线程退出的最长时间(秒)
+THREAD_JOIN_TIMEOUT = 3.0
+
+# 停止采集和关闭相机时等待消费者归还零拷贝帧的最长时间(秒)
+LEASE_RELEASE_TIMEOUT = 1.0
+
+# GenICam节点类型
+NODE_INT = "int"
+NODE_FLOAT = "float"
+NODE_BOOL = "bool"
+NODE_ENUM = "enum"
+
+# 节点名 -> 节点类型
+NODE_TYPES = {
+    'Width': NODE_INT,
+    'Height': NODE_INT,
+    'OffsetX': NODE_INT,
+    'OffsetY': NODE_INT,
+    'WidthMax': NODE_INT,
+    'HeightMax': NODE_INT,
+    'PayloadSize': NODE_INT,
+    'GevSCPSPacketSize': NODE_INT,
+    'AcquisitionFrameRate': NODE_FLOAT,
+    'ResultingFrameRate': NODE_FLOAT,
+    'ExposureTime': NODE_FLOAT,
+    'Gain': NODE_FLOAT,
+    'AcquisitionFrameRateEnable': NODE_BOOL,
+    'TriggerMode': NODE_ENUM,
+    'TriggerSource': NODE_ENUM,
+    'ExposureAuto': NODE_ENUM,
+    'GainAuto': NODE_ENUM,
+    'BalanceWhiteAuto': NODE_ENUM,
+    'PixelFormat': NODE_ENUM,
+}
+
+# 参数名 -> 节点名(get_parameters/set_parameters也直接接受节点名)
+PARAMETER_NODES = {
+    'width': 'Width',
+    'height': 'Height',
+    'offset_x': 'OffsetX',
+    'offset_y': 'OffsetY',
+    'frame_rate': 'AcquisitionFrameRate',
+    'frame_rate_enable': 'AcquisitionFrameRateEnable',
+    'exposure_time': 'ExposureTime',
+    'gain': 'Gain',
+    'trigger_mode': 'TriggerMode',
+    'pixel_format': 'PixelFormat',
+    'auto_exposure': 'ExposureAuto',
+    'auto_gain': 'GainAuto',
+    'auto_wb': 'BalanceWhiteAuto',
+}
+
+# 以布尔值表示的自动模式参数: 关闭为0，开启为连续模式
+AUTO_PARAMETERS = ('auto_exposure', 'auto_gain', 'auto_wb')
+AUTO_CONTINUOUS = 2
+
+# 写入后缓存一并失效的关联节点(相机可能随之修正这些节点的值)
+_DEPENDENT_NODES = {
+    'Width': ('OffsetX', 'PayloadSize'),
+    'Height': ('OffsetY', 'PayloadSize'),
+    'OffsetX': ('Width',),
+    'OffsetY': ('Height',),
+    'PixelFormat': ('PayloadSize',),
+    'ExposureTime': ('ResultingFrameRate',),
+    'AcquisitionFrameRate': ('ResultingFrameRate',),
+    'AcquisitionFrameRateEnable': ('AcquisitionFrameRate', 'ResultingFrameRate'),
+    'ExposureAuto': ('ExposureTime',),
+    'GainAuto': ('Gain',),
+}
+
+# 自动模式开启时由相机自行调整、不能缓存的节点: {节点: 自动模式节点}
+_AUTO_NODES = {'ExposureTime': 'ExposureAuto', 'Gain': 'GainAuto'}
+
+# 总是从相机读取的节点
+_VOLATILE_NODES = ('ResultingFrameRate',)
+
+# 表示相机没有该节点或该节点不可访问的错误码，读取结果(None)可以缓存；超时、设备忙等其他错误下次重新读取
+_NODE_UNAVAILABLE_ERRORS = frozenset((MV_E_SUPPORT, MV_E_GC_PROPERTY, MV_E_GC_ACCESS, MV_E_ACCESS_DENIED))
+
+# 批量写入时先写的节点(触发、自动模式和使能开关先于数值写入)
+_WRITE_FIRST = ('TriggerMode', 'PixelFormat', 'ExposureAuto', 'GainAuto', 'BalanceWhiteAuto',
+                'AcquisitionFrameRateEnable')
+
+class _NodeBuffers:
+    """
+    预分配的节点读取结构体
+
+    每台相机一份，由相机的参数锁保护；多台相机的参数读取互不等待。
+    """
+    __slots__ = ('int_value', 'float_value', 'enum_value', 'bool_value')
+
+    def __init__(self):
+        self.int_value = MVCC_INTVALUE()
+        self.float_value = MVCC_FLOATVALUE()
+        self.enum_value = MVCC_ENUMVALUE()
+        self.bool_value = ctypes.c_bool()
+
+
+def _read_node_value(cam, buffers: _NodeBuffers, node: str, node_type: str) -> Tuple[int, Any]:
+    """
+    用预分配的结构体读取一个节点，调用者持有该相机的参数锁
+
+    Returns:
+        (SDK错误码, 当前值)
+    """
+    if node_type == NODE_INT:
+        ret = cam.MV_CC_GetIntValue(node, buffers.int_value)
+        return ret, buffers.int_value.nCurValue
+    if node_type == NODE_FLOAT:
+        ret = cam.MV_CC_GetFloatValue(node, buffers.float_value)
+        return ret, buffers.float_value.fCurValue
+    if node_type == NODE_BOOL:
+        ret = cam.MV_CC_GetBoolValue(node, buffers.bool_value)
+        return ret, buffers.bool_value.value
+    ret = cam.MV_CC_GetEnumValue(node, buffers.enum_value)
+    return ret, buffers.enum_value.nCurValue
+
+
+def _write_node_value(cam, node: str, node_type: str, value: Any) -> int:
+    """写入一个节点，返回SDK错误码"""
+    if node_type == NODE_INT:
+        return cam.MV_CC_SetIntValue(node, int(value))
+    if node_type == NODE_FLOAT:
+        return cam.MV_CC_SetFloatValue(node, float(value))
+    if node_type == NODE_BOOL:
+        return cam.MV_CC_SetBoolValue(node, bool(value))
+    return cam.MV_CC_SetEnumValue(node, int(value))
+
+
+# 目标型号，枚举时标记is_target_model，未指定设备ID时优先打开
+TARGET_MODEL = "MV-CI003-GL-N6"
+
+
+def _decode_string(raw) -> str:
+    """SDK结构体中以\\0结尾的字符数组解码为字符串"""
+    return bytes(raw).split(b'\0', 1)[0].decode('utf-8', errors='replace')
+
+
+def _parse_device_info(info, device_id: str) -> Dict[str, Any]:
+    """
+    把MV_CC_DEVICE_INFO转换为设备信息字典
+
+    Args:
+        info: 设备信息结构体
+        device_id: 设备ID(本次枚举结果中的序号)
+
+    Returns:
+        设备信息字典
+    """
+    if info.nTLayerType == MV_GIGE_DEVICE:
+        gige = info.SpecialInfo.stGigEInfo
+        ip = gige.nCurrentIp
+        device_ip = f"{(ip >> 24) & 0xff}.{(ip >> 16) & 0xff}.{(ip >> 8) & 0xff}.{ip & 0xff}"
+        device_type = "GigE"
+        special = gige
+        fallback_name = f"GigE: {device_ip}"
+    else:
+        device_ip = None
+        device_type = "USB"
+        special = info.SpecialInfo.stUsb3VInfo
+        fallback_name = f"USB Camera-{device_id}"
+
+    model_name = _decode_string(special.chModelName)
+    serial_number = _decode_string(special.chSerialNumber)
+    manufacturer_name = _decode_string(special.chManufacturerName)
+
+    return {
+        'device_id': device_id,
+        'device_name': f"{manufacturer_name}-{model_name}" if manufacturer_name and model_name else fallback_name,
+        'device_type': device_type,
+        'device_ip': device_ip,
+        'vendor_name': manufacturer_name if manufacturer_name else 'Hikvision',
+        'model_name': model_name if model_name else 'Unknown',
+        'serial_number': serial_number if serial_number else device_id,
+        'user_id': device_id,
+        'is_target_model': TARGET_MODEL in model_name
+    }
+
+
+def _make_layer_probe(mv_camera, layer: int, layer_name: str):
+    """
+    生成扫描一个传输层的函数
+
+    设备信息结构体从SDK内部的设备列表拷贝出来，下一次枚举后仍可用于创建句柄。
+    """
+    def probe(first_index: int) -> List[Tuple[Dict[str, Any], Any]]:
+        device_list = MV_CC_DEVICE_INFO_LIST()
+        ret = mv_camera.MV_CC_EnumDevices(layer, device_list)
+        if ret != 0:
+            raise RuntimeError(f"枚举{layer_name}设备失败，错误码：0x{_to_hex_str(ret)}")
+        found = []
+        for i in range(device_list.nDeviceNum):
+            info = MV_CC_DEVICE_INFO.from_buffer_copy(
+                cast(device_list.pDeviceInfo[i], POINTER(MV_CC_DEVICE_INFO)).contents)
+            device = _parse_device_info(info, str(first_index + i))
+            if device['is_target_model']:
+                logger.info(f"发现目标型号相机 {TARGET_MODEL}: ID={device['device_id']}, SN={device['serial_number']}")
+            found.append((device, info))
+        return found
+    return probe
+
+
+def create_device_enumerator(mv_camera, ttl: float = DEFAULT_TTL) -> DeviceEnumerator:
+    """
+    创建海康相机的设备枚举器
+
+    USB设备枚举很快，GigE设备要等待广播应答，所以先扫描USB再扫描GigE，USB设备可以先显示出来。
+    SDK不建议多线程同时枚举，两个传输层在同一个工作线程中依次扫描。
+
+    Args:
+        mv_camera: MvCamera(或FakeMvCamera等替身)
+        ttl: 缓存有效期(秒)
+
+    Returns:
+        设备枚举器
+    """
+    return DeviceEnumerator([("USB", _make_layer_probe(mv_camera, MV_USB_DEVICE, "USB")),
+                             ("GigE", _make_layer_probe(mv_camera, MV_GIGE_DEVICE, "GigE"))],
+                            ttl=ttl, name="HikvisionEnumerator")
+
+
+# 真实SDK的枚举结果与相机实例无关，所有实例共用一个枚举器(第一次使用时创建)
+_sdk_enumerator: Optional[DeviceEnumerator] = None
+_sdk_enumerator_lock = threading.Lock()
+
+
+def get_sdk_enumerator() -> DeviceEnumerator:
+    """获取所有使用真实SDK的相机实例共用的设备枚举器"""
+    global _sdk_enumerator
+    with _sdk_enumerator_lock:
+        if _sdk_enumerator is None:
+            _sdk_enumerator = create_device_enumerator(MvCamera)
+        return _sdk_enumerator
+
 
 # 工作线程结束辅助函数
 def _async_raise(tid, exctype):
@@ -225,39 +504,6 @@ def _is_color_data(pixel_type):
     return False
 
 
-# 图像转换辅助函数
-def _mono_to_numpy(data, width, height):
-    """
-    将单色图像数据转换为numpy数组
-    """
-    data_arr = np.frombuffer(data, count=int(width * height), dtype=np.uint8, offset=0)
-    data_mono_arr = data_arr.reshape(height, width)
-    num_array = np.zeros([height, width, 1], "uint8")
-    num_array[:, :, 0] = data_mono_arr
-    return num_array
-
-
-def _color_to_numpy(data, width, height):
-    """
-    将彩色图像数据转换为numpy数组
-    """
-    data_arr = np.frombuffer(data, count=int(width * height * 3), dtype=np.uint8, offset=0)
-    data_r = data_arr[0:width * height * 3:3]
-    data_g = data_arr[1:width * height * 3:3]
-    data_b = data_arr[2:width * height * 3:3]
-
-    data_r_arr = data_r.reshape(height, width)
-    data_g_arr = data_g.reshape(height, width)
-    data_b_arr = data_b.reshape(height, width)
-    
-    num_array = np.zeros([height, width, 3], "uint8")
-    num_array[:, :, 0] = data_r_arr
-    num_array[:, :, 1] = data_g_arr
-    num_array[:, :, 2] = data_b_arr
-    
-    return num_array
-
-
 class HikvisionCamera(CameraInterface):
     """
     海康威视相机类
@@ -265,10 +511,26 @@ class HikvisionCamera(CameraInterface):
     实现了相机接口，适配海康威视SDK的功能。
     """
     
-    def __init__(self):
-        """初始化海康威视相机"""
-        self._obj_cam = MvCamera() if HIKVISION_SDK_AVAILABLE else None
-        self._device_list = None
+    def __init__(self, mv_camera=None, simulation: bool = False):
+        """
+        初始化海康威视相机
+        
+        Args:
+            mv_camera: 可选的MvCamera对象(或FakeMvCamera等替身)，为None时使用SDK创建
+            simulation: 是否强制使用模拟模式(例如多相机负载测试)
+        """
+        if mv_camera is not None:
+            self._obj_cam = mv_camera
+        elif simulation:
+            self._obj_cam = None
+        else:
+            self._obj_cam = MvCamera() if HIKVISION_SDK_AVAILABLE else None
+        # 设备枚举器: 真实SDK时所有实例共用，注入的替身各自使用一个
+        self._enumerator = None
+        if self._obj_cam is not None:
+            self._enumerator = (get_sdk_enumerator() if mv_camera is None
+                                else create_device_enumerator(self._obj_cam))
+        self._device_info = None        # 已打开设备的MV_CC_DEVICE_INFO
         self._connect_num = 0
         self._grabbing = False
         self._is_open = False
@@ -284,20 +546,49 @@ class HikvisionCamera(CameraInterface):
         
         # 模拟模式相关变量 - 明确设置为False，除非SDK不可用
         self._is_simulation = False
-        if not HIKVISION_SDK_AVAILABLE:
+        if self._obj_cam is None:
             self._is_simulation = True
-            logger.warning("SDK不可用，切换到模拟模式")
+            if not simulation:
+                logger.warning("SDK不可用，切换到模拟模式")
         # 图像参数
         self._frame_width = 1280
         self._frame_height = 1024
         self._roi = (0, 0, self._frame_width, self._frame_height)
         self._trigger_mode = False
-        # 保存图像
-        self._save_bmp = False
-        self._save_jpg = False
+        # 原始帧录制器，录制时采集线程把每一帧交给它的后台写入线程
+        self._recorder: Optional[StreamRecorder] = None
         
         # 缓冲区锁
         self._buf_lock = threading.Lock()
+        # 预分配帧缓冲池，ROI/分辨率变化时重新分配
+        self._buffer_pool = FrameBufferPool(DEFAULT_POOL_SIZE)
+        # 零拷贝模式: 布局无需转换的帧直接以只读视图引用SDK缓冲区
+        self._zero_copy = False
+        self._lease_manager = FrameLeaseManager()
+        # 单色相机默认保持单通道，只有消费者明确要求时才扩展为BGR
+        self._mono_to_bgr = False
+        # 采集线程与界面之间的有界帧队列，队列由空变为非空时才发射frame_ready_signal；
+        # 队列中的每一帧持有缓冲区的一个引用，被丢弃时归还
+        self._frame_channel = FrameChannel(DEFAULT_DEPTH, DROP_OLDEST, notify=self._emit_frame_ready,
+                                           name="hikvision", release=self._release_queued)
+        # 最新帧槽位，供get_frame(timeout)阻塞等待；槽位中的帧同样持有一个引用
+        self._latest_frame = LatestFrameSlot(retain=self.retain_frame, release=self.release_frame)
+        self._last_pulled_sequence = 0
+        self._sim_frame_number = 0
+        self._sim_source: Optional[FrameSource] = None   # 模拟图像源，第一次使用时创建
+        self._sim_trigger = threading.Event()            # 模拟模式的软触发
+        self._sim_trigger_index = 0
+        # 自定义相机ID(多相机时使用设备序列号)，None表示使用默认ID
+        self._camera_id = None
+        # 采集方式: 轮询或SDK回调
+        self._acquisition_mode = ACQUISITION_POLL
+        self._callback_registered = False
+        self._frame_callback = None     # 持有回调函数指针，防止被垃圾回收
+        # 参数节点缓存: {节点名: 值}，值为None表示相机不支持该节点；每次SDK读写都是一次设备往返
+        self._node_cache: Dict[str, Any] = {}
+        self._param_lock = threading.RLock()
+        self._node_buffers = _NodeBuffers()
+        self._param_stats = {'hits': 0, 'reads': 0, 'writes': 0, 'skipped_writes': 0, 'invalidations': 0}
         
         logger.info(f"海康威视相机初始化完成，模拟模式：{self._is_simulation}")
     
@@ -308,179 +599,123 @@ class HikvisionCamera(CameraInterface):
         在SDK不可用时用于测试
         
         Returns:
-            模拟图像数据
+            模拟图像数据(新数组，按单色输出设置转换)
         """
-        # 创建一个灰度图像
-        img = np.ones((self._frame_height, self._frame_width), dtype=np.uint8) * 128
-        
-        # 添加一些图案，例如中心十字和边框
-        h, w = img.shape
-        thickness = 2
-        
-        # 中心十字
-        cv = int(w / 2)
-        ch = int(h / 2)
-        img[ch-50:ch+50, cv-thickness:cv+thickness] = 255  # 垂直线
-        img[ch-thickness:ch+thickness, cv-50:cv+50] = 255  # 水平线
-        
-        # 边框
-        img[0:thickness, :] = 200  # 上边框
-        img[h-thickness:h, :] = 200  # 下边框
-        img[:, 0:thickness] = 200  # 左边框
-        img[:, w-thickness:w] = 200  # 右边框
-        
-        # 添加噪声
-        noise = np.random.normal(0, 5, (h, w)).astype(np.int8)
-        img = np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8)
-        
-        # 当前时间戳
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        
-        # 创建彩色图像
-        color_img = np.stack([img, img, img], axis=2)
-        
-        # 添加一个旋转的矩形以模拟动态
-        angle = int(time.time() * 10) % 360
-        rect_center = (cv, ch)
-        rect_size = (100, 50)
-        rect_angle = angle
-        
-        box = cv2.boxPoints((rect_center, rect_size, rect_angle))
-        box = np.intp(box)
-        cv2.drawContours(color_img, [box], 0, (0, 0, 255), 2)
-        
-        # 添加时间戳文本
-        cv2.putText(color_img, timestamp, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        source = self._get_simulation_source()
+        raw = source.render()
+        frame = convert_frame(source.raw_bytes(raw), source.width, source.height, source.pixel_type,
+                              to_bgr=self._mono_to_bgr)
+        return frame.copy() if frame.base is not None else frame
+    
+    def set_simulation_source(self, source=None, width: int = None, height: int = None,
+                              pixel_type: int = None, **kwargs) -> bool:
+        """
+        设置模拟模式的图像源
         
-        return color_img
+        Args:
+            source: None表示合成图像源；图像文件夹或视频文件路径表示回放该文件；也可以直接传入FrameSource
+            width: 宽度，None表示合成图像源沿用当前分辨率、文件图像源使用文件的分辨率
+            height: 高度，规则同width
+            pixel_type: 模拟的相机像素格式(PixelType_Gvsp_*)，None表示BGR8
+            **kwargs: 传给SimulationSource或FileSource的其他参数，如bank_size、noise_sigma、loop
+            
+        Returns:
+            是否设置成功
+        """
+        if pixel_type is None:
+            pixel_type = PixelType_Gvsp_BGR8_Packed
+        if source is None:
+            width = width or self._frame_width
+            height = height or self._frame_height
+        try:
+            new_source = create_source(source, width, height, pixel_type, **kwargs)
+        except (ValueError, OSError) as e:
+            logger.error(f"设置模拟图像源失败: {str(e)}")
+            return False
+        old_source, self._sim_source = self._sim_source, new_source
+        if old_source is not None and old_source is not new_source:
+            old_source.close()
+        self._frame_width, self._frame_height = new_source.width, new_source.height
+        self._roi = (0, 0, self._frame_width, self._frame_height)
+        logger.info(f"模拟图像源: {type(new_source).__name__} {new_source.width}x{new_source.height} "
+                    f"{get_converter(new_source.pixel_type).name}")
+        return True
+    
+    def get_simulation_source(self) -> Optional[FrameSource]:
+        """获取模拟模式的图像源，尚未创建时返回None"""
+        return self._sim_source
+    
+    def _get_simulation_source(self) -> FrameSource:
+        """获取模拟图像源，不存在时按当前分辨率创建合成图像源"""
+        if self._sim_source is None:
+            self._sim_source = SimulationSource(self._frame_width, self._frame_height)
+        return self._sim_source
 
     @handle_exception
-    def enumerate_devices(self) -> List[Dict[str, Any]]:
+    def enumerate_devices(self, refresh: bool = False,
+                          callback: Optional[DevicesCallback] = None) -> List[Dict[str, Any]]:
         """
         枚举可用的相机设备
         
+        结果缓存在设备枚举器中，有效期内不访问SDK；需要扫描时在工作线程中进行，本方法等待扫描完成。
+        界面中应使用enumerate_devices_async，避免等待期间界面卡住。
+
+        Args:
+            refresh: 是否忽略缓存重新扫描
+            callback: 增量回调，每扫完一个传输层以目前发现的全部设备调用一次
+        
         Returns:
             可用相机设备列表，每个设备为一个字典，包含设备信息
         """
         if self._is_simulation:
-        # 模拟模式下返回一个虚拟设备
-            return [{
-                'device_id': 'SIM001',
-                'device_name': '模拟海康相机',
-                'vendor_name': 'Hikvision(模拟)',
-                'model_name': 'MV-SIM001',
-                'serial_number': 'SIM001',
-                'user_id': 'SIM001',
-                'is_target_model': False
-            }]
-    
-        # 创建设备列表
-        self._device_list = MV_CC_DEVICE_INFO_LIST()
-        
-        # 枚举设备 - 同时枚举GigE和USB设备
-        ret = MvCamera.MV_CC_EnumDevices(MV_GIGE_DEVICE | MV_USB_DEVICE, self._device_list)
-        if ret != 0:
-            logger.error(f"枚举设备失败，错误码：0x{_to_hex_str(ret)}")
-            return []
-        
-        logger.info(f"找到 {self._device_list.nDeviceNum} 个设备")
-            
-        devices = []
-        for i in range(self._device_list.nDeviceNum):
-            device_info = {}
-            mvcc_dev_info = cast(self._device_list.pDeviceInfo[i], POINTER(MV_CC_DEVICE_INFO)).contents
-            if mvcc_dev_info:
-                # 提取设备信息
-                device_id = str(i)
-                
-                # 判断网口/U口相机
-                if mvcc_dev_info.nTLayerType == MV_GIGE_DEVICE:
-                    # 网口相机
-                    nip1 = ((mvcc_dev_info.SpecialInfo.stGigEInfo.nCurrentIp & 0xff000000) >> 24)
-                    nip2 = ((mvcc_dev_info.SpecialInfo.stGigEInfo.nCurrentIp & 0x00ff0000) >> 16)
-                    nip3 = ((mvcc_dev_info.SpecialInfo.stGigEInfo.nCurrentIp & 0x0000ff00) >> 8)
-                    nip4 = (mvcc_dev_info.SpecialInfo.stGigEInfo.nCurrentIp & 0x000000ff)
-                    device_ip = f"{nip1}.{nip2}.{nip3}.{nip4}"
-                    device_type = "GigE"
-                    
-                    # 尝试获取型号名称
-                    model_name = ""
-                    for j in range(64):
-                        if mvcc_dev_info.SpecialInfo.stGigEInfo.chModelName[j] > 0:
-                            model_name += chr(mvcc_dev_info.SpecialInfo.stGigEInfo.chModelName[j])
-                        else:
-                            break
-                    
-                    # 尝试获取序列号
-                    serial_number = ""
-                    for j in range(16):
-                        if mvcc_dev_info.SpecialInfo.stGigEInfo.chSerialNumber[j] > 0:
-                            serial_number += chr(mvcc_dev_info.SpecialInfo.stGigEInfo.chSerialNumber[j])
-                        else:
-                            break
-                    
-                    # 尝试获取制造商名称
-                    manufacturer_name = ""
-                    for j in range(32):
-                        if mvcc_dev_info.SpecialInfo.stGigEInfo.chManufacturerName[j] > 0:
-                            manufacturer_name += chr(mvcc_dev_info.SpecialInfo.stGigEInfo.chManufacturerName[j])
-                        else:
-                            break
-                    
-                    device_name = f"{manufacturer_name}-{model_name}" if manufacturer_name and model_name else f"GigE: {device_ip}"
-                    vendor_name = manufacturer_name if manufacturer_name else 'Hikvision'
-                else:
-                    # USB相机
-                    device_type = "USB"
-                    device_ip = None
-                    
-                    # 尝试获取型号名称
-                    model_name = ""
-                    for j in range(64):
-                        if mvcc_dev_info.SpecialInfo.stUsb3VInfo.chModelName[j] > 0:
-                            model_name += chr(mvcc_dev_info.SpecialInfo.stUsb3VInfo.chModelName[j])
-                        else:
-                            break
-                    
-                    # 尝试获取序列号
-                    serial_number = ""
-                    for j in range(64):
-                        if mvcc_dev_info.SpecialInfo.stUsb3VInfo.chSerialNumber[j] > 0:
-                            serial_number += chr(mvcc_dev_info.SpecialInfo.stUsb3VInfo.chSerialNumber[j])
-                        else:
-                            break
-                    
-                    # 尝试获取制造商名称
-                    manufacturer_name = ""
-                    for j in range(64):
-                        if mvcc_dev_info.SpecialInfo.stUsb3VInfo.chManufacturerName[j] > 0:
-                            manufacturer_name += chr(mvcc_dev_info.SpecialInfo.stUsb3VInfo.chManufacturerName[j])
-                        else:
-                            break
-                    
-                    device_name = f"{manufacturer_name}-{model_name}" if manufacturer_name and model_name else f"USB Camera-{i}"
-                    vendor_name = manufacturer_name if manufacturer_name else 'Hikvision'
-                
-                # 检查是否是目标型号：MV-CI003-GL-N6
-                is_target_model = "MV-CI003-GL-N6" in model_name
-                if is_target_model:
-                    logger.info(f"发现目标型号相机 MV-CI003-GL-N6: ID={device_id}, SN={serial_number}")
-                
-                # 添加设备信息
-                device_info = {
-                    'device_id': device_id,
-                    'device_name': device_name,
-                    'device_type': device_type,
-                    'device_ip': device_ip,
-                    'vendor_name': vendor_name,
-                    'model_name': model_name if model_name else 'Unknown',
-                    'serial_number': serial_number if serial_number else device_id,
-                    'user_id': device_id,
-                    'is_target_model': is_target_model
-                }
-                devices.append(device_info)
-        
-        return devices
+            devices = self._simulated_devices()
+            if callback is not None:
+                callback(devices)
+            return devices
+        return self._enumerator.enumerate(refresh, callback)
+
+    def enumerate_devices_async(self, refresh: bool = False, callback: Optional[DevicesCallback] = None,
+                                done_callback: Optional[DevicesCallback] = None) -> bool:
+        """
+        在工作线程中枚举设备(不阻塞)
+
+        Args:
+            refresh: 是否忽略缓存重新扫描
+            callback: 增量回调，在枚举线程中调用
+            done_callback: 枚举结束回调，参数为全部设备
+
+        Returns:
+            是否启动了扫描；False表示结果来自缓存(或模拟模式)，回调已在调用线程中完成
+        """
+        if self._is_simulation:
+            devices = self._simulated_devices()
+            for notify in (callback, done_callback):
+                if notify is not None:
+                    notify(list(devices))
+            return False
+        return self._enumerator.enumerate_async(refresh, callback, done_callback)
+
+    def get_enumeration_stats(self) -> Dict[str, Any]:
+        """
+        获取设备枚举统计信息
+
+        Returns:
+            扫描次数、缓存命中数、上次扫描耗时(毫秒)等；模拟模式下为空字典
+        """
+        return self._enumerator.get_stats() if self._enumerator is not None else {}
+
+    @staticmethod
+    def _simulated_devices() -> List[Dict[str, Any]]:
+        """模拟模式下的虚拟设备"""
+        return [{
+            'device_id': 'SIM001',
+            'device_name': '模拟海康相机',
+            'vendor_name': 'Hikvision(模拟)',
+            'model_name': 'MV-SIM001',
+            'serial_number': 'SIM001',
+            'user_id': 'SIM001',
+            'is_target_model': False
+        }]
     
     @handle_exception
     def open(self, device_id: str = "") -> bool:
@@ -494,34 +729,30 @@ class HikvisionCamera(CameraInterface):
             self._is_open = True
             return True
             
-        # 获取设备列表
-        if not self._device_list or self._device_list.nDeviceNum == 0:
+        # 设备ID是上一次枚举结果中的序号，已经枚举过时不重新扫描，避免序号变化后打开另一台设备
+        devices = self._enumerator.get_devices()
+        if not devices:
             devices = self.enumerate_devices()
-            if not devices:
-                logger.error("没有找到可用的相机设备")
-                return False
-            
-        if self._device_list.nDeviceNum == 0:
+        if not devices:
             logger.error("没有找到可用的相机设备")
             return False
             
         # 确定要打开的设备索引
         device_index = 0
         
-        # 如果没有指定设备ID，优先选择MV-CI003-GL-N6型号相机
+        # 如果没有指定设备ID，优先选择目标型号相机
         if not device_id:
-            devices_info = self.enumerate_devices()
-            for device in devices_info:
+            for device in devices:
                 if device.get('is_target_model', False):
                     device_id = device['device_id']
-                    logger.info(f"自动选择MV-CI003-GL-N6型号相机，ID: {device_id}")
+                    logger.info(f"自动选择{TARGET_MODEL}型号相机，ID: {device_id}")
                     break
         
         # 处理设备ID
         if device_id:
             try:
                 device_index = int(device_id)
-                if device_index < 0 or device_index >= self._device_list.nDeviceNum:
+                if device_index < 0 or device_index >= len(devices):
                     logger.warning(f"无效的设备ID: {device_id}，将使用默认设备")
                     device_index = 0
             except ValueError:
@@ -532,7 +763,7 @@ class HikvisionCamera(CameraInterface):
                     
         # 创建相机句柄
         try:
-            stDeviceList = cast(self._device_list.pDeviceInfo[int(device_index)], POINTER(MV_CC_DEVICE_INFO)).contents
+            stDeviceList = self._enumerator.get_handle(str(device_index))
             ret = self._obj_cam.MV_CC_CreateHandle(stDeviceList)
             if ret != 0:
                 logger.error(f"创建相机句柄失败，错误码：0x{_to_hex_str(ret)}")
@@ -558,11 +789,14 @@ class HikvisionCamera(CameraInterface):
                     logger.warning(f"获取最佳包大小失败: {packet_size}")
             
             # 设置触发模式为关闭
-            ret = self._obj_cam.MV_CC_SetEnumValue("TriggerMode", MV_TRIGGER_MODE_OFF)
+            # 新打开的设备，之前缓存的节点值不再有效
+            self.invalidate_parameter_cache(device=False)
+            ret = self._write_node("TriggerMode", MV_TRIGGER_MODE_OFF)
             if ret != 0:
                 logger.warning(f"设置触发模式失败，错误码：0x{_to_hex_str(ret)}")
             
             self._is_open = True
+            self._device_info = stDeviceList
             logger.info(f"相机打开成功，设备索引：{device_index}")
             
             # 获取相机参数
@@ -588,11 +822,17 @@ class HikvisionCamera(CameraInterface):
             
         if self._grabbing:
             self.stop_grabbing()
+        if self._recorder is not None:
+            self.stop_recording()
             
         if self._is_simulation:
             logger.info("模拟模式：关闭相机")
             self._is_open = False
             return True
+        
+        # 句柄销毁后SDK缓冲区随之失效，先等待持有者归还零拷贝帧，仍未归还的只能在此强制归还
+        if self._lease_manager.wait_released(LEASE_RELEASE_TIMEOUT):
+            self._lease_manager.release_all()
             
         # 关闭设备
         ret = self._obj_cam.MV_CC_CloseDevice()
@@ -604,6 +844,8 @@ class HikvisionCamera(CameraInterface):
         ret = self._obj_cam.MV_CC_DestroyHandle()
         if ret != 0:
             logger.error(f"销毁相机句柄失败，错误码：{ret}")
+        # 句柄销毁后注册的图像回调随之失效
+        self._callback_registered = False
                 
         self._is_open = False
         logger.info("相机关闭成功")
@@ -620,10 +862,14 @@ class HikvisionCamera(CameraInterface):
         return self._is_open
     
     @handle_exception
-    def start_grabbing(self) -> bool:
+    def start_grabbing(self, acquisition_mode: str = None) -> bool:
         """
         开始采集图像
         
+        Args:
+            acquisition_mode: 采集方式，"poll"为采集线程轮询取流，"callback"为SDK回调推送；
+                None表示使用set_acquisition_mode设置的方式
+        
         Returns:
             是否成功开始采集
         """
@@ -635,6 +881,15 @@ class HikvisionCamera(CameraInterface):
             logger.info("相机已在采集中")
             return True
             
+        mode = acquisition_mode or self._acquisition_mode
+        if mode not in (ACQUISITION_POLL, ACQUISITION_CALLBACK):
+            logger.error(f"不支持的采集方式: {mode}")
+            return False
+            
+        self._frame_channel.reopen()
+        self._latest_frame.reopen()
+        register_channel(self.camera_id, self._frame_channel)
+            
         if self._is_simulation:
             logger.info("模拟模式：开始采集")
             self._grabbing = True
@@ -651,14 +906,36 @@ class HikvisionCamera(CameraInterface):
                 
             return True
             
+        if mode == ACQUISITION_CALLBACK:
+            # 回调必须在开始取流前注册
+            if not self._callback_registered:
+                self._frame_callback = FrameInfoCallBack(self._on_image_callback)
+                ret = self._obj_cam.MV_CC_RegisterImageCallBackEx(self._frame_callback, None)
+                if ret != 0:
+                    logger.error(f"注册图像回调失败，错误码：0x{_to_hex_str(ret)}")
+                    return False
+                self._callback_registered = True
+        elif self._callback_registered:
+            # SDK不支持注销图像回调，注册后只能重新打开相机才能改回轮询
+            logger.error("已注册图像回调，需要重新打开相机才能切换为轮询采集")
+            return False
+            
+        # 回调可能在MV_CC_StartGrabbing返回前就开始触发
+        self._exit = False
+        
         # 开始采集
         ret = self._obj_cam.MV_CC_StartGrabbing()
         if ret != 0:
             logger.error(f"开始采集失败，错误码：{ret}")
+            self._exit = True
             return False
             
         self._grabbing = True
-        self._exit = False
+        
+        if mode == ACQUISITION_CALLBACK:
+            # 图像由SDK内部线程通过_on_image_callback推送，不需要采集线程
+            logger.info("开始采集成功(回调模式)")
+            return True
         
         # 创建采集线程
         try:
@@ -692,18 +969,26 @@ class HikvisionCamera(CameraInterface):
             
         if self._is_simulation:
             logger.info("模拟模式：停止采集")
-            # 退出线程
-            if self._thread_closed:
-                _stop_thread(self._thread_handle)
-                self._thread_closed = False
-            self._grabbing = False
+            # 先让模拟线程退出并等待其结束，此后不会再有帧发布到帧队列和最新帧槽位
             self._exit = True
+            self._join_acquisition_thread()
+            self._close_frame_channel()
+            self._grabbing = False
             return True
             
-        # 退出线程
-        if self._thread_closed:
-            _stop_thread(self._thread_handle)
-            self._thread_closed = False
+        # 让取流线程退出并等待其结束，此后不会再读取SDK缓冲区或借出新的租约；
+        # 回调模式下让仍在进行的回调尽快返回
+        self._exit = True
+        self._join_acquisition_thread()
+        
+        # 唤醒等待中的消费者，丢弃未被取走的帧
+        self._close_frame_channel()
+        
+        # 等待消费者归还零拷贝帧。仍被持有的租约不强制归还(否则持有者会读到已被SDK复用的内存)，
+        # 由最后一个持有者归还给SDK
+        outstanding = self._lease_manager.wait_released(LEASE_RELEASE_TIMEOUT)
+        if outstanding:
+            logger.warning(f"停止采集时仍有{outstanding}个零拷贝帧被持有，将在持有者归还后归还给SDK")
         
         # 停止采集
         ret = self._obj_cam.MV_CC_StopGrabbing()
@@ -716,6 +1001,32 @@ class HikvisionCamera(CameraInterface):
         logger.info("停止采集成功")
         return True
     
+    def _join_acquisition_thread(self) -> None:
+        """
+        等待采集线程退出(调用前需设置self._exit)
+        
+        取流线程最多阻塞在MV_CC_GetImageBuffer的1秒超时或BLOCK策略帧队列的1秒超时上；
+        超过THREAD_JOIN_TIMEOUT仍未退出时才向线程抛出SystemExit强制结束。
+        """
+        thread = self._thread_handle
+        if not self._thread_closed or thread is None:
+            return
+        self._thread_closed = False
+        if thread is threading.current_thread():
+            return
+        thread.join(THREAD_JOIN_TIMEOUT)
+        if thread.is_alive():
+            logger.warning(f"采集线程在{THREAD_JOIN_TIMEOUT}秒内未退出，强制结束")
+            _stop_thread(thread)
+            thread.join(THREAD_JOIN_TIMEOUT)
+    
+    def _close_frame_channel(self) -> None:
+        """关闭帧队列和最新帧槽位，唤醒等待中的消费者并归还未被取走的帧占用的引用"""
+        self._frame_channel.close()
+        self._frame_channel.clear()
+        self._latest_frame.close()
+        unregister_channel(self.camera_id, self._frame_channel)
+    
     @handle_exception
     def is_grabbing(self) -> bool:
         """
@@ -749,18 +1060,18 @@ class HikvisionCamera(CameraInterface):
         # 设置触发模式
         if not trigger_on:
             # 关闭触发模式，设置为连续采集
-            ret = self._obj_cam.MV_CC_SetEnumValue("TriggerMode", 0)
+            ret = self._write_node("TriggerMode", 0)
             if ret != 0:
                 logger.error(f"设置连续采集模式失败，错误码：{ret}")
                 return False
         else:
             # 开启触发模式
-            ret = self._obj_cam.MV_CC_SetEnumValue("TriggerMode", 1)
+            ret = self._write_node("TriggerMode", 1)
             if ret != 0:
                 logger.error(f"设置触发模式失败，错误码：{ret}")
                 return False
             # 设置软触发
-            ret = self._obj_cam.MV_CC_SetEnumValue("TriggerSource", 7)
+            ret = self._write_node("TriggerSource", 7)
             if ret != 0:
                 logger.error(f"设置软触发源失败，错误码：{ret}")
                 return False
@@ -786,7 +1097,8 @@ class HikvisionCamera(CameraInterface):
             return False
             
         if self._is_simulation:
-            logger.info("模拟模式：软触发一次")
+            logger.debug("模拟模式：软触发一次")
+            self._sim_trigger.set()
             return True
             
         # 软触发
@@ -801,6 +1113,8 @@ class HikvisionCamera(CameraInterface):
     def get_parameter(self) -> dict:
         """
         获取相机参数
+
+        通过get_parameters批量读取，已缓存的节点不再访问相机
         
         Returns:
             相机参数
@@ -815,91 +1129,13 @@ class HikvisionCamera(CameraInterface):
                 'roi': self._roi
             }
         
-        params = {}
-        
-        try:
-            # 为MV_CC_GetIntValue准备C结构体
-            class MVCC_INTVALUE(ctypes.Structure):
-                _fields_ = [
-                    ("nCurValue", ctypes.c_uint32),
-                    ("nMax", ctypes.c_uint32),
-                    ("nMin", ctypes.c_uint32),
-                    ("nInc", ctypes.c_uint32),
-                    ("nReserved", ctypes.c_uint32 * 4)
-                ]
-            
-            # 获取宽度
-            stIntValue = MVCC_INTVALUE()
-            ret = self._obj_cam.MV_CC_GetIntValue("Width", stIntValue)
-            if ret == 0:
-                self._frame_width = stIntValue.nCurValue
-                params['width'] = stIntValue.nCurValue
-            
-            # 获取高度
-            ret = self._obj_cam.MV_CC_GetIntValue("Height", stIntValue)
-            if ret == 0:
-                self._frame_height = stIntValue.nCurValue
-                params['height'] = stIntValue.nCurValue
-            
-            # 帧率控制开关
-            class MVCC_BOOLVALUE(ctypes.Structure):
-                _fields_ = [
-                    ("bCurValue", ctypes.c_bool),
-                    ("bReserved", ctypes.c_bool * 31)
-                ]
-            
-            stBoolValue = MVCC_BOOLVALUE()
-            ret = self._obj_cam.MV_CC_GetBoolValue("AcquisitionFrameRateEnable", stBoolValue)
-            if ret == 0:
-                params['frame_rate_enable'] = stBoolValue.bCurValue
-            
-            # 获取帧率
-            class MVCC_FLOATVALUE(ctypes.Structure):
-                _fields_ = [
-                    ("fCurValue", ctypes.c_float),
-                    ("fMax", ctypes.c_float),
-                    ("fMin", ctypes.c_float),
-                    ("fReserved", ctypes.c_float * 4)
-                ]
-            
-            stFloatValue = MVCC_FLOATVALUE()
-            ret = self._obj_cam.MV_CC_GetFloatValue("AcquisitionFrameRate", stFloatValue)
-            if ret == 0:
-                self._frame_rate = stFloatValue.fCurValue
-                params['frame_rate'] = stFloatValue.fCurValue
-            
-            # 获取曝光时间
-            ret = self._obj_cam.MV_CC_GetFloatValue("ExposureTime", stFloatValue)
-            if ret == 0:
-                self._exposure_time = stFloatValue.fCurValue
-                params['exposure_time'] = stFloatValue.fCurValue
-            
-            # 获取增益
-            ret = self._obj_cam.MV_CC_GetFloatValue("Gain", stFloatValue)
-            if ret == 0:
-                self._gain = stFloatValue.fCurValue
-                params['gain'] = stFloatValue.fCurValue
-            
-            # ROI相关参数
-            ret = self._obj_cam.MV_CC_GetIntValue("OffsetX", stIntValue)
-            if ret == 0:
-                offsetX = stIntValue.nCurValue
-            else:
-                offsetX = 0
-                
-            ret = self._obj_cam.MV_CC_GetIntValue("OffsetY", stIntValue)
-            if ret == 0:
-                offsetY = stIntValue.nCurValue
-            else:
-                offsetY = 0
-                
-            self._roi = (offsetX, offsetY, self._frame_width, self._frame_height)
-            params['roi'] = self._roi
-        
-        except Exception as e:
-            logger.error(f"获取相机参数时出错: {str(e)}")
-            traceback.print_exc()
-        
+        # 自动模式节点在前，决定曝光时间和增益能否使用缓存
+        params = self.get_parameters(['auto_exposure', 'auto_gain', 'width', 'height', 'frame_rate_enable',
+                                      'frame_rate', 'exposure_time', 'gain', 'offset_x', 'offset_y']) or {}
+        offset_x = params.pop('offset_x', 0)
+        offset_y = params.pop('offset_y', 0)
+        self._roi = (offset_x, offset_y, self._frame_width, self._frame_height)
+        params['roi'] = self._roi
         return params
     
     @handle_exception
@@ -929,89 +1165,353 @@ class HikvisionCamera(CameraInterface):
                 self._gain = gain
             return True
             
-        try:
-            # 关闭自动曝光
-            ret = self._obj_cam.MV_CC_SetEnumValue("ExposureAuto", 0)
-            if ret != 0:
-                logger.warning(f"关闭自动曝光失败，错误码：{ret}")
-                
-            # 设置曝光时间
-            if exposure_time is not None:
-                ret = self._obj_cam.MV_CC_SetFloatValue("ExposureTime", float(exposure_time))
-                if ret != 0:
-                    logger.error(f"设置曝光时间失败，错误码：{ret}")
-                    return False
-                self._exposure_time = exposure_time
-                
-            # 设置增益
-            if gain is not None:
-                ret = self._obj_cam.MV_CC_SetFloatValue("Gain", float(gain))
-                if ret != 0:
-                    logger.error(f"设置增益失败，错误码：{ret}")
-                    return False
-                self._gain = gain
-                
-            # 设置帧率
-            if frame_rate is not None:
-                ret = self._obj_cam.MV_CC_SetFloatValue("AcquisitionFrameRate", float(frame_rate))
-                if ret != 0:
-                    logger.error(f"设置帧率失败，错误码：{ret}")
-                    return False
-                self._frame_rate = frame_rate
+        # 关闭自动曝光
+        values = {'auto_exposure': False}
+        if exposure_time is not None:
+            values['exposure_time'] = exposure_time
+        if gain is not None:
+            values['gain'] = gain
+        if frame_rate is not None:
+            values['frame_rate'] = frame_rate
+        results = self.set_parameters(values) or {}
+        if not results.pop('auto_exposure', False):
+            logger.warning("关闭自动曝光失败")
+        failed = [name for name, ok in results.items() if not ok]
+        if failed:
+            logger.error(f"设置相机参数失败: {', '.join(failed)}")
+            return False
                 
-            logger.info(f"设置相机参数成功: 帧率={self._frame_rate}, 曝光时间={self._exposure_time}, 增益={self._gain}")
-            return True
-        except Exception as e:
-            logger.error(f"设置相机参数失败: {str(e)}")
+        logger.info(f"设置相机参数成功: 帧率={self._frame_rate}, 曝光时间={self._exposure_time}, 增益={self._gain}")
+        return True
+
+    @handle_exception
+    def get_parameters(self, names: List[str], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        批量读取参数
+
+        已缓存的节点直接返回，其余节点各读取一次并缓存；自动曝光/自动增益开启时，
+        曝光时间/增益由相机自行调整，总是从相机读取。
+
+        Args:
+            names: 参数名(见PARAMETER_NODES)或GenICam节点名
+            use_cache: False时忽略缓存，重新从相机读取
+
+        Returns:
+            {名称: 值}，相机不支持或读取失败的参数不包含在内；自动模式参数为布尔值
+        """
+        if self._is_simulation:
+            nodes = self._simulated_node_values()
+        elif not self._is_open:
+            logger.warning("相机未打开，无法读取参数")
+            return {}
+
+        params = {}
+        for name in names:
+            node = PARAMETER_NODES.get(name, name)
+            node_type = NODE_TYPES.get(node)
+            if node_type is None:
+                logger.warning(f"未知的参数节点: {name}")
+                continue
+            value = nodes.get(node) if self._is_simulation else self._read_node(node, node_type, use_cache)
+            if value is None:
+                continue
+            params[name] = value != 0 if name in AUTO_PARAMETERS else value
+            self._sync_parameter(node, value)
+        return params
+
+    @handle_exception
+    def set_parameters(self, values: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        批量设置参数
+
+        触发、自动模式和使能开关先于数值写入；值与缓存相同的节点不再写入相机。
+        写入后该节点及关联节点(如宽度与X偏移)的缓存失效，下次读取时取相机修正后的实际值。
+
+        Args:
+            values: {参数名或GenICam节点名: 值}，自动模式参数可以使用布尔值
+
+        Returns:
+            {名称: 是否成功}
+        """
+        if not self._is_open:
+            logger.error("相机未打开，无法设置参数")
+            return {name: False for name in values}
+
+        def write_order(item):
+            node = PARAMETER_NODES.get(item[0], item[0])
+            return _WRITE_FIRST.index(node) if node in _WRITE_FIRST else len(_WRITE_FIRST)
+
+        results = {}
+        for name, value in sorted(values.items(), key=write_order):
+            node = PARAMETER_NODES.get(name, name)
+            if node not in NODE_TYPES:
+                logger.warning(f"未知的参数节点: {name}")
+                results[name] = False
+                continue
+            if name in AUTO_PARAMETERS and isinstance(value, bool):
+                value = AUTO_CONTINUOUS if value else 0
+            if self._is_simulation:
+                logger.debug(f"模拟模式：设置参数 {node}={value}")
+                ret = 0
+            else:
+                ret = self._write_node(node, value)
+            results[name] = ret == 0
+            if ret != 0:
+                logger.error(f"设置参数{node}失败，错误码：0x{_to_hex_str(ret)}")
+                continue
+            self._sync_parameter(node, value)
+            if node in ('Width', 'Height', 'PixelFormat'):
+                # 图像规格变化，丢弃旧规格的缓冲区
+                self._buffer_pool.invalidate()
+        return results
+
+    def invalidate_parameter_cache(self, device: bool = True) -> None:
+        """
+        清空参数缓存
+
+        相机参数可能被其他程序或相机自身修改时调用(如切换用户集之后)。
+
+        Args:
+            device: 是否同时调用MV_CC_InvalidateNodes，使SDK内部的节点缓存也失效
+        """
+        with self._param_lock:
+            self._node_cache.clear()
+            self._param_stats['invalidations'] += 1
+        if device and self._is_open and not self._is_simulation and \
+                hasattr(self._obj_cam, 'MV_CC_InvalidateNodes'):
+            ret = self._obj_cam.MV_CC_InvalidateNodes()
+            if ret != 0:
+                logger.warning(f"使SDK节点缓存失效失败，错误码：0x{_to_hex_str(ret)}")
+
+    def get_parameter_cache_stats(self) -> Dict[str, Any]:
+        """
+        获取参数缓存统计
+
+        Returns:
+            缓存命中数、SDK读取/写入次数、因值未变而跳过的写入次数、失效次数和已缓存节点数
+        """
+        with self._param_lock:
+            stats = dict(self._param_stats)
+            stats['cached'] = sum(1 for value in self._node_cache.values() if value is not None)
+        return stats
+
+    def _read_node(self, node: str, node_type: str, use_cache: bool = True) -> Any:
+        """读取一个节点，优先使用缓存；读取失败时返回None，只有相机不支持该节点时才缓存None"""
+        with self._param_lock:
+            if use_cache and node in self._node_cache and self._is_cacheable(node):
+                self._param_stats['hits'] += 1
+                return self._node_cache[node]
+            ret, value = _read_node_value(self._obj_cam, self._node_buffers, node, node_type)
+            self._param_stats['reads'] += 1
+            if ret != 0:
+                logger.debug(f"读取参数{node}失败，错误码：0x{_to_hex_str(ret)}")
+                if ret not in _NODE_UNAVAILABLE_ERRORS:
+                    # 超时、设备忙等临时错误，不能让节点一直显示为不支持
+                    self._node_cache.pop(node, None)
+                    return None
+                value = None
+            self._node_cache[node] = value
+            return value
+
+    def _write_node(self, node: str, value: Any) -> int:
+        """
+        写入一个节点，值与缓存相同时跳过SDK调用；写入后该节点及关联节点的缓存失效
+
+        Returns:
+            SDK错误码
+        """
+        with self._param_lock:
+            if node in self._node_cache and self._node_cache[node] == value and self._is_cacheable(node):
+                self._param_stats['skipped_writes'] += 1
+                return 0
+            ret = _write_node_value(self._obj_cam, node, NODE_TYPES[node], value)
+            self._param_stats['writes'] += 1
+            self._invalidate_nodes(node, *_DEPENDENT_NODES.get(node, ()))
+            return ret
+
+    def _invalidate_nodes(self, *nodes: str) -> None:
+        """使指定节点的缓存失效"""
+        with self._param_lock:
+            for node in nodes:
+                self._node_cache.pop(node, None)
+
+    def _is_cacheable(self, node: str) -> bool:
+        """节点的缓存值是否可用: 易变节点不缓存，自动模式节点未知或已开启时对应的数值节点不缓存"""
+        if node in _VOLATILE_NODES:
             return False
+        auto_node = _AUTO_NODES.get(node)
+        if auto_node is None:
+            return True
+        # 自动模式节点值为None表示相机不支持自动模式
+        return auto_node in self._node_cache and not self._node_cache[auto_node]
+
+    def _sync_parameter(self, node: str, value: Any) -> None:
+        """把读写的节点值同步到对应的成员变量"""
+        if node == 'ExposureTime':
+            self._exposure_time = value
+        elif node == 'Gain':
+            self._gain = value
+        elif node == 'AcquisitionFrameRate':
+            self._frame_rate = value
+        elif node == 'Width':
+            self._frame_width = value
+        elif node == 'Height':
+            self._frame_height = value
+        elif node == 'TriggerMode':
+            self._trigger_mode = bool(value)
+
+    def _simulated_node_values(self) -> Dict[str, Any]:
+        """模拟模式下各节点的当前值"""
+        return {
+            'Width': self._frame_width,
+            'Height': self._frame_height,
+            'OffsetX': self._roi[0],
+            'OffsetY': self._roi[1],
+            'AcquisitionFrameRateEnable': True,
+            'AcquisitionFrameRate': self._frame_rate,
+            'ExposureTime': self._exposure_time,
+            'Gain': self._gain,
+            'TriggerMode': int(self._trigger_mode),
+            'ExposureAuto': 0,
+            'GainAuto': 0,
+        }
     
     @handle_exception
-    def get_frame(self) -> np.ndarray:
+    def get_frame(self, timeout: int = 1000) -> Optional[np.ndarray]:
         """
         获取一帧图像
         
+        采集中时阻塞等待比上一次get_frame返回的更新的一帧，等待期间不占用CPU。
+        返回的图像占用缓冲池的一个引用，用完后调用release_frame()归还。
+        
+        Args:
+            timeout: 超时时间(毫秒)
+        
         Returns:
-            图像数据（numpy数组）
+            图像数据（numpy数组），超时返回None
+        """
+        frame, _ = self.get_frame_with_info(timeout)
+        return frame
+    
+    @handle_exception
+    def get_frame_with_info(self, timeout: int = 1000,
+                            auto_start: bool = True) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        """
+        获取一帧图像及其帧信息
+        
+        返回的图像占用缓冲池的一个引用，用完后调用release_frame()归还。
+        
+        Args:
+            timeout: 超时时间(毫秒)
+            auto_start: 未在采集时是否自动开始采集(模拟模式下直接生成一帧)
+        
+        Returns:
+            (图像数据, 帧信息)，帧信息包含frame_number、timestamp、sequence等；超时返回(None, {})
         """
         if not self._is_open:
             logger.error("相机未打开，无法获取图像")
-            return np.zeros((1, 1, 3), dtype=np.uint8)
+            return None, {}
             
-        if self._is_simulation:
-            # 模拟模式下直接生成一张测试图像
-            return self._simulate_image()
-            
-        # 实际使用中，通常是从采集线程中获取图像
-        # 这里简化处理，直接获取一帧
         if not self._grabbing:
+            if not auto_start:
+                return None, {}
+            if self._is_simulation:
+                # 未采集时模拟模式直接生成一张测试图像
+                self._sim_frame_number += 1
+                return self._simulate_image(), {
+                    'camera_id': self.camera_id,
+                    'frame_number': self._sim_frame_number,
+                    'timestamp': time.time(),
+                }
             logger.warning("相机未在采集中，尝试启动采集")
-            self.start_grabbing()
-            time.sleep(0.1)  # 稍微等待采集启动
-            
-        # 由于实际实现中图像是由采集线程推送的，这里直接返回一个空帧
-        # 真实的图像会通过signal_manager的信号发送出去
-        # 但为了兼容接口，这里返回一个空图像
-        return np.zeros((1, 1, 3), dtype=np.uint8)
+            if not self.start_grabbing():
+                return None, {}
+        
+        frame, info = self._latest_frame.wait_newer(self._last_pulled_sequence, max(0, timeout) / 1000.0)
+        if frame is not None:
+            self._last_pulled_sequence = info['sequence']
+        return frame, info
+    
+    def get_frame_record(self, timeout: int = 1000, auto_start: bool = True) -> Optional[Frame]:
+        """
+        获取一帧图像及其元数据
+        
+        返回的Frame占用缓冲池的一个引用，用完后调用其release()归还。
+        
+        Args:
+            timeout: 超时时间(毫秒)
+            auto_start: 未在采集时是否自动开始采集
+        
+        Returns:
+            Frame(图像数组、帧号、设备/主机时间戳、像素格式、丢包数等)，超时返回None
+        """
+        frame, info = self.get_frame_with_info(timeout, auto_start)
+        if frame is None:
+            return None
+        return Frame.from_info(frame, info, owner=self)
     
     def _simulation_thread(self):
         """
         模拟采集线程函数
+        
+        连续模式下按帧率的绝对时间点出图(不累积休眠误差)，触发模式下每次软触发出一帧。
+        图像源输出相机原始像素格式，与真实相机一样经过像素转换写入缓冲池。
         """
         logger.info("模拟采集线程启动")
+        next_time = time.perf_counter()
         while not self._exit:
-            if not self._trigger_mode:
-                # 连续模式下定时生成图像
-                frame = self._simulate_image()
-                # 发送图像信号
-                signal_manager.frame_ready_signal.emit(frame, "SIM001")
-                # 模拟帧率
-                time.sleep(1.0 / max(1, self._frame_rate))
+            if self._trigger_mode:
+                # 触发模式下等待软触发
+                if not self._sim_trigger.wait(0.01):
+                    continue
+                self._sim_trigger.clear()
+                self._sim_trigger_index += 1
             else:
-                # 触发模式下不主动生成图像，等待触发
+                interval = 1.0 / max(1, self._frame_rate)
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                # 落后太多时不追帧，与真实相机按固定帧率出图一致
+                next_time = max(next_time + interval, time.perf_counter() - interval)
+            try:
+                self._publish_simulated_frame()
+            except Exception as e:
+                logger.error(f"生成模拟图像失败: {str(e)}")
                 time.sleep(0.01)
                 
         logger.info("模拟采集线程退出")
     
+    def _publish_simulated_frame(self) -> None:
+        """由模拟图像源生成一帧，转换到缓冲池后放入帧队列"""
+        source = self._get_simulation_source()
+        width, height, pixel_type = source.width, source.height, source.pixel_type
+        converter = get_converter(pixel_type)
+        to_bgr = self._mono_to_bgr
+        
+        convert_start = time.perf_counter()
+        frame_buffer = self._buffer_pool.acquire(width, height, pixel_type,
+                                                 converter.output_shape(width, height, to_bgr))
+        if converter.is_passthrough(to_bgr):
+            # 布局一致，图像源直接写入缓冲池
+            frame = source.render(out=frame_buffer.output)
+        else:
+            raw = source.render()
+            frame = convert_frame(source.raw_bytes(raw), width, height, pixel_type,
+                                  out=frame_buffer.output, to_bgr=to_bgr)
+        metrics.observe(STAGE_CONVERT, (time.perf_counter() - convert_start) * 1000.0)
+        
+        self._sim_frame_number += 1
+        self._publish_frame(frame, {
+            'camera_id': self.camera_id,
+            'frame_number': self._sim_frame_number,
+            'trigger_index': self._sim_trigger_index,
+            'timestamp': time.time(),
+            'width': width,
+            'height': height,
+            'pixel_type': pixel_type,
+            'lost_packets': 0,
+        })
+    
     def _work_thread(self):
         """
         相机采集线程函数
@@ -1019,83 +1519,382 @@ class HikvisionCamera(CameraInterface):
         logger.info("相机采集线程启动")
         
         stOutFrame = MV_FRAME_OUT()
-        ctypes.memset(ctypes.byref(stOutFrame), 0, ctypes.sizeof(stOutFrame))    # 
-        
+        ctypes.memset(ctypes.byref(stOutFrame), 0, ctypes.sizeof(stOutFrame))
+
         while not self._exit:
+            get_start = time.perf_counter()
             ret = self._obj_cam.MV_CC_GetImageBuffer(stOutFrame, 1000)
-            if ret == 0:
-                # 获取图像数据成功
-                try:
-                    # 保存帧信息
-                    self._frame_info = stOutFrame.stFrameInfo
-                    
-                    # 获取图像数据
-                    height = stOutFrame.stFrameInfo.nHeight
-                    width = stOutFrame.stFrameInfo.nWidth
-                    pixel_type = stOutFrame.stFrameInfo.enPixelType
-                    buffer_size = stOutFrame.stFrameInfo.nFrameLen
-                    # logger.info(f"stOutFrame.stFrameInfo.nFrameLen: {buffer_size}")
-
-                    # 根据图像类型进行处理
-                    if _is_mono_data(pixel_type):
-                        # 单色图像
-                        # 获取缓存锁
-                        self._buf_lock.acquire()
-                        pData = (c_ubyte * buffer_size)()
-                        cdll.msvcrt.memcpy(byref(pData), stOutFrame.pBufAddr, buffer_size)
-                        self._buf_lock.release()
-                        data = np.frombuffer(pData, 
-                                            count=int(width * height), 
-                                            dtype=np.uint8)
-                        mono_array = data.reshape(height, width)
-                        frame = cv2.cvtColor(mono_array, cv2.COLOR_GRAY2BGR)
-                        # 释放缓存
-                        self._obj_cam.MV_CC_FreeImageBuffer(stOutFrame)
-                    elif pixel_type == PixelType_Gvsp_YUV422_YUYV_Packed:
-                        # YUV格式图像
-                        # 申请内存(注意YUV422_YUYV_Packed的图像数据大小为Width*Height*2)4 Bytes for 2 pixels-------------
-                        pData = (c_ubyte * stOutFrame.stFrameInfo.nWidth * stOutFrame.stFrameInfo.nHeight * 2)()
-                        cdll.msvcrt.memcpy(byref(pData), stOutFrame.pBufAddr,
-                                stOutFrame.stFrameInfo.nWidth * stOutFrame.stFrameInfo.nHeight * 2)
-                        data = np.frombuffer(pData,
-                                            count=int(width * height * 2),
-                                            dtype=np.uint8)
-                        yuv_array = data.reshape(height, width, -1)
-                        frame = cv2.cvtColor(yuv_array, cv2.COLOR_YUV2BGR_YUYV)
-                    else:
-                        # 彩色图像
-                        data = np.frombuffer(stOutFrame.pBufAddr, 
-                                            count=int(width * height * 3), 
-                                            dtype=np.uint8)
-                        r_data = data[0:width * height * 3:3]
-                        g_data = data[1:width * height * 3:3]
-                        b_data = data[2:width * height * 3:3]
-                        
-                        r_array = r_data.reshape(height, width)
-                        g_array = g_data.reshape(height, width)
-                        b_array = b_data.reshape(height, width)
-                        
-                        frame = np.zeros((height, width, 3), dtype=np.uint8)
-                        frame[:, :, 0] = b_array  # OpenCV使用BGR顺序
-                        frame[:, :, 1] = g_array
-                        frame[:, :, 2] = r_array
-                    
-                    # 通过信号发送图像
-                    signal_manager.frame_ready_signal.emit(frame, f"CAM{self._connect_num}")
-                    
-                except Exception as e:
-                    logger.error(f"处理图像数据失败: {str(e)}")
-                finally:
-                    # 释放缓存
+            if ret != 0:
+                continue
+            metrics.observe(STAGE_SDK_GET, (time.perf_counter() - get_start) * 1000.0)
+
+            leased = False
+            try:
+                address = cast(stOutFrame.pBufAddr, c_void_p).value
+                leased = self._process_sdk_frame(address, stOutFrame.stFrameInfo, stOutFrame)
+                if leased:
+                    # 被借出的结构体由租约持有，下一帧使用新的结构体
+                    stOutFrame = MV_FRAME_OUT()
+                    ctypes.memset(ctypes.byref(stOutFrame), 0, ctypes.sizeof(stOutFrame))
+            except Exception as e:
+                logger.error(f"处理图像数据失败: {str(e)}")
+            finally:
+                # 释放缓存(已借出的缓冲区由租约负责释放)
+                if not leased:
                     self._obj_cam.MV_CC_FreeImageBuffer(stOutFrame)
-            # else:
-            #     # 获取图像超时或失败
-            #     if ret != -1:
-                    # logger.warning(f"获取图像失败，错误码：{ret}")
-            #     time.sleep(0.01)
-                
+
         logger.info("相机采集线程退出")
     
+    def _on_image_callback(self, pData, pFrameInfo, pUser):
+        """
+        SDK图像回调，在SDK内部线程中调用
+        
+        图像数据只在回调期间有效，因此总是拷贝(或转换)到缓冲池后再放入帧队列。
+        """
+        if self._exit or not pData or not pFrameInfo:
+            return
+        try:
+            # 帧信息结构体同样只在回调期间有效，保留一份拷贝
+            frame_info = MV_FRAME_OUT_INFO_EX.from_buffer_copy(pFrameInfo.contents)
+            self._process_sdk_frame(cast(pData, c_void_p).value, frame_info)
+        except Exception as e:
+            logger.error(f"处理回调图像失败: {str(e)}")
+    
+    def _process_sdk_frame(self, address: int, frame_info, frame_out=None) -> bool:
+        """
+        将SDK缓冲区中的一帧转换后放入帧队列(取流和回调两种方式共用)
+        
+        Args:
+            address: 图像数据地址
+            frame_info: MV_FRAME_OUT_INFO_EX帧信息
+            frame_out: 取流方式下的MV_FRAME_OUT，传入时允许零拷贝借出；回调方式下为None
+            
+        Returns:
+            缓冲区是否已交给租约(此后由租约归还，调用者不能再释放该缓冲区)
+        """
+        # 保存帧信息
+        self._frame_info = frame_info
+        
+        height = frame_info.nHeight
+        width = frame_info.nWidth
+        pixel_type = frame_info.enPixelType
+        buffer_size = frame_info.nFrameLen
+        
+        converter = get_converter(pixel_type)
+        if converter is None:
+            logger.warning(f"不支持的像素格式: {pixel_type}")
+            return False
+        
+        to_bgr = self._mono_to_bgr
+        raw_size = converter.raw_size(width, height)
+        if buffer_size < raw_size:
+            logger.warning(f"图像数据长度不足: {buffer_size} < {raw_size} ({converter.name})")
+            return False
+        output_shape = converter.output_shape(width, height, to_bgr)
+        
+        convert_start = time.perf_counter()
+        lease = None
+        if (frame_out is not None and self._zero_copy and converter.is_passthrough(to_bgr)
+                and self._lease_manager.try_reserve()):
+            # 零拷贝: 直接把SDK缓冲区交给消费者，最后一个持有者释放租约时才归还给SDK
+            frame = sdk_buffer_view(address, output_shape)
+            lease = FrameLease(frame, frame_out, self._obj_cam.MV_CC_FreeImageBuffer)
+        else:
+            frame_buffer = self._buffer_pool.acquire(width, height, pixel_type, output_shape)
+            with self._buf_lock:
+                if converter.is_passthrough(to_bgr):
+                    # 布局一致，单次memmove拷贝到缓冲池
+                    copy_from_address(frame_buffer.output, address, raw_size)
+                    frame = frame_buffer.output
+                else:
+                    # 直接从SDK缓冲区转换到缓冲池，一次cvtColor完成
+                    frame = convert_frame(sdk_buffer_view(address, (raw_size,)), width, height,
+                                          pixel_type, out=frame_buffer.output, to_bgr=to_bgr)
+        
+        metrics.observe(STAGE_CONVERT, (time.perf_counter() - convert_start) * 1000.0)
+        
+        info = {
+            'camera_id': self.camera_id,
+            'frame_number': frame_info.nFrameNum,
+            'trigger_index': frame_info.nTriggerIndex,
+            'timestamp': time.time(),
+            'device_timestamp': (frame_info.nDevTimeStampHigh << 32) | frame_info.nDevTimeStampLow,
+            'host_timestamp': frame_info.nHostTimeStamp,
+            'width': width,
+            'height': height,
+            'pixel_type': pixel_type,
+            'lost_packets': frame_info.nLostPacket,
+        }
+        if lease is None:
+            # 放入帧队列，由队列负责通知界面
+            self._publish_frame(frame, info)
+            return False
+        
+        # 登记后SDK缓冲区只由租约归还，调用者不能再释放；采集线程持有的第一个引用在发布结束时归还，
+        # 发布失败时没有其他持有者，缓冲区随之归还给SDK
+        self._lease_manager.add(lease)
+        try:
+            self._publish_frame(frame, info)
+        except Exception as e:
+            logger.error(f"发布零拷贝帧失败: {str(e)}")
+        return True
+    
+    def set_acquisition_mode(self, mode: str) -> bool:
+        """
+        设置采集方式，下一次start_grabbing时生效
+        
+        Args:
+            mode: "poll"(采集线程轮询MV_CC_GetImageBuffer) 或 "callback"(SDK回调推送)
+            
+        Returns:
+            是否设置成功
+        """
+        if mode not in (ACQUISITION_POLL, ACQUISITION_CALLBACK):
+            logger.error(f"不支持的采集方式: {mode}")
+            return False
+        self._acquisition_mode = mode
+        logger.info(f"采集方式设置为: {mode}")
+        return True
+    
+    def get_acquisition_mode(self) -> str:
+        """获取当前设置的采集方式"""
+        return self._acquisition_mode
+    
+    @property
+    def camera_id(self) -> str:
+        """frame_ready_signal中使用的相机ID"""
+        if self._camera_id:
+            return self._camera_id
+        return "SIM001" if self._is_simulation else f"CAM{self._connect_num}"
+    
+    def set_camera_id(self, camera_id: str) -> None:
+        """
+        设置帧标记使用的相机ID，需在start_grabbing之前调用
+        
+        Args:
+            camera_id: 相机ID，例如设备序列号；None或空字符串恢复默认ID
+        """
+        self._camera_id = camera_id or None
+    
+    def _publish_frame(self, frame: np.ndarray, info: Dict[str, Any] = None) -> None:
+        """
+        将采集到的帧放入最新帧槽位和帧队列
+        
+        槽位、帧队列和录制器各自持有缓冲区的一个引用，发布完成后归还采集线程借出时的引用。
+        
+        Args:
+            frame: 图像数据
+            info: 帧信息(帧号、时间戳等)
+        """
+        emit_start = time.perf_counter()
+        try:
+            info = dict(info) if info else {'camera_id': self.camera_id}
+            info['sequence'] = self._latest_frame.publish(frame, info)
+            record = Frame.from_info(frame, info, owner=self)
+            # 帧队列的引用，被消费者取出后由消费者归还，被丢弃时由队列归还
+            self.retain_frame(frame)
+            # BLOCK策略下设置超时，保证采集线程能及时响应停止请求
+            timeout = 1.0 if self._frame_channel.policy == BLOCK else None
+            try:
+                self._frame_channel.put(record, timeout=timeout)
+            except Exception:
+                self.release_frame(frame)
+                raise
+            recorder = self._recorder
+            if recorder is not None:
+                if self._zero_copy and self._lease_manager.get_lease(frame) is not None:
+                    # 零拷贝帧引用的SDK缓冲区很快会被归还，录制前必须拷贝
+                    recorder.write(frame.copy(), info)
+                else:
+                    recorder.write(record, info)
+        finally:
+            # 归还采集线程借出缓冲区(或登记租约)时持有的引用
+            self.release_frame(frame)
+        metrics.observe(STAGE_EMIT, (time.perf_counter() - emit_start) * 1000.0)
+        if 'frame_number' in info:
+            metrics.track_frame(info.get('camera_id', self.camera_id), info['frame_number'])
+    
+    def _release_queued(self, record: Frame) -> None:
+        """帧队列丢弃一帧时归还其缓冲区引用"""
+        self.release_frame(record.array)
+    
+    def _emit_frame_ready(self, record: Frame) -> None:
+        """帧队列由空变为非空时发布帧就绪事件(在采集线程中调用)，界面进程中桥接到frame_ready_signal"""
+        event_bus.publish(FRAME_READY, record, record.camera_id)
+    
+    def get_frame_channel(self) -> FrameChannel:
+        """
+        获取采集线程与消费者之间的帧队列
+        
+        Returns:
+            帧通道，元素为带帧号、时间戳等元数据的Frame
+        """
+        return self._frame_channel
+    
+    def set_frame_queue(self, depth: int = None, policy: str = None) -> None:
+        """
+        设置帧队列的深度和丢帧策略
+        
+        Args:
+            depth: 队列深度，None表示不修改
+            policy: drop_oldest / drop_newest / block，None表示不修改
+        """
+        if depth is not None:
+            self._frame_channel.set_depth(depth)
+        if policy is not None:
+            self._frame_channel.set_policy(policy)
+    
+    def get_frame_queue_stats(self) -> Dict[str, Any]:
+        """
+        获取帧队列统计信息
+        
+        Returns:
+            队列深度、当前长度、丢帧数等
+        """
+        return self._frame_channel.get_stats()
+    
+    def set_buffer_pool_size(self, pool_size: int) -> None:
+        """
+        设置帧缓冲池容量
+        
+        Args:
+            pool_size: 缓冲区数量，应不小于消费者同时持有的帧数
+        """
+        self._buffer_pool.set_pool_size(pool_size)
+    
+    def get_buffer_pool_stats(self) -> Dict[str, Any]:
+        """
+        获取帧缓冲池统计信息，用于在负载下调整缓冲池大小
+        
+        Returns:
+            命中/未命中/耗尽等计数
+        """
+        return self._buffer_pool.get_stats()
+    
+    def retain_frame(self, frame: np.ndarray) -> bool:
+        """
+        为新的持有者增加缓冲区引用，例如把取到的帧同时交给另一个线程保存
+        
+        Args:
+            frame: 从帧队列或get_frame取到的Frame或其图像数组
+            
+        Returns:
+            是否增加了引用；帧不来自缓冲池或租约时返回False
+        """
+        frame = as_array(frame)
+        return self._lease_manager.retain_array(frame) or self._buffer_pool.retain_array(frame)
+    
+    def release_frame(self, frame: np.ndarray) -> bool:
+        """
+        消费者用完帧后归还其缓冲区引用，零拷贝帧则归还租约的引用
+        
+        从帧队列或get_frame取得的每一帧、以及每次retain_frame，都对应一次release_frame；
+        所有持有者(最新帧槽位、帧队列、录制器、消费者)都归还后缓冲区才会被复用，零拷贝帧才会归还给SDK。
+        
+        Args:
+            frame: 从帧队列或get_frame取到的Frame或其图像数组
+            
+        Returns:
+            是否成功归还
+        """
+        frame = as_array(frame)
+        if self._lease_manager.release_array(frame):
+            return True
+        return self._buffer_pool.release_array(frame)
+    
+    def start_recording(self, directory: str, prefix: str = "", **kwargs) -> Optional[StreamRecorder]:
+        """
+        开始把原始帧录制到分块文件
+        
+        Args:
+            directory: 录制目录
+            prefix: 文件名前缀，为空时使用"相机ID_开始时间"
+            **kwargs: 传给StreamRecorder的其他参数(chunk_size、queue_depth、policy)
+            
+        Returns:
+            录制器，失败时返回None
+        """
+        if self._recorder is not None:
+            logger.warning("相机已在录制中")
+            return self._recorder
+        recorder = StreamRecorder(directory, prefix, camera_id=self.camera_id, **kwargs)
+        if not recorder.start():
+            return None
+        self._recorder = recorder
+        return recorder
+    
+    def stop_recording(self) -> Dict[str, Any]:
+        """
+        停止录制
+        
+        Returns:
+            录制统计信息(帧数、分块数、丢帧数、吞吐等)，未在录制时返回空字典
+        """
+        recorder, self._recorder = self._recorder, None
+        if recorder is None:
+            return {}
+        return recorder.stop()
+    
+    def get_recording_stats(self) -> Dict[str, Any]:
+        """
+        获取录制统计信息
+        
+        Returns:
+            录制统计信息，未在录制时返回空字典
+        """
+        recorder = self._recorder
+        return recorder.get_stats() if recorder is not None else {}
+    
+    def set_zero_copy(self, enabled: bool, max_leases: int = None) -> None:
+        """
+        设置零拷贝模式
+        
+        开启后，Mono8(单通道输出)和BGR8等无需转换的帧以只读视图直接引用SDK缓冲区，
+        消费者用完后应调用release_frame()或Frame.release()尽快归还，
+        否则SDK缓冲节点耗尽会导致丢帧；借出数量达到上限时自动退回拷贝模式。
+        关闭后不再借出新的租约，已借出的租约在持有者全部归还后归还给SDK。
+        
+        Args:
+            enabled: 是否开启
+            max_leases: 最多同时借出的SDK缓冲区数量，None表示不修改
+        """
+        self._zero_copy = bool(enabled)
+        if max_leases is not None:
+            self._lease_manager.set_max_leases(max_leases)
+        logger.info(f"零拷贝模式: {self._zero_copy}")
+    
+    def get_frame_lease(self, frame: np.ndarray) -> FrameLease:
+        """
+        获取零拷贝帧对应的租约，可用作上下文管理器(退出时归还调用者的引用，等同于release_frame)
+        
+        Args:
+            frame: 从帧队列或get_frame取到的Frame或其图像数组
+            
+        Returns:
+            租约对象，非零拷贝帧返回None
+        """
+        return self._lease_manager.get_lease(as_array(frame))
+    
+    def get_lease_stats(self) -> Dict[str, Any]:
+        """
+        获取零拷贝租约统计信息
+        
+        Returns:
+            借出/释放/拒绝次数和未归还的租约数
+        """
+        return self._lease_manager.get_stats()
+    
+    def set_mono_output_bgr(self, to_bgr: bool) -> None:
+        """
+        设置单色相机是否输出BGR三通道图像
+        
+        默认输出单通道图像，只有需要三通道的消费者才应开启。
+        
+        Args:
+            to_bgr: 是否扩展为BGR
+        """
+        self._mono_to_bgr = bool(to_bgr)
+    
     def __del__(self):
         """
         析构函数，确保资源被释放
@@ -1122,7 +1921,7 @@ class HikvisionCamera(CameraInterface):
                 self._exposure_time = exposure_time
                 return True
                 
-            ret = self._obj_cam.MV_CC_SetFloatValue("ExposureTime", float(exposure_time))
+            ret = self._write_node("ExposureTime", float(exposure_time))
             if ret != 0:
                 logger.error(f"设置曝光时间失败，错误码：{ret}")
                 return False
@@ -1146,14 +1945,12 @@ class HikvisionCamera(CameraInterface):
             return self._exposure_time
             
         try:
-            stFloatParam_exposureTime = MVCC_FLOATVALUE()
-            ctypes.memset(byref(stFloatParam_exposureTime), 0, sizeof(MVCC_FLOATVALUE))
-            ret = self._obj_cam.MV_CC_GetFloatValue("ExposureTime", stFloatParam_exposureTime)
-            if ret != 0:
-                logger.error(f"获取曝光时间失败，错误码：{ret}")
+            value = self._read_node("ExposureTime", NODE_FLOAT)
+            if value is None:
+                logger.error("获取曝光时间失败")
                 return self._exposure_time
                 
-            self._exposure_time = stFloatParam_exposureTime.fCurValue
+            self._exposure_time = value
             return self._exposure_time
         except Exception as e:
             logger.error(f"获取曝光时间失败: {str(e)}")
@@ -1175,7 +1972,7 @@ class HikvisionCamera(CameraInterface):
                 self._gain = gain
                 return True
                 
-            ret = self._obj_cam.MV_CC_SetFloatValue("Gain", float(gain))
+            ret = self._write_node("Gain", float(gain))
             if ret != 0:
                 logger.error(f"设置增益失败，错误码：{ret}")
                 return False
@@ -1199,14 +1996,12 @@ class HikvisionCamera(CameraInterface):
             return self._gain
             
         try:
-            stFloatParam_gain = MVCC_FLOATVALUE()
-            ctypes.memset(byref(stFloatParam_gain), 0, sizeof(MVCC_FLOATVALUE))
-            ret = self._obj_cam.MV_CC_GetFloatValue("Gain", stFloatParam_gain)
-            if ret != 0:
-                logger.error(f"获取增益失败，错误码：{ret}")
+            value = self._read_node("Gain", NODE_FLOAT)
+            if value is None:
+                logger.error("获取增益失败")
                 return self._gain
                 
-            self._gain = stFloatParam_gain.fCurValue
+            self._gain = value
             return self._gain
         except Exception as e:
             logger.error(f"获取增益失败: {str(e)}")
@@ -1228,39 +2023,34 @@ class HikvisionCamera(CameraInterface):
         """
         if self._is_simulation:
             self._roi = (x, y, width, height)
+            self._buffer_pool.invalidate()
             return True
             
-        try:
-            # 设置宽度
-            ret = self._obj_cam.MV_CC_SetWidth(width)
-            if ret != 0:
-                logger.error(f"设置ROI宽度失败，错误码：{ret}")
-                return False
-                
-            # 设置高度
-            ret = self._obj_cam.MV_CC_SetHeight(height)
-            if ret != 0:
-                logger.error(f"设置ROI高度失败，错误码：{ret}")
-                return False
-                
-            # 设置偏移X
-            ret = self._obj_cam.MV_CC_SetOffsetX(x)
-            if ret != 0:
-                logger.error(f"设置ROI X偏移失败，错误码：{ret}")
-                return False
-                
-            # 设置偏移Y
-            ret = self._obj_cam.MV_CC_SetOffsetY(y)
-            if ret != 0:
-                logger.error(f"设置ROI Y偏移失败，错误码：{ret}")
-                return False
-                
+        current = self.get_parameters(['offset_x', 'offset_y', 'width', 'height']) or {}
+        if (current.get('offset_x'), current.get('offset_y'), current.get('width'), current.get('height')) == \
+                (x, y, width, height):
             self._roi = (x, y, width, height)
-            logger.info(f"设置ROI成功: x={x}, y={y}, width={width}, height={height}")
             return True
-        except Exception as e:
-            logger.error(f"设置ROI失败: {str(e)}")
-            return False
+
+        # 偏移加尺寸不能超出传感器，扩大ROI时先把偏移归零再设置尺寸和目标偏移；与当前值相同的节点不会写入
+        steps = [
+            ("尺寸", {'width': width, 'height': height}),
+            ("偏移", {'offset_x': x, 'offset_y': y}),
+        ]
+        if width > current.get('width', 0) or height > current.get('height', 0):
+            steps.insert(0, ("偏移", {'offset_x': 0, 'offset_y': 0}))
+        for label, values in steps:
+            results = self.set_parameters(values) or {}
+            failed = [name for name in values if not results.get(name)]
+            if failed:
+                logger.error(f"设置ROI{label}失败: {', '.join(failed)}")
+                return False
+                
+        self._roi = (x, y, width, height)
+        # ROI写入成功后图像尺寸改变，丢弃旧规格的缓冲区
+        self._buffer_pool.invalidate()
+        logger.info(f"设置ROI成功: x={x}, y={y}, width={width}, height={height}")
+        return True
 
     @handle_exception
     def get_roi(self) -> Tuple[int, int, int, int]:
@@ -1273,44 +2063,12 @@ class HikvisionCamera(CameraInterface):
         if self._is_simulation:
             return self._roi
             
-        try:
-            # 获取宽度
-            stWidthParam = MV_GENTL_INT_VALUE()
-            ret = self._obj_cam.MV_CC_GetWidth(stWidthParam)
-            if ret != 0:
-                logger.error(f"获取ROI宽度失败，错误码：{ret}")
-                return self._roi
-            width = stWidthParam.nCurValue
-            
-            # 获取高度
-            stHeightParam = MV_GENTL_INT_VALUE()
-            ret = self._obj_cam.MV_CC_GetHeight(stHeightParam)
-            if ret != 0:
-                logger.error(f"获取ROI高度失败，错误码：{ret}")
-                return self._roi
-            height = stHeightParam.nCurValue
-            
-            # 获取偏移X
-            stOffsetXParam = MV_GENTL_INT_VALUE()
-            ret = self._obj_cam.MV_CC_GetOffsetX(stOffsetXParam)
-            if ret != 0:
-                logger.error(f"获取ROI X偏移失败，错误码：{ret}")
-                return self._roi
-            offset_x = stOffsetXParam.nCurValue
-            
-            # 获取偏移Y
-            stOffsetYParam = MV_GENTL_INT_VALUE()
-            ret = self._obj_cam.MV_CC_GetOffsetY(stOffsetYParam)
-            if ret != 0:
-                logger.error(f"获取ROI Y偏移失败，错误码：{ret}")
-                return self._roi
-            offset_y = stOffsetYParam.nCurValue
-            
-            self._roi = (offset_x, offset_y, width, height)
-            return self._roi
-        except Exception as e:
-            logger.error(f"获取ROI失败: {str(e)}")
+        params = self.get_parameters(['offset_x', 'offset_y', 'width', 'height'])
+        if not params or len(params) < 4:
+            logger.error("获取ROI失败")
             return self._roi
+        self._roi = (params['offset_x'], params['offset_y'], params['width'], params['height'])
+        return self._roi
 
     @handle_exception
     def reset_roi(self) -> bool:
@@ -1321,19 +2079,18 @@ class HikvisionCamera(CameraInterface):
             是否成功重置
         """
         if self._is_simulation:
+            self._buffer_pool.invalidate()
             self._roi = (0, 0, self._frame_width, self._frame_height)
             return True
             
         try:
-            # 获取相机信息
-            device_info = self.get_device_info()
-            if not device_info:
-                logger.error("重置ROI失败，未获取到设备信息")
+            # 获取最大宽度和高度(传感器尺寸)
+            size = self.get_parameters(['WidthMax', 'HeightMax']) or {}
+            if len(size) < 2:
+                logger.error("重置ROI失败，未获取到传感器尺寸")
                 return False
-                
-            # 获取最大宽度和高度
-            max_width = int(device_info.get("Width", 1920))
-            max_height = int(device_info.get("Height", 1080))
+            max_width = int(size['WidthMax'])
+            max_height = int(size['HeightMax'])
             
             # 设置为最大ROI
             return self.set_roi(0, 0, max_width, max_height)
@@ -1368,34 +2125,23 @@ class HikvisionCamera(CameraInterface):
         try:
             device_info = {}
             
-            # 获取设备信息
-            stDeviceInfo = self._obj_cam.MV_CC_GetDeviceInfo()
+            # 打开设备时使用的设备信息
+            stDeviceInfo = self._device_info
             if stDeviceInfo is None:
                 logger.error("获取设备信息失败")
                 return {}
                 
             # 基本信息
-            device_info["DeviceType"] = "GigE" if stDeviceInfo.nTLayerType == MV_GIGE_DEVICE else "USB"
-            
-            # 如果是GigE相机
-            if stDeviceInfo.nTLayerType == MV_GIGE_DEVICE:
-                try:
-                    device_info["VendorName"] = stDeviceInfo.SpecialInfo.stGigEInfo.chManufacturerName.decode('ascii').strip('\0')
-                    device_info["ModelName"] = stDeviceInfo.SpecialInfo.stGigEInfo.chModelName.decode('ascii').strip('\0')
-                    device_info["SerialNumber"] = stDeviceInfo.SpecialInfo.stGigEInfo.chSerialNumber.decode('ascii').strip('\0')
-                except:
-                    device_info["VendorName"] = "Unknown"
-                    device_info["ModelName"] = "Unknown"
-                    device_info["SerialNumber"] = "Unknown"
+            parsed = _parse_device_info(stDeviceInfo, str(self._connect_num))
+            device_info["DeviceType"] = parsed['device_type']
+            device_info["VendorName"] = parsed['vendor_name']
+            device_info["ModelName"] = parsed['model_name']
+            device_info["SerialNumber"] = parsed['serial_number']
                     
-            # 获取宽度和高度
-            width_value = MV_GENTL_INT_VALUE()
-            self._obj_cam.MV_CC_GetWidth(width_value)
-            device_info["Width"] = width_value.nCurValue
-            
-            height_value = MV_GENTL_INT_VALUE()
-            self._obj_cam.MV_CC_GetHeight(height_value)
-            device_info["Height"] = height_value.nCurValue
+            # 获取最大宽度和高度(传感器尺寸)
+            size = self.get_parameters(['WidthMax', 'HeightMax', 'width', 'height'])
+            device_info["Width"] = size.get('WidthMax', size.get('width', self._frame_width))
+            device_info["Height"] = size.get('HeightMax', size.get('height', self._frame_height))
             
             return device_info
         except Exception as e:
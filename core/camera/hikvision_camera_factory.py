@@ -20,15 +20,18 @@ class HikvisionCameraFactory(CameraFactory):
     负责创建海康威视相机对象，实现CameraFactory接口。
     """
     
-    def create_camera(self) -> CameraInterface:
+    def create_camera(self, simulation: bool = False) -> CameraInterface:
         """
         创建海康威视相机对象
         
+        Args:
+            simulation: 是否使用模拟模式，SDK不可用时总是使用模拟模式
+            
         Returns:
             海康威视相机接口对象
         """
-        logger.info("创建海康威视相机实例")
-        return HikvisionCamera()
+        logger.info("创建海康威视相机实例" + ("(模拟模式)" if simulation else ""))
+        return HikvisionCamera(simulation=simulation)
 
 
 # 注册海康威视相机工厂到工厂管理器
@@ -0,0 +1,366 @@
+"""
+多相机管理模块
+
+一台工控机同时连接多台海康相机时，统一打开、启动和停止所有相机：
+- 每台相机使用独立的HikvisionCamera实例(独立的SDK句柄和采集线程)
+- 每台相机再配一个取帧工作线程，阻塞在get_frame_with_info上，把帧分发给注册的处理函数
+- 帧以设备序列号标记，frame_ready_signal和帧队列中的相机ID也是序列号
+- 汇总每台相机的帧率、丢帧和延迟统计
+"""
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .hikvision_camera import HikvisionCamera
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+# 处理函数签名: (序列号, 图像, 帧信息) -> None
+FrameHandler = Callable[[str, np.ndarray, Dict[str, Any]], None]
+
+# 统计窗口长度(帧)
+_STATS_WINDOW = 120
+
+
+class ManagedCamera:
+    """
+    被管理的单台相机及其取帧工作线程和统计信息
+    """
+
+    def __init__(self, serial: str, camera: HikvisionCamera, device_info: Dict[str, Any]):
+        self.serial = serial
+        self.camera = camera
+        self.device_info = device_info
+        self.worker: Optional[threading.Thread] = None
+        self.running = False
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """清零统计信息"""
+        with self._lock:
+            self.frames = 0
+            self.missed = 0
+            self.handler_errors = 0
+            self.last_frame_number = None
+            self.receive_times = deque(maxlen=_STATS_WINDOW)
+            self.latencies = deque(maxlen=_STATS_WINDOW)
+
+    def record(self, info: Dict[str, Any], now: float) -> None:
+        """
+        记录收到的一帧
+
+        Args:
+            info: 帧信息
+            now: 收到帧的时间
+        """
+        with self._lock:
+            self.frames += 1
+            frame_number = info.get('frame_number')
+            if frame_number is not None:
+                # 帧号不连续说明工作线程处理不过来，最新帧槽位中的帧被覆盖
+                if self.last_frame_number is not None and frame_number > self.last_frame_number + 1:
+                    self.missed += frame_number - self.last_frame_number - 1
+                self.last_frame_number = frame_number
+            self.receive_times.append(now)
+            timestamp = info.get('timestamp')
+            if timestamp:
+                self.latencies.append(now - timestamp)
+
+    def record_handler_error(self) -> None:
+        """记录一次帧处理函数异常"""
+        with self._lock:
+            self.handler_errors += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取单台相机的统计信息
+
+        Returns:
+            帧率、帧数、丢帧数、延迟(毫秒)等
+        """
+        with self._lock:
+            times = list(self.receive_times)
+            latencies = list(self.latencies)
+            stats = {
+                'serial': self.serial,
+                'running': self.running,
+                'frames': self.frames,
+                'missed': self.missed,
+                'handler_errors': self.handler_errors,
+                'fps': 0.0,
+                'latency_ms_avg': 0.0,
+                'latency_ms_max': 0.0,
+            }
+        if len(times) >= 2 and times[-1] > times[0]:
+            # 最近一帧太久以前时认为帧率为0
+            if time.time() - times[-1] < 2.0:
+                stats['fps'] = (len(times) - 1) / (times[-1] - times[0])
+        if latencies:
+            stats['latency_ms_avg'] = sum(latencies) * 1000.0 / len(latencies)
+            stats['latency_ms_max'] = max(latencies) * 1000.0
+        queue_stats = self.camera.get_frame_queue_stats()
+        stats['queue_dropped'] = queue_stats['dropped'] + queue_stats['superseded']
+        stats['pool_exhausted'] = self.camera.get_buffer_pool_stats()['exhausted']
+        return stats
+
+
+class MultiCameraManager:
+    """
+    多相机采集管理器
+    """
+
+    def __init__(self, camera_factory: Callable[..., HikvisionCamera] = HikvisionCamera,
+                 frame_timeout: int = 1000):
+        """
+        初始化多相机管理器
+
+        Args:
+            camera_factory: 创建相机实例的可调用对象，支持simulation关键字参数
+            frame_timeout: 工作线程等待一帧的超时时间(毫秒)
+        """
+        self._camera_factory = camera_factory
+        self._frame_timeout = frame_timeout
+        self._cameras: Dict[str, ManagedCamera] = {}
+        self._handlers: List[FrameHandler] = []
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 设备管理
+    # ------------------------------------------------------------------
+
+    def enumerate_devices(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        枚举所有可用设备
+
+        Args:
+            refresh: 是否忽略缓存的枚举结果重新扫描
+
+        Returns:
+            设备信息列表
+        """
+        probe = self._camera_factory()
+        return probe.enumerate_devices(refresh=refresh) or []
+
+    def open_all(self, serials: Optional[List[str]] = None) -> List[str]:
+        """
+        打开枚举到的设备
+
+        Args:
+            serials: 只打开这些序列号的设备，None表示全部打开
+
+        Returns:
+            成功打开的设备序列号列表
+        """
+        opened = []
+        for device in self.enumerate_devices():
+            serial = device.get('serial_number') or device.get('device_id')
+            if serials is not None and serial not in serials:
+                continue
+            if serial in self._cameras:
+                opened.append(serial)
+                continue
+            camera = self._camera_factory()
+            if not camera.open(device['device_id']):
+                logger.error(f"打开相机失败: {serial}")
+                continue
+            self._add_camera(serial, camera, device)
+            opened.append(serial)
+        logger.info(f"已打开 {len(opened)} 台相机: {opened}")
+        return opened
+
+    def open_simulated(self, count: int, frame_rate: float = 30.0) -> List[str]:
+        """
+        打开N台模拟相机，每台运行自己的模拟采集线程，用于负载测试
+
+        Args:
+            count: 相机数量
+            frame_rate: 每台相机的帧率
+
+        Returns:
+            模拟相机的序列号列表
+        """
+        opened = []
+        for i in range(count):
+            serial = f"SIM{i + 1:03d}"
+            if serial in self._cameras:
+                opened.append(serial)
+                continue
+            camera = self._camera_factory(simulation=True)
+            camera.open(serial)
+            camera.set_parameter(frame_rate=frame_rate)
+            self._add_camera(serial, camera, {'device_id': serial, 'serial_number': serial,
+                                              'device_name': f"模拟相机{i + 1}"})
+            opened.append(serial)
+        logger.info(f"已打开 {len(opened)} 台模拟相机")
+        return opened
+
+    def close_all(self) -> None:
+        """停止并关闭所有相机"""
+        self.stop_all()
+        with self._lock:
+            cameras = list(self._cameras.values())
+            self._cameras.clear()
+        for managed in cameras:
+            managed.camera.close()
+        logger.info("已关闭所有相机")
+
+    def get_serials(self) -> List[str]:
+        """获取已打开相机的序列号列表"""
+        with self._lock:
+            return list(self._cameras.keys())
+
+    def get_camera(self, serial: str) -> Optional[HikvisionCamera]:
+        """
+        根据序列号获取相机实例
+
+        Args:
+            serial: 设备序列号
+
+        Returns:
+            相机实例，不存在时返回None
+        """
+        with self._lock:
+            managed = self._cameras.get(serial)
+        return managed.camera if managed else None
+
+    # ------------------------------------------------------------------
+    # 采集控制
+    # ------------------------------------------------------------------
+
+    def start_all(self, acquisition_mode: Optional[str] = None) -> List[str]:
+        """
+        启动所有相机的采集和取帧工作线程
+
+        Args:
+            acquisition_mode: 采集方式("poll"/"callback")，None表示使用各相机的设置
+
+        Returns:
+            成功启动的相机序列号列表
+        """
+        started = []
+        with self._lock:
+            cameras = list(self._cameras.values())
+        for managed in cameras:
+            if managed.running:
+                started.append(managed.serial)
+                continue
+            if not managed.camera.start_grabbing(acquisition_mode):
+                logger.error(f"相机 {managed.serial} 开始采集失败")
+                continue
+            managed.running = True
+            managed.worker = threading.Thread(target=self._worker_loop, args=(managed,),
+                                              name=f"CameraWorker-{managed.serial}", daemon=True)
+            managed.worker.start()
+            started.append(managed.serial)
+        return started
+
+    def stop_all(self) -> None:
+        """停止所有相机的采集和取帧工作线程"""
+        with self._lock:
+            cameras = list(self._cameras.values())
+        for managed in cameras:
+            managed.running = False
+        # 先等工作线程退出(阻塞在get_frame上的线程最多frame_timeout后醒来)，
+        # 避免停止采集时仍有线程在处理帧或持有帧
+        for managed in cameras:
+            if managed.worker is not None:
+                managed.worker.join(timeout=self._frame_timeout / 1000.0 + 1.0)
+                managed.worker = None
+        for managed in cameras:
+            managed.camera.stop_grabbing()
+
+    # ------------------------------------------------------------------
+    # 帧分发
+    # ------------------------------------------------------------------
+
+    def add_frame_handler(self, handler: FrameHandler) -> None:
+        """
+        注册帧处理函数，在各相机的工作线程中调用
+
+        图像只在处理函数执行期间有效，返回后缓冲区会被复用；需要保留图像时拷贝，
+        或调用get_camera(序列号).retain_frame(图像)并在用完后release_frame。
+
+        Args:
+            handler: 处理函数(序列号, 图像, 帧信息)
+        """
+        with self._lock:
+            if handler not in self._handlers:
+                self._handlers.append(handler)
+
+    def remove_frame_handler(self, handler: FrameHandler) -> None:
+        """注销帧处理函数"""
+        with self._lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取所有相机的统计信息
+
+        Returns:
+            {'cameras': {序列号: 单台统计}, 'total': 汇总统计}
+        """
+        with self._lock:
+            cameras = list(self._cameras.values())
+        per_camera = {managed.serial: managed.get_stats() for managed in cameras}
+        values = list(per_camera.values())
+        total = {
+            'camera_count': len(values),
+            'running': sum(1 for v in values if v['running']),
+            'fps': sum(v['fps'] for v in values),
+            'frames': sum(v['frames'] for v in values),
+            'missed': sum(v['missed'] for v in values),
+            'queue_dropped': sum(v['queue_dropped'] for v in values),
+            'latency_ms_max': max((v['latency_ms_max'] for v in values), default=0.0),
+        }
+        return {'cameras': per_camera, 'total': total}
+
+    def reset_stats(self) -> None:
+        """清零所有相机的统计信息"""
+        with self._lock:
+            cameras = list(self._cameras.values())
+        for managed in cameras:
+            managed.reset_stats()
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _add_camera(self, serial: str, camera: HikvisionCamera, device_info: Dict[str, Any]) -> None:
+        """登记相机并以序列号作为帧标记"""
+        camera.set_camera_id(serial)
+        with self._lock:
+            self._cameras[serial] = ManagedCamera(serial, camera, device_info)
+
+    def _worker_loop(self, managed: ManagedCamera) -> None:
+        """单台相机的取帧工作线程"""
+        logger.info(f"相机 {managed.serial} 取帧线程启动")
+        while managed.running:
+            frame, info = managed.camera.get_frame_with_info(self._frame_timeout, auto_start=False) or (None, {})
+            if frame is None:
+                if not managed.camera.is_grabbing():
+                    time.sleep(0.05)
+                continue
+            managed.record(info, time.time())
+            with self._lock:
+                handlers = list(self._handlers)
+            try:
+                for handler in handlers:
+                    try:
+                        handler(managed.serial, frame, info)
+                    except Exception as e:
+                        managed.record_handler_error()
+                        logger.error(f"相机 {managed.serial} 帧处理函数异常: {str(e)}")
+            finally:
+                # 所有处理函数返回后归还缓冲区，需要保留图像的处理函数应自行拷贝或retain_frame
+                managed.camera.release_frame(frame)
+        logger.info(f"相机 {managed.serial} 取帧线程退出")
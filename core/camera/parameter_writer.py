@@ -0,0 +1,239 @@
+"""
+相机参数写入模块
+
+拖动曝光/增益滑块时每个valueChanged都会产生一次参数修改，逐个同步写入相机会让界面线程等待SDK往返，
+并与采集线程争用相机。ParameterWriter把写入移到后台线程：
+- submit只把参数放入待写字典并立即返回，同一参数尚未写入时新值覆盖旧值(只写最后一个值)
+- 写入线程把积攒的参数作为一批交给写入函数，两批之间至少间隔min_interval，限制SDK写入频率
+- 写入结果(相机修正后的实际值和是否成功)通过回调在写入线程中异步返回
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..utils.logger import get_logger
+from ..utils.metrics import Histogram
+
+logger = get_logger()
+
+# 写入函数: 参数字典 -> (实际值字典, {参数名: 是否成功})
+ApplyFunc = Callable[[Dict[str, Any]], Tuple[Dict[str, Any], Dict[str, bool]]]
+
+# 写入完成回调: (请求的参数字典, 实际值字典, {参数名: 是否成功})
+ResultCallback = Callable[[Dict[str, Any], Dict[str, Any], Dict[str, bool]], None]
+
+# 默认两批写入之间的最小间隔(秒)
+DEFAULT_MIN_INTERVAL = 0.05
+
+
+class ParameterWriter:
+    """
+    合并写入的后台参数写入器
+
+        writer = ParameterWriter(apply_func, result_callback=on_applied)
+        writer.start()
+        slider.valueChanged.connect(lambda v: writer.submit("exposure_time", v))
+        ...
+        writer.stop()
+    """
+
+    def __init__(self, apply_func: ApplyFunc, result_callback: Optional[ResultCallback] = None,
+                 min_interval: float = DEFAULT_MIN_INTERVAL, name: str = "ParameterWriter"):
+        """
+        初始化参数写入器
+
+        Args:
+            apply_func: 在写入线程中调用的写入函数
+            result_callback: 每批写入完成后的回调，None表示不回报
+            min_interval: 两批写入之间的最小间隔(秒)
+            name: 写入线程名称
+        """
+        self._apply_func = apply_func
+        self._result_callback = result_callback
+        self.min_interval = max(0.0, float(min_interval))
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pending: Dict[str, Any] = {}
+        self._applying = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._last_apply = 0.0
+        self._apply_time = Histogram(f"{name}_apply")
+
+        self.reset_stats()
+
+    @property
+    def running(self) -> bool:
+        """写入线程是否在运行"""
+        return self._running
+
+    def start(self) -> bool:
+        """
+        启动写入线程
+
+        Returns:
+            是否启动成功
+        """
+        with self._lock:
+            if self._running:
+                return True
+            self._running = True
+        self._thread = threading.Thread(target=self._writer_thread, name=self.name, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, flush: bool = True, timeout: float = 2.0) -> None:
+        """
+        停止写入线程
+
+        Args:
+            flush: 是否先写完待写的参数；False时丢弃
+            timeout: 等待写入线程结束的最长时间(秒)
+        """
+        with self._lock:
+            if not self._running:
+                return
+            if not flush:
+                self._discard_pending()
+            self._running = False
+            self._changed.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, name: str, value: Any) -> None:
+        """
+        提交一个参数修改(不阻塞)
+
+        Args:
+            name: 参数名
+            value: 参数值
+        """
+        self.submit_many({name: value})
+
+    def submit_many(self, values: Dict[str, Any]) -> None:
+        """
+        提交一组参数修改(不阻塞)，同一批写入中一起生效
+
+        Args:
+            values: {参数名: 参数值}
+        """
+        with self._lock:
+            for name, value in values.items():
+                if name in self._pending:
+                    self._stats['coalesced'] += 1
+                self._pending[name] = value
+                self._stats['submitted'] += 1
+            self._changed.notify_all()
+
+    def is_pending(self, name: str) -> bool:
+        """参数是否有尚未写入的新值"""
+        with self._lock:
+            return name in self._pending
+
+    def clear(self) -> int:
+        """
+        丢弃尚未写入的参数(如相机断开时)
+
+        Returns:
+            丢弃的参数个数
+        """
+        with self._lock:
+            return self._discard_pending()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待待写参数全部写入
+
+        Args:
+            timeout: 最长等待时间(秒)，None表示一直等待
+
+        Returns:
+            是否已全部写入
+        """
+        with self._lock:
+            return self._changed.wait_for(lambda: not self._pending and not self._applying, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取写入统计信息
+
+        Returns:
+            提交数、被合并(覆盖)数、丢弃数、写入批数、写入参数数、失败数、待写参数数和写入耗时(毫秒)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        apply_ms = self._apply_time.snapshot()
+        stats['apply_ms_p50'] = apply_ms['p50']
+        stats['apply_ms_max'] = apply_ms['max']
+        return stats
+
+    def reset_stats(self) -> None:
+        """清零统计计数"""
+        with self._lock:
+            self._stats = {'submitted': 0, 'coalesced': 0, 'discarded': 0, 'batches': 0, 'written': 0,
+                           'failed': 0}
+        self._apply_time.reset()
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _discard_pending(self) -> int:
+        """丢弃待写参数，调用者持有锁"""
+        count = len(self._pending)
+        self._stats['discarded'] += count
+        self._pending = {}
+        self._changed.notify_all()
+        return count
+
+    def _next_batch(self) -> Optional[Dict[str, Any]]:
+        """等待下一批待写参数并遵守最小间隔；写入线程应退出时返回None"""
+        with self._lock:
+            while True:
+                if not self._pending:
+                    if not self._running:
+                        return None
+                    self._changed.wait()
+                    continue
+                wait = self._last_apply + self.min_interval - time.perf_counter()
+                if wait > 0 and self._running:
+                    # 等待期间到达的新值继续合并到同一批
+                    self._changed.wait(wait)
+                    continue
+                batch, self._pending = self._pending, {}
+                self._applying = True
+                return batch
+
+    def _writer_thread(self):
+        """写入线程函数：取出合并后的一批参数写入相机并回报结果"""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            started = time.perf_counter()
+            try:
+                applied, results = self._apply_func(batch)
+            except Exception as e:
+                logger.error(f"写入参数失败: {str(e)}")
+                applied, results = {}, {name: False for name in batch}
+            finished = time.perf_counter()
+            self._apply_time.observe((finished - started) * 1000.0)
+
+            # 回调结束后才算写完，flush返回时结果已经回报
+            if self._result_callback is not None:
+                try:
+                    self._result_callback(batch, applied, results)
+                except Exception as e:
+                    logger.error(f"参数写入回调出错: {str(e)}")
+
+            with self._lock:
+                self._last_apply = finished
+                self._applying = False
+                self._stats['batches'] += 1
+                self._stats['written'] += len(batch)
+                self._stats['failed'] += sum(1 for ok in results.values() if not ok)
+                self._changed.notify_all()
@@ -0,0 +1,277 @@
+"""
+像素格式转换模块
+
+提供以海康SDK像素格式常量(PixelType_Gvsp_*)为键的转换器注册表，
+把相机输出的原始数据转换为OpenCV使用的numpy数组。
+每种格式只做一次reshape视图或一次cv2.cvtColor调用；
+当数据布局已经是BGR时直接返回零拷贝视图。
+10/12位打包格式(两个像素占3字节)只取每个像素的高8位，不展开为16位。
+"""
+import math
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from .MvImport.PixelType_header import (
+    PixelType_Gvsp_Mono8, PixelType_Gvsp_Mono10, PixelType_Gvsp_Mono12,
+    PixelType_Gvsp_BayerRG8, PixelType_Gvsp_BayerGB8, PixelType_Gvsp_BayerGR8, PixelType_Gvsp_BayerBG8,
+    PixelType_Gvsp_BayerRG10, PixelType_Gvsp_BayerGB10, PixelType_Gvsp_BayerGR10, PixelType_Gvsp_BayerBG10,
+    PixelType_Gvsp_BayerRG12, PixelType_Gvsp_BayerGB12, PixelType_Gvsp_BayerGR12, PixelType_Gvsp_BayerBG12,
+    PixelType_Gvsp_Mono10_Packed, PixelType_Gvsp_Mono12_Packed,
+    PixelType_Gvsp_BayerRG10_Packed, PixelType_Gvsp_BayerGB10_Packed,
+    PixelType_Gvsp_BayerGR10_Packed, PixelType_Gvsp_BayerBG10_Packed,
+    PixelType_Gvsp_BayerRG12_Packed, PixelType_Gvsp_BayerGB12_Packed,
+    PixelType_Gvsp_BayerGR12_Packed, PixelType_Gvsp_BayerBG12_Packed,
+    PixelType_Gvsp_RGB8_Packed, PixelType_Gvsp_BGR8_Packed,
+    PixelType_Gvsp_YUV422_Packed, PixelType_Gvsp_YUV422_YUYV_Packed,
+)
+
+# 转换函数签名: (原始数据uint8一维数组, 宽, 高, 输出数组或None, 是否输出BGR) -> 图像
+ConvertFunc = Callable[[np.ndarray, int, int, Optional[np.ndarray], bool], np.ndarray]
+
+
+class PixelConverter:
+    """
+    单个像素格式的转换器描述
+
+    Attributes:
+        name: 格式名称
+        bytes_per_pixel: 原始数据每像素字节数(10/12位打包格式为1.5)
+        mono: 是否为单色格式(不输出BGR时保持单通道)
+        func: 转换函数
+        passthrough: 原始数据布局是否与输出一致(无需转换，可直接使用SDK缓冲区)
+    """
+    __slots__ = ('name', 'bytes_per_pixel', 'mono', 'func', 'passthrough')
+
+    def __init__(self, name: str, bytes_per_pixel: float, mono: bool, func: ConvertFunc,
+                 passthrough: bool = False):
+        self.name = name
+        self.bytes_per_pixel = bytes_per_pixel
+        self.mono = mono
+        self.func = func
+        self.passthrough = passthrough
+
+    def raw_size(self, width: int, height: int) -> int:
+        """原始数据字节数"""
+        return int(math.ceil(int(width) * int(height) * self.bytes_per_pixel))
+
+    def output_shape(self, width: int, height: int, to_bgr: bool = True) -> Tuple[int, ...]:
+        """输出数组形状"""
+        if self.mono and not to_bgr:
+            return (int(height), int(width))
+        return (int(height), int(width), 3)
+
+    def is_passthrough(self, to_bgr: bool = True) -> bool:
+        """在给定输出要求下，原始数据是否可以不经转换直接作为输出"""
+        return self.passthrough and not (self.mono and to_bgr)
+
+
+# 转换器注册表
+_converters: Dict[int, PixelConverter] = {}
+
+
+def register_converter(pixel_type: int, name: str, bytes_per_pixel: float,
+                       func: ConvertFunc, mono: bool = False, passthrough: bool = False) -> None:
+    """
+    注册像素格式转换器
+
+    Args:
+        pixel_type: PixelType_Gvsp_* 常量
+        name: 格式名称
+        bytes_per_pixel: 原始数据每像素字节数(10/12位打包格式为1.5)
+        func: 转换函数
+        mono: 是否为单色格式
+        passthrough: 原始数据布局是否与输出一致
+    """
+    _converters[int(pixel_type)] = PixelConverter(name, bytes_per_pixel, mono, func, passthrough)
+
+
+def get_converter(pixel_type: int) -> Optional[PixelConverter]:
+    """
+    获取像素格式对应的转换器
+
+    Args:
+        pixel_type: PixelType_Gvsp_* 常量
+
+    Returns:
+        转换器，未注册时返回None
+    """
+    return _converters.get(int(pixel_type))
+
+
+def is_supported(pixel_type: int) -> bool:
+    """判断像素格式是否已注册转换器"""
+    return int(pixel_type) in _converters
+
+
+def get_supported_formats() -> Dict[int, str]:
+    """获取所有已注册的像素格式 {pixel_type: name}"""
+    return {pixel_type: conv.name for pixel_type, conv in _converters.items()}
+
+
+def convert_frame(data: np.ndarray, width: int, height: int, pixel_type: int,
+                  out: Optional[np.ndarray] = None, to_bgr: bool = True) -> np.ndarray:
+    """
+    将原始图像数据转换为numpy图像
+
+    Args:
+        data: 原始数据(uint8一维数组或支持缓冲区协议的对象)
+        width: 图像宽度
+        height: 图像高度
+        pixel_type: PixelType_Gvsp_* 常量
+        out: 可选的预分配输出数组，形状需与output_shape一致
+        to_bgr: 单色格式是否扩展为BGR三通道
+
+    Returns:
+        转换后的图像，可能是输入数据的视图
+
+    Raises:
+        ValueError: 像素格式未注册或数据长度不足
+    """
+    converter = _converters.get(int(pixel_type))
+    if converter is None:
+        raise ValueError(f"不支持的像素格式: {pixel_type}")
+    if not isinstance(data, np.ndarray):
+        data = np.frombuffer(data, dtype=np.uint8)
+    raw_size = converter.raw_size(width, height)
+    if data.size < raw_size:
+        raise ValueError(f"图像数据长度不足: {data.size} < {raw_size} ({converter.name})")
+    return converter.func(data[:raw_size], int(width), int(height), out, to_bgr)
+
+
+# ---------------------------------------------------------------------------
+# 内置转换器
+# ---------------------------------------------------------------------------
+
+def _mono8(data, width, height, out, to_bgr):
+    """Mono8: 直接reshape为单通道视图，给出out时拷贝到out"""
+    mono = data.reshape(height, width)
+    if not to_bgr:
+        return _copy_to(mono, out)
+    return cv2.cvtColor(mono, cv2.COLOR_GRAY2BGR, dst=out)
+
+
+def _make_mono16(shift: int) -> ConvertFunc:
+    """Mono10/Mono12(16位非打包): 按位宽缩放到8位"""
+    scale = 1.0 / (1 << shift)
+
+    def convert(data, width, height, out, to_bgr):
+        mono16 = data.view(np.uint16).reshape(height, width)
+        if not to_bgr:
+            return cv2.convertScaleAbs(mono16, dst=out, alpha=scale)
+        mono8 = cv2.convertScaleAbs(mono16, alpha=scale)
+        return cv2.cvtColor(mono8, cv2.COLOR_GRAY2BGR, dst=out)
+    return convert
+
+
+def _make_bayer8(code: int) -> ConvertFunc:
+    """Bayer 8位: 一次cvtColor完成去马赛克"""
+    def convert(data, width, height, out, to_bgr):
+        return cv2.cvtColor(data.reshape(height, width), code, dst=out)
+    return convert
+
+
+def _make_bayer16(code: int, shift: int) -> ConvertFunc:
+    """Bayer 10/12位(16位非打包): 先缩放到8位再去马赛克"""
+    scale = 1.0 / (1 << shift)
+
+    def convert(data, width, height, out, to_bgr):
+        bayer8 = cv2.convertScaleAbs(data.view(np.uint16).reshape(height, width), alpha=scale)
+        return cv2.cvtColor(bayer8, code, dst=out)
+    return convert
+
+
+def _rgb8(data, width, height, out, to_bgr):
+    """RGB8: 一次cvtColor交换通道"""
+    return cv2.cvtColor(data.reshape(height, width, 3), cv2.COLOR_RGB2BGR, dst=out)
+
+
+def _bgr8(data, width, height, out, to_bgr):
+    """BGR8: 布局与OpenCV一致，返回零拷贝视图，给出out时拷贝到out"""
+    return _copy_to(data.reshape(height, width, 3), out)
+
+
+def _copy_to(image, out):
+    """out为None时直接返回image，否则拷贝到out并返回out"""
+    if out is None:
+        return image
+    np.copyto(out, image)
+    return out
+
+
+def _unpack_high_bytes(data, width, height, out=None):
+    """
+    10/12位打包数据取高8位
+
+    GigE Vision的Mono10Packed/Mono12Packed及对应Bayer格式中，每两个像素占3字节:
+    第0字节为像素0的高8位，第2字节为像素1的高8位，第1字节存放两个像素的低位。
+    只需要8位输出时跳过中间字节，不展开为16位。
+
+    Args:
+        data: 原始数据(uint8一维数组)
+        width: 图像宽度
+        height: 图像高度
+        out: 可选的(height, width)输出数组
+
+    Returns:
+        8位单通道图像
+    """
+    count = width * height
+    if out is None:
+        out = np.empty((height, width), dtype=np.uint8)
+    flat = out.reshape(-1)
+    flat[0::2] = data[0::3][:(count + 1) // 2]
+    flat[1::2] = data[2::3][:count // 2]
+    return out
+
+
+def _mono_packed(data, width, height, out, to_bgr):
+    """Mono10/Mono12打包: 取高8位，需要时再扩展为BGR"""
+    if not to_bgr:
+        return _unpack_high_bytes(data, width, height, out)
+    return cv2.cvtColor(_unpack_high_bytes(data, width, height), cv2.COLOR_GRAY2BGR, dst=out)
+
+
+def _make_bayer_packed(code: int) -> ConvertFunc:
+    """Bayer 10/12位打包: 取高8位后一次cvtColor完成去马赛克"""
+    def convert(data, width, height, out, to_bgr):
+        return cv2.cvtColor(_unpack_high_bytes(data, width, height), code, dst=out)
+    return convert
+
+
+def _make_yuv422(code: int) -> ConvertFunc:
+    """YUV422: 一次cvtColor转换为BGR"""
+    def convert(data, width, height, out, to_bgr):
+        return cv2.cvtColor(data.reshape(height, width, 2), code, dst=out)
+    return convert
+
+
+register_converter(PixelType_Gvsp_Mono8, "Mono8", 1, _mono8, mono=True, passthrough=True)
+register_converter(PixelType_Gvsp_Mono10, "Mono10", 2, _make_mono16(2), mono=True)
+register_converter(PixelType_Gvsp_Mono12, "Mono12", 2, _make_mono16(4), mono=True)
+register_converter(PixelType_Gvsp_Mono10_Packed, "Mono10_Packed", 1.5, _mono_packed, mono=True)
+register_converter(PixelType_Gvsp_Mono12_Packed, "Mono12_Packed", 1.5, _mono_packed, mono=True)
+
+# 注意: GenICam与OpenCV的Bayer命名不同，GenICam的BayerRG对应OpenCV的COLOR_BayerBG2BGR
+_BAYER_CODES = (
+    ("RG", cv2.COLOR_BayerBG2BGR, PixelType_Gvsp_BayerRG8, PixelType_Gvsp_BayerRG10, PixelType_Gvsp_BayerRG12,
+     PixelType_Gvsp_BayerRG10_Packed, PixelType_Gvsp_BayerRG12_Packed),
+    ("GB", cv2.COLOR_BayerGR2BGR, PixelType_Gvsp_BayerGB8, PixelType_Gvsp_BayerGB10, PixelType_Gvsp_BayerGB12,
+     PixelType_Gvsp_BayerGB10_Packed, PixelType_Gvsp_BayerGB12_Packed),
+    ("GR", cv2.COLOR_BayerGB2BGR, PixelType_Gvsp_BayerGR8, PixelType_Gvsp_BayerGR10, PixelType_Gvsp_BayerGR12,
+     PixelType_Gvsp_BayerGR10_Packed, PixelType_Gvsp_BayerGR12_Packed),
+    ("BG", cv2.COLOR_BayerRG2BGR, PixelType_Gvsp_BayerBG8, PixelType_Gvsp_BayerBG10, PixelType_Gvsp_BayerBG12,
+     PixelType_Gvsp_BayerBG10_Packed, PixelType_Gvsp_BayerBG12_Packed),
+)
+for _pattern, _code, _type8, _type10, _type12, _type10p, _type12p in _BAYER_CODES:
+    register_converter(_type8, f"Bayer{_pattern}8", 1, _make_bayer8(_code))
+    register_converter(_type10, f"Bayer{_pattern}10", 2, _make_bayer16(_code, 2))
+    register_converter(_type12, f"Bayer{_pattern}12", 2, _make_bayer16(_code, 4))
+    register_converter(_type10p, f"Bayer{_pattern}10_Packed", 1.5, _make_bayer_packed(_code))
+    register_converter(_type12p, f"Bayer{_pattern}12_Packed", 1.5, _make_bayer_packed(_code))
+
+register_converter(PixelType_Gvsp_RGB8_Packed, "RGB8", 3, _rgb8)
+register_converter(PixelType_Gvsp_BGR8_Packed, "BGR8", 3, _bgr8, passthrough=True)
+register_converter(PixelType_Gvsp_YUV422_Packed, "YUV422", 2, _make_yuv422(cv2.COLOR_YUV2BGR_UYVY))
+register_converter(PixelType_Gvsp_YUV422_YUYV_Packed, "YUV422_YUYV", 2, _make_yuv422(cv2.COLOR_YUV2BGR_YUYV))
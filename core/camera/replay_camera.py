@@ -0,0 +1,643 @@
+"""
+回放相机模块
+
+把录制的帧流文件(core.camera.frame_stream)当作一台相机回放，帧经过与真实相机相同的
+最新帧槽位、帧队列和帧就绪事件，检测算法的回归测试可以在没有SDK和相机的Linux机器上运行。
+"""
+import glob
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+from ..utils.error_handler import handle_exception
+from ..utils.event_bus import event_bus, FRAME_READY
+from ..utils.metrics import metrics, STAGE_EMIT
+from ..utils.frame_channel import (FrameChannel, LatestFrameSlot, DROP_OLDEST, BLOCK, DEFAULT_DEPTH,
+                                   register_channel, unregister_channel)
+from .camera_interface import CameraInterface
+from .frame import Frame
+from .frame_stream import FrameStreamReader, STREAM_EXTENSION
+from .stream_recorder import RecordingReader, INDEX_EXTENSION
+
+logger = get_logger()
+
+
+class ReplayCamera(CameraInterface):
+    """
+    回放相机类
+
+    内存映射帧流文件，连续模式下按录制时的帧间隔(可用speed加速)或以最快速度出图，
+    触发模式下每次trigger_once出一帧。曝光和增益只记录数值，不影响回放图像；ROI对回放图像裁剪。
+    """
+
+    def __init__(self, path: str = "", speed: float = 1.0, loop: bool = True, zero_copy: bool = False):
+        """
+        初始化回放相机
+
+        Args:
+            path: 帧流文件路径，也可以在open时指定；为目录时enumerate_devices列出其中的帧流文件
+            speed: 回放速度倍数，1.0按录制时的帧间隔，0表示以最快速度回放
+            loop: 播放到文件末尾后是否从头循环
+            zero_copy: 是否直接发布引用映射内存的只读数组(消费者不能在相机关闭后继续持有)
+        """
+        self._path = path
+        self._reader = None                     # FrameStreamReader或RecordingReader
+        self._speed = max(0.0, float(speed))
+        self._loop = loop
+        self._zero_copy = zero_copy
+        self._is_open = False
+        self._grabbing = False
+        self._exit = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._position = 0                      # 下一帧在文件中的序号
+        self._position_lock = threading.Lock()
+
+        # 参数(回放时只记录数值)
+        self._exposure_time = 0.0
+        self._gain = 0.0
+        self._roi: Optional[Tuple[int, int, int, int]] = None
+        self._trigger_mode = False
+        self._trigger = threading.Event()
+        self._trigger_index = 0
+
+        self._frame_channel = FrameChannel(DEFAULT_DEPTH, DROP_OLDEST, notify=self._emit_frame_ready,
+                                           name="replay")
+        self._latest_frame = LatestFrameSlot()
+        self._last_pulled_sequence = 0
+        self._camera_id = None
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+        logger.info("回放相机初始化完成")
+
+    def _reset_stats(self) -> None:
+        """清空吞吐统计"""
+        with self._stats_lock:
+            self._frames = 0
+            self._bytes = 0
+            self._loops = 0
+            self._late = 0
+            self._started = None
+            self._stopped = None
+            self._finished = False
+
+    @handle_exception
+    def enumerate_devices(self, refresh: bool = False,
+                          callback: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        枚举可回放的帧流文件和录制
+
+        path为目录时列出其中的全部录制索引和帧流文件，为文件时只返回该文件；列目录很快，不缓存结果
+
+        Args:
+            refresh: 无作用(每次都重新列出)
+            callback: 列出后以全部文件调用一次
+
+        Returns:
+            设备列表，device_id为文件路径
+        """
+        path = self._path or os.getcwd()
+        if os.path.isdir(path):
+            files = sorted(glob.glob(os.path.join(path, f"*{INDEX_EXTENSION}")))
+            files += sorted(glob.glob(os.path.join(path, f"*{STREAM_EXTENSION}")))
+        else:
+            files = [path] if os.path.isfile(path) else []
+        devices = []
+        for file in files:
+            name = os.path.splitext(os.path.basename(file))[0]
+            devices.append({
+                'device_id': file,
+                'device_name': f"回放-{name}",
+                'device_type': 'Replay',
+                'device_ip': None,
+                'vendor_name': 'Replay',
+                'model_name': 'ReplayCamera',
+                'serial_number': name,
+                'user_id': name,
+                'is_target_model': False,
+            })
+        if callback is not None:
+            callback(list(devices))
+        return devices
+
+    @handle_exception
+    def open(self, device_id: str = "") -> bool:
+        """
+        打开帧流文件或录制
+
+        Args:
+            device_id: 帧流文件(.afs)或录制索引(.afx)路径，为空时使用构造时的path(为目录时打开其中第一个)
+
+        Returns:
+            是否成功打开
+        """
+        if self._is_open:
+            logger.info("回放相机已打开")
+            return True
+
+        path = device_id or self._path
+        if path and os.path.isdir(path):
+            devices = self.enumerate_devices()
+            path = devices[0]['device_id'] if devices else ""
+        if not path or not os.path.isfile(path):
+            logger.error(f"帧流文件不存在: {path}")
+            return False
+
+        try:
+            if path.endswith(INDEX_EXTENSION):
+                self._reader = RecordingReader(path)
+            else:
+                self._reader = FrameStreamReader(path)
+        except (OSError, ValueError) as e:
+            logger.error(f"打开帧流文件失败: {str(e)}")
+            return False
+        if len(self._reader) == 0:
+            logger.error(f"帧流文件中没有帧: {path}")
+            self._reader.close()
+            self._reader = None
+            return False
+
+        self._path = path
+        self._position = 0
+        self._is_open = True
+        logger.info(f"打开帧流文件成功: {path}，共{len(self._reader)}帧，时长{self._reader.duration:.2f}秒")
+        return True
+
+    @handle_exception
+    def close(self) -> bool:
+        """
+        关闭帧流文件
+
+        Returns:
+            是否成功关闭
+        """
+        if not self._is_open:
+            return True
+        if self._grabbing:
+            self.stop_grabbing()
+        self._latest_frame.clear()
+        self._reader.close()
+        self._reader = None
+        self._is_open = False
+        logger.info("回放相机已关闭")
+        return True
+
+    def is_open(self) -> bool:
+        """
+        检查帧流文件是否已打开
+
+        Returns:
+            是否已打开
+        """
+        return self._is_open
+
+    @handle_exception
+    def start_grabbing(self) -> bool:
+        """
+        开始回放
+
+        Returns:
+            是否成功开始
+        """
+        if not self._is_open:
+            logger.error("回放相机未打开，无法开始采集")
+            return False
+        if self._grabbing:
+            logger.info("回放相机已在采集中")
+            return True
+
+        self._frame_channel.reopen()
+        self._latest_frame.reopen()
+        self._last_pulled_sequence = self._latest_frame.sequence
+        register_channel(self.camera_id, self._frame_channel)
+        self._reset_stats()
+        self._exit.clear()
+        self._trigger.clear()
+        self._grabbing = True
+        self._thread = threading.Thread(target=self._replay_thread, name="ReplayCamera", daemon=True)
+        self._thread.start()
+        logger.info(f"开始回放，速度: {'最快' if self._speed == 0 else f'{self._speed}x'}")
+        return True
+
+    @handle_exception
+    def stop_grabbing(self) -> bool:
+        """
+        停止回放，下次开始时从当前位置继续
+
+        Returns:
+            是否成功停止
+        """
+        if not self._grabbing:
+            return True
+        # 先唤醒可能阻塞在帧队列上的回放线程并等待其退出，再丢弃未取走的帧
+        self._exit.set()
+        self._frame_channel.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._frame_channel.clear()
+        self._latest_frame.close()
+        unregister_channel(self.camera_id, self._frame_channel)
+        self._grabbing = False
+        with self._stats_lock:
+            if self._stopped is None:
+                self._stopped = time.perf_counter()
+        logger.info("停止回放")
+        return True
+
+    def is_grabbing(self) -> bool:
+        """检查是否正在回放"""
+        return self._grabbing
+
+    def _replay_thread(self):
+        """
+        回放线程函数
+
+        连续模式下第i帧在 起点 + (录制时间戳[i] - 录制时间戳[起始帧]) / speed 时刻发布，
+        落后时不补偿等待，按录制节奏继续；触发模式下每次软触发发布下一帧。
+        """
+        logger.info("回放线程启动")
+        timestamps = self._reader.timestamps
+        with self._stats_lock:
+            self._started = time.perf_counter()
+        base_wall = None
+        base_index = 0
+        while not self._exit.is_set():
+            if self._trigger_mode:
+                if not self._trigger.wait(0.01):
+                    continue
+                self._trigger.clear()
+                self._trigger_index += 1
+                base_wall = None
+            index = self._next_index()
+            if index is None:
+                with self._stats_lock:
+                    self._stopped = time.perf_counter()
+                    self._finished = True
+                logger.info("帧流文件回放结束")
+                break
+            if index == 0:
+                base_wall = None
+
+            if not self._trigger_mode and self._speed > 0:
+                if base_wall is None:
+                    base_wall, base_index = time.perf_counter(), index
+                due = base_wall + (timestamps[index] - timestamps[base_index]) / self._speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    if self._exit.wait(delay):
+                        break
+                elif delay < -0.1:
+                    # 落后超过100毫秒，以当前帧为新的起点
+                    with self._stats_lock:
+                        self._late += 1
+                    base_wall, base_index = time.perf_counter(), index
+
+            try:
+                self._publish_index(index)
+            except Exception as e:
+                logger.error(f"回放第{index}帧失败: {str(e)}")
+                time.sleep(0.01)
+        logger.info("回放线程退出")
+
+    def _next_index(self) -> Optional[int]:
+        """取出下一帧的序号并前移位置，不循环且已到末尾时返回None"""
+        with self._position_lock:
+            if self._position >= len(self._reader):
+                if not self._loop:
+                    return None
+                self._position = 0
+                with self._stats_lock:
+                    self._loops += 1
+            index = self._position
+            self._position += 1
+            return index
+
+    def _read_frame(self, index: int) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """读取一帧并按ROI裁剪，帧信息中的到达时间改为回放时刻"""
+        frame, info = self._reader.read(index)
+        if self._roi is not None:
+            x, y, width, height = self._roi
+            frame = frame[y:y + height, x:x + width]
+        if not self._zero_copy:
+            frame = frame.copy()
+        info['camera_id'] = self.camera_id
+        info['timestamp'] = time.time()
+        info['width'] = frame.shape[1]
+        info['height'] = frame.shape[0]
+        if self._trigger_mode:
+            info['trigger_index'] = self._trigger_index
+        return frame, info
+
+    def _publish_index(self, index: int) -> None:
+        """读取第index帧，放入最新帧槽位和帧队列"""
+        frame, info = self._read_frame(index)
+        emit_start = time.perf_counter()
+        info['sequence'] = self._latest_frame.publish(frame, info)
+        timeout = 1.0 if self._frame_channel.policy == BLOCK else None
+        self._frame_channel.put(Frame.from_info(frame, info), timeout=timeout)
+        metrics.observe(STAGE_EMIT, (time.perf_counter() - emit_start) * 1000.0)
+        metrics.track_frame(info['camera_id'], info['frame_number'])
+        with self._stats_lock:
+            self._frames += 1
+            self._bytes += frame.nbytes
+
+    def _emit_frame_ready(self, record: Frame) -> None:
+        """帧队列由空变为非空时发布帧就绪事件(在回放线程中调用)"""
+        event_bus.publish(FRAME_READY, record, record.camera_id)
+
+    @handle_exception
+    def get_frame(self, timeout: int = 1000) -> Optional[np.ndarray]:
+        """
+        获取一帧图像
+
+        Args:
+            timeout: 超时时间(毫秒)
+
+        Returns:
+            图像数据，超时返回None
+        """
+        frame, _ = self.get_frame_with_info(timeout)
+        return frame
+
+    @handle_exception
+    def get_frame_with_info(self, timeout: int = 1000) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        """
+        获取一帧图像及其帧信息
+
+        回放中时等待比上一次返回的更新的一帧；未回放时直接读取当前位置的一帧并前移
+
+        Args:
+            timeout: 超时时间(毫秒)
+
+        Returns:
+            (图像数据, 帧信息)，超时返回(None, {})
+        """
+        if not self._is_open:
+            logger.error("回放相机未打开，无法获取图像")
+            return None, {}
+        if not self._grabbing:
+            index = self._next_index()
+            if index is None:
+                return None, {}
+            return self._read_frame(index)
+        frame, info = self._latest_frame.wait_newer(self._last_pulled_sequence, max(0, timeout) / 1000.0)
+        if frame is not None:
+            self._last_pulled_sequence = info['sequence']
+        return frame, info
+
+    def get_frame_record(self, timeout: int = 1000) -> Optional[Frame]:
+        """
+        获取一帧图像及其元数据
+
+        Args:
+            timeout: 超时时间(毫秒)
+
+        Returns:
+            Frame，超时返回None
+        """
+        frame, info = self.get_frame_with_info(timeout)
+        if frame is None:
+            return None
+        return Frame.from_info(frame, info)
+
+    def seek(self, index: int) -> bool:
+        """
+        定位到指定帧，下一次出图从该帧开始
+
+        Args:
+            index: 帧序号
+
+        Returns:
+            是否成功
+        """
+        if not self._is_open or not 0 <= index < len(self._reader):
+            return False
+        with self._position_lock:
+            self._position = index
+        return True
+
+    def set_speed(self, speed: float) -> None:
+        """
+        设置回放速度
+
+        Args:
+            speed: 速度倍数，0表示以最快速度回放
+        """
+        self._speed = max(0.0, float(speed))
+
+    def set_loop(self, loop: bool) -> None:
+        """设置是否循环回放"""
+        self._loop = loop
+
+    @handle_exception
+    def trigger_once(self) -> bool:
+        """
+        软触发一次，回放下一帧
+
+        Returns:
+            触发是否成功
+        """
+        if not self._is_open:
+            logger.error("回放相机未打开，无法触发")
+            return False
+        if not self._trigger_mode:
+            logger.warning("回放相机不在触发模式，无法触发")
+            return False
+        self._trigger.set()
+        return True
+
+    @handle_exception
+    def set_trigger_mode(self, enabled: bool) -> bool:
+        """
+        设置触发模式
+
+        Args:
+            enabled: True为触发模式，False为连续回放
+
+        Returns:
+            是否成功
+        """
+        self._trigger_mode = enabled
+        logger.info(f"回放相机触发模式: {'开' if enabled else '关'}")
+        return True
+
+    def set_exposure(self, exposure_time: float) -> bool:
+        """记录曝光时间(不影响回放图像)"""
+        self._exposure_time = exposure_time
+        return True
+
+    def get_exposure(self) -> float:
+        """获取记录的曝光时间"""
+        return self._exposure_time
+
+    def set_gain(self, gain: float) -> bool:
+        """记录增益(不影响回放图像)"""
+        self._gain = gain
+        return True
+
+    def get_gain(self) -> float:
+        """获取记录的增益"""
+        return self._gain
+
+    def _frame_size(self) -> Tuple[int, int]:
+        """录制图像的(宽, 高)"""
+        info = self._reader.read_info(0)
+        return info['width'], info['height']
+
+    @handle_exception
+    def set_roi(self, x: int, y: int, width: int, height: int) -> bool:
+        """
+        设置感兴趣区域，回放图像按ROI裁剪
+
+        Args:
+            x: 左上角x坐标
+            y: 左上角y坐标
+            width: 宽度
+            height: 高度
+
+        Returns:
+            是否成功设置
+        """
+        if not self._is_open:
+            logger.error("回放相机未打开，无法设置ROI")
+            return False
+        frame_width, frame_height = self._frame_size()
+        if x < 0 or y < 0 or width <= 0 or height <= 0 or x + width > frame_width or y + height > frame_height:
+            logger.error(f"ROI超出录制图像范围({frame_width}x{frame_height}): {(x, y, width, height)}")
+            return False
+        self._roi = (x, y, width, height)
+        return True
+
+    def get_roi(self) -> Tuple[int, int, int, int]:
+        """
+        获取感兴趣区域
+
+        Returns:
+            (x, y, width, height)
+        """
+        if self._roi is not None:
+            return self._roi
+        if not self._is_open:
+            return (0, 0, 0, 0)
+        return (0, 0) + self._frame_size()
+
+    def reset_roi(self) -> bool:
+        """
+        重置感兴趣区域为整幅图像
+
+        Returns:
+            是否成功重置
+        """
+        self._roi = None
+        return True
+
+    @handle_exception
+    def get_device_info(self) -> Dict[str, Any]:
+        """
+        获取设备信息
+
+        Returns:
+            文件路径、帧数、时长、录制图像尺寸等
+        """
+        if not self._is_open:
+            return {}
+        width, height = self._frame_size()
+        info = self._reader.read_info(0)
+        return {
+            "DeviceType": "Replay",
+            "VendorName": "Replay",
+            "ModelName": "ReplayCamera",
+            "SerialNumber": self.camera_id,
+            "Path": self._path,
+            "FrameCount": len(self._reader),
+            "Duration": self._reader.duration,
+            "Width": width,
+            "Height": height,
+            "PixelType": info['pixel_type'],
+            "RecordedCameraId": self._reader.camera_id,
+            "TriggerMode": "On" if self._trigger_mode else "Off",
+        }
+
+    @property
+    def camera_id(self) -> str:
+        """帧就绪事件中使用的相机ID，默认使用录制时的相机ID"""
+        if self._camera_id:
+            return self._camera_id
+        if self._reader is not None and self._reader.camera_id:
+            return self._reader.camera_id
+        return "REPLAY"
+
+    def set_camera_id(self, camera_id: str) -> None:
+        """
+        设置帧标记使用的相机ID，需在start_grabbing之前调用
+
+        Args:
+            camera_id: 相机ID；None或空字符串恢复默认ID
+        """
+        self._camera_id = camera_id or None
+
+    def get_frame_channel(self) -> FrameChannel:
+        """获取回放线程与消费者之间的帧队列"""
+        return self._frame_channel
+
+    def set_frame_queue(self, depth: int = None, policy: str = None) -> None:
+        """
+        设置帧队列的深度和丢帧策略
+
+        回归测试需要每一帧都被处理时使用BLOCK策略，回放线程会等待消费者
+
+        Args:
+            depth: 队列深度，None表示不修改
+            policy: drop_oldest / drop_newest / block，None表示不修改
+        """
+        if depth is not None:
+            self._frame_channel.set_depth(depth)
+        if policy is not None:
+            self._frame_channel.set_policy(policy)
+
+    def get_frame_queue_stats(self) -> Dict[str, Any]:
+        """获取帧队列统计信息"""
+        return self._frame_channel.get_stats()
+
+    def release_frame(self, frame) -> bool:
+        """回放帧不来自缓冲池，无需归还；保留该方法与HikvisionCamera一致"""
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取回放吞吐统计
+
+        Returns:
+            frames(已发布帧数)、elapsed(秒)、fps、mb_per_sec、loops(循环次数)、
+            late(落后重新对齐次数)、position(下一帧序号)、finished(不循环时是否已播放到末尾)、dropped(帧队列丢弃数)
+        """
+        with self._stats_lock:
+            frames, total_bytes, loops, late = self._frames, self._bytes, self._loops, self._late
+            finished = self._finished
+            started, stopped = self._started, self._stopped
+        elapsed = 0.0
+        if started is not None:
+            elapsed = (stopped if stopped is not None else time.perf_counter()) - started
+        queue_stats = self._frame_channel.get_stats()
+        return {
+            'frames': frames,
+            'elapsed': elapsed,
+            'fps': frames / elapsed if elapsed > 0 else 0.0,
+            'mb_per_sec': total_bytes / elapsed / 1e6 if elapsed > 0 else 0.0,
+            'loops': loops,
+            'late': late,
+            'position': self._position,
+            'finished': finished,
+            'dropped': queue_stats.get('dropped', 0),
+        }
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+回放相机工厂模块
+
+实现回放相机的工厂类，用于创建回放录制帧流文件的相机对象。
+"""
+from .camera_factory import CameraFactory, CameraFactoryManager
+from .replay_camera import ReplayCamera
+from .camera_interface import CameraInterface
+from core.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class ReplayCameraFactory(CameraFactory):
+    """
+    回放相机工厂类
+
+    负责创建回放相机对象，实现CameraFactory接口。
+    """
+
+    def create_camera(self, simulation: bool = False) -> CameraInterface:
+        """
+        创建回放相机对象
+
+        Args:
+            simulation: 回放相机不访问硬件，忽略此参数
+
+        Returns:
+            回放相机接口对象，打开时指定帧流文件路径
+        """
+        logger.info("创建回放相机实例")
+        return ReplayCamera()
+
+
+# 注册回放相机工厂到工厂管理器
+CameraFactoryManager.register_factory("replay", ReplayCameraFactory)
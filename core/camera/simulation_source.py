@@ -0,0 +1,380 @@
+"""
+模拟图像源模块
+
+为模拟模式和FakeMvCamera提供按相机原始像素格式(PixelType_Gvsp_*)输出的图像：
+
+- SimulationSource: 预先生成一组带噪声的背景帧并编码为目标像素格式，每帧只把背景拷贝到复用的缓冲区
+  再画上移动的叠加图形，单帧开销约为一次内存拷贝，可以支撑数百帧每秒的负载测试
+- FileSource: 把图像文件夹或视频文件作为相机画面循环回放
+
+输出的是相机原始布局(Mono8为单通道、Bayer为马赛克、YUV422为双通道等)，由pixel_converter转换，
+与真实相机经过同样的转换路径。
+"""
+import os
+import time
+import threading
+from typing import List, Optional
+
+import numpy as np
+import cv2
+
+from .pixel_converter import get_converter
+from .MvImport.PixelType_header import PixelType_Gvsp_BGR8_Packed
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+# 默认预生成的背景帧数量
+DEFAULT_BANK_SIZE = 8
+
+# FileSource默认缓存的已编码帧数量，文件帧数不超过该值时全部缓存，回放时不再解码
+DEFAULT_FILE_CACHE = 64
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
+def raw_layout(pixel_type: int, width: int, height: int):
+    """
+    获取像素格式的原始数据布局
+
+    Args:
+        pixel_type: 像素格式
+        width: 宽度
+        height: 高度
+
+    Returns:
+        (形状, 数据类型)
+    """
+    converter = get_converter(pixel_type)
+    if converter is None:
+        raise ValueError(f"不支持的像素格式: {pixel_type}")
+    name = converter.name
+    if name.endswith("_Packed"):
+        raise ValueError(f"图像源不支持打包像素格式: {name}")
+    if name in ("RGB8", "BGR8"):
+        return (height, width, 3), np.uint8
+    if name.startswith("YUV422"):
+        return (height, width, 2), np.uint8
+    if converter.bytes_per_pixel == 2:
+        return (height, width), np.uint16
+    return (height, width), np.uint8
+
+
+def _bit_depth(name: str) -> int:
+    """从格式名称取位宽(Mono12 -> 12)，8位格式返回8"""
+    digits = ''.join(c for c in name if c.isdigit())
+    return int(digits) if digits and name.startswith(("Mono", "Bayer")) else 8
+
+
+def encode_bgr(bgr: np.ndarray, pixel_type: int) -> np.ndarray:
+    """
+    把BGR图像编码为相机原始像素格式
+
+    Args:
+        bgr: BGR图像(uint8)
+        pixel_type: 目标像素格式
+
+    Returns:
+        原始布局的数组，布局见raw_layout
+    """
+    converter = get_converter(pixel_type)
+    if converter is None:
+        raise ValueError(f"不支持的像素格式: {pixel_type}")
+    name = converter.name
+    height, width = bgr.shape[:2]
+    shift = _bit_depth(name) - 8
+
+    if name == "BGR8":
+        return np.ascontiguousarray(bgr)
+    if name == "RGB8":
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+    if name.startswith("Mono"):
+        raw = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    elif name.startswith("Bayer"):
+        # GenICam命名: 第一行依次为pattern[0]、pattern[1]，第二行为另外两个
+        pattern = name[5:7]
+        index = {'B': 0, 'G': 1, 'R': 2}
+        second = {"RG": "GB", "GB": "RG", "GR": "BG", "BG": "GR"}[pattern]
+        raw = np.empty((height, width), dtype=np.uint8)
+        for row, colors in ((0, pattern), (1, second)):
+            for col, color in enumerate(colors):
+                raw[row::2, col::2] = bgr[row::2, col::2, index[color]]
+    elif name.startswith("YUV422"):
+        yuv = cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV)
+        raw = np.empty((height, width, 2), dtype=np.uint8)
+        # YUYV: (Y0,U0)(Y1,V0)；UYVY: (U0,Y0)(V0,Y1)
+        luma, chroma = (0, 1) if name == "YUV422_YUYV" else (1, 0)
+        raw[:, :, luma] = yuv[:, :, 0]
+        raw[:, 0::2, chroma] = yuv[:, 0::2, 1]
+        raw[:, 1::2, chroma] = yuv[:, 0::2, 2]
+        return raw
+    else:
+        raise ValueError(f"无法编码为像素格式: {name}")
+    if shift:
+        return raw.astype(np.uint16) << shift
+    return raw
+
+
+def _ink(pixel_type: int, bgr=(255, 255, 255)):
+    """叠加图形在原始布局中使用的颜色"""
+    swatch = encode_bgr(np.full((2, 2, 3), bgr, dtype=np.uint8), pixel_type)
+    value = swatch[0, 0]
+    return tuple(int(v) for v in np.atleast_1d(value))
+
+
+class FrameSource:
+    """
+    图像源接口
+
+    render()返回相机原始布局的一帧；传入out时直接写入out，否则写入源内部复用的缓冲区，
+    返回的数组在下一次render之前有效。
+    """
+
+    def __init__(self, width: int, height: int, pixel_type: int):
+        self.width = int(width)
+        self.height = int(height)
+        self.pixel_type = int(pixel_type)
+        self.shape, self.dtype = raw_layout(self.pixel_type, self.width, self.height)
+        self.frame_number = 0
+        self._buffer = np.empty(self.shape, dtype=self.dtype)
+
+    def render(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        生成下一帧
+
+        Args:
+            out: 输出数组，形状和类型需与self.shape/self.dtype一致；None表示使用内部缓冲区
+
+        Returns:
+            原始布局的图像
+        """
+        target = self._buffer if out is None else out
+        self.frame_number += 1
+        self._render_into(target)
+        return target
+
+    def raw_bytes(self, frame: np.ndarray) -> np.ndarray:
+        """把render的结果展开为pixel_converter使用的uint8一维数组(不拷贝)"""
+        return frame.reshape(-1).view(np.uint8)
+
+    def reset(self) -> None:
+        """回到第一帧"""
+        self.frame_number = 0
+
+    def close(self) -> None:
+        """释放资源"""
+        pass
+
+    def _render_into(self, out: np.ndarray) -> None:
+        raise NotImplementedError
+
+
+class SimulationSource(FrameSource):
+    """
+    合成图像源
+
+    背景为灰色底、中心十字和边框，叠加高斯噪声；预先生成bank_size帧并编码为目标像素格式。
+    每帧把其中一帧背景拷贝到输出缓冲区，再画上旋转的矩形、水平往返的方块和时间戳。
+    """
+
+    def __init__(self, width: int = 1280, height: int = 1024, pixel_type: int = PixelType_Gvsp_BGR8_Packed,
+                 bank_size: int = DEFAULT_BANK_SIZE, noise_sigma: float = 5.0, text: bool = True, seed: int = 0):
+        """
+        初始化合成图像源
+
+        Args:
+            width: 宽度
+            height: 高度
+            pixel_type: 输出的像素格式
+            bank_size: 预生成的背景帧数量
+            noise_sigma: 噪声标准差，0表示不加噪声
+            text: 是否绘制时间戳文字(16位和YUV422格式不绘制)
+            seed: 随机种子
+        """
+        super().__init__(width, height, pixel_type)
+        # cv2.putText只支持8位单通道或三通道图像
+        self._text = text and self.dtype == np.uint8 and not (len(self.shape) == 3 and self.shape[2] == 2)
+        self._ink = _ink(self.pixel_type, (0, 0, 255))
+        self._marker_ink = _ink(self.pixel_type, (255, 255, 255))
+        self._text_ink = _ink(self.pixel_type, (0, 255, 0))
+        self._bank = self._make_bank(max(1, int(bank_size)), noise_sigma, seed)
+
+    def _make_bank(self, count: int, noise_sigma: float, seed: int) -> List[np.ndarray]:
+        """生成背景帧"""
+        w, h = self.width, self.height
+        base = np.full((h, w), 128, dtype=np.uint8)
+        thickness = 2
+        cx, cy = w // 2, h // 2
+        base[max(0, cy - 50):cy + 50, max(0, cx - thickness):cx + thickness] = 255
+        base[max(0, cy - thickness):cy + thickness, max(0, cx - 50):cx + 50] = 255
+        base[:thickness, :] = 200
+        base[h - thickness:, :] = 200
+        base[:, :thickness] = 200
+        base[:, w - thickness:] = 200
+
+        rng = np.random.default_rng(seed)
+        bank = []
+        for _ in range(count):
+            if noise_sigma > 0:
+                noise = rng.standard_normal((h, w), dtype=np.float32) * noise_sigma
+                gray = np.clip(base + noise, 0, 255).astype(np.uint8)
+            else:
+                gray = base
+            bank.append(encode_bgr(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR), self.pixel_type))
+        return bank
+
+    def _render_into(self, out: np.ndarray) -> None:
+        n = self.frame_number
+        np.copyto(out, self._bank[n % len(self._bank)])
+
+        w, h = self.width, self.height
+        # 旋转的矩形
+        box = np.intp(cv2.boxPoints(((w // 2, h // 2), (100, 50), (n * 3) % 360)))
+        cv2.drawContours(out, [box], 0, self._ink, 2)
+        # 水平往返的方块，用于观察丢帧和撕裂
+        size = max(4, min(w, h) // 16)
+        span = max(1, w - size)
+        x = n * 8 % (2 * span)
+        x = x if x < span else 2 * span - x
+        y = h // 4
+        out[y:y + size, x:x + size] = self._marker_ink
+        if self._text:
+            cv2.putText(out, f"{time.strftime('%H:%M:%S')} #{n}", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, self._text_ink, 2)
+
+
+class FileSource(FrameSource):
+    """
+    文件图像源
+
+    按文件名顺序回放文件夹中的图像，或逐帧回放视频文件，播放完后从头循环。
+    图像缩放到指定分辨率(未指定时使用第一帧的分辨率)并编码为目标像素格式；
+    总帧数不超过cache_frames时编码结果全部缓存，之后的回放只做内存拷贝。
+    """
+
+    def __init__(self, path: str, width: Optional[int] = None, height: Optional[int] = None,
+                 pixel_type: int = PixelType_Gvsp_BGR8_Packed, loop: bool = True,
+                 cache_frames: int = DEFAULT_FILE_CACHE):
+        """
+        初始化文件图像源
+
+        Args:
+            path: 图像文件夹或视频文件路径
+            width: 输出宽度，None表示使用第一帧的宽度
+            height: 输出高度，None表示使用第一帧的高度
+            pixel_type: 输出的像素格式
+            loop: 播放完后是否从头循环；不循环时最后一帧保持不变
+            cache_frames: 最多缓存的已编码帧数
+        """
+        self._path = path
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._files: List[str] = []
+        self._capture = None
+        if os.path.isdir(path):
+            self._files = sorted(os.path.join(path, name) for name in os.listdir(path)
+                                 if name.lower().endswith(IMAGE_EXTENSIONS))
+            if not self._files:
+                raise ValueError(f"文件夹中没有图像: {path}")
+            first = cv2.imread(self._files[0], cv2.IMREAD_COLOR)
+            count = len(self._files)
+        else:
+            self._capture = cv2.VideoCapture(path)
+            if not self._capture.isOpened():
+                raise ValueError(f"无法打开视频文件: {path}")
+            ok, first = self._capture.read()
+            count = int(self._capture.get(cv2.CAP_PROP_FRAME_COUNT)) or 0
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            if not ok:
+                raise ValueError(f"视频文件没有可读的帧: {path}")
+        if first is None:
+            raise ValueError(f"无法读取图像: {path}")
+
+        super().__init__(width or first.shape[1], height or first.shape[0], pixel_type)
+        self.frame_count = count
+        self._cache_limit = int(cache_frames) if 0 < count <= int(cache_frames) else 0
+        self._cache = {}
+        self._last = None
+        self._index = 0
+        logger.info(f"文件图像源: {path}，{count} 帧，输出 {self.width}x{self.height}")
+
+    def _read(self, index: int) -> Optional[np.ndarray]:
+        """读取第index帧(BGR)，读取失败返回None"""
+        if self._files:
+            return cv2.imread(self._files[index], cv2.IMREAD_COLOR)
+        ok, frame = self._capture.read()
+        if not ok:
+            return None
+        return frame
+
+    def _render_into(self, out: np.ndarray) -> None:
+        with self._lock:
+            encoded = self._next_encoded()
+            if encoded is not None:
+                self._last = encoded
+            if self._last is not None:
+                np.copyto(out, self._last)
+
+    def _next_encoded(self) -> Optional[np.ndarray]:
+        """取出下一帧的编码结果；不循环且已播放完时返回None(保持最后一帧)"""
+        index = self._index
+        if self.frame_count and index >= self.frame_count:
+            if not self._loop:
+                return None
+            index = 0
+            if self._capture is not None:
+                self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        encoded = self._cache.get(index)
+        if encoded is None:
+            bgr = self._read(index)
+            if bgr is None and self._capture is not None and self._loop and index:
+                # 视频读到末尾(帧数元数据可能不准确)，回到开头
+                self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                index = 0
+                bgr = self._read(0)
+            if bgr is None:
+                return None
+            if bgr.shape[1] != self.width or bgr.shape[0] != self.height:
+                bgr = cv2.resize(bgr, (self.width, self.height), interpolation=cv2.INTER_AREA)
+            encoded = encode_bgr(bgr, self.pixel_type)
+            # 帧数不超过缓存上限时第一轮播放就缓存全部帧，之后不再解码
+            if index < self._cache_limit:
+                self._cache[index] = encoded
+        self._index = index + 1
+        return encoded
+
+    def reset(self) -> None:
+        """回到第一帧"""
+        super().reset()
+        with self._lock:
+            self._index = 0
+            if self._capture is not None:
+                self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def close(self) -> None:
+        """释放视频文件"""
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+def create_source(source=None, width: Optional[int] = None, height: Optional[int] = None,
+                  pixel_type: int = PixelType_Gvsp_BGR8_Packed, **kwargs) -> FrameSource:
+    """
+    创建图像源
+
+    Args:
+        source: None表示合成图像源；字符串表示图像文件夹或视频文件路径；FrameSource实例原样返回
+        width: 宽度，None表示合成图像源使用1280、文件图像源使用文件的分辨率
+        height: 高度，None表示合成图像源使用1024、文件图像源使用文件的分辨率
+        pixel_type: 像素格式
+        **kwargs: 传给SimulationSource或FileSource的其他参数
+
+    Returns:
+        图像源
+    """
+    if isinstance(source, FrameSource):
+        return source
+    if source is None:
+        return SimulationSource(width or 1280, height or 1024, pixel_type, **kwargs)
+    return FileSource(str(source), width, height, pixel_type, **kwargs)
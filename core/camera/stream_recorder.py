@@ -0,0 +1,448 @@
+"""
+原始帧录制模块
+
+把采集到的原始帧和元数据写入预分配、内存映射的分块文件。采集线程只把帧放入有界队列，
+由后台写入线程直接拷贝到映射内存中，不做图像编码，可以跟上产线帧率；写入跟不上时按队列策略丢帧并计数。
+
+一次录制包含:
+    <前缀>_00000.afs, <前缀>_00001.afs, ...   分块文件，格式与帧流文件相同，可以单独用FrameStreamReader/ReplayCamera打开
+    <前缀>.afx                                 索引文件，每帧一条定长记录(分块号、偏移、帧号、时间戳)，按帧序号O(1)定位
+
+分块文件创建时用truncate预分配到chunk_size，写满后截断到实际长度再切换到下一个分块。
+"""
+import glob
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+from ..utils.metrics import Histogram
+from ..utils.frame_channel import FrameChannel, DROP_NEWEST
+from .frame import Frame
+from .frame_stream import (FILE_MAGIC, FILE_HEADER_SIZE, RECORD_HEADER, STREAM_EXTENSION, aligned_size,
+                           pack_record_header, read_record, record_info, write_file_header, read_file_header)
+
+logger = get_logger()
+
+INDEX_MAGIC = b"ACFSIDX\0"
+
+# 录制索引文件扩展名
+INDEX_EXTENSION = ".afx"
+
+# 索引记录: 分块号, 保留, 记录在分块中的偏移, 帧号, 到达时间
+INDEX_ENTRY = struct.Struct("<IIQQd")
+INDEX_DTYPE = np.dtype([('chunk', '<u4'), ('reserved', '<u4'), ('offset', '<u8'),
+                        ('frame_number', '<u8'), ('timestamp', '<f8')])
+
+# 默认分块大小(字节)
+DEFAULT_CHUNK_SIZE = 256 * 1024 * 1024
+
+# 默认录制队列深度(帧)
+DEFAULT_QUEUE_DEPTH = 64
+
+
+def chunk_path(directory: str, prefix: str, chunk: int) -> str:
+    """
+    分块文件路径
+
+    Args:
+        directory: 录制目录
+        prefix: 文件名前缀
+        chunk: 分块号
+
+    Returns:
+        分块文件路径
+    """
+    return os.path.join(directory, f"{prefix}_{chunk:05d}{STREAM_EXTENSION}")
+
+
+class _Chunk:
+    """一个预分配并内存映射的分块文件"""
+
+    def __init__(self, path: str, size: int, camera_id: str):
+        self.path = path
+        self.size = size
+        self._file = open(path, 'w+b')
+        self._file.truncate(size)
+        self.mm = mmap.mmap(self._file.fileno(), size)
+        write_file_header(self.mm, FILE_MAGIC, camera_id)
+        self.position = FILE_HEADER_SIZE
+
+    def fits(self, record_size: int) -> bool:
+        """剩余空间能否放下一条记录"""
+        return self.position + record_size <= self.size
+
+    def write(self, frame: np.ndarray, info: Dict[str, Any]) -> int:
+        """
+        写入一条记录
+
+        Returns:
+            记录在分块中的偏移
+        """
+        offset = self.position
+        self.mm[offset:offset + RECORD_HEADER.size] = pack_record_header(frame, info)
+        # 直接在映射内存上构造目标数组，非连续的视图(如ROI裁剪)也只拷贝一次
+        target = np.ndarray(frame.shape, frame.dtype, buffer=self.mm, offset=offset + RECORD_HEADER.size)
+        target[...] = frame
+        self.position = offset + RECORD_HEADER.size + aligned_size(frame.nbytes)
+        return offset
+
+    def close(self) -> None:
+        """解除映射并把文件截断到实际写入的长度"""
+        self.mm.close()
+        self._file.truncate(self.position)
+        self._file.close()
+
+
+class StreamRecorder:
+    """
+    原始帧录制器
+
+    write()在采集线程中调用，只做入队；后台写入线程把帧写入分块文件并追加索引。
+    队列中保存的是帧的引用，零拷贝帧(引用SDK缓冲区)必须拷贝后再交给录制器；
+    传入带缓冲区所有者的Frame时，录制器为排队的帧增加一个引用，写入或丢弃后归还。
+    """
+
+    def __init__(self, directory: str, prefix: str = "", chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 queue_depth: int = DEFAULT_QUEUE_DEPTH, policy: str = DROP_NEWEST, camera_id: str = ""):
+        """
+        初始化录制器
+
+        Args:
+            directory: 录制目录，不存在时创建
+            prefix: 文件名前缀，为空时使用"相机ID_开始时间"
+            chunk_size: 分块文件预分配大小(字节)，单帧超过该大小时该分块按单帧大小分配
+            queue_depth: 写入队列深度(帧)
+            policy: 队列满时的策略，默认丢弃新帧(已入队的帧保证写入)；BLOCK会阻塞采集线程
+            camera_id: 写入文件头的相机ID
+        """
+        self.directory = directory
+        self.camera_id = camera_id
+        self.prefix = prefix
+        self.chunk_size = max(FILE_HEADER_SIZE + RECORD_HEADER.size, int(chunk_size))
+        self._queue = FrameChannel(queue_depth, policy, name="recorder", renotify_interval=0,
+                                   release=self._release_item)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._chunk: Optional[_Chunk] = None
+        self._chunk_count = 0
+        self._index_file = None
+        self._write_time = Histogram("record_write")
+        self._lock = threading.Lock()
+        self._frames = 0
+        self._bytes = 0
+        self._errors = 0
+        self._started = None
+        self._stopped = None
+
+    @property
+    def index_path(self) -> str:
+        """索引文件路径"""
+        return os.path.join(self.directory, f"{self.prefix}{INDEX_EXTENSION}")
+
+    @property
+    def is_recording(self) -> bool:
+        """是否正在录制"""
+        return self._running
+
+    def start(self) -> bool:
+        """
+        开始录制
+
+        Returns:
+            是否成功开始
+        """
+        if self._running:
+            return True
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if not self.prefix:
+                self.prefix = f"{self.camera_id or 'record'}_{time.strftime('%Y%m%d_%H%M%S')}"
+            self._index_file = open(self.index_path, 'wb')
+            header = bytearray(FILE_HEADER_SIZE)
+            write_file_header(header, INDEX_MAGIC, self.camera_id)
+            self._index_file.write(header)
+        except OSError as e:
+            logger.error(f"创建录制文件失败: {str(e)}")
+            return False
+
+        self._chunk = None
+        self._chunk_count = 0
+        self._frames = 0
+        self._bytes = 0
+        self._errors = 0
+        self._write_time.reset()
+        self._queue.reopen()
+        self._queue.reset_stats()
+        self._started = time.perf_counter()
+        self._stopped = None
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_thread, name="StreamRecorder", daemon=True)
+        self._thread.start()
+        logger.info(f"开始录制: {self.index_path}")
+        return True
+
+    def write(self, frame, info: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        提交一帧(采集线程调用，不阻塞，BLOCK策略除外)
+
+        Args:
+            frame: 图像数组或Frame
+            info: 帧信息，frame为Frame时可省略
+
+        Returns:
+            是否入队；未在录制或队列已满被丢弃时返回False
+        """
+        if not self._running:
+            return False
+        if isinstance(frame, Frame):
+            info = frame.to_info() if info is None else info
+            frame.retain()
+        return self._queue.put((frame, info or {}), timeout=1.0)
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        停止录制，写完队列中剩余的帧后关闭文件
+
+        Returns:
+            录制统计信息
+        """
+        if not self._running:
+            return self.get_stats()
+        self._running = False
+        self._queue.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._chunk is not None:
+            self._chunk.close()
+            self._chunk = None
+        self._index_file.close()
+        self._stopped = time.perf_counter()
+        stats = self.get_stats()
+        logger.info(f"停止录制: {stats['frames']}帧，{stats['chunks']}个分块，丢弃{stats['dropped']}帧")
+        return stats
+
+    def _writer_thread(self):
+        """写入线程函数：取出帧写入当前分块，写满时切换分块"""
+        logger.info("录制写入线程启动")
+        while True:
+            item = self._queue.get(timeout=0.1)
+            if item is None:
+                if not self._running:
+                    break
+                continue
+            frame, info = item
+            start = time.perf_counter()
+            try:
+                self._write_frame(np.asarray(frame), info)
+            except Exception as e:
+                with self._lock:
+                    self._errors += 1
+                logger.error(f"录制写入失败: {str(e)}")
+            self._write_time.observe((time.perf_counter() - start) * 1000.0)
+            self._release_item(item)
+        logger.info("录制写入线程退出")
+
+    @staticmethod
+    def _release_item(item) -> None:
+        """归还队列元素中Frame的引用(写入完成或被队列丢弃时调用)"""
+        frame = item[0]
+        if isinstance(frame, Frame):
+            frame.release()
+
+    def _write_frame(self, frame: np.ndarray, info: Dict[str, Any]) -> None:
+        """把一帧写入分块并追加索引记录"""
+        record_size = RECORD_HEADER.size + aligned_size(frame.nbytes)
+        if self._chunk is None or not self._chunk.fits(record_size):
+            self._next_chunk(record_size)
+        offset = self._chunk.write(frame, info)
+        self._index_file.write(INDEX_ENTRY.pack(self._chunk_count - 1, 0, offset,
+                                                int(info.get('frame_number', 0) or 0),
+                                                float(info.get('timestamp', 0.0) or 0.0)))
+        with self._lock:
+            self._frames += 1
+            self._bytes += record_size
+
+    def _next_chunk(self, record_size: int) -> None:
+        """关闭当前分块，预分配下一个分块"""
+        if self._chunk is not None:
+            self._chunk.close()
+            # 分块切换时把索引落盘，录制中断时索引和已完成的分块一致
+            self._index_file.flush()
+        size = max(self.chunk_size, FILE_HEADER_SIZE + record_size)
+        self._chunk = _Chunk(chunk_path(self.directory, self.prefix, self._chunk_count), size, self.camera_id)
+        self._chunk_count += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取录制统计信息
+
+        Returns:
+            frames(已写入帧数)、bytes、chunks、dropped(队列满丢弃的帧数)、queued(队列中待写的帧数)、
+            high_watermark、errors、elapsed、fps、mb_per_sec、write_ms(单帧写入耗时p50/p99)
+        """
+        with self._lock:
+            frames, total_bytes, errors = self._frames, self._bytes, self._errors
+        queue_stats = self._queue.get_stats()
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = (self._stopped if self._stopped is not None else time.perf_counter()) - self._started
+        write_time = self._write_time.snapshot()
+        return {
+            'frames': frames,
+            'bytes': total_bytes,
+            'chunks': self._chunk_count,
+            'dropped': queue_stats['dropped'],
+            'queued': queue_stats['size'],
+            'high_watermark': queue_stats['high_watermark'],
+            'errors': errors,
+            'elapsed': elapsed,
+            'fps': frames / elapsed if elapsed > 0 else 0.0,
+            'mb_per_sec': total_bytes / elapsed / 1e6 if elapsed > 0 else 0.0,
+            'write_ms': {'p50': write_time['p50'], 'p99': write_time['p99']},
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class RecordingReader:
+    """
+    录制读取器
+
+    内存映射索引文件，按帧序号O(1)定位到分块和偏移；分块文件在第一次访问时才映射。
+    接口与FrameStreamReader一致，ReplayCamera可以直接回放一次录制。
+    """
+
+    def __init__(self, index_path: str):
+        """
+        打开一次录制
+
+        Args:
+            index_path: 索引文件(.afx)路径
+        """
+        self.path = index_path
+        self.directory = os.path.dirname(index_path)
+        self.prefix = os.path.splitext(os.path.basename(index_path))[0]
+        with open(index_path, 'rb') as f:
+            header = f.read(FILE_HEADER_SIZE)
+        header_size, self.created, self.camera_id = read_file_header(header, INDEX_MAGIC, index_path)
+        # 录制中断时索引末尾可能只有半条记录
+        count = (os.path.getsize(index_path) - header_size) // INDEX_DTYPE.itemsize
+        if count > 0:
+            self._index = np.memmap(index_path, dtype=INDEX_DTYPE, mode='r', offset=header_size, shape=(count,))
+        else:
+            self._index = np.zeros(0, dtype=INDEX_DTYPE)
+        self._chunks: Dict[int, Tuple[Any, mmap.mmap]] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """各帧录制时的到达时间(秒)"""
+        return self._index['timestamp']
+
+    @property
+    def frame_numbers(self) -> np.ndarray:
+        """各帧的相机帧号"""
+        return self._index['frame_number']
+
+    @property
+    def duration(self) -> float:
+        """录制时长(秒)"""
+        if len(self._index) < 2:
+            return 0.0
+        return float(self._index['timestamp'][-1] - self._index['timestamp'][0])
+
+    def chunk_files(self) -> List[str]:
+        """本次录制的全部分块文件"""
+        return sorted(glob.glob(os.path.join(self.directory, f"{glob.escape(self.prefix)}_*{STREAM_EXTENSION}")))
+
+    def _chunk(self, chunk: int) -> mmap.mmap:
+        """映射分块文件"""
+        entry = self._chunks.get(chunk)
+        if entry is None:
+            f = open(chunk_path(self.directory, self.prefix, chunk), 'rb')
+            entry = (f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            self._chunks[chunk] = entry
+        return entry[1]
+
+    def find(self, frame_number: int) -> int:
+        """
+        按相机帧号查找帧序号(帧号单调递增时二分查找)
+
+        Args:
+            frame_number: 相机帧号
+
+        Returns:
+            帧序号，不存在时返回-1
+        """
+        numbers = self._index['frame_number']
+        index = int(np.searchsorted(numbers, frame_number))
+        if index < len(numbers) and numbers[index] == frame_number:
+            return index
+        return -1
+
+    def read_info(self, index: int) -> Dict[str, Any]:
+        """
+        读取一帧的帧信息
+
+        Args:
+            index: 帧序号
+
+        Returns:
+            帧信息字典，键与Frame.to_info一致
+        """
+        entry = self._index[index]
+        mm = self._chunk(int(entry['chunk']))
+        return record_info(RECORD_HEADER.unpack_from(mm, int(entry['offset'])), self.camera_id)
+
+    def read(self, index: int, copy: bool = False) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        读取一帧
+
+        Args:
+            index: 帧序号
+            copy: 是否拷贝；False时返回引用映射内存的只读数组
+
+        Returns:
+            (图像数组, 帧信息)
+        """
+        entry = self._index[index]
+        array, fields = read_record(self._chunk(int(entry['chunk'])), int(entry['offset']))
+        if copy:
+            array = array.copy()
+        return array, record_info(fields, self.camera_id)
+
+    def read_frame(self, index: int, copy: bool = False) -> Frame:
+        """读取一帧为Frame"""
+        array, info = self.read(index, copy)
+        return Frame.from_info(array, info)
+
+    def close(self) -> None:
+        """关闭索引和分块文件(仍被引用的映射由垃圾回收关闭)"""
+        for f, mm in self._chunks.values():
+            try:
+                mm.close()
+            except BufferError:
+                pass
+            f.close()
+        self._chunks.clear()
+        self._index = np.zeros(0, dtype=INDEX_DTYPE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
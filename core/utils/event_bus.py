@@ -0,0 +1,148 @@
+"""
+事件总线模块
+
+不依赖PyQt5的线程安全发布/订阅机制，供相机采集等核心模块使用，使无界面的检测服务不必加载Qt。
+- 回调订阅：publish在发布者线程中同步调用回调
+- 队列订阅：事件参数放入queue.Queue，由消费者线程自行取出
+界面进程中由signal_manager把事件桥接到对应的Qt信号(见signal_manager.bridge_event_bus)。
+"""
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+# 事件名称
+FRAME_READY = "frame_ready"                 # (Frame, 相机ID)
+LOG_MESSAGE = "log_message"                 # (级别, 内容)
+ALGORITHM_RESULT = "algorithm_result"       # (结果类型, 结果图像, 附加数据)
+PLC_TRIGGER = "plc_trigger"                 # ()
+DATA_SAVED = "data_saved"                   # (数据类型, 路径)
+
+# 项目日志器(core.utils.logger)通过事件总线发布日志，这里只能使用标准库日志，避免循环导入和递归发布
+_log = logging.getLogger(__name__)
+
+
+class EventBus:
+    """
+    线程安全的事件总线
+
+    订阅者列表采用写时复制，publish只读取当前的不可变元组，不加锁。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Tuple[Callable[..., Any], ...]] = {}
+        # 是否已桥接到Qt信号(见signal_manager.bridge_event_bus)
+        self._qt_bridged = False
+
+    def subscribe(self, event: str, callback: Callable[..., Any]) -> None:
+        """
+        订阅事件
+
+        Args:
+            event: 事件名称
+            callback: 回调函数，参数与publish的参数一致
+        """
+        with self._lock:
+            callbacks = self._subscribers.get(event, ())
+            if callback not in callbacks:
+                self._subscribers[event] = callbacks + (callback,)
+
+    def unsubscribe(self, event: str, callback: Callable[..., Any]) -> None:
+        """取消订阅"""
+        with self._lock:
+            callbacks = self._subscribers.get(event, ())
+            if callback in callbacks:
+                self._subscribers[event] = tuple(c for c in callbacks if c != callback)
+
+    def subscribe_queue(self, event: str, maxsize: int = 0) -> "queue.Queue":
+        """
+        以队列方式订阅事件
+
+        Args:
+            event: 事件名称
+            maxsize: 队列长度上限，0表示不限；队列满时丢弃新事件
+
+        Returns:
+            接收事件参数元组的队列，取消订阅时把该队列传给unsubscribe_queue
+        """
+        q = queue.Queue(maxsize)
+        self.subscribe(event, _QueueForwarder(q))
+        return q
+
+    def unsubscribe_queue(self, event: str, q: "queue.Queue") -> None:
+        """取消队列订阅"""
+        self.unsubscribe(event, _QueueForwarder(q))
+
+    def has_subscribers(self, event: str) -> bool:
+        """事件是否有订阅者(没有订阅者时发布者可以省去准备参数的开销)"""
+        return bool(self._subscribers.get(event))
+
+    def publish(self, event: str, *args: Any) -> None:
+        """
+        发布事件，在当前线程中依次调用订阅者
+
+        Args:
+            event: 事件名称
+            *args: 事件参数
+        """
+        for callback in self._subscribers.get(event, ()):
+            try:
+                callback(*args)
+            except Exception:
+                _log.exception(f"事件{event}的订阅者执行失败")
+
+    def mark_qt_bridged(self) -> bool:
+        """
+        标记事件总线已桥接到Qt信号
+
+        Returns:
+            是否为第一次标记；已经桥接过时返回False，调用者不应重复订阅
+        """
+        with self._lock:
+            if self._qt_bridged:
+                return False
+            self._qt_bridged = True
+            return True
+
+    @property
+    def qt_bridged(self) -> bool:
+        """是否已桥接到Qt信号"""
+        return self._qt_bridged
+
+    def clear(self, event: str = None) -> None:
+        """
+        清除订阅
+
+        Args:
+            event: 事件名称，None表示清除全部
+        """
+        with self._lock:
+            if event is None:
+                self._subscribers.clear()
+            else:
+                self._subscribers.pop(event, None)
+
+
+class _QueueForwarder:
+    """把事件参数转发到队列的订阅者，按队列对象判等以便取消订阅"""
+    __slots__ = ('queue',)
+
+    def __init__(self, q: "queue.Queue"):
+        self.queue = q
+
+    def __call__(self, *args: Any) -> None:
+        try:
+            self.queue.put_nowait(args)
+        except queue.Full:
+            pass
+
+    def __eq__(self, other):
+        return isinstance(other, _QueueForwarder) and other.queue is self.queue
+
+    def __hash__(self):
+        return id(self.queue)
+
+
+# 全局事件总线
+event_bus = EventBus()
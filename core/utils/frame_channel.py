@@ -0,0 +1,500 @@
+"""
+帧通道模块
+
+在相机采集线程(生产者)和界面线程(消费者)之间传递图像帧的有界环形队列。
+队列满时按策略丢帧，而不是像逐帧发射Qt信号那样让跨线程事件队列无限增长。
+
+通知采用边沿触发：只有在消费者取空队列后的第一帧才调用notify回调(通常用于发射Qt信号)，
+因此任意时刻最多只有一个待处理的跨线程事件。
+
+元素引用帧缓冲池中的缓冲区时，put把生产者的引用交给通道：通道丢弃的元素(队列满丢帧、清空等)
+交给release回调归还，被get/get_latest/drain取出的元素由消费者负责归还。
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger()
+
+# 队列满时的处理策略
+DROP_OLDEST = "drop_oldest"     # 丢弃最旧的帧，保证显示最新画面
+DROP_NEWEST = "drop_newest"     # 丢弃新到的帧，保证已入队的帧都被处理
+BLOCK = "block"                 # 阻塞生产者直到有空位(超时后丢弃新帧)
+
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+# 默认队列深度
+DEFAULT_DEPTH = 2
+
+# 通知后消费者长时间未取帧时重新通知的间隔(秒)，防止消费者错过通知导致画面停止更新
+DEFAULT_RENOTIFY_INTERVAL = 0.5
+
+
+class FrameChannel:
+    """
+    单生产者单消费者的有界帧队列
+
+    预分配固定长度的环形槽位，put/get只移动读写索引；
+    临界区只包含索引操作，不在锁内拷贝图像数据或调用回调。
+    """
+
+    def __init__(self, depth: int = DEFAULT_DEPTH, policy: str = DROP_OLDEST,
+                 notify: Optional[Callable[[Any], None]] = None, name: str = "",
+                 renotify_interval: float = DEFAULT_RENOTIFY_INTERVAL,
+                 release: Optional[Callable[[Any], Any]] = None):
+        """
+        初始化帧通道
+
+        Args:
+            depth: 队列深度
+            policy: 队列满时的策略，DROP_OLDEST / DROP_NEWEST / BLOCK
+            notify: 队列由空变为非空时在生产者线程中调用的回调，参数为新入队的元素
+            name: 通道名称，用于日志
+            renotify_interval: 消费者未取帧时重新通知的间隔(秒)，0表示不重新通知
+            release: 通道丢弃元素(未入队、被挤出、被清空)时调用，用于归还帧缓冲区
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"不支持的丢帧策略: {policy}")
+        self._name = name
+        self._policy = policy
+        self._notify = notify
+        self._release = release
+        self._renotify_interval = renotify_interval
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._not_empty = threading.Condition(self._lock)
+        self._closed = False
+        self._allocate(depth)
+
+        # 通知状态
+        self._notify_pending = False
+        self._last_notify_time = 0.0
+
+        # 统计信息
+        self._put_count = 0
+        self._get_count = 0
+        self._dropped = 0
+        self._superseded = 0
+        self._blocked = 0
+        self._high_watermark = 0
+
+    def _allocate(self, depth: int) -> None:
+        """分配环形槽位，调用者需持有锁或处于初始化阶段"""
+        self._depth = max(1, int(depth))
+        self._slots: List[Any] = [None] * self._depth
+        self._head = 0      # 下一个读取位置
+        self._size = 0
+
+    @property
+    def name(self) -> str:
+        """通道名称"""
+        return self._name
+
+    @property
+    def depth(self) -> int:
+        """队列深度"""
+        return self._depth
+
+    @property
+    def policy(self) -> str:
+        """丢帧策略"""
+        return self._policy
+
+    def __len__(self) -> int:
+        return self._size
+
+    def set_depth(self, depth: int) -> None:
+        """
+        修改队列深度，队列中已有的帧会被丢弃
+
+        Args:
+            depth: 新的队列深度
+        """
+        with self._lock:
+            dropped = self._take_all_locked()
+            self._dropped += len(dropped)
+            self._allocate(depth)
+            self._notify_pending = False
+            self._not_full.notify_all()
+        self._release_items(dropped)
+        logger.info(f"帧通道{self._name}深度设置为: {self._depth}")
+
+    def set_policy(self, policy: str) -> None:
+        """
+        修改丢帧策略
+
+        Args:
+            policy: DROP_OLDEST / DROP_NEWEST / BLOCK
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"不支持的丢帧策略: {policy}")
+        with self._lock:
+            self._policy = policy
+            self._not_full.notify_all()
+
+    def set_notify(self, notify: Optional[Callable[[Any], None]]) -> None:
+        """设置队列由空变为非空时的通知回调"""
+        self._notify = notify
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """
+        放入一帧(生产者调用)
+
+        Args:
+            item: 帧或(帧, 相机ID)等任意对象
+            timeout: BLOCK策略下的最长等待时间(秒)，None表示一直等待
+
+        Returns:
+            是否入队成功；DROP_NEWEST策略队列已满或BLOCK超时时返回False(该帧交给release回调)
+        """
+        accepted = False
+        should_notify = False
+        evicted = None
+        with self._lock:
+            if self._closed:
+                evicted = item
+            elif self._size >= self._depth:
+                if self._policy == DROP_OLDEST:
+                    evicted = self._slots[self._head]
+                    self._slots[self._head] = None
+                    self._head = (self._head + 1) % self._depth
+                    self._size -= 1
+                    self._dropped += 1
+                elif self._policy == DROP_NEWEST:
+                    self._dropped += 1
+                    evicted = item
+                else:
+                    self._blocked += 1
+                    if not self._not_full.wait_for(lambda: self._size < self._depth or self._closed, timeout):
+                        self._dropped += 1
+                        evicted = item
+                    elif self._closed:
+                        evicted = item
+
+            if evicted is not item:
+                accepted = True
+                self._slots[(self._head + self._size) % self._depth] = item
+                self._size += 1
+                self._put_count += 1
+                if self._size > self._high_watermark:
+                    self._high_watermark = self._size
+                self._not_empty.notify()
+
+                now = time.monotonic()
+                if not self._notify_pending or (
+                        self._renotify_interval > 0 and now - self._last_notify_time >= self._renotify_interval):
+                    self._notify_pending = True
+                    self._last_notify_time = now
+                    should_notify = True
+
+        if evicted is not None:
+            self._release_items([evicted])
+        if should_notify and self._notify is not None:
+            try:
+                self._notify(item)
+            except Exception as e:
+                logger.error(f"帧通道{self._name}通知回调失败: {str(e)}")
+        return accepted
+
+    def get(self, timeout: Optional[float] = 0) -> Optional[Any]:
+        """
+        取出最旧的一帧(消费者调用)
+
+        Args:
+            timeout: 等待时间(秒)，0表示不等待，None表示一直等待
+
+        Returns:
+            帧，队列为空或超时时返回None
+        """
+        with self._lock:
+            if self._size == 0 and timeout != 0:
+                self._not_empty.wait_for(lambda: self._size > 0 or self._closed, timeout)
+            if self._size == 0:
+                self._notify_pending = False
+                return None
+            return self._pop_locked()
+
+    def get_latest(self) -> Optional[Any]:
+        """
+        取出最新的一帧并丢弃其余帧(用于界面显示)
+
+        Returns:
+            最新的帧，队列为空时返回None
+        """
+        superseded = []
+        with self._lock:
+            if self._size == 0:
+                self._notify_pending = False
+                return None
+            while self._size > 1:
+                superseded.append(self._pop_locked())
+                self._superseded += 1
+            latest = self._pop_locked()
+        self._release_items(superseded)
+        return latest
+
+    def drain(self) -> List[Any]:
+        """
+        取出队列中的全部帧(按入队顺序)
+
+        Returns:
+            帧列表
+        """
+        with self._lock:
+            items = []
+            while self._size > 0:
+                items.append(self._pop_locked())
+            self._notify_pending = False
+            return items
+
+    def clear(self) -> None:
+        """清空队列，被清掉的帧计入丢帧数并交给release回调"""
+        with self._lock:
+            dropped = self._take_all_locked()
+            self._dropped += len(dropped)
+            self._slots = [None] * self._depth
+            self._head = 0
+            self._size = 0
+            self._notify_pending = False
+            self._not_full.notify_all()
+        self._release_items(dropped)
+
+    def close(self) -> None:
+        """关闭通道，唤醒所有等待中的生产者和消费者"""
+        with self._lock:
+            self._closed = True
+            self._not_full.notify_all()
+            self._not_empty.notify_all()
+
+    def reopen(self) -> None:
+        """重新打开已关闭的通道"""
+        with self._lock:
+            self._closed = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取通道统计信息
+
+        Returns:
+            包含队列深度、当前长度、丢帧数等信息的字典
+        """
+        with self._lock:
+            return {
+                'name': self._name,
+                'policy': self._policy,
+                'depth': self._depth,
+                'size': self._size,
+                'high_watermark': self._high_watermark,
+                'put': self._put_count,
+                'get': self._get_count,
+                'dropped': self._dropped,
+                'superseded': self._superseded,
+                'blocked': self._blocked,
+            }
+
+    def reset_stats(self) -> None:
+        """清零统计计数"""
+        with self._lock:
+            self._put_count = 0
+            self._get_count = 0
+            self._dropped = 0
+            self._superseded = 0
+            self._blocked = 0
+            self._high_watermark = self._size
+
+    def _pop_locked(self) -> Any:
+        """弹出队首元素，调用者需持有锁且队列非空"""
+        item = self._slots[self._head]
+        self._slots[self._head] = None
+        self._head = (self._head + 1) % self._depth
+        self._size -= 1
+        self._get_count += 1
+        if self._size == 0:
+            self._notify_pending = False
+        self._not_full.notify()
+        return item
+
+    def _take_all_locked(self) -> List[Any]:
+        """按入队顺序返回队列中的全部元素(不修改队列)，调用者需持有锁"""
+        return [self._slots[(self._head + i) % self._depth] for i in range(self._size)]
+
+    def _release_items(self, items: List[Any]) -> None:
+        """把通道丢弃的元素交给release回调，不持有锁时调用"""
+        if self._release is None:
+            return
+        for item in items:
+            try:
+                self._release(item)
+            except Exception as e:
+                logger.error(f"帧通道{self._name}释放帧失败: {str(e)}")
+
+
+class LatestFrameSlot:
+    """
+    最新帧槽位
+
+    采集线程每到一帧就覆盖槽位并唤醒等待者；拉取式消费者(get_frame)在条件变量上阻塞等待
+    比上次取到的更新的一帧，等待期间不占用CPU。
+
+    设置retain/release回调时，槽位自己持有当前帧的一个引用，被覆盖或清空时归还；
+    wait_newer/peek返回的帧已为调用者增加了一个引用，调用者用完后负责归还。
+    """
+
+    def __init__(self, retain: Optional[Callable[[Any], Any]] = None,
+                 release: Optional[Callable[[Any], Any]] = None):
+        """
+        Args:
+            retain: 为新的持有者增加帧引用的函数
+            release: 归还帧引用的函数
+        """
+        self._cond = threading.Condition(threading.Lock())
+        self._retain = retain
+        self._release = release
+        self._frame = None
+        self._info: Dict[str, Any] = {}
+        self._sequence = 0
+        self._closed = False
+
+    @property
+    def sequence(self) -> int:
+        """已发布的帧序号(每发布一帧加1)"""
+        return self._sequence
+
+    def publish(self, frame: Any, info: Optional[Dict[str, Any]] = None) -> int:
+        """
+        发布一帧(生产者调用)
+
+        Args:
+            frame: 图像数据
+            info: 帧信息，如帧号、时间戳
+
+        Returns:
+            该帧的序号；槽位已关闭时丢弃该帧并返回0
+        """
+        if self._retain is not None:
+            self._retain(frame)
+        with self._cond:
+            if self._closed:
+                # 与close()竞争的发布：不保存该帧，否则停止后仍占用缓冲区，重新开始后还会被当作最新帧取走
+                previous = frame
+                sequence = 0
+            else:
+                previous = self._frame
+                self._sequence += 1
+                self._frame = frame
+                self._info = dict(info) if info else {}
+                self._info['sequence'] = self._sequence
+                self._cond.notify_all()
+                sequence = self._sequence
+        self._drop(previous)
+        return sequence
+
+    def wait_newer(self, after_sequence: int, timeout: Optional[float] = None):
+        """
+        等待序号大于after_sequence的帧
+
+        Args:
+            after_sequence: 上次取到的帧序号
+            timeout: 最长等待时间(秒)，None表示一直等待
+
+        Returns:
+            (帧, 帧信息)；超时或槽位关闭时返回(None, {})
+        """
+        with self._cond:
+            # 已发布但被clear/close丢弃的帧不算新帧，继续等待下一次发布
+            if not self._cond.wait_for(
+                    lambda: (self._sequence > after_sequence and self._frame is not None) or self._closed, timeout):
+                return None, {}
+            if self._frame is None:
+                return None, {}
+            return self._hand_out_locked()
+
+    def peek(self):
+        """
+        不等待，直接返回当前最新帧
+
+        Returns:
+            (帧, 帧信息)，尚无帧时返回(None, {})
+        """
+        with self._cond:
+            if self._frame is None:
+                return None, {}
+            return self._hand_out_locked()
+
+    def clear(self) -> None:
+        """丢弃当前帧(序号保持递增)"""
+        with self._cond:
+            previous, self._frame = self._frame, None
+            self._info = {}
+        self._drop(previous)
+
+    def close(self) -> None:
+        """关闭槽位并唤醒所有等待者"""
+        with self._cond:
+            self._closed = True
+            previous, self._frame = self._frame, None
+            self._info = {}
+            self._cond.notify_all()
+        self._drop(previous)
+
+    def reopen(self) -> None:
+        """重新打开槽位"""
+        with self._cond:
+            self._closed = False
+
+    def _hand_out_locked(self):
+        """为调用者增加当前帧的引用后返回(帧, 帧信息)，调用者需持有锁，保证帧不会在此期间被覆盖归还"""
+        if self._retain is not None:
+            self._retain(self._frame)
+        return self._frame, dict(self._info)
+
+    def _drop(self, frame: Any) -> None:
+        """归还槽位持有的帧引用"""
+        if frame is not None and self._release is not None:
+            self._release(frame)
+
+
+# 按相机ID登记的帧通道，消费者收到frame_ready_signal后据此找到对应通道取帧
+_channels: Dict[str, FrameChannel] = {}
+_channels_lock = threading.Lock()
+
+
+def register_channel(camera_id: str, channel: FrameChannel) -> None:
+    """
+    登记相机的帧通道
+
+    Args:
+        camera_id: 相机ID，与frame_ready_signal中的相机ID一致
+        channel: 帧通道
+    """
+    with _channels_lock:
+        _channels[camera_id] = channel
+
+
+def unregister_channel(camera_id: str, channel: Optional[FrameChannel] = None) -> None:
+    """
+    注销相机的帧通道
+
+    Args:
+        camera_id: 相机ID
+        channel: 只有当前登记的通道是该对象时才注销，None表示无条件注销
+    """
+    with _channels_lock:
+        if channel is None or _channels.get(camera_id) is channel:
+            _channels.pop(camera_id, None)
+
+
+def get_channel(camera_id: str) -> Optional[FrameChannel]:
+    """
+    根据相机ID获取帧通道
+
+    Args:
+        camera_id: 相机ID
+
+    Returns:
+        帧通道，未登记时返回None
+    """
+    with _channels_lock:
+        return _channels.get(camera_id)
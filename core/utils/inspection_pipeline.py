@@ -0,0 +1,383 @@
+"""
+多进程检测流水线模块
+
+OpenCV/YOLO等检测算法如果在界面进程中运行，会与Qt事件循环争用GIL，检测吞吐量无法随CPU核数增长。
+本模块把检测放到进程池中执行：
+- 图像写入预先分配的multiprocessing.shared_memory槽位，任务只传递槽位名、形状和数据类型，不序列化图像
+- 工作进程按名称附着共享内存，直接在其上构造numpy视图并调用注册的算法函数，任务结束后关闭映射
+- 默认只把结果字典传回主进程；需要结果图像时由工作进程写回同一槽位再由主进程拷出
+- 结果作为ALGORITHM_RESULT事件发布到事件总线(界面进程中桥接到algorithm_result_signal)，或交给自定义回调
+
+算法函数必须是模块级函数(能被pickle按名称引用)，签名为:
+
+    func(image: np.ndarray, **params) -> dict 或 (结果图像, dict)
+
+工作进程中的image视图在函数返回后即失效，算法不能保留对它的引用。
+"""
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .logger import get_logger
+from .event_bus import event_bus, ALGORITHM_RESULT
+
+logger = get_logger()
+
+# 算法函数签名
+AlgorithmFunc = Callable[..., Any]
+
+# 已注册的检测算法: {名称: 函数}
+_algorithms: Dict[str, AlgorithmFunc] = {}
+
+# 无结果图像时随信号发出的空图像
+_EMPTY_IMAGE = np.empty((0, 0), dtype=np.uint8)
+
+
+def register_algorithm(name: str, func: AlgorithmFunc) -> None:
+    """
+    注册检测算法
+
+    Args:
+        name: 算法名称，作为algorithm_result_signal的结果类型
+        func: 模块级算法函数
+    """
+    _algorithms[name] = func
+    logger.info(f"注册检测算法: {name}")
+
+
+def unregister_algorithm(name: str) -> None:
+    """注销检测算法"""
+    _algorithms.pop(name, None)
+
+
+def get_algorithms() -> List[str]:
+    """获取已注册的算法名称列表"""
+    return list(_algorithms.keys())
+
+
+# ----------------------------------------------------------------------
+# 工作进程
+# ----------------------------------------------------------------------
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """
+    在工作进程中附着共享内存槽位
+
+    每个任务附着一次并在结束时由_detach_segment关闭。主进程停止流水线后会删除槽位，
+    工作进程若一直保留映射，已删除槽位的内存要等工作进程退出才能回收，重启流水线时还会不断累积。
+    """
+    return shared_memory.SharedMemory(name=name)
+
+
+def _detach_segment(segment: shared_memory.SharedMemory) -> None:
+    """在工作进程中关闭共享内存映射(不删除槽位)"""
+    try:
+        segment.close()
+    except BufferError:
+        # 算法保留了图像视图的引用，映射随工作进程退出释放
+        logger.warning(f"检测算法保留了共享内存视图，无法关闭槽位: {segment.name}")
+
+
+def _run_task(func: AlgorithmFunc, segment_name: str, shape: Tuple[int, ...], dtype: str,
+              params: Dict[str, Any], return_image: bool) -> Dict[str, Any]:
+    """
+    在工作进程中执行一次检测
+
+    Returns:
+        {'result': 结果字典, 'image': 写回槽位的图像形状和类型或直接返回的图像, 'error': 错误信息}
+    """
+    started = time.perf_counter()
+    segment = _attach_segment(segment_name)
+    reply: Dict[str, Any] = {'result': {}, 'image': None, 'error': None}
+    try:
+        reply.update(_run_on_segment(func, segment, shape, dtype, params, return_image))
+    except Exception as e:
+        reply['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        # 图像视图都是_run_on_segment的局部变量，返回后即可关闭映射
+        _detach_segment(segment)
+    reply['worker_ms'] = (time.perf_counter() - started) * 1000.0
+    return reply
+
+
+def _run_on_segment(func: AlgorithmFunc, segment: shared_memory.SharedMemory, shape: Tuple[int, ...],
+                    dtype: str, params: Dict[str, Any], return_image: bool) -> Dict[str, Any]:
+    """在共享内存槽位上调用算法函数，需要时把结果图像写回槽位"""
+    image = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+    output = func(image, **params)
+    if isinstance(output, tuple):
+        out_image, result = output
+    else:
+        out_image, result = None, output
+    reply = {'result': result if isinstance(result, dict) else {'value': result}}
+
+    if return_image and out_image is not None:
+        out_image = np.ascontiguousarray(out_image)
+        if out_image.nbytes <= segment.size:
+            # 写回同一槽位，避免通过管道传输图像
+            target = np.ndarray(out_image.shape, dtype=out_image.dtype, buffer=segment.buf)
+            if target.__array_interface__['data'][0] != out_image.__array_interface__['data'][0]:
+                target[...] = out_image
+            reply['image'] = ('shm', out_image.shape, out_image.dtype.str)
+        else:
+            reply['image'] = ('data', out_image)
+    return reply
+
+
+# ----------------------------------------------------------------------
+# 主进程
+# ----------------------------------------------------------------------
+
+class InspectionPipeline:
+    """
+    基于共享内存和进程池的检测流水线
+
+        pipeline = InspectionPipeline(workers=4, slot_bytes=2448 * 2048 * 3)
+        pipeline.start()
+        manager.add_frame_handler(lambda serial, frame, info: pipeline.submit(frame, "blob", tag=serial))
+        ...
+        pipeline.stop()
+    """
+
+    def __init__(self, workers: Optional[int] = None, slot_bytes: int = 1920 * 1080 * 3,
+                 slots: Optional[int] = None, result_callback: Optional[Callable[[str, np.ndarray, dict], None]] = None):
+        """
+        初始化检测流水线
+
+        Args:
+            workers: 工作进程数，None表示CPU核数
+            slot_bytes: 每个共享内存槽位的字节数，应不小于最大图像
+            slots: 槽位数量(即最多同时在处理的帧数)，None表示工作进程数的2倍
+            result_callback: 结果回调(算法名, 结果图像, 结果字典)，None表示发布ALGORITHM_RESULT事件
+        """
+        self._workers = max(1, workers or multiprocessing.cpu_count())
+        self._slot_bytes = int(slot_bytes)
+        self._slot_count = max(1, slots or self._workers * 2)
+        self._result_callback = result_callback
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._segments: List[shared_memory.SharedMemory] = []
+        self._free_slots: List[int] = []
+        self._lock = threading.Lock()
+        self._slot_available = threading.Condition(self._lock)
+        self._running = False
+        self._in_flight = 0
+        # stop(wait=False)时仍有任务在处理，这些槽位等最后一个任务完成后再释放
+        self._retired_segments: List[shared_memory.SharedMemory] = []
+
+        self.reset_stats()
+
+    @property
+    def running(self) -> bool:
+        """流水线是否已启动"""
+        return self._running
+
+    def start(self) -> bool:
+        """
+        分配共享内存槽位并启动进程池
+
+        Returns:
+            是否启动成功
+        """
+        if self._running:
+            return True
+        try:
+            self._segments = [shared_memory.SharedMemory(create=True, size=self._slot_bytes)
+                              for _ in range(self._slot_count)]
+            self._free_slots = list(range(self._slot_count))
+            # spawn方式启动，避免在已加载Qt的进程中fork
+            self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            self._running = True
+            logger.info(f"检测流水线已启动: {self._workers}个工作进程, {self._slot_count}个共享内存槽位")
+            return True
+        except Exception as e:
+            logger.error(f"启动检测流水线失败: {str(e)}")
+            self._release_segments(self._segments)
+            self._segments = []
+            self._free_slots = []
+            return False
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        停止进程池并释放共享内存
+
+        不等待时仍在处理的任务照常完成并发出结果，它们使用的槽位在最后一个任务完成后释放。
+
+        Args:
+            wait: 是否等待正在处理的任务完成
+        """
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._slot_available.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+        with self._lock:
+            self._retired_segments.extend(self._segments)
+            self._segments = []
+            self._free_slots = []
+            retired = self._take_retired_locked()
+        self._release_segments(retired)
+        logger.info("检测流水线已停止")
+
+    def submit(self, frame: np.ndarray, algorithm: str, params: Optional[Dict[str, Any]] = None,
+               return_image: bool = False, tag: Any = None, timeout: float = 0) -> bool:
+        """
+        提交一帧进行检测
+
+        Args:
+            frame: 图像
+            algorithm: 已注册的算法名称
+            params: 传给算法函数的关键字参数
+            return_image: 是否需要传回结果图像
+            tag: 附加到结果字典'tag'字段的标记，如相机序列号
+            timeout: 没有空闲槽位时的等待时间(秒)，0表示立即丢弃该帧
+
+        Returns:
+            是否已提交；没有空闲槽位或流水线未启动时返回False
+        """
+        func = _algorithms.get(algorithm)
+        if func is None:
+            raise ValueError(f"未注册的检测算法: {algorithm}")
+        frame = np.ascontiguousarray(frame)
+        if frame.nbytes > self._slot_bytes:
+            logger.error(f"图像大小{frame.nbytes}超过共享内存槽位大小{self._slot_bytes}")
+            return False
+
+        with self._lock:
+            if not self._running:
+                return False
+            if not self._free_slots and timeout:
+                self._slot_available.wait_for(lambda: self._free_slots or not self._running, timeout)
+            if not self._running or not self._free_slots:
+                self._stats['dropped'] += 1
+                return False
+            slot = self._free_slots.pop()
+            segment = self._segments[slot]
+            self._stats['submitted'] += 1
+            self._in_flight += 1
+
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=segment.buf)[...] = frame
+        submitted_at = time.perf_counter()
+        try:
+            future = self._executor.submit(_run_task, func, segment.name, frame.shape, frame.dtype.str,
+                                           params or {}, return_image)
+        except Exception as e:
+            logger.error(f"提交检测任务失败: {str(e)}")
+            self._release_slot(slot, segment, failed=True)
+            return False
+        future.add_done_callback(
+            lambda f: self._on_task_done(f, slot, segment, algorithm, tag, submitted_at))
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取流水线统计信息
+
+        Returns:
+            提交/完成/失败/丢弃数、在处理帧数、平均延迟(毫秒)等
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = self._in_flight
+            stats['free_slots'] = len(self._free_slots)
+            stats['workers'] = self._workers
+            completed = stats['completed'] + stats['failed']
+            stats['latency_ms_avg'] = self._latency_total / completed if completed else 0.0
+            stats['worker_ms_avg'] = self._worker_total / completed if completed else 0.0
+        return stats
+
+    def reset_stats(self) -> None:
+        """清零统计计数"""
+        with self._lock:
+            self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'dropped': 0}
+            self._latency_total = 0.0
+            self._worker_total = 0.0
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _on_task_done(self, future, slot: int, segment: shared_memory.SharedMemory, algorithm: str,
+                      tag: Any, submitted_at: float) -> None:
+        """
+        任务完成回调(在进程池的管理线程中执行)
+
+        直接使用提交时的槽位对象：stop(wait=False)之后self._segments已清空或属于重新启动后的新槽位，
+        而本任务的槽位在_release_slot归还之前不会被关闭。
+        """
+        latency = (time.perf_counter() - submitted_at) * 1000.0
+        image = _EMPTY_IMAGE
+        try:
+            reply = future.result()
+        except Exception as e:
+            reply = {'result': {}, 'image': None, 'error': f"{type(e).__name__}: {e}", 'worker_ms': 0.0}
+
+        if reply['image'] is not None:
+            kind, *payload = reply['image']
+            if kind == 'shm':
+                shape, dtype = payload
+                image = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf).copy()
+            elif kind == 'data':
+                image = payload[0]
+
+        failed = reply['error'] is not None
+        with self._lock:
+            self._latency_total += latency
+            self._worker_total += reply.get('worker_ms', 0.0)
+        self._release_slot(slot, segment, failed=failed)
+
+        result = dict(reply['result'])
+        result['latency_ms'] = latency
+        if tag is not None:
+            result['tag'] = tag
+        if failed:
+            result['error'] = reply['error']
+            logger.error(f"检测算法{algorithm}执行失败: {reply['error']}")
+        self._emit_result(algorithm, image, result)
+
+    def _release_slot(self, slot: int, segment: shared_memory.SharedMemory, failed: bool = False) -> None:
+        """归还共享内存槽位；流水线已停止时槽位不再复用，最后一个任务完成后释放已停用的槽位"""
+        with self._lock:
+            self._in_flight -= 1
+            self._stats['failed' if failed else 'completed'] += 1
+            if self._running and slot < len(self._segments) and self._segments[slot] is segment:
+                self._free_slots.append(slot)
+                self._slot_available.notify()
+            retired = self._take_retired_locked()
+        self._release_segments(retired)
+
+    def _take_retired_locked(self) -> List[shared_memory.SharedMemory]:
+        """没有正在处理的任务时取出已停用的槽位(调用者持有锁)"""
+        if self._in_flight or not self._retired_segments:
+            return []
+        retired, self._retired_segments = self._retired_segments, []
+        return retired
+
+    def _emit_result(self, algorithm: str, image: np.ndarray, result: Dict[str, Any]) -> None:
+        """发出检测结果"""
+        try:
+            if self._result_callback is not None:
+                self._result_callback(algorithm, image, result)
+            else:
+                event_bus.publish(ALGORITHM_RESULT, algorithm, image, result)
+        except Exception as e:
+            logger.error(f"发送检测结果失败: {str(e)}")
+
+    @staticmethod
+    def _release_segments(segments: List[shared_memory.SharedMemory]) -> None:
+        """关闭并删除共享内存槽位"""
+        for segment in segments:
+            try:
+                segment.close()
+                segment.unlink()
+            except Exception as e:
+                logger.warning(f"释放共享内存失败: {str(e)}")
@@ -10,17 +10,17 @@ import logging
 import logging.handlers
 import time
 from typing import Optional, Union
-from PyQt5.QtCore import pyqtSignal, QObject
 
-# 创建日志信号类
-class LoggerSignals(QObject):
-    """
-    用于在UI中显示日志的信号类
-    """
-    log_message = pyqtSignal(str, str)  # 级别, 内容
+from .event_bus import event_bus, LOG_MESSAGE
+
+
+def __getattr__(name):
+    # 日志信号类依赖PyQt5，只在界面代码访问时才导入
+    if name in ('LoggerSignals', 'logger_signals'):
+        from . import signal_manager
+        return getattr(signal_manager, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# 初始化日志信号实例
-logger_signals = LoggerSignals()
 
 class Logger:
     """
@@ -108,14 +108,14 @@ class Logger:
     def info(self, message: str):
         """记录信息日志"""
         self.logger.info(message)
-        # 发送信号到UI
-        logger_signals.log_message.emit('INFO', message)
+        # 发布到事件总线，界面进程中桥接到日志信号
+        event_bus.publish(LOG_MESSAGE, 'INFO', message)
     
     def warning(self, message: str):
         """记录警告日志"""
         self.logger.warning(message)
-        # 发送信号到UI
-        logger_signals.log_message.emit('WARNING', message)
+        # 发布到事件总线，界面进程中桥接到日志信号
+        event_bus.publish(LOG_MESSAGE, 'WARNING', message)
     
     def error(self, message: str, exc_info=False):
         """
@@ -126,8 +126,8 @@ class Logger:
             exc_info: 是否包含异常堆栈信息
         """
         self.logger.error(message, exc_info=exc_info)
-        # 发送信号到UI
-        logger_signals.log_message.emit('ERROR', message)
+        # 发布到事件总线，界面进程中桥接到日志信号
+        event_bus.publish(LOG_MESSAGE, 'ERROR', message)
     
     def exception(self, message: str, exc_info=True):
         """
@@ -138,14 +138,14 @@ class Logger:
             exc_info: 是否包含异常堆栈信息
         """
         self.logger.exception(message, exc_info=exc_info)
-        # 发送信号到UI
-        logger_signals.log_message.emit('ERROR', f"{message} (详细堆栈信息见日志文件)")
+        # 发布到事件总线，界面进程中桥接到日志信号
+        event_bus.publish(LOG_MESSAGE, 'ERROR', f"{message} (详细堆栈信息见日志文件)")
     
     def critical(self, message: str):
         """记录严重错误日志"""
         self.logger.critical(message)
-        # 发送信号到UI
-        logger_signals.log_message.emit('CRITICAL', message)
+        # 发布到事件总线，界面进程中桥接到日志信号
+        event_bus.publish(LOG_MESSAGE, 'CRITICAL', message)
     
 # 单例Logger实例
 _logger_instance = None
@@ -0,0 +1,334 @@
+"""
+性能指标模块
+
+按名称登记直方图和计数器，记录采集链路各阶段(SDK取帧 -> 像素转换 -> 发布 -> 显示)的耗时分布(p50/p95/p99)、
+每台相机的帧数和帧号跳变(丢帧)次数，可导出为JSON快照。不依赖PyQt5，采集线程和无界面服务都可以使用。
+"""
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# 采集链路的阶段名称(耗时直方图，单位毫秒)
+STAGE_SDK_GET = "sdk_get"       # MV_CC_GetImageBuffer返回一帧所用时间(包含等待下一帧)
+STAGE_CONVERT = "convert"       # 像素格式转换/拷贝到缓冲池
+STAGE_EMIT = "emit"             # 放入最新帧槽位和帧队列并通知消费者
+STAGE_DISPLAY = "display"       # 查看器转换并更新图像项
+STAGE_LATENCY = "latency"       # 帧到达采集线程到显示完成的端到端延迟
+
+# 直方图默认保留的最近样本数
+DEFAULT_WINDOW = 2048
+
+
+class Histogram:
+    """
+    耗时直方图
+
+    保留最近window个样本用于计算分位数，同时累计全部样本的次数、总和、最小值和最大值。
+    """
+
+    def __init__(self, name: str, window: int = DEFAULT_WINDOW):
+        """
+        初始化直方图
+
+        Args:
+            name: 名称
+            window: 计算分位数时使用的最近样本数
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=max(1, int(window)))
+        self._count = 0
+        self._total = 0.0
+        self._min = None
+        self._max = None
+
+    def observe(self, value: float) -> None:
+        """
+        记录一个样本
+
+        Args:
+            value: 样本值(耗时为毫秒)
+        """
+        with self._lock:
+            self._samples.append(value)
+            self._count += 1
+            self._total += value
+            if self._min is None or value < self._min:
+                self._min = value
+            if self._max is None or value > self._max:
+                self._max = value
+
+    def percentile(self, p: float) -> float:
+        """
+        计算最近样本的分位数
+
+        Args:
+            p: 百分位(0~100)
+
+        Returns:
+            分位数值，没有样本时返回0.0
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        return _percentile(samples, p)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取统计快照
+
+        Returns:
+            count/mean/min/max以及最近样本的p50/p95/p99
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+            count, total = self._count, self._total
+            minimum, maximum = self._min, self._max
+        return {
+            'count': count,
+            'mean': total / count if count else 0.0,
+            'min': minimum if minimum is not None else 0.0,
+            'max': maximum if maximum is not None else 0.0,
+            'p50': _percentile(samples, 50),
+            'p95': _percentile(samples, 95),
+            'p99': _percentile(samples, 99),
+        }
+
+    def reset(self) -> None:
+        """清空样本和累计值"""
+        with self._lock:
+            self._samples.clear()
+            self._count = 0
+            self._total = 0.0
+            self._min = None
+            self._max = None
+
+
+def _percentile(sorted_samples, p: float) -> float:
+    """对已排序样本按最近秩法计算分位数"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, math.ceil(p / 100.0 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+class FrameGapTracker:
+    """
+    帧号跳变统计
+
+    相机帧号应当逐帧加1，跳过的帧号说明相机或传输链路丢了帧；帧号变小视为相机重新开始计数。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def track(self, camera_id: str, frame_number: int) -> int:
+        """
+        记录一帧的帧号
+
+        Args:
+            camera_id: 相机ID
+            frame_number: 相机帧号
+
+        Returns:
+            本帧之前跳过的帧数
+        """
+        with self._lock:
+            stats = self._stats.get(camera_id)
+            if stats is None:
+                stats = self._stats[camera_id] = {'frames': 0, 'gaps': 0, 'missing': 0, 'resets': 0}
+            stats['frames'] += 1
+            last = self._last.get(camera_id)
+            self._last[camera_id] = frame_number
+            if last is None:
+                return 0
+            if frame_number <= last:
+                stats['resets'] += 1
+                return 0
+            missing = frame_number - last - 1
+            if missing:
+                stats['gaps'] += 1
+                stats['missing'] += missing
+            return missing
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """
+        获取各相机的统计
+
+        Returns:
+            {相机ID: {'frames', 'gaps'(跳变次数), 'missing'(跳过的帧数), 'resets'(重新计数次数)}}
+        """
+        with self._lock:
+            return {camera_id: dict(stats) for camera_id, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        """清空统计"""
+        with self._lock:
+            self._last.clear()
+            self._stats.clear()
+
+
+class MetricsRegistry:
+    """
+    性能指标注册表
+
+    直方图和计数器在第一次使用时按名称创建。disable()后记录接口直接返回，采集线程中的开销可以忽略。
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        初始化注册表
+
+        Args:
+            window: 新建直方图保留的最近样本数
+        """
+        self._lock = threading.Lock()
+        self._window = window
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._frame_gaps = FrameGapTracker()
+        self._started = time.time()
+        self.enabled = True
+
+    def enable(self) -> None:
+        """开启记录"""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """关闭记录(已记录的数据保留)"""
+        self.enabled = False
+
+    def histogram(self, name: str) -> Histogram:
+        """
+        获取直方图，不存在时创建
+
+        Args:
+            name: 名称
+
+        Returns:
+            直方图
+        """
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(name, self._window))
+        return histogram
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        向直方图记录一个样本
+
+        Args:
+            name: 直方图名称，如STAGE_CONVERT
+            value: 样本值(耗时为毫秒)
+        """
+        if self.enabled:
+            self.histogram(name).observe(value)
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        计时上下文，退出时把耗时(毫秒)记入直方图
+
+        Args:
+            name: 直方图名称
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).observe((time.perf_counter() - start) * 1000.0)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """
+        增加计数器
+
+        Args:
+            name: 计数器名称
+            value: 增加量
+        """
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def track_frame(self, camera_id: str, frame_number: int) -> int:
+        """
+        记录帧号用于统计丢帧
+
+        Args:
+            camera_id: 相机ID
+            frame_number: 相机帧号
+
+        Returns:
+            本帧之前跳过的帧数
+        """
+        if not self.enabled:
+            return 0
+        return self._frame_gaps.track(camera_id, frame_number)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取全部指标的快照
+
+        Returns:
+            {'timestamp', 'uptime', 'histograms': {名称: {...}}, 'counters': {...}, 'frame_gaps': {相机ID: {...}}}
+        """
+        with self._lock:
+            histograms = list(self._histograms.values())
+            counters = dict(self._counters)
+        now = time.time()
+        return {
+            'timestamp': now,
+            'uptime': now - self._started,
+            'histograms': {histogram.name: histogram.snapshot() for histogram in histograms},
+            'counters': counters,
+            'frame_gaps': self._frame_gaps.snapshot(),
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """
+        以JSON字符串导出快照
+
+        Args:
+            indent: 缩进，None表示紧凑格式
+
+        Returns:
+            JSON字符串
+        """
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=indent)
+
+    def export_json(self, path: str) -> str:
+        """
+        把快照写入JSON文件
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            写入的文件路径
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+        return path
+
+    def reset(self) -> None:
+        """清空全部指标"""
+        with self._lock:
+            histograms = list(self._histograms.values())
+            self._counters.clear()
+            self._started = time.time()
+        for histogram in histograms:
+            histogram.reset()
+        self._frame_gaps.reset()
+
+
+# 全局指标注册表
+metrics = MetricsRegistry()
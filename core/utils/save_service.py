@@ -0,0 +1,338 @@
+"""
+异步图像保存模块
+
+连拍或批量保存时，如果在采集线程或界面线程中同步编码并写盘，PNG/TIFF编码一帧就要几十毫秒，
+期间采集停顿、界面卡住。本模块把保存移到后台：
+- submit只把图像(默认拷贝一份，避免相机缓冲区被回收)放入有界的待保存队列，立即返回
+- 编码线程池调用cv2.imencode(编码期间释放GIL，多线程可以并行占满多核)
+- 编码结果一次写入大缓冲区的文件，写完后改名为最终文件名，监视目录的程序不会读到不完整的文件
+- 保存完成后发布DATA_SAVED事件(界面进程中桥接到data_saved_signal)，或交给自定义回调
+- 待保存队列满时按timeout等待或丢弃该帧并计数，不会阻塞采集
+"""
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import cv2
+import numpy as np
+
+from .logger import get_logger
+from .event_bus import event_bus, DATA_SAVED
+
+logger = get_logger()
+
+# 支持的保存格式: {格式名: 文件扩展名}
+FORMATS = {
+    'png': '.png',
+    'jpg': '.jpg',
+    'jpeg': '.jpg',
+    'bmp': '.bmp',
+    'tif': '.tif',
+    'tiff': '.tif',
+}
+
+# 默认保存目录(与主配置data.image_save_path的默认值一致)
+DEFAULT_DIRECTORY = os.path.join('data', 'images')
+
+# 写文件使用的缓冲区大小
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def encode_params(fmt: str, jpeg_quality: int = 95, png_compression: int = 1) -> list:
+    """
+    生成cv2.imencode的编码参数
+
+    Args:
+        fmt: 保存格式
+        jpeg_quality: JPEG质量(0-100)
+        png_compression: PNG压缩级别(0-9)，级别越低编码越快、文件越大
+
+    Returns:
+        编码参数列表
+    """
+    if fmt in ('jpg', 'jpeg'):
+        return [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+    if fmt == 'png':
+        return [cv2.IMWRITE_PNG_COMPRESSION, int(png_compression)]
+    return []
+
+
+class ImageSaveService:
+    """
+    基于线程池的异步图像保存服务
+
+        service = ImageSaveService("D:/images", fmt="png")
+        service.start()
+        manager.add_frame_handler(lambda serial, frame, info: service.submit(frame, directory=f"D:/images/{serial}"))
+        ...
+        service.stop()
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, fmt: str = 'jpg', workers: Optional[int] = None,
+                 max_pending: int = 32, jpeg_quality: int = 95, png_compression: int = 1,
+                 data_type: str = "image", saved_callback: Optional[Callable[[str, str], None]] = None):
+        """
+        初始化保存服务
+
+        Args:
+            directory: 默认保存目录
+            fmt: 默认保存格式(png / jpg / bmp / tiff)
+            workers: 编码线程数，None表示min(4, CPU核数)
+            max_pending: 待保存(排队和正在编码)的最大帧数，超出时丢弃新帧
+            jpeg_quality: JPEG质量
+            png_compression: PNG压缩级别
+            data_type: 随DATA_SAVED事件发出的数据类型
+            saved_callback: 保存完成回调(数据类型, 路径)，None表示发布DATA_SAVED事件
+        """
+        fmt = fmt.lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"不支持的保存格式: {fmt}")
+        self.directory = directory
+        self.fmt = fmt
+        self.jpeg_quality = jpeg_quality
+        self.png_compression = png_compression
+        self.data_type = data_type
+        self._workers = max(1, workers or min(4, multiprocessing.cpu_count()))
+        self._max_pending = max(1, int(max_pending))
+        self._saved_callback = saved_callback
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slot_available = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._running = False
+        self._pending = 0
+        self._name_counter = 0
+
+        self.reset_stats()
+
+    @property
+    def running(self) -> bool:
+        """服务是否已启动"""
+        return self._running
+
+    def start(self) -> bool:
+        """
+        启动编码线程池
+
+        Returns:
+            是否启动成功
+        """
+        with self._lock:
+            if self._running:
+                return True
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="ImageSave")
+            self._running = True
+        logger.info(f"图像保存服务已启动: {self._workers}个编码线程, 最多{self._max_pending}帧待保存")
+        return True
+
+    def stop(self, wait: bool = True) -> Dict[str, Any]:
+        """
+        停止保存服务
+
+        Args:
+            wait: 是否等待已提交的帧全部保存；False时丢弃尚未开始编码的帧
+
+        Returns:
+            最终统计信息
+        """
+        with self._lock:
+            executor = self._executor if self._running else None
+            self._running = False
+            self._slot_available.notify_all()
+            self._executor = None
+        if executor is None:
+            return self.get_stats()
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+        logger.info("图像保存服务已停止")
+        return self.get_stats()
+
+    def submit(self, frame, name: Optional[str] = None, fmt: Optional[str] = None,
+               directory: Optional[str] = None, data_type: Optional[str] = None,
+               copy: bool = True, timeout: float = 0) -> Optional[str]:
+        """
+        提交一帧保存
+
+        Args:
+            frame: 图像数组或Frame
+            name: 文件名(不含扩展名)，None时由相机ID、帧号和时间生成
+            fmt: 保存格式，None表示默认格式
+            directory: 保存目录，None表示默认目录
+            data_type: 随DATA_SAVED事件发出的数据类型，None表示默认类型
+            copy: 是否拷贝图像；调用者保证图像在保存完成前不被修改时可以传False
+            timeout: 待保存帧数已满时的等待时间(秒)，0表示立即丢弃该帧
+
+        Returns:
+            将要写入的文件路径；未启动或被丢弃时返回None
+        """
+        fmt = (fmt or self.fmt).lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"不支持的保存格式: {fmt}")
+        info = frame.to_info() if hasattr(frame, 'to_info') else {}
+        array = getattr(frame, 'array', frame)
+
+        with self._lock:
+            if not self._running:
+                return None
+            if self._pending >= self._max_pending and timeout:
+                self._slot_available.wait_for(lambda: self._pending < self._max_pending or not self._running,
+                                              timeout)
+            if not self._running or self._pending >= self._max_pending:
+                self._stats['dropped'] += 1
+                return None
+            self._pending += 1
+            self._stats['submitted'] += 1
+            if self._stats['high_watermark'] < self._pending:
+                self._stats['high_watermark'] = self._pending
+            self._name_counter += 1
+            counter = self._name_counter
+            executor = self._executor
+
+        if copy:
+            array = np.array(array, copy=True, order='C')
+        path = os.path.join(directory or self.directory, (name or self._make_name(info, counter)) + FORMATS[fmt])
+        try:
+            future = executor.submit(self._save, array, path, fmt, data_type or self.data_type, time.perf_counter())
+        except RuntimeError as e:
+            # stop()与submit()并发时线程池可能已关闭
+            logger.error(f"提交保存任务失败: {str(e)}")
+            self._finish('failed')
+            return None
+        future.add_done_callback(self._on_cancelled)
+        return path
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待已提交的帧全部保存
+
+        Args:
+            timeout: 最长等待时间(秒)，None表示一直等待
+
+        Returns:
+            是否已全部保存
+        """
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取保存统计信息
+
+        Returns:
+            提交/保存/失败/丢弃数、积压帧数、吞吐量和平均编码/写入耗时(毫秒)等
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['backlog'] = self._pending
+            stats['max_pending'] = self._max_pending
+            stats['workers'] = self._workers
+            elapsed = time.time() - self._started_at
+            saved = stats['saved']
+            done = saved + stats['failed']
+            stats['elapsed'] = elapsed
+            stats['fps'] = saved / elapsed if elapsed > 0 else 0.0
+            stats['mb_per_sec'] = stats['bytes'] / elapsed / 1e6 if elapsed > 0 else 0.0
+            stats['encode_ms_avg'] = self._encode_total / done if done else 0.0
+            stats['write_ms_avg'] = self._write_total / saved if saved else 0.0
+            stats['latency_ms_avg'] = self._latency_total / done if done else 0.0
+        return stats
+
+    def reset_stats(self) -> None:
+        """清零统计计数"""
+        with self._lock:
+            self._stats = {'submitted': 0, 'saved': 0, 'failed': 0, 'dropped': 0, 'bytes': 0,
+                           'high_watermark': self._pending}
+            self._encode_total = 0.0
+            self._write_total = 0.0
+            self._latency_total = 0.0
+            self._started_at = time.time()
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _make_name(info: Dict[str, Any], counter: int) -> str:
+        """由帧信息生成文件名: [相机ID_]时间_毫秒_帧号(无帧信息时用提交序号)"""
+        timestamp = info.get('timestamp') or time.time()
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(timestamp))
+        millis = int((timestamp % 1) * 1000)
+        number = info.get('frame_number', counter) if info else counter
+        camera_id = info.get('camera_id') or ""
+        prefix = f"{camera_id}_" if camera_id else ""
+        return f"{prefix}{stamp}_{millis:03d}_{number:08d}"
+
+    def _save(self, array: np.ndarray, path: str, fmt: str, data_type: str, submitted_at: float) -> None:
+        """编码并写入一帧(在线程池中执行)"""
+        started = time.perf_counter()
+        encoded = None
+        written = 0.0
+        temp_path = path + '.part'
+        try:
+            ok, encoded = cv2.imencode(FORMATS[fmt], array,
+                                       encode_params(fmt, self.jpeg_quality, self.png_compression))
+            if not ok:
+                raise ValueError(f"图像编码失败(格式{fmt}, 形状{array.shape}, 类型{array.dtype})")
+            encoded_at = time.perf_counter()
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(temp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(memoryview(encoded))
+            os.replace(temp_path, path)
+            written = time.perf_counter()
+        except Exception as e:
+            logger.error(f"保存图像失败 {path}: {str(e)}")
+            # 写入或改名失败时不留下不完整的临时文件
+            try:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            except OSError as remove_error:
+                logger.warning(f"删除临时文件失败 {temp_path}: {str(remove_error)}")
+            with self._lock:
+                self._encode_total += (time.perf_counter() - started) * 1000.0
+                self._latency_total += (time.perf_counter() - submitted_at) * 1000.0
+            self._finish('failed')
+            return
+
+        with self._lock:
+            self._stats['bytes'] += encoded.nbytes
+            self._encode_total += (encoded_at - started) * 1000.0
+            self._write_total += (written - encoded_at) * 1000.0
+            self._latency_total += (written - submitted_at) * 1000.0
+        self._emit_saved(data_type, path)
+        self._finish('saved')
+
+    def _on_cancelled(self, future) -> None:
+        """stop(wait=False)取消的任务计为丢弃"""
+        if future.cancelled():
+            self._finish('dropped')
+
+    def _finish(self, outcome: str) -> None:
+        """
+        一帧处理结束，释放待保存名额
+
+        Args:
+            outcome: 计入的统计项(saved / failed / dropped)
+        """
+        with self._lock:
+            self._pending -= 1
+            self._stats[outcome] += 1
+            self._slot_available.notify()
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def _emit_saved(self, data_type: str, path: str) -> None:
+        """发出保存完成通知"""
+        try:
+            if self._saved_callback is not None:
+                self._saved_callback(data_type, path)
+            else:
+                event_bus.publish(DATA_SAVED, data_type, path)
+        except Exception as e:
+            logger.error(f"发送保存完成通知失败: {str(e)}")
+
+
+# 全局保存服务(拍照等界面操作使用，首次提交前需调用start)
+image_save_service = ImageSaveService()
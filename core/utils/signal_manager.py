@@ -7,6 +7,16 @@
 from PyQt5.QtCore import QObject, pyqtSignal
 import numpy as np
 
+from .event_bus import event_bus, EventBus, FRAME_READY, LOG_MESSAGE, ALGORITHM_RESULT, PLC_TRIGGER, \
+    DATA_SAVED
+
+
+class LoggerSignals(QObject):
+    """
+    用于在UI中显示日志的信号类
+    """
+    log_message = pyqtSignal(str, str)  # 级别, 内容
+
 
 class SignalManager(QObject):
     """
@@ -48,7 +58,7 @@ class SignalManager(QObject):
     updateImageSignal = pyqtSignal(np.ndarray)  # 更新图像信号
     requestSetSimulationMode = pyqtSignal(bool)  # 请求设置模拟模式
 
-    frame_ready_signal = pyqtSignal(np.ndarray, str)  # 帧准备好信号
+    frame_ready_signal = pyqtSignal(object, str)  # 帧准备好信号，参数：Frame(图像及帧号、时间戳等元数据)，相机ID
 
     # 算法相关信号
     algorithm_result_signal = pyqtSignal(str, np.ndarray, dict)  # 算法结果，参数：结果类型，处理后图像，附加数据
@@ -97,3 +107,39 @@ class SignalManager(QObject):
 
 # 全局单例实例
 signal_manager = SignalManager()
+
+# 日志信号实例
+logger_signals = LoggerSignals()
+
+
+def _emit_safely(signal):
+    """返回发射指定信号的回调；退出阶段Qt对象已销毁时忽略"""
+    def emit(*args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            pass
+    return emit
+
+
+def bridge_event_bus(bus: EventBus = event_bus) -> None:
+    """
+    将核心模块的事件总线桥接到Qt信号
+
+    核心模块只向事件总线发布事件，不依赖PyQt5；导入本模块(即界面进程)时自动建立桥接：
+    事件总线 -> frame_ready_signal / log_message / algorithm_result_signal / data_saved_signal，
+    plc_trigger_signal -> 事件总线。
+
+    Args:
+        bus: 事件总线
+    """
+    if not bus.mark_qt_bridged():
+        return
+    bus.subscribe(FRAME_READY, _emit_safely(signal_manager.frame_ready_signal))
+    bus.subscribe(LOG_MESSAGE, _emit_safely(logger_signals.log_message))
+    bus.subscribe(ALGORITHM_RESULT, _emit_safely(signal_manager.algorithm_result_signal))
+    bus.subscribe(DATA_SAVED, _emit_safely(signal_manager.data_saved_signal))
+    signal_manager.plc_trigger_signal.connect(lambda: bus.publish(PLC_TRIGGER))
+
+
+bridge_event_bus()
@@ -0,0 +1,7 @@
+"""测试配置：把项目根目录加入导入路径，使core/UI包可以直接导入"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
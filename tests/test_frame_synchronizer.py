@@ -0,0 +1,173 @@
+"""
+FrameSynchronizer测试
+
+SimulatedTriggerHarness用手动时钟和固定随机种子生成触发和帧，结果完全可复现，
+用于验证容差、超时和丢帧/迟到场景。
+"""
+import random
+import weakref
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.camera.frame_synchronizer import (FrameGroup, FrameSynchronizer, MATCH_TIMESTAMP,
+                                            MATCH_TRIGGER_INDEX)
+
+
+class SimulatedTriggerHarness:
+    """
+    可复现的模拟触发测试工具
+
+    用手动时钟驱动FrameSynchronizer：每次触发为每台相机生成一帧，帧时间戳 = 触发时间 + 固定延迟 + 抖动；
+    可指定某些(触发序号, 相机)丢帧或迟到，运行结果只由参数和随机种子决定。
+
+        harness = SimulatedTriggerHarness(["A", "B", "C"], jitter_ms=2.0, drop={(3, "B")}, late={(5, "C"): 500})
+        report = harness.run(triggers=10)
+        assert report['groups_complete'] == 8
+    """
+
+    def __init__(self, serials: Iterable[str], trigger_interval_ms: float = 100.0, latency_ms: float = 10.0,
+                 jitter_ms: float = 1.0, tolerance_ms: float = 5.0, timeout_ms: float = 200.0,
+                 match: str = MATCH_TIMESTAMP, use_plc_trigger: bool = False,
+                 drop: Optional[Iterable] = None, late: Optional[Dict] = None, seed: int = 0):
+        """
+        Args:
+            serials: 相机序列号
+            trigger_interval_ms: 触发间隔(毫秒)
+            latency_ms: 触发到帧到达的固定延迟(毫秒)
+            jitter_ms: 各相机时间戳的均匀抖动范围(±毫秒)
+            tolerance_ms: 同步器匹配容差(毫秒)
+            timeout_ms: 同步器分组超时(毫秒)
+            match: 匹配方式
+            use_plc_trigger: 是否在每次触发时调用notify_trigger(模拟plc_trigger_signal)
+            drop: 需要丢弃的(触发序号, 序列号)集合
+            late: {(触发序号, 序列号): 额外到达延迟毫秒}，时间戳不变但到达时间推迟
+            seed: 随机种子
+        """
+        self.serials = list(serials)
+        self.trigger_interval = trigger_interval_ms / 1000.0
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.use_plc_trigger = use_plc_trigger
+        self.drop = set(drop or ())
+        self.late = dict(late or {})
+        self.seed = seed
+        self.now = 0.0
+        self.synchronizer = FrameSynchronizer(self.serials, tolerance_ms=tolerance_ms, timeout_ms=timeout_ms,
+                                              match=match, trigger_latency_ms=latency_ms,
+                                              clock=lambda: self.now)
+        self.complete_groups: List[FrameGroup] = []
+        self.incomplete_groups: List[FrameGroup] = []
+        self.late_frames: List[tuple] = []
+        self.synchronizer.add_group_handler(self.complete_groups.append)
+        self.synchronizer.add_incomplete_handler(self.incomplete_groups.append)
+        self.synchronizer.add_late_handler(lambda s, f, i, g: self.late_frames.append((s, i['trigger'], g)))
+
+    def run(self, triggers: int) -> Dict[str, Any]:
+        """
+        执行模拟
+
+        Args:
+            triggers: 触发次数
+
+        Returns:
+            同步器统计信息，另含complete_triggers(完整分组对应的触发序号)
+        """
+        rng = random.Random(self.seed)
+        frame = np.zeros((1, 1), dtype=np.uint8)
+
+        # 生成事件: (到达时间, 顺序, 类型, 数据)
+        events = []
+        order = 0
+        for trigger in range(triggers):
+            trigger_time = trigger * self.trigger_interval
+            events.append((trigger_time, order, 'trigger', trigger_time))
+            order += 1
+            for serial in self.serials:
+                if (trigger, serial) in self.drop:
+                    continue
+                timestamp = trigger_time + self.latency + rng.uniform(-self.jitter, self.jitter)
+                arrival = timestamp + self.late.get((trigger, serial), 0.0) / 1000.0
+                info = {'timestamp': timestamp, 'trigger_index': trigger, 'frame_number': trigger + 1,
+                        'trigger': trigger}
+                events.append((arrival, order, 'frame', (serial, info)))
+                order += 1
+        events.sort(key=lambda e: (e[0], e[1]))
+
+        for arrival, _, kind, payload in events:
+            self.now = arrival
+            self.synchronizer.poll()
+            if kind == 'trigger':
+                if self.use_plc_trigger:
+                    self.synchronizer.notify_trigger(payload)
+            else:
+                serial, info = payload
+                self.synchronizer.add_frame(serial, frame, info)
+
+        # 推进时钟让剩余分组超时
+        self.now += (self.synchronizer.timeout_ms / 1000.0) + self.trigger_interval
+        self.synchronizer.poll()
+
+        report = self.synchronizer.get_stats()
+        report['complete_triggers'] = sorted(
+            next(iter(g.frames.values()))[1]['trigger'] for g in self.complete_groups)
+        report['late'] = list(self.late_frames)
+        return report
+
+
+SERIALS = ["A", "B", "C"]
+
+
+def test_all_frames_within_tolerance_form_complete_groups():
+    report = SimulatedTriggerHarness(SERIALS, jitter_ms=1.0).run(10)
+    assert report['groups_complete'] == 10
+    assert report['groups_incomplete'] == 0
+    assert report['complete_triggers'] == list(range(10))
+
+
+def test_dropped_and_late_frames():
+    harness = SimulatedTriggerHarness(SERIALS, jitter_ms=2.0, drop={(3, "B")}, late={(5, "C"): 500})
+    report = harness.run(10)
+    assert report['groups_complete'] == 8
+    assert report['groups_incomplete'] == 2
+    assert 3 not in report['complete_triggers'] and 5 not in report['complete_triggers']
+    assert [group.missing for group in harness.incomplete_groups] == [["B"], ["C"]]
+    assert [(serial, trigger) for serial, trigger, _ in report['late']] == [("C", 5)]
+
+
+def test_jitter_beyond_tolerance_breaks_timestamp_matching_but_not_trigger_index():
+    by_timestamp = SimulatedTriggerHarness(SERIALS, jitter_ms=20.0, tolerance_ms=5.0).run(10)
+    assert by_timestamp['groups_complete'] < 10
+    by_index = SimulatedTriggerHarness(SERIALS, jitter_ms=20.0, match=MATCH_TRIGGER_INDEX).run(10)
+    assert by_index['groups_complete'] == 10
+
+
+def test_plc_trigger_groups():
+    report = SimulatedTriggerHarness(SERIALS, use_plc_trigger=True, drop={(2, "A")}).run(10)
+    assert report['triggers'] == 10
+    assert report['groups_complete'] == 9
+    assert report['groups_incomplete'] == 1
+
+
+def test_runs_are_reproducible():
+    first = SimulatedTriggerHarness(SERIALS, jitter_ms=4.0, tolerance_ms=5.0, seed=7).run(20)
+    second = SimulatedTriggerHarness(SERIALS, jitter_ms=4.0, tolerance_ms=5.0, seed=7).run(20)
+    assert first == second
+
+
+def test_timeout_is_public():
+    synchronizer = FrameSynchronizer(SERIALS, tolerance_ms=3.0, timeout_ms=150.0)
+    assert synchronizer.timeout_ms == 150.0
+    assert synchronizer.tolerance_ms == 3.0
+
+
+def test_closed_groups_do_not_keep_images():
+    synchronizer = FrameSynchronizer(["A", "B"], tolerance_ms=5.0)
+    frame = np.zeros((4, 4), dtype=np.uint8)
+    ref = weakref.ref(frame)
+    synchronizer.add_frame("A", frame, {'timestamp': 1.0})
+    synchronizer.add_frame("B", np.zeros((4, 4), dtype=np.uint8), {'timestamp': 1.001})
+    del frame
+    # 分组关闭后只保留迟到帧识别所需的信息
+    assert ref() is None
+    assert synchronizer.get_stats()['groups_complete'] == 1
@@ -0,0 +1,161 @@
+"""
+HikvisionCamera测试
+
+通过FakeMvCamera驱动真实的SDK代码路径(取流、像素转换、缓冲池和零拷贝租约)，不需要相机和海康SDK。
+每个测试结束后检查替身的SDK缓冲节点和缓冲池引用已全部归还。
+"""
+import numpy as np
+import pytest
+
+from core.camera.fake_mv_camera import FakeMvCamera
+from core.camera.hikvision_camera import ACQUISITION_CALLBACK, ACQUISITION_POLL, HikvisionCamera
+from core.camera.MvImport.MvErrorDefine_const import MV_E_BUSY
+from core.camera.MvImport.PixelType_header import (PixelType_Gvsp_BayerRG8, PixelType_Gvsp_Mono8,
+                                                   PixelType_Gvsp_Mono12_Packed)
+
+# 采集线程未能按时退出时stop_grabbing会向其抛出SystemExit，pytest会把它报告为线程未处理异常
+pytestmark = pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+
+WIDTH, HEIGHT = 64, 48
+
+
+@pytest.fixture
+def open_camera():
+    """创建并打开由FakeMvCamera驱动的相机；测试失败时也关闭相机，避免采集线程阻止进程退出"""
+    cameras = []
+
+    def create(pixel_type=PixelType_Gvsp_Mono8, buffer_count=4):
+        fake = FakeMvCamera(width=WIDTH, height=HEIGHT, pixel_type=pixel_type, frame_rate=200.0,
+                            buffer_count=buffer_count)
+        camera = HikvisionCamera(mv_camera=fake)
+        cameras.append(camera)
+        devices = camera.enumerate_devices()
+        assert len(devices) == 1
+        assert camera.open(devices[0]['device_id'])
+        return camera, fake
+
+    yield create
+    for camera in cameras:
+        camera.close()
+
+
+def close_camera(camera, fake):
+    """停止采集并关闭，检查SDK缓冲节点和缓冲池引用已全部归还"""
+    assert camera.stop_grabbing()
+    # stop_grabbing返回前已等待采集线程退出
+    thread = camera._thread_handle
+    assert thread is None or not thread.is_alive()
+    assert camera.close()
+    assert fake.get_stats()['outstanding_buffers'] == 0
+    assert camera.get_buffer_pool_stats()['in_use'] == 0
+
+
+@pytest.mark.parametrize("mode", [ACQUISITION_POLL, ACQUISITION_CALLBACK])
+def test_start_get_frame_release_stop(open_camera, mode):
+    camera, fake = open_camera()
+    assert camera.start_grabbing(mode)
+
+    frame = camera.get_frame(timeout=2000)
+    assert frame is not None
+    assert frame.shape == (HEIGHT, WIDTH) and frame.dtype == np.uint8
+    assert camera.release_frame(frame)
+
+    newer = camera.get_frame(timeout=2000)
+    assert newer is not None
+    assert camera.release_frame(newer)
+    assert fake.get_stats()['frames'] >= 2
+    close_camera(camera, fake)
+
+
+@pytest.mark.parametrize("pixel_type, shape", [
+    (PixelType_Gvsp_Mono8, (HEIGHT, WIDTH)),
+    (PixelType_Gvsp_BayerRG8, (HEIGHT, WIDTH, 3)),
+    (PixelType_Gvsp_Mono12_Packed, (HEIGHT, WIDTH)),
+])
+def test_pixel_formats_are_converted(open_camera, pixel_type, shape):
+    camera, fake = open_camera(pixel_type)
+    camera.set_mono_output_bgr(False)
+    assert camera.start_grabbing()
+
+    frame, info = camera.get_frame_with_info(timeout=2000)
+    assert frame is not None
+    assert frame.shape == shape
+    assert info['pixel_type'] == pixel_type
+    assert camera.release_frame(frame)
+    close_camera(camera, fake)
+
+
+def test_held_frame_is_not_overwritten(open_camera):
+    camera, fake = open_camera()
+    assert camera.start_grabbing()
+
+    held = camera.get_frame(timeout=2000)
+    snapshot = held.copy()
+    # 继续取流，缓冲池必须跳过仍被持有的缓冲区
+    for _ in range(10):
+        frame = camera.get_frame(timeout=2000)
+        assert frame is not None
+        assert camera.release_frame(frame)
+    assert np.array_equal(held, snapshot)
+    assert camera.release_frame(held)
+    close_camera(camera, fake)
+
+
+def test_zero_copy_lease_returns_sdk_buffer_after_release(open_camera):
+    camera, fake = open_camera(buffer_count=8)
+    camera.set_mono_output_bgr(False)
+    camera.set_zero_copy(True)
+    assert camera.start_grabbing(ACQUISITION_POLL)
+
+    frame = camera.get_frame(timeout=2000)
+    assert frame is not None
+    assert not frame.flags.writeable
+    assert camera.get_frame_lease(frame) is not None
+    # 调用者持有期间SDK节点不会被归还
+    assert fake.get_stats()['outstanding_buffers'] >= 1
+    assert camera.release_frame(frame)
+
+    close_camera(camera, fake)
+    assert camera.get_lease_stats()['outstanding'] == 0
+
+
+def test_held_lease_survives_stop_grabbing(open_camera):
+    camera, fake = open_camera(buffer_count=8)
+    camera.set_mono_output_bgr(False)
+    camera.set_zero_copy(True)
+    assert camera.start_grabbing(ACQUISITION_POLL)
+
+    held = camera.get_frame(timeout=2000)
+    assert held is not None
+    snapshot = held.copy()
+    assert camera.stop_grabbing()
+    # 停止采集不会归还仍被持有的SDK缓冲区，数据保持有效
+    assert fake.get_stats()['outstanding_buffers'] == 1
+    assert np.array_equal(held, snapshot)
+    assert camera.release_frame(held)
+    assert fake.get_stats()['outstanding_buffers'] == 0
+
+    # 重新开始采集后仍能取到新帧
+    assert camera.start_grabbing(ACQUISITION_POLL)
+    frame = camera.get_frame(timeout=2000)
+    assert frame is not None
+    assert camera.release_frame(frame)
+    close_camera(camera, fake)
+
+
+def test_only_unsupported_nodes_are_cached_as_missing(open_camera):
+    camera, fake = open_camera()
+
+    # 相机没有的节点: 读取一次后缓存为不支持
+    del fake._values['AcquisitionFrameRate']
+    assert camera.get_parameters(['AcquisitionFrameRate'], use_cache=False) == {}
+    reads = fake.get_stats()['node_reads']
+    assert camera.get_parameters(['AcquisitionFrameRate']) == {}
+    assert fake.get_stats()['node_reads'] == reads
+
+    # 设备忙等临时错误不缓存，下次重新读取
+    real_get = fake.MV_CC_GetFloatValue
+    fake.MV_CC_GetFloatValue = lambda key, st: MV_E_BUSY
+    assert camera.get_parameters(['ExposureTime'], use_cache=False) == {}
+    fake.MV_CC_GetFloatValue = real_get
+    assert camera.get_parameters(['ExposureTime']) == {'ExposureTime': 10000.0}